@@ -29,6 +29,7 @@ from helpers.ui_components import inject_pwa_head
 from core.navigation import PAGE_KEYS, _set_query, init_navigation_defaults
 from core.state import get_current_user_role
 from auth.auth import require_login
+from core.database import sync_shared_cache_domains
 
 st.markdown(
     """
@@ -63,6 +64,9 @@ _gcal_state = st.query_params.get("state", "")
 
 init_navigation_defaults()
 
+# ── Shared caches: drop local entries another worker invalidated ──
+sync_shared_cache_domains()
+
 # ── PWA ──
 inject_pwa_head()
 
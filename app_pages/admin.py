@@ -1469,6 +1469,15 @@ def _build_admin_ai_snapshot() -> dict[str, Any]:
         float((actual_ai_df.get("status", pd.Series(dtype=str)).astype(str).str.lower() == "success").sum()) if not actual_ai_df.empty else 0.0,
         float(len(actual_ai_df)),
     )
+    ai_cache_statuses = (
+        ai_usage_df.get("meta_json", pd.Series(dtype=object)).map(_ai_usage_cache_status)
+        if not ai_usage_df.empty
+        else pd.Series(dtype=str)
+    )
+    ai_cache_hit_ratio = _safe_ratio(
+        float((ai_cache_statuses == "hit").sum()),
+        float(ai_cache_statuses.isin(["hit", "miss"]).sum()),
+    )
 
     recommendation_event_counts = (
         recommendation_df.groupby("event_type", as_index=False).size().rename(columns={"size": "count"})
@@ -1560,6 +1569,7 @@ def _build_admin_ai_snapshot() -> dict[str, Any]:
             "topic_linkage_score": topic_linkage_score,
             "review_closure_score": review_closure_score,
             "ai_success_score": ai_success_score,
+            "ai_cache_hit_ratio": ai_cache_hit_ratio,
             "feedback_loop_score": feedback_loop_score,
             "recommendation_acceptance_score": recommendation_acceptance_score,
             "recommendation_outcome_score": recommendation_outcome_score,
@@ -1601,6 +1611,7 @@ def _render_admin_eic() -> None:
             (t("admin_ai_metric_review_closure"), _pct_text(metrics["review_closure_score"])),
             (t("admin_ai_metric_feedback_loop"), _pct_text(metrics["feedback_loop_score"])),
             (t("admin_ai_metric_ai_success"), _pct_text(metrics["ai_success_score"])),
+            (t("admin_ai_metric_ai_cache_hits"), _pct_text(metrics["ai_cache_hit_ratio"])),
         ]
     )
     st.markdown("<div class='admin-kpi-stack-gap'></div>", unsafe_allow_html=True)
@@ -2075,6 +2086,10 @@ def _ai_usage_is_actual_ai(meta: Any) -> bool:
     return safe_meta.get("used_ai") is not False
 
 
+def _ai_usage_cache_status(meta: Any) -> str:
+    return str(_safe_meta_json(meta).get("cache") or "").strip().lower()
+
+
 def _ai_usage_inspection_frame(ai_usage_df: pd.DataFrame) -> pd.DataFrame:
     if ai_usage_df.empty:
         return pd.DataFrame()
@@ -2086,7 +2101,12 @@ def _ai_usage_inspection_frame(ai_usage_df: pd.DataFrame) -> pd.DataFrame:
     inspection["feature_label"] = inspection.get("feature_name", pd.Series(dtype=str)).astype(str).map(humanize_ai_feature_name)
     inspection["feature_scope"] = inspection.get("feature_name", pd.Series(dtype=str)).astype(str).map(_ai_feature_scope_label)
     inspection["status_label"] = inspection.get("status", pd.Series(dtype=str)).astype(str).str.strip().str.lower().map(
-        lambda value: {"requested": t("admin_ai_status_requested"), "success": t("admin_ai_status_success"), "failed": t("admin_ai_status_failed")}.get(value, value or "—")
+        lambda value: {
+            "requested": t("admin_ai_status_requested"),
+            "success": t("admin_ai_status_success"),
+            "cache_hit": t("admin_ai_status_cache_hit"),
+            "failed": t("admin_ai_status_failed"),
+        }.get(value, value or "—")
     )
     inspection["meta_summary"] = inspection["meta_json"].map(
         lambda meta: ", ".join(
@@ -8,7 +8,7 @@ import plotly.graph_objects as go
 from core.i18n import t
 from core.navigation import go_to, page_header
 import matplotlib.pyplot as plt
-from helpers.analytics import build_income_analytics, money_fmt, _build_income_analytics_from_payments
+from helpers.analytics import build_income_analytics, money_fmt
 from helpers.ui_components import ts_today_naive, to_dt_naive, pretty_df, translate_df_headers, chart_series, render_styled_dataframe
 from helpers.language import translate_modality_value
 from helpers.dashboard import _rebuild_dashboard_from_frames, load_dashboard_source_frames
@@ -33,14 +33,11 @@ def render_analytics():
         expiry_days=365,
         grace_days=0,
     )
-    kpis, income_table, by_student, sold_by_subject, sold_by_modality = _build_income_analytics_from_payments(
-        payments_all,
+    kpis, income_table, by_student, sold_by_subject, sold_by_modality = build_income_analytics(
         group="monthly",
+        payments=payments_all,
     )
-    _, yearly_income_table, *_ = _build_income_analytics_from_payments(
-        payments_all,
-        group="yearly",
-    )
+    _, yearly_income_table, *_ = build_income_analytics(group="yearly", payments=payments_all)
     dashboard_student_units = {}
     if dashboard_all is not None and not dashboard_all.empty and "Student" in dashboard_all.columns:
         dash_tmp = dashboard_all.copy()
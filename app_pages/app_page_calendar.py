@@ -3,10 +3,9 @@ import datetime
 from datetime import datetime as _dt, date, time, timedelta
 import pandas as pd
 from core.i18n import t
-from core.state import get_current_user_id
 from core.timezone import today_local, get_app_tz, get_app_tz_name
 from core.navigation import go_to, page_header
-from core.database import load_students, get_sb, clear_app_caches
+from core.database import load_students, clear_app_caches
 from helpers.calendar_helpers import build_calendar_events, render_fullcalendar, _parse_time_value, validate_hhmm
 from helpers.schedule import (
     active_schedule_freezes,
@@ -29,8 +28,9 @@ from helpers.google_calendar import (
     load_gcal_tokens,
     clear_gcal_tokens,
     is_gcal_connected,
-    create_gcal_event,
-    delete_gcal_event,
+    enqueue_gcal_create,
+    enqueue_gcal_delete,
+    supersede_pending_gcal_creates,
 )
 
 # 12.5) PAGE: CALENDAR
@@ -221,7 +221,7 @@ def render_calendar():
                     else:
                         hh, mm = map(int, sch_time.split(":"))
                         combined_dt = _dt.combine(sch_one_time_date, time(hh, mm))
-                        add_override(
+                        override_id = add_override(
                             student=sch_student,
                             original_date=sch_one_time_date,
                             new_dt=combined_dt,
@@ -229,25 +229,16 @@ def render_calendar():
                             status="scheduled",
                             note=t("schedule_one_time"),
                         )
-                        # Sync one-time lesson to Google Calendar
+                        # Queue the Google Calendar sync; the outbox worker
+                        # creates the event and stores its id on the override.
                         if st.session_state.get("gcal_auto_sync") and is_gcal_connected():
-                            gcal_eid = create_gcal_event(sch_student, combined_dt, sch_duration)
-                            if gcal_eid:
-                                # Update the override with the gcal event ID
-                                try:
-                                    update_query = (
-                                        get_sb().table("calendar_overrides").update(
-                                            {"gcal_event_id": gcal_eid}
-                                        ).eq("student", sch_student).eq(
-                                            "original_date", sch_one_time_date.isoformat()
-                                        )
-                                    )
-                                    current_user_id = str(get_current_user_id() or "").strip()
-                                    if current_user_id:
-                                        update_query = update_query.eq("user_id", current_user_id)
-                                    update_query.order("id", desc=True).limit(1).execute()
-                                except Exception:
-                                    pass
+                            enqueue_gcal_create(
+                                sch_student,
+                                combined_dt,
+                                sch_duration,
+                                original_date=sch_one_time_date,
+                                override_id=override_id,
+                            )
 
                     st.success(t("saved"))
                     st.rerun()
@@ -557,7 +548,13 @@ def render_calendar():
                         combined_dt = None
                         duration = 60
 
-                    add_override(
+                    # Look up the old event before the new override shadows it.
+                    old_gcal_eid = None
+                    gcal_sync = bool(st.session_state.get("gcal_auto_sync") and is_gcal_connected())
+                    if gcal_sync:
+                        old_gcal_eid = find_gcal_event_id(ov_student, ov_original_date)
+
+                    override_id = add_override(
                         student=ov_student,
                         original_date=ov_original_date,
                         new_dt=combined_dt,
@@ -566,31 +563,21 @@ def render_calendar():
                         note=ov_note,
                     )
 
-                    # Google Calendar sync
-                    if st.session_state.get("gcal_auto_sync") and is_gcal_connected():
-                        # Delete the old event for this student+date
-                        old_gcal_eid = find_gcal_event_id(ov_student, ov_original_date)
+                    # Google Calendar sync (queued; see helpers/google_calendar outbox)
+                    if gcal_sync:
+                        supersede_pending_gcal_creates(ov_student, ov_original_date)
                         if old_gcal_eid:
-                            delete_gcal_event(old_gcal_eid)
+                            enqueue_gcal_delete(old_gcal_eid, student=ov_student, original_date=ov_original_date)
 
                         if ov_status == "scheduled" and combined_dt:
-                            # Create new event for rescheduled lesson
-                            gcal_eid = create_gcal_event(ov_student, combined_dt, duration, ov_note)
-                            if gcal_eid:
-                                try:
-                                    update_query = (
-                                        get_sb().table("calendar_overrides").update(
-                                            {"gcal_event_id": gcal_eid}
-                                        ).eq("student", ov_student).eq(
-                                            "original_date", ov_original_date.isoformat()
-                                        )
-                                    )
-                                    current_user_id = str(get_current_user_id() or "").strip()
-                                    if current_user_id:
-                                        update_query = update_query.eq("user_id", current_user_id)
-                                    update_query.order("id", desc=True).limit(1).execute()
-                                except Exception:
-                                    pass
+                            enqueue_gcal_create(
+                                ov_student,
+                                combined_dt,
+                                duration,
+                                ov_note,
+                                original_date=ov_original_date,
+                                override_id=override_id,
+                            )
 
                     st.success(t("saved"))
                     st.rerun()
@@ -13,7 +13,7 @@ from helpers.student_meta import student_meta_maps
 from helpers.goals import render_home_indicator, YEAR_GOAL_SCOPE
 from helpers.kpi_bubbles import kpi_stat_cards
 from helpers.ui_components import pretty_df, translate_df_headers, translate_df, ts_today_naive, render_styled_dataframe
-from helpers.analytics import _build_income_analytics_from_payments
+from helpers.analytics import build_income_analytics
 from helpers.year_goals import get_year_goal
 from helpers.currency import format_currency, get_preferred_currency, get_exchange_rate
 from helpers.language import translate_status, translate_modality_value, translate_language_value
@@ -29,6 +29,7 @@ from helpers.student_report import (
 )
 from helpers.notifications import (
     get_teacher_notifications_from_context,
+    load_notification_unread_count,
     render_lazy_notification_panel,
 )
 import re as _re
@@ -523,7 +524,7 @@ def render_dashboard():
 
     next_lesson = _get_next_lesson_from_events(future_events)
 
-    kpis, *_ = _build_income_analytics_from_payments(payments_df, group="monthly")
+    kpis, *_ = build_income_analytics(group="monthly", payments=payments_df)
     income_this_year = float(kpis.get("income_this_year", 0.0))
 
     current_year = int(ts_today_naive().year)
@@ -899,6 +900,7 @@ def render_dashboard():
             classes_df=classes_df,
         ),
         title_text=t("notifications"),
+        unread_loader=load_notification_unread_count,
     )
 
 # =========================
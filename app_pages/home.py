@@ -47,15 +47,19 @@ from helpers.lesson_planner import (
     subject_label as _subject_label_fn,
 )
 from helpers.planner_storage import (
+    MY_LESSON_PLANS_FEED,
+    PUBLIC_LESSON_PLANS_FEED,
     load_my_lesson_plans,
     load_public_lesson_plans,
     render_plan_library_cards,
     render_quick_lesson_plan_result,
     render_quick_lesson_planner_expander,
 )
-from helpers.quick_exam_storage import load_my_exams, load_public_exams, render_exam_library_cards, render_exam_result, render_quick_exam_builder_expander
+from helpers.quick_exam_storage import MY_EXAMS_FEED, PUBLIC_EXAMS_FEED, load_my_exams, load_public_exams, render_exam_library_cards, render_exam_result, render_quick_exam_builder_expander
 from helpers.recommendation_models import log_teacher_material_impressions, rank_teacher_resource_feed
 from helpers.video_library import (
+    MY_VIDEOS_FEED,
+    PUBLIC_VIDEOS_FEED,
     attach_video_to_topic,
     load_my_videos,
     load_public_videos,
@@ -67,6 +71,8 @@ from helpers.video_library import (
 )
 from helpers.worksheet_builder import normalize_worksheet_output
 from helpers.worksheet_storage import (
+    MY_WORKSHEETS_FEED,
+    PUBLIC_WORKSHEETS_FEED,
     load_my_worksheets,
     load_public_worksheets,
     render_quick_worksheet_maker_expander,
@@ -369,14 +375,35 @@ def _render_teacher_home_menu_card(
     return st.button(f"**{label}**  \n{desc}", key=button_key, use_container_width=True)
 
 
-def _render_resource_pagination_controls(df, state_key: str, *, page_size: int = _RESOURCE_PAGE_SIZE):
+def _owner_scope() -> str:
+    return str(get_current_user_id() or "")
+
+
+def _library_pages(state_key: str) -> int:
+    """Keyset pages loaded so far for the library listing paged by ``state_key``."""
+    return max(1, int(st.session_state.get(f"{state_key}_keyset_pages", 1) or 1))
+
+
+def _render_resource_pagination_controls(
+    df,
+    state_key: str,
+    *,
+    page_size: int = _RESOURCE_PAGE_SIZE,
+    feed=None,
+    scope: str = "",
+):
+    """Prev/next pager; with ``feed`` the next arrow keeps reading keyset pages past the loaded rows."""
     _, current_page, total_pages, start_idx, end_idx, total_items = _slice_resource_page(
         df,
         state_key,
         page_size=page_size,
     )
-    if total_items <= page_size:
+    loaded_pages = _library_pages(state_key)
+    has_more = bool(feed is not None and feed.has_more(scope, loaded_pages))
+    if total_items <= page_size and not has_more:
         return
+    if has_more and current_page >= total_pages - 1:
+        feed.prefetch(scope, loaded_pages)
 
     prev_col, info_col, next_col = st.columns([1, 3, 1])
     with prev_col:
@@ -385,11 +412,21 @@ def _render_resource_pagination_controls(df, state_key: str, *, page_size: int =
             st.session_state[state_key] = max(1, current_page - 1)
             st.rerun()
     with info_col:
-        st.caption(f"{start_idx + 1}-{end_idx} / {total_items} · {current_page}/{total_pages}")
+        more_suffix = "+" if has_more else ""
+        st.caption(f"{start_idx + 1}-{end_idx} / {total_items}{more_suffix} · {current_page}/{total_pages}{more_suffix}")
     with next_col:
-        if st.button("→", key=f"{state_key}_next", use_container_width=True, disabled=current_page >= total_pages):
+        if st.button(
+            "→",
+            key=f"{state_key}_next",
+            use_container_width=True,
+            disabled=current_page >= total_pages and not has_more,
+        ):
             clear_open_resource_previews()
-            st.session_state[state_key] = min(total_pages, current_page + 1)
+            if current_page >= total_pages and has_more:
+                st.session_state[f"{state_key}_keyset_pages"] = loaded_pages + 1
+                st.session_state[state_key] = current_page + 1
+            else:
+                st.session_state[state_key] = min(total_pages, current_page + 1)
             st.rerun()
 
 
@@ -1569,10 +1606,10 @@ def render_home(*, panel_override: str | None = None, show_home_actions: bool =
 
         own_filter_frames = [
             load_my_learning_programs(),
-            load_my_lesson_plans(),
-            load_my_worksheets(),
-            load_my_exams(),
-            load_my_videos(),
+            load_my_lesson_plans(pages=_library_pages("my_plans_page")),
+            load_my_worksheets(pages=_library_pages("my_ws_page")),
+            load_my_exams(pages=_library_pages("my_exams_page")),
+            load_my_videos(pages=_library_pages("my_videos_page")),
         ]
         own_resources_query, own_resources_subject_filter, own_resources_stage_filter, own_resources_level_filter = _render_shared_resource_filters(
             "resources_own",
@@ -1628,7 +1665,7 @@ def render_home(*, panel_override: str | None = None, show_home_actions: bool =
             _render_selected_file_resource_detail("program", scope="my_programs")
 
         with tab1:
-            my_df = load_my_lesson_plans()
+            my_df = load_my_lesson_plans(pages=_library_pages("my_plans_page"))
 
             if my_df.empty:
                 render_empty_state(
@@ -1665,11 +1702,11 @@ def render_home(*, panel_override: str | None = None, show_home_actions: bool =
                         allow_visibility_toggle=True,
                         allow_archive_toggle=True,
                     )
-                    _render_resource_pagination_controls(filtered, "my_plans_page")
+                    _render_resource_pagination_controls(filtered, "my_plans_page", feed=MY_LESSON_PLANS_FEED, scope=_owner_scope())
             _render_selected_file_resource_detail("plan", scope="my_plans")
 
         with tab2:
-            ws_df = load_my_worksheets()
+            ws_df = load_my_worksheets(pages=_library_pages("my_ws_page"))
             if ws_df.empty:
                 render_empty_state(
                     title_key="files_empty_worksheets_title",
@@ -1701,11 +1738,11 @@ def render_home(*, panel_override: str | None = None, show_home_actions: bool =
                     allow_visibility_toggle=True,
                     allow_archive_toggle=True,
                 )
-                _render_resource_pagination_controls(ws_filtered, "my_ws_page")
+                _render_resource_pagination_controls(ws_filtered, "my_ws_page", feed=MY_WORKSHEETS_FEED, scope=_owner_scope())
             _render_selected_file_resource_detail("worksheet", scope="my_worksheets")
 
         with tab_exams:
-            exam_df = load_my_exams()
+            exam_df = load_my_exams(pages=_library_pages("my_exams_page"))
             if exam_df.empty:
                 render_empty_state(
                     title_key="files_empty_exams_title",
@@ -1737,7 +1774,7 @@ def render_home(*, panel_override: str | None = None, show_home_actions: bool =
                     allow_visibility_toggle=True,
                     allow_archive_toggle=True,
                 )
-                _render_resource_pagination_controls(exam_filtered, "my_exams_page")
+                _render_resource_pagination_controls(exam_filtered, "my_exams_page", feed=MY_EXAMS_FEED, scope=_owner_scope())
             _render_selected_file_resource_detail("exam", scope="my_exams")
 
         with tab_videos:
@@ -1902,7 +1939,7 @@ def render_home(*, panel_override: str | None = None, show_home_actions: bool =
                         st.rerun()
                     st.error(t(key))
 
-            video_df = load_my_videos()
+            video_df = load_my_videos(pages=_library_pages("my_videos_page"))
             if video_df.empty:
                 render_empty_state(
                     title_key="files_empty_videos_title",
@@ -1934,7 +1971,7 @@ def render_home(*, panel_override: str | None = None, show_home_actions: bool =
                     allow_visibility_toggle=True,
                     allow_archive_toggle=True,
                 )
-                _render_resource_pagination_controls(video_filtered, "my_videos_page")
+                _render_resource_pagination_controls(video_filtered, "my_videos_page", feed=MY_VIDEOS_FEED, scope=_owner_scope())
             _render_selected_file_resource_detail("video", scope="my_videos")
 
         with tab3:
@@ -1982,7 +2019,7 @@ def render_home(*, panel_override: str | None = None, show_home_actions: bool =
                 _render_selected_file_resource_detail("program", scope="community_programs")
 
             with comm_tab_plans:
-                public_df = load_public_lesson_plans()
+                public_df = load_public_lesson_plans(pages=_library_pages("community_plans_page"))
 
                 if public_df.empty:
                     render_empty_state(
@@ -2036,11 +2073,11 @@ def render_home(*, panel_override: str | None = None, show_home_actions: bool =
                             surface=f"resources_community_plans_page_{int(st.session_state.get('community_plans_page', 1) or 1)}",
                         )
                         render_plan_library_cards(filtered_public_page_df, prefix="community_plans", show_author=True)
-                        _render_resource_pagination_controls(filtered_public, "community_plans_page")
+                        _render_resource_pagination_controls(filtered_public, "community_plans_page", feed=PUBLIC_LESSON_PLANS_FEED)
                 _render_selected_file_resource_detail("plan", scope="community_plans")
 
             with comm_tab_ws:
-                pub_ws_df = load_public_worksheets()
+                pub_ws_df = load_public_worksheets(pages=_library_pages("community_ws_page"))
 
                 if pub_ws_df.empty:
                     render_empty_state(
@@ -2095,11 +2132,11 @@ def render_home(*, panel_override: str | None = None, show_home_actions: bool =
                             surface=f"resources_community_worksheets_page_{int(st.session_state.get('community_ws_page', 1) or 1)}",
                         )
                         render_worksheet_library_cards(pub_ws_filtered_page_df, prefix="pub_ws", show_author=True)
-                        _render_resource_pagination_controls(pub_ws_filtered, "community_ws_page")
+                        _render_resource_pagination_controls(pub_ws_filtered, "community_ws_page", feed=PUBLIC_WORKSHEETS_FEED)
                 _render_selected_file_resource_detail("worksheet", scope="community_worksheets")
 
             with comm_tab_exams:
-                pub_exam_df = load_public_exams()
+                pub_exam_df = load_public_exams(pages=_library_pages("community_exams_page"))
 
                 if pub_exam_df.empty:
                     render_empty_state(
@@ -2132,11 +2169,11 @@ def render_home(*, panel_override: str | None = None, show_home_actions: bool =
                             surface=f"resources_community_exams_page_{int(st.session_state.get('community_exams_page', 1) or 1)}",
                         )
                         render_exam_library_cards(pub_exam_filtered_page_df, prefix="pub_exams", show_author=True)
-                        _render_resource_pagination_controls(pub_exam_filtered, "community_exams_page")
+                        _render_resource_pagination_controls(pub_exam_filtered, "community_exams_page", feed=PUBLIC_EXAMS_FEED)
                 _render_selected_file_resource_detail("exam", scope="community_exams")
 
             with comm_tab_videos:
-                public_video_df = load_public_videos()
+                public_video_df = load_public_videos(pages=_library_pages("community_videos_page"))
                 if public_video_df.empty:
                     render_empty_state(
                         title_key="community_resources_empty_title",
@@ -2173,7 +2210,7 @@ def render_home(*, panel_override: str | None = None, show_home_actions: bool =
                             open_in_files=True,
                             require_signup=not getattr(st.user, "is_logged_in", False),
                         )
-                        _render_resource_pagination_controls(public_video_filtered, "community_videos_page")
+                        _render_resource_pagination_controls(public_video_filtered, "community_videos_page", feed=PUBLIC_VIDEOS_FEED)
                 _render_selected_file_resource_detail("video", scope="community_videos")
 
         with tab4:
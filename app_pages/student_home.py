@@ -9,6 +9,7 @@ from core.database import load_profile_row
 from helpers.practice_engine import exam_to_exercises, worksheet_to_exercises
 from helpers.notifications import (
     get_student_notifications,
+    load_notification_unread_count,
     render_lazy_notification_panel,
 )
 from helpers.empty_states import render_empty_state
@@ -596,4 +597,5 @@ def render_student_home():
         toggle_key="student_home_notifications_toggle",
         loader=get_student_notifications,
         title_text=t("notifications"),
+        unread_loader=load_notification_unread_count,
     )
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from typing import Any, Iterable
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_VALUE_BYTES = 4 * 1024 * 1024
+ALL_DOMAINS = "*"
+
+MISSING = object()
+
+_SCHEMA = (
+    """
+    create table if not exists cache_domain_versions (
+        domain text primary key,
+        version integer not null default 0
+    )
+    """,
+    """
+    create table if not exists cache_entries (
+        key text primary key,
+        value blob not null,
+        expires_at real not null
+    )
+    """,
+    "create index if not exists idx_cache_entries_expires_at on cache_entries (expires_at)",
+)
+
+
+def shared_cache_key(namespace: str, args: tuple, kwargs: dict, versions: Iterable[int]) -> str | None:
+    """Entry key for one call, or None when the arguments cannot be keyed.
+
+    The domain versions are part of the key, so bumping a domain makes every
+    entry derived from it unreachable without touching the entries.
+    """
+    try:
+        raw = pickle.dumps(
+            (namespace, tuple(args), tuple(sorted(kwargs.items())), tuple(versions)),
+            protocol=pickle.HIGHEST_PROTOCOL,
+        )
+    except Exception:
+        return None
+    return hashlib.sha256(raw).hexdigest()
+
+
+class SQLiteCacheBackend:
+    """Cache values and domain-version counters in one SQLite file.
+
+    Every worker process on the host opens the same file, so a value loaded
+    by one worker is a hit for the others, and a domain bumped by one worker
+    is stale everywhere. Values are pickled; anything larger than
+    ``max_value_bytes`` is simply not shared.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike,
+        *,
+        max_value_bytes: int = DEFAULT_MAX_VALUE_BYTES,
+        timeout: float = 2.0,
+        purge_every: int = 256,
+    ):
+        self.path = os.fspath(path)
+        self.max_value_bytes = int(max_value_bytes)
+        self.timeout = float(timeout)
+        self.purge_every = max(1, int(purge_every))
+        self._local = threading.local()
+        self._writes = 0
+        conn = self._conn()
+        for statement in _SCHEMA:
+            conn.execute(statement)
+
+    def _conn(self) -> sqlite3.Connection:
+        # One connection per thread and per process: sqlite connections must
+        # not cross a fork, and Streamlit serves sessions on many threads.
+        conn = getattr(self._local, "conn", None)
+        if conn is not None and getattr(self._local, "pid", None) == os.getpid():
+            return conn
+        conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None, check_same_thread=False)
+        conn.execute("pragma journal_mode=wal")
+        conn.execute("pragma synchronous=normal")
+        self._local.conn = conn
+        self._local.pid = os.getpid()
+        return conn
+
+    def domain_versions(self) -> dict[str, int]:
+        rows = self._conn().execute("select domain, version from cache_domain_versions").fetchall()
+        return {str(domain): int(version) for domain, version in rows}
+
+    def bump(self, domains: Iterable[str]) -> None:
+        names = sorted({str(domain) for domain in domains if str(domain or "").strip()})
+        if not names:
+            return
+        self._conn().executemany(
+            "insert into cache_domain_versions (domain, version) values (?, 1) "
+            "on conflict(domain) do update set version = version + 1",
+            [(name,) for name in names],
+        )
+
+    def get(self, key: str) -> Any:
+        row = self._conn().execute(
+            "select value, expires_at from cache_entries where key = ?",
+            (key,),
+        ).fetchone()
+        if row is None or float(row[1]) < time.time():
+            return MISSING
+        try:
+            return pickle.loads(row[0])
+        except Exception:
+            return MISSING
+
+    def set(self, key: str, value: Any, ttl: float) -> bool:
+        try:
+            payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            return False
+        if len(payload) > self.max_value_bytes:
+            return False
+        conn = self._conn()
+        conn.execute(
+            "insert or replace into cache_entries (key, value, expires_at) values (?, ?, ?)",
+            (key, sqlite3.Binary(payload), time.time() + max(0.0, float(ttl))),
+        )
+        self._writes += 1
+        if self._writes % self.purge_every == 0:
+            conn.execute("delete from cache_entries where expires_at < ?", (time.time(),))
+        return True
@@ -7,10 +7,12 @@ import logging
 import json
 import math
 import time
+import functools
 from datetime import datetime, timezone
 from typing import Any, List, Optional
 from supabase import create_client
 
+from core.cache_backend import ALL_DOMAINS, MISSING, SQLiteCacheBackend, shared_cache_key
 from core.i18n import t
 from core.state import get_current_user_id, with_owner, _set_logged_in_user, _clear_logged_in_user, resolve_active_face
 
@@ -85,23 +87,150 @@ def get_sb():
 _CACHE_REGISTRY = []
 _CACHE_DOMAINS: dict[Any, set[str]] = {}
 
+# Optional cross-process backend. st.cache_data is per process, so without it
+# each server worker warms its own copy and a clear only reaches one worker.
+_SHARED_CACHE_BACKEND = None
+_SHARED_CACHE_CONFIGURED = False
+_SHARED_DOMAIN_VERSIONS: dict[str, int] | None = None
+
+
+def _normalize_cache_domains(domains) -> set[str]:
+    return {str(domain or "").strip().lower() for domain in domains if str(domain or "").strip()}
+
 
 def register_cache(func, *domains: str):
     """Register a cache and the data domains that make its contents stale."""
     if func not in _CACHE_REGISTRY:
         _CACHE_REGISTRY.append(func)
-    normalized = {str(domain or "").strip().lower() for domain in domains if str(domain or "").strip()}
+    normalized = _normalize_cache_domains(domains)
     if normalized:
         _CACHE_DOMAINS.setdefault(func, set()).update(normalized)
     return func
 
 
+def set_shared_cache_backend(backend) -> None:
+    """Install (or with None, remove) the backend shared by every worker."""
+    global _SHARED_CACHE_BACKEND, _SHARED_CACHE_CONFIGURED, _SHARED_DOMAIN_VERSIONS
+    _SHARED_CACHE_BACKEND = backend
+    _SHARED_CACHE_CONFIGURED = True
+    _SHARED_DOMAIN_VERSIONS = None
+
+
+def get_shared_cache_backend():
+    """The configured shared backend, or None when caches are process-local.
+
+    Set CLASSIO_SHARED_CACHE_PATH to a file every worker on the host can
+    write to enable the SQLite backend.
+    """
+    global _SHARED_CACHE_BACKEND, _SHARED_CACHE_CONFIGURED
+    if _SHARED_CACHE_CONFIGURED:
+        return _SHARED_CACHE_BACKEND
+    _SHARED_CACHE_CONFIGURED = True
+    try:
+        path = st.secrets.get("CLASSIO_SHARED_CACHE_PATH", None) or os.getenv("CLASSIO_SHARED_CACHE_PATH", "")
+    except Exception:
+        path = os.getenv("CLASSIO_SHARED_CACHE_PATH", "")
+    path = str(path or "").strip()
+    if path:
+        try:
+            _SHARED_CACHE_BACKEND = SQLiteCacheBackend(path)
+        except Exception:
+            logger.warning("Shared cache backend unavailable; using process-local caches", exc_info=True)
+            _SHARED_CACHE_BACKEND = None
+    return _SHARED_CACHE_BACKEND
+
+
+def _bump_shared_domains(domains) -> None:
+    backend = get_shared_cache_backend()
+    if backend is None:
+        return
+    try:
+        backend.bump(domains)
+        current = backend.domain_versions()
+    except Exception:
+        logger.debug("Shared cache invalidation failed", exc_info=True)
+        return
+    # This process already cleared its own caches for these domains; record
+    # their new versions so the next sync does not clear them a second time.
+    if _SHARED_DOMAIN_VERSIONS is not None:
+        for domain in domains:
+            _SHARED_DOMAIN_VERSIONS[domain] = current.get(domain, 0)
+
+
+def shared_cache(*domains: str, ttl: float):
+    """Back a loader with the shared cache, keyed by its domains' versions.
+
+    Apply it beneath ``@st.cache_data``: the Streamlit cache stays the fast
+    per-process layer and this one lets a miss there reuse a value another
+    worker already loaded. Without a configured backend it is a no-op.
+    """
+    normalized = sorted(_normalize_cache_domains(domains))
+
+    def decorate(fn):
+        namespace = f"{fn.__module__}.{fn.__qualname__}"
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            backend = get_shared_cache_backend()
+            if backend is None:
+                return fn(*args, **kwargs)
+            try:
+                versions = backend.domain_versions()
+                key = shared_cache_key(
+                    namespace,
+                    args,
+                    kwargs,
+                    [versions.get(ALL_DOMAINS, 0), *[versions.get(domain, 0) for domain in normalized]],
+                )
+                value = backend.get(key) if key else MISSING
+            except Exception:
+                logger.debug("Shared cache read failed", exc_info=True)
+                key, value = None, MISSING
+            if value is not MISSING:
+                return value
+            value = fn(*args, **kwargs)
+            if key:
+                try:
+                    backend.set(key, value, ttl)
+                except Exception:
+                    logger.debug("Shared cache write failed", exc_info=True)
+            return value
+
+        return wrapper
+
+    return decorate
+
+
+def sync_shared_cache_domains() -> None:
+    """Clear local caches for domains another worker invalidated since the last run."""
+    global _SHARED_DOMAIN_VERSIONS
+    backend = get_shared_cache_backend()
+    if backend is None:
+        return
+    try:
+        versions = backend.domain_versions()
+    except Exception:
+        logger.debug("Shared cache sync failed", exc_info=True)
+        return
+    previous, _SHARED_DOMAIN_VERSIONS = _SHARED_DOMAIN_VERSIONS, versions
+    if previous is None:
+        return
+    changed = {domain for domain, version in versions.items() if previous.get(domain, 0) != version}
+    if not changed:
+        return
+    if ALL_DOMAINS in changed:
+        clear_specific_caches(*_CACHE_REGISTRY)
+        return
+    clear_specific_caches(*[fn for fn, cache_domains in _CACHE_DOMAINS.items() if changed.intersection(cache_domains)])
+
+
 def clear_app_caches() -> None:
     for fn in _CACHE_REGISTRY:
         try:
             fn.clear()
         except Exception:
             pass
+    _bump_shared_domains([ALL_DOMAINS])
 
 
 def clear_specific_caches(*funcs) -> None:
@@ -120,7 +249,7 @@ def clear_cache_domains(*domains: str, include_data_cache: bool = True) -> None:
     The generic table cache is included by default because it can contain rows
     from any mutated domain. Expensive unrelated derived caches remain warm.
     """
-    requested = {str(domain or "").strip().lower() for domain in domains if str(domain or "").strip()}
+    requested = _normalize_cache_domains(domains)
     if include_data_cache:
         requested.add("database")
     if not requested:
@@ -132,6 +261,7 @@ def clear_cache_domains(*domains: str, include_data_cache: bool = True) -> None:
             if requested.intersection(cache_domains)
         ]
     )
+    _bump_shared_domains(requested)
 
 
 def _db_diagnostics_enabled() -> bool:
@@ -222,6 +352,7 @@ def insert_row_with_retries(
     *,
     clear_cache: bool = False,
     context: Optional[dict] = None,
+    optional_columns: tuple[str, ...] = (),
 ):
     base_payload = dict(payload or {})
     attempts: list[tuple[str, dict]] = [("primary", base_payload)]
@@ -239,6 +370,18 @@ def insert_row_with_retries(
             safe_legacy_payload.pop("status", None)
             attempts.append(("json_safe_legacy_status", safe_legacy_payload))
 
+    # Columns newer migrations add; schemas that have not run them yet still
+    # accept the rest of the row.
+    dropped = [column for column in optional_columns if column in base_payload]
+    if dropped:
+        attempts.extend(
+            (
+                f"{attempt_name}_without_optional",
+                {key: value for key, value in attempt_payload.items() if key not in dropped},
+            )
+            for attempt_name, attempt_payload in list(attempts)
+        )
+
     last_error = None
     for attempt_name, attempt_payload in attempts:
         try:
@@ -0,0 +1,286 @@
+from __future__ import annotations
+
+import hashlib
+import math
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Optional, Sequence, TypeVar
+
+import streamlit as st
+
+from helpers.ai_retry import is_retryable_ai_error, run_with_ai_retries
+
+
+T = TypeVar("T")
+
+DEFAULT_HEDGE_PERCENTILE = 90.0
+DEFAULT_HEDGE_DELAY_SECONDS = 8.0
+MIN_HEDGE_LATENCY_SAMPLES = 5
+LATENCY_SAMPLE_WINDOW = 50
+BREAKER_FAILURE_THRESHOLD = 3
+BREAKER_COOLDOWN_SECONDS = 60.0
+
+_CLIENT_POOL: dict[tuple[str, str, str], Any] = {}
+_CLIENT_POOL_LOCK = threading.Lock()
+_LATENCY_SAMPLES: dict[str, deque] = {}
+_LATENCY_LOCK = threading.Lock()
+
+
+class AIProviderCircuitOpenError(RuntimeError):
+    def __init__(self, provider: str):
+        self.provider = str(provider or "")
+        super().__init__(f"{self.provider} circuit open after repeated provider failures")
+
+
+def _config_value(name: str) -> str:
+    value = ""
+    try:
+        value = str(st.secrets.get(name, "")).strip()
+    except Exception:
+        value = ""
+    if not value:
+        value = str(os.getenv(name, "")).strip()
+    return value
+
+
+def _credential_fingerprint(api_key: str) -> str:
+    return hashlib.sha256(str(api_key or "").encode("utf-8")).hexdigest()[:16]
+
+
+# ---------------------------------------------------------------------------
+# Client pool
+# ---------------------------------------------------------------------------
+
+def get_pooled_ai_client(
+    provider: str,
+    api_key: str,
+    factory: Callable[[], Any],
+    *,
+    base_url: str = "",
+) -> Any:
+    """Return one process-wide SDK client per provider, credential and endpoint."""
+    key = (str(provider or "").strip().lower(), _credential_fingerprint(api_key), str(base_url or ""))
+    client = _CLIENT_POOL.get(key)
+    if client is not None:
+        return client
+    with _CLIENT_POOL_LOCK:
+        client = _CLIENT_POOL.get(key)
+        if client is None:
+            client = factory()
+            _CLIENT_POOL[key] = client
+    return client
+
+
+def clear_ai_client_pool() -> None:
+    with _CLIENT_POOL_LOCK:
+        _CLIENT_POOL.clear()
+
+
+# ---------------------------------------------------------------------------
+# Circuit breaker
+# ---------------------------------------------------------------------------
+
+class ProviderCircuitBreaker:
+    """Per-provider breaker that only trips on transient (retryable) AI errors.
+
+    Auth and configuration errors do not count: they will not recover by
+    waiting, and the provider chain already skips past them.
+    """
+
+    def __init__(
+        self,
+        *,
+        failure_threshold: int = BREAKER_FAILURE_THRESHOLD,
+        cooldown_seconds: float = BREAKER_COOLDOWN_SECONDS,
+        timer: Callable[[], float] = time.monotonic,
+    ):
+        self.failure_threshold = max(1, int(failure_threshold))
+        self.cooldown_seconds = max(0.0, float(cooldown_seconds))
+        self._timer = timer
+        self._lock = threading.Lock()
+        self._failures: dict[str, int] = {}
+        self._opened_at: dict[str, float] = {}
+
+    def state(self, provider: str) -> str:
+        with self._lock:
+            if self._failures.get(provider, 0) < self.failure_threshold:
+                return "closed"
+            opened_at = self._opened_at.get(provider, 0.0)
+            if self._timer() - opened_at >= self.cooldown_seconds:
+                return "half_open"
+            return "open"
+
+    def allow(self, provider: str) -> bool:
+        return self.state(provider) != "open"
+
+    def record_success(self, provider: str) -> None:
+        with self._lock:
+            self._failures.pop(provider, None)
+            self._opened_at.pop(provider, None)
+
+    def record_failure(self, provider: str, exc: Exception) -> None:
+        if not is_retryable_ai_error(exc):
+            return
+        with self._lock:
+            failures = self._failures.get(provider, 0) + 1
+            self._failures[provider] = failures
+            if failures >= self.failure_threshold:
+                self._opened_at[provider] = self._timer()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._failures.clear()
+            self._opened_at.clear()
+
+
+_CIRCUIT_BREAKER = ProviderCircuitBreaker()
+
+
+def get_ai_circuit_breaker() -> ProviderCircuitBreaker:
+    return _CIRCUIT_BREAKER
+
+
+# ---------------------------------------------------------------------------
+# Latency tracking
+# ---------------------------------------------------------------------------
+
+def record_provider_latency(provider: str, seconds: float) -> None:
+    with _LATENCY_LOCK:
+        samples = _LATENCY_SAMPLES.setdefault(provider, deque(maxlen=LATENCY_SAMPLE_WINDOW))
+        samples.append(max(0.0, float(seconds)))
+
+
+def provider_latency_percentile(
+    provider: str,
+    percentile: float,
+    *,
+    min_samples: int = MIN_HEDGE_LATENCY_SAMPLES,
+) -> Optional[float]:
+    with _LATENCY_LOCK:
+        samples = sorted(_LATENCY_SAMPLES.get(provider) or [])
+    if len(samples) < max(1, int(min_samples)):
+        return None
+    rank = max(0.0, min(100.0, float(percentile))) / 100.0 * (len(samples) - 1)
+    lower = int(math.floor(rank))
+    upper = int(math.ceil(rank))
+    return samples[lower] + (samples[upper] - samples[lower]) * (rank - lower)
+
+
+def clear_provider_latencies() -> None:
+    with _LATENCY_LOCK:
+        _LATENCY_SAMPLES.clear()
+
+
+def get_ai_hedge_delay_seconds(provider: str) -> Optional[float]:
+    """Seconds to wait on ``provider`` before hedging, or None when hedging is off."""
+    if _config_value("AI_HEDGE_ENABLED").lower() not in {"1", "true", "yes", "on"}:
+        return None
+    try:
+        percentile = float(_config_value("AI_HEDGE_PERCENTILE") or DEFAULT_HEDGE_PERCENTILE)
+    except ValueError:
+        percentile = DEFAULT_HEDGE_PERCENTILE
+    try:
+        default_delay = float(_config_value("AI_HEDGE_DELAY_SECONDS") or DEFAULT_HEDGE_DELAY_SECONDS)
+    except ValueError:
+        default_delay = DEFAULT_HEDGE_DELAY_SECONDS
+    observed = provider_latency_percentile(provider, percentile)
+    return max(0.0, observed if observed is not None else default_delay)
+
+
+# ---------------------------------------------------------------------------
+# Provider calls
+# ---------------------------------------------------------------------------
+
+def call_ai_provider(
+    provider: str,
+    request: Callable[[], T],
+    *,
+    breaker: Optional[ProviderCircuitBreaker] = None,
+    timer: Callable[[], float] = time.monotonic,
+) -> T:
+    breaker = breaker or get_ai_circuit_breaker()
+    if not breaker.allow(provider):
+        raise AIProviderCircuitOpenError(provider)
+    started_at = timer()
+    try:
+        result = run_with_ai_retries(request)
+    except Exception as exc:
+        breaker.record_failure(provider, exc)
+        raise
+    breaker.record_success(provider)
+    record_provider_latency(provider, timer() - started_at)
+    return result
+
+
+def _with_script_run_ctx(fn: Callable[[], T]) -> Callable[[], T]:
+    try:
+        from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+    except Exception:
+        return fn
+    ctx = get_script_run_ctx(suppress_warning=True)
+    if ctx is None:
+        return fn
+
+    def _run() -> T:
+        add_script_run_ctx(threading.current_thread(), ctx)
+        return fn()
+
+    return _run
+
+
+def run_provider_chain(
+    providers: Sequence[str],
+    attempt: Callable[[str], T],
+    *,
+    hedge_delay_seconds: Optional[float] = None,
+) -> tuple[T, str, list[str]]:
+    """Run ``attempt(provider)`` along ``providers`` until one returns.
+
+    ``attempt`` must raise for anything that is not a usable result (including
+    invalid JSON), so "first to return" means "first valid answer". Without a
+    hedge delay providers are tried strictly in order. With one, the next
+    provider is started whenever the in-flight ones have been silent for that
+    long, and whichever valid answer lands first wins; late answers are dropped.
+    Returns ``(result, provider, errors_from_earlier_providers)``.
+    """
+    providers = [str(p) for p in providers or []]
+    errors: list[str] = []
+
+    if hedge_delay_seconds is None or len(providers) < 2:
+        for provider in providers:
+            try:
+                return attempt(provider), provider, errors
+            except Exception as exc:
+                errors.append(f"{provider}: {exc}")
+        raise RuntimeError(" | ".join(errors) or "No AI provider configured.")
+
+    executor = ThreadPoolExecutor(max_workers=len(providers), thread_name_prefix="ai-hedge")
+    pending: dict[Any, str] = {}
+    remaining = list(providers)
+
+    def _launch_next() -> None:
+        provider = remaining.pop(0)
+        pending[executor.submit(_with_script_run_ctx(lambda: attempt(provider)))] = provider
+
+    try:
+        _launch_next()
+        while pending:
+            timeout = max(0.0, float(hedge_delay_seconds)) if remaining else None
+            done, _ = wait(list(pending), timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                _launch_next()
+                continue
+            for future in done:
+                provider = pending.pop(future)
+                try:
+                    return future.result(), provider, errors
+                except Exception as exc:
+                    errors.append(f"{provider}: {exc}")
+            if remaining:
+                _launch_next()
+        raise RuntimeError(" | ".join(errors) or "No AI provider configured.")
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,248 @@
+from __future__ import annotations
+
+import copy
+from contextlib import contextmanager
+import hashlib
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from typing import Any, Callable, Iterator, Optional
+
+import pandas as pd
+import streamlit as st
+
+
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600
+DEFAULT_MAX_ENTRIES = 500
+
+CACHE_HIT = "hit"
+CACHE_MISS = "miss"
+CACHE_BYPASS = "bypass"
+
+# ai_usage_logs status for a generation served from this cache. Hits are not
+# charged against the daily quota and do not start the cooldown.
+CACHE_HIT_LOG_STATUS = "cache_hit"
+
+_STORE_LOCK = threading.Lock()
+_STORES: dict[str, "AIResponseCache"] = {}
+
+
+def _config_value(name: str) -> str:
+    value = ""
+    try:
+        value = str(st.secrets.get(name, "")).strip()
+    except Exception:
+        value = ""
+    if not value:
+        value = str(os.getenv(name, "")).strip()
+    return value
+
+
+def _config_number(name: str, default: float) -> float:
+    try:
+        return float(_config_value(name) or default)
+    except ValueError:
+        return float(default)
+
+
+def _normalize_cache_input(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {str(key): _normalize_cache_input(item) for key, item in sorted(value.items(), key=lambda kv: str(kv[0]))}
+    if isinstance(value, (list, tuple)):
+        return [_normalize_cache_input(item) for item in value]
+    if isinstance(value, str):
+        return " ".join(value.split()).strip().lower()
+    if isinstance(value, (bool, int, float)) or value is None:
+        return value
+    return " ".join(str(value).split()).strip().lower()
+
+
+def build_ai_cache_key(feature: str, template_version: str, inputs: dict[str, Any]) -> str:
+    """Hash the provider-independent generation inputs into a stable cache key.
+
+    Strings are whitespace-collapsed and lower-cased and dict keys are sorted,
+    so "Past Simple " and "past simple" share one entry.
+    """
+    payload = {
+        "feature": str(feature or "").strip().lower(),
+        "template_version": str(template_version or "").strip(),
+        "inputs": _normalize_cache_input(inputs or {}),
+    }
+    encoded = json.dumps(payload, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class AIResponseCache:
+    """SQLite-backed store of parsed AI results with a TTL and an LRU size cap."""
+
+    def __init__(
+        self,
+        path: str,
+        *,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.path = str(path)
+        self.ttl_seconds = max(0.0, float(ttl_seconds))
+        self.max_entries = max(1, int(max_entries))
+        self._clock = clock
+        self._lock = threading.Lock()
+        with self._connect() as conn:
+            conn.execute(
+                """
+                create table if not exists ai_response_cache (
+                    cache_key text primary key,
+                    feature text not null,
+                    payload text not null,
+                    created_at real not null,
+                    last_used_at real not null
+                )
+                """
+            )
+            conn.execute(
+                "create index if not exists idx_ai_response_cache_last_used on ai_response_cache (last_used_at)"
+            )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.path, timeout=5.0)
+        try:
+            conn.execute("pragma journal_mode=wal")
+            yield conn
+            conn.commit()
+        finally:
+            conn.close()
+
+    def get(self, cache_key: str) -> Optional[Any]:
+        now = self._clock()
+        with self._lock, self._connect() as conn:
+            row = conn.execute(
+                "select payload, created_at from ai_response_cache where cache_key = ?",
+                (cache_key,),
+            ).fetchone()
+            if row is None:
+                return None
+            payload, created_at = row
+            if now - float(created_at) > self.ttl_seconds:
+                conn.execute("delete from ai_response_cache where cache_key = ?", (cache_key,))
+                return None
+            conn.execute("update ai_response_cache set last_used_at = ? where cache_key = ?", (now, cache_key))
+        try:
+            return json.loads(payload)
+        except ValueError:
+            return None
+
+    def put(self, cache_key: str, feature: str, value: Any) -> None:
+        now = self._clock()
+        payload = json.dumps(value, ensure_ascii=False)
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                """
+                insert into ai_response_cache (cache_key, feature, payload, created_at, last_used_at)
+                values (?, ?, ?, ?, ?)
+                on conflict(cache_key) do update set
+                    feature = excluded.feature,
+                    payload = excluded.payload,
+                    created_at = excluded.created_at,
+                    last_used_at = excluded.last_used_at
+                """,
+                (cache_key, str(feature or ""), payload, now, now),
+            )
+            conn.execute("delete from ai_response_cache where created_at < ?", (now - self.ttl_seconds,))
+            conn.execute(
+                """
+                delete from ai_response_cache
+                where cache_key in (
+                    select cache_key from ai_response_cache
+                    order by last_used_at desc
+                    limit -1 offset ?
+                )
+                """,
+                (self.max_entries,),
+            )
+
+    def size(self) -> int:
+        with self._lock, self._connect() as conn:
+            return int(conn.execute("select count(*) from ai_response_cache").fetchone()[0])
+
+    def clear(self) -> None:
+        with self._lock, self._connect() as conn:
+            conn.execute("delete from ai_response_cache")
+
+
+def provider_request_rows(feature_logs: pd.DataFrame) -> pd.DataFrame:
+    """Drop cache hits, and the ``requested`` rows they answered, from one feature's logs.
+
+    ``feature_logs`` must be sorted by ``created_at`` with a normalized
+    ``status`` column; what remains are the requests that reached a provider.
+    """
+    if feature_logs.empty:
+        return feature_logs
+    status = feature_logs["status"]
+    is_hit = status.eq(CACHE_HIT_LOG_STATUS)
+    answered_by_hit = status.eq("requested") & is_hit.shift(-1, fill_value=False)
+    return feature_logs[~(is_hit | answered_by_hit)]
+
+
+def ai_response_cache_enabled() -> bool:
+    return _config_value("AI_RESPONSE_CACHE_ENABLED").lower() not in {"0", "false", "no", "off"}
+
+
+def get_ai_response_cache() -> AIResponseCache:
+    path = _config_value("AI_RESPONSE_CACHE_PATH") or os.path.join(
+        tempfile.gettempdir(), "classio_ai_response_cache.sqlite3"
+    )
+    with _STORE_LOCK:
+        store = _STORES.get(path)
+        if store is None:
+            store = AIResponseCache(
+                path,
+                ttl_seconds=_config_number("AI_RESPONSE_CACHE_TTL_SECONDS", DEFAULT_TTL_SECONDS),
+                max_entries=int(_config_number("AI_RESPONSE_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES)),
+            )
+            _STORES[path] = store
+    return store
+
+
+def cached_ai_generation(
+    feature: str,
+    inputs: dict[str, Any],
+    generate: Callable[[], Any],
+    *,
+    template_version: str,
+    force_fresh: bool = False,
+    cache: Optional[AIResponseCache] = None,
+) -> tuple[Any, str]:
+    """Return ``(result, cache_status)`` for a generation, reusing identical past results.
+
+    ``force_fresh`` skips the lookup but still stores the new result, so the
+    next identical request reuses the fresh version. Cache failures never
+    block generation.
+    """
+    if cache is None and not ai_response_cache_enabled():
+        return generate(), CACHE_BYPASS
+
+    cache_key = build_ai_cache_key(feature, template_version, inputs)
+    try:
+        store = cache or get_ai_response_cache()
+    except Exception:
+        return generate(), CACHE_BYPASS
+
+    if not force_fresh:
+        try:
+            cached = store.get(cache_key)
+        except Exception:
+            cached = None
+        if cached is not None:
+            return cached, CACHE_HIT
+
+    result = generate()
+    try:
+        store.put(cache_key, feature, copy.deepcopy(result))
+    except Exception:
+        pass
+    return result, (CACHE_BYPASS if force_fresh else CACHE_MISS)
@@ -7,10 +7,11 @@ from core.state import get_current_user_id
 from helpers.lesson_planner import subject_label as _subject_label_fn
 from core.timezone import now_local
 from core.database import load_table_filtered
+from helpers.payment_rollups import load_payment_rollups, normalize_payment_rollups
 from helpers.ui_components import to_dt_naive, ts_today_naive
 
 
-_PAYMENT_ANALYTICS_COLUMNS = "student,payment_date,paid_amount,number_of_lesson,modality,subject"
+_PAYMENT_STUDENT_COLUMNS = "student,payment_date,paid_amount"
 
 def money_fmt(value, symbol=""):
     try:
@@ -72,48 +73,30 @@ def _display_subject_combo(subject_key: str) -> str:
     return " + ".join(translated)
 
 
-def _build_income_analytics_from_payments(payments: pd.DataFrame | None, group: str = "monthly"):
-    if payments is None or payments.empty:
-        payments = pd.DataFrame(columns=["student", "payment_date", "paid_amount", "number_of_lesson", "modality", "subject"])
-
-    for c, default in {
-        "student": "",
-        "payment_date": None,
-        "paid_amount": 0.0,
-        "number_of_lesson": 0,
-        "modality": "Online",
-        "subject": "",
-    }.items():
-        if c not in payments.columns:
-            payments[c] = default
-
-    payments["student"] = payments["student"].astype(str).str.strip()
-    payments["payment_date"] = to_dt_naive(payments["payment_date"], utc=True)
-    payments["paid_amount"] = pd.to_numeric(payments["paid_amount"], errors="coerce").fillna(0.0)
-    payments["subject"] = payments["subject"].fillna("").astype(str).str.strip()
-    payments["modality"] = payments["modality"].fillna("Online").astype(str).str.strip()
-
-    payments = payments.dropna(subset=["payment_date"])
-    payments = payments[payments["student"].astype(str).str.len() > 0].copy()
+def _income_summaries(income: pd.DataFrame, group: str = "monthly"):
+    """KPIs and income breakdowns from rows with payment_date, paid_amount, subject and modality.
 
+    The rows may be single payments or daily rollups: every figure is a sum.
+    """
+    income = income.copy()
     today = ts_today_naive()
 
     week_start = today - pd.Timedelta(days=int(today.weekday()))
     week_end = week_start + pd.Timedelta(days=6)
 
-    income_all_time = float(payments["paid_amount"].sum()) if not payments.empty else 0.0
+    income_all_time = float(income["paid_amount"].sum()) if not income.empty else 0.0
     income_this_year = float(
-        payments.loc[payments["payment_date"].dt.year == today.year, "paid_amount"].sum()
-    ) if not payments.empty else 0.0
+        income.loc[income["payment_date"].dt.year == today.year, "paid_amount"].sum()
+    ) if not income.empty else 0.0
 
     this_month_key = str(today.to_period("M"))
     income_this_month = float(
-        payments.loc[payments["payment_date"].dt.to_period("M").astype(str) == this_month_key, "paid_amount"].sum()
-    ) if not payments.empty else 0.0
+        income.loc[income["payment_date"].dt.to_period("M").astype(str) == this_month_key, "paid_amount"].sum()
+    ) if not income.empty else 0.0
 
     income_this_week = float(
-        payments.loc[(payments["payment_date"] >= week_start) & (payments["payment_date"] <= week_end), "paid_amount"].sum()
-    ) if not payments.empty else 0.0
+        income.loc[(income["payment_date"] >= week_start) & (income["payment_date"] <= week_end), "paid_amount"].sum()
+    ) if not income.empty else 0.0
 
     kpis = {
         "income_all_time": income_all_time,
@@ -125,57 +108,114 @@ def _build_income_analytics_from_payments(payments: pd.DataFrame | None, group:
     }
 
     if group == "yearly":
-        payments["Key"] = payments["payment_date"].dt.to_period("Y").astype(str)
+        income["Key"] = income["payment_date"].dt.to_period("Y").astype(str)
     else:
-        payments["Key"] = payments["payment_date"].dt.to_period("M").astype(str)
+        income["Key"] = income["payment_date"].dt.to_period("M").astype(str)
 
     income_table = (
-        payments.groupby("Key", as_index=False)["paid_amount"]
+        income.groupby("Key", as_index=False)["paid_amount"]
         .sum()
         .rename(columns={"paid_amount": "income"})
         .sort_values("Key")
         .reset_index(drop=True)
     )
 
-    by_student = (
-        payments.groupby("student", as_index=False)
-        .agg(
-            total_paid=("paid_amount", "sum"),
-            packages=("paid_amount", "size"),
-            last_payment=("payment_date", "max"),
-        )
-        .sort_values("total_paid", ascending=False)
-        .reset_index(drop=True)
-    )
-
-    payments["subject_key"] = payments["subject"].apply(_normalize_subject_combo)
+    # Normalize each distinct subject text once rather than once per row.
+    subjects = income["subject"].astype(str)
+    income["subject_key"] = subjects.map({raw: _normalize_subject_combo(raw) for raw in subjects.unique()})
 
     sold_by_subject = (
-        payments.groupby("subject_key", as_index=False)["paid_amount"].sum()
+        income.groupby("subject_key", as_index=False)["paid_amount"].sum()
         .rename(columns={"subject_key": "subject", "paid_amount": "income"})
         .sort_values("income", ascending=False)
         .reset_index(drop=True)
     )
 
-    sold_by_subject["subject"] = sold_by_subject["subject"].apply(_display_subject_combo)
+    sold_by_subject["subject"] = sold_by_subject["subject"].map(
+        {key: _display_subject_combo(key) for key in sold_by_subject["subject"].unique()}
+    )
 
     sold_by_modality = (
-        payments.groupby("modality", as_index=False)["paid_amount"].sum()
+        income.groupby("modality", as_index=False)["paid_amount"].sum()
         .rename(columns={"paid_amount": "income"})
         .sort_values("income", ascending=False)
         .reset_index(drop=True)
     )
 
+    return kpis, income_table, sold_by_subject, sold_by_modality
+
+
+def _clean_income_payments(payments: pd.DataFrame | None) -> pd.DataFrame:
+    if payments is None or payments.empty:
+        payments = pd.DataFrame(columns=["student", "payment_date", "paid_amount", "number_of_lesson", "modality", "subject"])
+
+    for c, default in {
+        "student": "",
+        "payment_date": None,
+        "paid_amount": 0.0,
+        "number_of_lesson": 0,
+        "modality": "Online",
+        "subject": "",
+    }.items():
+        if c not in payments.columns:
+            payments[c] = default
+
+    payments["student"] = payments["student"].astype(str).str.strip()
+    payments["payment_date"] = to_dt_naive(payments["payment_date"], utc=True)
+    payments["paid_amount"] = pd.to_numeric(payments["paid_amount"], errors="coerce").fillna(0.0)
+    payments["subject"] = payments["subject"].fillna("").astype(str).str.strip()
+    payments["modality"] = payments["modality"].fillna("Online").astype(str).str.strip()
+
+    payments = payments.dropna(subset=["payment_date"])
+    return payments[payments["student"].astype(str).str.len() > 0].copy()
+
+
+def _income_by_student(payments: pd.DataFrame) -> pd.DataFrame:
+    return (
+        payments.groupby("student", as_index=False)
+        .agg(
+            total_paid=("paid_amount", "sum"),
+            packages=("paid_amount", "size"),
+            last_payment=("payment_date", "max"),
+        )
+        .sort_values("total_paid", ascending=False)
+        .reset_index(drop=True)
+    )
+
+
+def _build_income_analytics_from_payments(payments: pd.DataFrame | None, group: str = "monthly"):
+    payments = _clean_income_payments(payments)
+    by_student = _income_by_student(payments)
+    kpis, income_table, sold_by_subject, sold_by_modality = _income_summaries(payments, group=group)
     return kpis, income_table, by_student, sold_by_subject, sold_by_modality
 
 
-@st.cache_data(ttl=45, show_spinner=False)
-def build_income_analytics(group: str = "monthly"):
-    payments = load_table_filtered(
-        "payments",
-        columns=_PAYMENT_ANALYTICS_COLUMNS,
-        order_by="payment_date",
-        order_desc=True,
+def _build_income_analytics_from_rollups(rollups: pd.DataFrame | None, group: str = "monthly"):
+    """KPIs and breakdowns from ``payment_rollups`` rows (see helpers.payment_rollups)."""
+    rollups = normalize_payment_rollups(rollups)
+    income = rollups.rename(columns={"period": "payment_date"})
+    return _income_summaries(income, group=group)
+
+
+def build_income_analytics(group: str = "monthly", payments: pd.DataFrame | None = None):
+    """Income KPIs, income table, per-student table and subject/modality breakdowns.
+
+    Everything but the per-student table comes from the daily rollups.
+    Rollups carry no student dimension, so that table reads ``payments``
+    when the caller already holds the frame, else the three payment columns
+    it needs.
+    """
+    kpis, income_table, sold_by_subject, sold_by_modality = _build_income_analytics_from_rollups(
+        load_payment_rollups(),
+        group=group,
     )
-    return _build_income_analytics_from_payments(payments, group=group)
+    if payments is None:
+        payments = load_table_filtered(
+            "payments",
+            columns=_PAYMENT_STUDENT_COLUMNS,
+            order_by="payment_date",
+            order_desc=True,
+        )
+    by_student = _income_by_student(_clean_income_payments(payments.copy()))
+    return kpis, income_table, by_student, sold_by_subject, sold_by_modality
 # =========================
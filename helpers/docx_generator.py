@@ -778,6 +778,7 @@ def _resolve_word_search_grid(payload: dict) -> tuple[list[list[str]], list[dict
         return [], []
 
     try:
+        from helpers.wordsearch_layout import wordsearch_layout_version
         from helpers.worksheet_storage import _generate_wordsearch_grid, _normalize_wordsearch_words
 
         normalized_words = _normalize_wordsearch_words(words)
@@ -789,6 +790,7 @@ def _resolve_word_search_grid(payload: dict) -> tuple[list[list[str]], list[dict
             normalized_words,
             seed=seed,
             size=size,
+            layout_version=wordsearch_layout_version(payload),
         )
         return grid or [], placements or []
     except Exception:
@@ -316,13 +316,16 @@ def update_explorer_move_status(
 
 
 def _insert_with_legacy_status_support(table: str, payload: dict) -> Any:
+    from helpers.resource_gallery import GALLERY_META_COLUMN
+
     try:
         response = get_sb().table(table).insert(payload).execute()
     except Exception as exc:
-        if "status" not in str(exc).lower():
+        message = str(exc).lower()
+        legacy_columns = {column for column in ("status", GALLERY_META_COLUMN) if column in message and column in payload}
+        if not legacy_columns:
             raise
-        legacy_payload = dict(payload)
-        legacy_payload.pop("status", None)
+        legacy_payload = {key: value for key, value in payload.items() if key not in legacy_columns}
         response = get_sb().table(table).insert(legacy_payload).execute()
     rows = getattr(response, "data", None) or []
     if rows and isinstance(rows, list):
@@ -355,6 +358,7 @@ def _insert_lesson_plan_for_user(move: dict, user_id: str, owner_name: str) -> A
 
 def _insert_worksheet_for_user(move: dict, user_id: str, owner_name: str) -> Any:
     from helpers.archive_utils import ACTIVE_STATUS
+    from helpers.resource_gallery import GALLERY_META_COLUMN, build_gallery_meta
     from helpers.worksheet_storage import _normalize_worksheet_unicode, _wb
 
     meta = move.get("meta_json") if isinstance(move.get("meta_json"), dict) else {}
@@ -379,11 +383,13 @@ def _insert_worksheet_for_user(move: dict, user_id: str, owner_name: str) -> Any
         "status": ACTIVE_STATUS,
         "created_at": _now_iso(),
     }
+    payload[GALLERY_META_COLUMN] = build_gallery_meta(payload, kind="worksheet")
     return _insert_with_legacy_status_support("worksheets", payload)
 
 
 def _insert_exam_for_user(move: dict, user_id: str, owner_name: str) -> Any:
     from helpers.archive_utils import ACTIVE_STATUS
+    from helpers.resource_gallery import GALLERY_META_COLUMN, build_gallery_meta
 
     meta = move.get("meta_json") if isinstance(move.get("meta_json"), dict) else {}
     payload = move.get("payload_json") if isinstance(move.get("payload_json"), dict) else {}
@@ -404,6 +410,7 @@ def _insert_exam_for_user(move: dict, user_id: str, owner_name: str) -> Any:
         "status": ACTIVE_STATUS,
         "created_at": _now_iso(),
     }
+    insert_payload[GALLERY_META_COLUMN] = build_gallery_meta(insert_payload, kind="exam")
     return _insert_with_legacy_status_support("quick_exams", insert_payload)
 
 
@@ -481,6 +488,7 @@ def _publish_lesson_plan(move: dict) -> tuple[bool, str, str, Any]:
 
 def _publish_worksheet(move: dict) -> tuple[bool, str, str, Any]:
     from helpers.archive_utils import ACTIVE_STATUS
+    from helpers.resource_gallery import GALLERY_META_COLUMN, build_gallery_meta
     from helpers.worksheet_storage import _normalize_worksheet_unicode, _wb
 
     meta = move.get("meta_json") if isinstance(move.get("meta_json"), dict) else {}
@@ -505,6 +513,7 @@ def _publish_worksheet(move: dict) -> tuple[bool, str, str, Any]:
         "status": ACTIVE_STATUS,
         "created_at": _now_iso(),
     })
+    payload[GALLERY_META_COLUMN] = build_gallery_meta(payload, kind="worksheet")
     record_id = _insert_with_legacy_status_support("worksheets", payload)
     clear_app_caches()
     return (record_id is not None), "worksheets", "", record_id
@@ -5,12 +5,44 @@ import numpy as np
 from core.i18n import t
 from core.state import get_current_user_id
 from core.timezone import now_local
-from core.database import load_table
+from core.database import load_table_filtered
 import math
 from helpers.dashboard import rebuild_dashboard
 from helpers.ui_components import to_dt_naive, ts_today_naive
 from helpers.language import translate_status, translate_modality_value, translate_language_value
-from helpers.package_lang_lookups import _is_free_note, _units_multiplier
+from helpers.package_lang_lookups import _free_note_mask, _units_multipliers
+
+
+_FORECAST_CLASS_COLUMNS = "student,lesson_date,number_of_lesson,modality,note"
+
+
+def _recent_class_units(classes: pd.DataFrame | None, rate_cutoff: pd.Timestamp) -> pd.DataFrame:
+    """Counted lesson units per student for classes on or after ``rate_cutoff``.
+
+    Free/demo notes count zero units; every other class counts
+    number_of_lesson times its modality multiplier.
+    """
+    if classes is None or classes.empty or "lesson_date" not in classes.columns:
+        return pd.DataFrame(columns=["Student", "Units_Last_Lookback"])
+    lesson_dates = to_dt_naive(classes["lesson_date"], utc=True)
+    window = lesson_dates.notna() & (lesson_dates >= rate_cutoff)
+    if not window.any():
+        return pd.DataFrame(columns=["Student", "Units_Last_Lookback"])
+
+    recent = classes.loc[window]
+
+    def column(name: str) -> pd.Series:
+        if name in recent.columns:
+            return recent[name]
+        return pd.Series(None, index=recent.index, dtype=object)
+
+    lessons = pd.to_numeric(column("number_of_lesson"), errors="coerce").fillna(0).astype(int)
+    modalities = column("modality").fillna("Online").astype(str).str.strip()
+    units = (lessons * _units_multipliers(modalities)).where(~_free_note_mask(column("note")), 0)
+    return (
+        pd.DataFrame({"Student": column("student").fillna("").astype(str).str.strip(), "Units_Last_Lookback": units})
+        .groupby("Student", as_index=False)["Units_Last_Lookback"].sum()
+    )
 
 # 07.15) FORECAST (BEHAVIOR-BASED + PIPELINE-AWARE + FINISHED LAST 3 MONTHS)
 # =========================
@@ -26,21 +58,6 @@ def build_forecast_table(
     if dash is None or dash.empty:
         return pd.DataFrame()
 
-    # Need raw classes to estimate burn rate
-    classes = classes_df if classes_df is not None else load_table("classes")
-    if classes is None or classes.empty:
-        classes = pd.DataFrame(columns=["student", "lesson_date", "number_of_lesson", "modality", "note"])
-    else:
-        for c in ["student", "lesson_date", "number_of_lesson", "modality", "note"]:
-            if c not in classes.columns:
-                classes[c] = None
-
-    classes["student"] = classes["student"].fillna("").astype(str).str.strip()
-    classes["lesson_date"] = to_dt_naive(classes["lesson_date"], utc=True)
-    classes["number_of_lesson"] = pd.to_numeric(classes["number_of_lesson"], errors="coerce").fillna(0).astype(int)
-    classes["modality"] = classes["modality"].fillna("Online").astype(str).str.strip()
-    classes["note"] = classes["note"].fillna("").astype(str)
-
     today = ts_today_naive()
     active_cutoff = today - pd.Timedelta(days=int(active_window_days))
     finished_cutoff = today - pd.Timedelta(days=int(finished_keep_days))
@@ -93,21 +110,21 @@ def build_forecast_table(
     if df.empty:
         return pd.DataFrame()
 
-    # Estimate burn rate (units/day) from last lookback window per student
-    def _units_row(r) -> int:
-        if _is_free_note(r.get("note", "")):
-            return 0
-        return int(r.get("number_of_lesson", 0)) * _units_multiplier(r.get("modality", ""))
-
-    recent = classes.dropna(subset=["lesson_date"]).copy()
-    recent = recent[recent["lesson_date"] >= rate_cutoff]
-
-    if not recent.empty:
-        recent["Units_Last_Lookback"] = recent.apply(_units_row, axis=1)
-        rate_tbl = (
-            recent.groupby("student", as_index=False)["Units_Last_Lookback"].sum()
-            .rename(columns={"student": "Student"})
+    # Estimate burn rate (units/day) from last lookback window per student.
+    # Only that window of classes is needed, so only that window is read
+    # when the caller has not already loaded them.
+    classes = classes_df
+    if classes is None:
+        classes = load_table_filtered(
+            "classes",
+            columns=_FORECAST_CLASS_COLUMNS,
+            filters=[("gte", "lesson_date", rate_cutoff.strftime("%Y-%m-%d"))],
+            order_by="lesson_date",
+            order_desc=True,
         )
+    rate_tbl = _recent_class_units(classes, rate_cutoff)
+
+    if not rate_tbl.empty:
         # Global median units/day (better fallback than constant)
         lookback_days = float(max(1, int(lookback_days_for_rate)))
         tmpu = rate_tbl["Units_Last_Lookback"] / lookback_days
@@ -4,6 +4,7 @@ from dataclasses import dataclass
 from datetime import datetime
 from typing import Any
 
+import numpy as np
 import pandas as pd
 
 from helpers.ui_components import to_dt_naive
@@ -143,6 +144,35 @@ def _goal_probability(projection: float, goal: float, risk_rate: float) -> float
     return max(0.0, min(0.99, progress * risk_drag))
 
 
+_ACTION_BOUNDS = np.array([[0.0, 0.18], [0.0, 8.0], [0.0, 10.0], [0.0, 1.0]])
+_ACTION_EFFORT_WEIGHTS = np.array([0.10, 0.45, 0.30, 0.18])
+
+
+def _action_factors(
+    baseline_projection: float,
+    avg_package_value: float,
+    effective_rate: float,
+    weeks_left: float,
+    renewal_pool: float,
+) -> np.ndarray:
+    return np.maximum(
+        0.0,
+        np.array([baseline_projection, avg_package_value, effective_rate * weeks_left, renewal_pool], dtype=float),
+    )
+
+
+def _action_effort_costs(gap: float) -> np.ndarray:
+    scale = np.maximum(0.0001, _ACTION_BOUNDS[:, 1] - _ACTION_BOUNDS[:, 0])
+    return _ACTION_EFFORT_WEIGHTS / scale**2 * max(1.0, gap) ** 2
+
+
+def _action_loss(x: np.ndarray, gap: float, factors: np.ndarray) -> np.ndarray:
+    """Objective for one action vector or a stack of them (last axis = actions)."""
+    x = np.asarray(x, dtype=float)
+    remaining = np.maximum(0.0, gap - x @ factors)
+    return remaining**2 + (x**2 * _action_effort_costs(gap)).sum(axis=-1)
+
+
 def _optimize_actions(
     gap: float,
     baseline_projection: float,
@@ -154,6 +184,44 @@ def _optimize_actions(
     if gap <= 0:
         return [0.0, 0.0, 0.0, 0.0], [0.0, 0.0, 0.0, 0.0]
 
+    # loss(x) = max(0, gap - f.x)^2 + sum(c_i x_i^2) over the box 0 <= x <= high.
+    # With r = gap - f.x > 0 the KKT conditions give x_i = min(high_i, r f_i / c_i)
+    # (f_i >= 0, so the lower bounds never bind), and r solves
+    # r + sum(f_i x_i(r)) = gap. That equation is piecewise linear in r with a
+    # breakpoint where each action hits its upper bound, so the exact optimum is
+    # found by evaluating every "first k actions clamped" segment at once.
+    factors = _action_factors(baseline_projection, avg_package_value, effective_rate, weeks_left, renewal_pool)
+    costs = _action_effort_costs(gap)
+    high = _ACTION_BOUNDS[:, 1]
+    with np.errstate(divide="ignore"):
+        breakpoints = np.where(factors > 0, high * costs / factors, np.inf)
+    order = np.argsort(breakpoints, kind="stable")
+    clamped_gain = np.concatenate(([0.0], np.cumsum((factors * high)[order])))
+    free_slope = (factors**2 / costs)[order]
+    free_slope = np.concatenate((np.cumsum(free_slope[::-1])[::-1], [0.0]))
+    residuals = (gap - clamped_gain) / (1.0 + free_slope)
+    lower = np.concatenate(([0.0], breakpoints[order]))
+    upper = np.concatenate((breakpoints[order], [np.inf]))
+    segment = int(np.argmax((residuals >= lower) & (residuals <= upper)))
+    residual = max(0.0, float(residuals[segment]))
+
+    x = np.minimum(high, residual * factors / costs)
+    impacts = x * factors
+    return x.tolist(), impacts.tolist()
+
+
+def _optimize_actions_reference(
+    gap: float,
+    baseline_projection: float,
+    avg_package_value: float,
+    effective_rate: float,
+    weeks_left: float,
+    renewal_pool: float,
+) -> tuple[list[float], list[float]]:
+    """Original finite-difference descent, kept as a reference for tests and benchmarks."""
+    if gap <= 0:
+        return [0.0, 0.0, 0.0, 0.0], [0.0, 0.0, 0.0, 0.0]
+
     factors = [
         max(0.0, baseline_projection),
         max(0.0, avg_package_value),
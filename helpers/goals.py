@@ -12,8 +12,9 @@ from io import BytesIO
 import streamlit.components.v1 as components
 from core.state import with_owner
 from core.database import clear_app_caches
+from helpers.payment_rollups import load_payment_rollups
 from helpers.ui_components import to_dt_naive, ts_today_naive
-from helpers.schedule import load_schedules, load_overrides
+from helpers.schedule import next_lesson_datetime
 from styles.theme import get_theme_mode
 from translations import I18N
 
@@ -162,30 +163,12 @@ def get_year_goal_progress_snapshot(year: int | None = None, goal_key: str = "ye
     )
     goal = _parse_float_loose(goal, 0.0)
 
-    # YTD income from payments
+    # YTD income from the daily payment rollups
     ytd = 0.0
     try:
-        p = load_table_filtered(
-            "payments",
-            columns="payment_date,paid_amount",
-            filters=[("gte", "payment_date", f"{yr}-01-01")],
-            limit=5000,
-            page_size=1000,
-            order_by="payment_date",
-            order_desc=True,
-        )
-        if p is not None and not p.empty:
-            if "payment_date" not in p.columns:
-                p["payment_date"] = None
-            if "paid_amount" not in p.columns:
-                p["paid_amount"] = 0.0
-
-            p = p.copy()
-            p["payment_date"] = to_dt_naive(p["payment_date"], utc=True)
-            p["paid_amount"] = pd.to_numeric(p["paid_amount"], errors="coerce").fillna(0.0).astype(float)
-            p = p.dropna(subset=["payment_date"])
-            p = p[p["payment_date"].dt.year == yr]
-            ytd = float(p["paid_amount"].sum())
+        rollups = load_payment_rollups()
+        if rollups is not None and not rollups.empty:
+            ytd = float(rollups.loc[rollups["period"].dt.year == yr, "paid_amount"].sum())
     except Exception:
         ytd = 0.0
 
@@ -575,58 +558,14 @@ body.theme-dark {{
 def get_next_lesson_display() -> str:
     """
     Returns next lesson time like 'Tue 19:15' or '--:--' if none.
-    Uses schedules + overrides (scheduled only).
+    Uses schedules + scheduled overrides, skipping cancelled slots and freezes.
     """
     try:
-        sched = load_schedules()
-        ov = load_overrides()
+        next_dt = next_lesson_datetime()
     except Exception:
         return "--:--"
-
-    now = now_local()
-    now_ts = pd.Timestamp(now.replace(tzinfo=None))
-
-    candidates = []
-
-    # --- 1) Overrides: take upcoming scheduled new_datetime ---
-    if ov is not None and not ov.empty and "new_datetime" in ov.columns:
-        tmp = ov.copy()
-        tmp["status"] = tmp.get("status", "").astype(str).str.lower()
-        tmp = tmp[tmp["status"] == "scheduled"].copy()
-        tmp["new_datetime"] = pd.to_datetime(tmp["new_datetime"], errors="coerce")
-        tmp = tmp[tmp["new_datetime"].notna()].copy()
-        tmp["new_datetime"] = tmp["new_datetime"].dt.tz_localize(None)
-
-        upcoming = tmp[tmp["new_datetime"] >= now_ts].sort_values("new_datetime")
-        for _, r in upcoming.head(20).iterrows():
-            candidates.append(pd.Timestamp(r["new_datetime"]).to_pydatetime())
-
-    # --- 2) Weekly schedules: generate next occurrence for each active schedule ---
-    if sched is not None and not sched.empty:
-        s = sched.copy()
-        s = s[s.get("active", True) == True].copy()
-
-        # weekday: 0=Mon ... 6=Sun in your code
-        for _, r in s.iterrows():
-            try:
-                wd = int(r.get("weekday", 0))
-                time_str = str(r.get("time", "00:00")).strip()
-                hh, mm = [int(x) for x in time_str.split(":")[:2]]
-
-                days_ahead = (wd - now_ts.weekday()) % 7
-                dt = (now_ts + pd.Timedelta(days=days_ahead)).normalize() + pd.Timedelta(hours=hh, minutes=mm)
-
-                if dt < now_ts:
-                    dt = dt + pd.Timedelta(days=7)
-
-                candidates.append(dt.to_pydatetime())
-            except Exception:
-                continue
-
-    if not candidates:
+    if next_dt is None:
         return "--:--"
-
-    next_dt = min(candidates)
     return next_dt.strftime("%a %H:%M")
 
 # =========================
@@ -5,7 +5,9 @@ Flow:
 1. Teacher clicks "Connect Google Calendar" → redirected to Google OAuth consent.
 2. After consent, Google redirects back with ?code=… query parameter.
 3. App exchanges the code for tokens, stores refresh_token in Supabase profiles.
-4. When a schedule/override is created, a Google Calendar event is created/updated.
+4. When a schedule/override is created, the event create/delete is written to
+   the gcal_outbox table; scripts/drain_gcal_outbox.py sends it to Google in
+   per-teacher batch requests.
 
 Required secrets (.streamlit/secrets.toml):
     GOOGLE_CAL_CLIENT_ID = "…"
@@ -13,18 +15,22 @@ Required secrets (.streamlit/secrets.toml):
 """
 
 import os
+import hashlib
 import json
+import threading
+from contextlib import contextmanager
 import requests as _requests
 import streamlit as st
-from datetime import datetime, timedelta
-from typing import Optional
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Iterator, Optional
 from urllib.parse import urlencode
 
 from google.oauth2.credentials import Credentials
 from googleapiclient.discovery import build
 
-from core.state import get_current_user_id
+from core.state import get_current_user_id, with_owner
 from core.database import get_sb
+from core.runtime import utc_now
 from core.timezone import get_app_tz_name
 
 
@@ -169,11 +175,20 @@ def is_gcal_connected() -> bool:
 # Calendar API client
 # ---------------------------------------------------------------------------
 
-def _get_calendar_service():
-    tokens = load_gcal_tokens()
-    if not tokens or not tokens.get("refresh_token"):
-        return None
+# Fingerprint -> (service, lock); see calendar_service().
+_SERVICE_CACHE: dict[str, tuple[Any, threading.Lock]] = {}
+_SERVICE_CACHE_LOCK = threading.Lock()
+
+
+def _tokens_fingerprint(tokens: dict) -> str:
+    raw = "|".join(
+        str(tokens.get(key) or "")
+        for key in ("refresh_token", "client_id", "token_uri")
+    )
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
 
+
+def _build_calendar_service(tokens: dict):
     creds = Credentials(
         token=tokens.get("token"),
         refresh_token=tokens.get("refresh_token"),
@@ -182,14 +197,49 @@ def _get_calendar_service():
         client_secret=tokens.get("client_secret") or _get_client_config()["web"]["client_secret"],
         scopes=SCOPES,
     )
+    return build("calendar", "v3", credentials=creds, cache_discovery=False)
+
 
-    service = build("calendar", "v3", credentials=creds, cache_discovery=False)
+def _cached_calendar_service(tokens: dict, factory: Optional[Callable[[dict], Any]]) -> Optional[tuple[Any, threading.Lock]]:
+    if not tokens or not tokens.get("refresh_token"):
+        return None
+    key = _tokens_fingerprint(tokens)
+    entry = _SERVICE_CACHE.get(key)
+    if entry is not None:
+        return entry
+    with _SERVICE_CACHE_LOCK:
+        entry = _SERVICE_CACHE.get(key)
+        if entry is None:
+            entry = ((factory or _build_calendar_service)(tokens), threading.Lock())
+            _SERVICE_CACHE[key] = entry
+    return entry
+
+
+@contextmanager
+def calendar_service(tokens: dict, *, factory: Optional[Callable[[dict], Any]] = None) -> Iterator[Any]:
+    """Yield the cached Calendar client for a token set, or None when not connected.
+
+    One client is kept per token set and its credentials refresh themselves
+    on use. Its httplib2 transport is not thread-safe and Streamlit serves
+    sessions from several threads, so each client is used by one thread at
+    a time.
+    """
+    entry = _cached_calendar_service(tokens, factory)
+    if entry is None:
+        yield None
+        return
+    service, lock = entry
+    with lock:
+        yield service
 
-    if creds.token != tokens.get("token"):
-        tokens["token"] = creds.token
-        save_gcal_tokens(tokens)
 
-    return service
+def clear_calendar_service_cache() -> None:
+    with _SERVICE_CACHE_LOCK:
+        _SERVICE_CACHE.clear()
+
+
+def _calendar_service():
+    return calendar_service(load_gcal_tokens() or {})
 
 
 # ---------------------------------------------------------------------------
@@ -266,52 +316,355 @@ def create_gcal_event(
     duration_minutes: int = 60,
     note: str = "",
 ) -> Optional[str]:
-    service = _get_calendar_service()
-    if not service:
-        return None
+    with _calendar_service() as service:
+        if not service:
+            return None
 
-    event_body = _build_event_body(student, start_dt, duration_minutes, note)
+        event_body = _build_event_body(student, start_dt, duration_minutes, note)
 
-    try:
-        event = service.events().insert(
-            calendarId="primary",
-            body=event_body,
-            sendUpdates="all",
-        ).execute()
-        return event.get("id")
-    except Exception:
-        return None
+        try:
+            event = service.events().insert(
+                calendarId="primary",
+                body=event_body,
+                sendUpdates="all",
+            ).execute()
+            return event.get("id")
+        except Exception:
+            return None
 
 
 def delete_gcal_event(event_id: str) -> bool:
-    service = _get_calendar_service()
-    if not service or not event_id:
+    with _calendar_service() as service:
+        if not service or not event_id:
+            return False
+        try:
+            service.events().delete(calendarId="primary", eventId=event_id).execute()
+            return True
+        except Exception:
+            return False
+
+
+def update_gcal_event(
+    event_id: str,
+    student: str,
+    start_dt: datetime,
+    duration_minutes: int = 60,
+    note: str = "",
+) -> bool:
+    with _calendar_service() as service:
+        if not service or not event_id:
+            return False
+
+        event_body = _build_event_body(student, start_dt, duration_minutes, note)
+
+        try:
+            service.events().patch(
+                calendarId="primary", eventId=event_id, body=event_body,
+                sendUpdates="all",
+            ).execute()
+            return True
+        except Exception:
+            return False
+
+
+# ---------------------------------------------------------------------------
+# Outbox
+# ---------------------------------------------------------------------------
+
+GCAL_OUTBOX_TABLE = "gcal_outbox"
+# Google caps Calendar batch requests at 50 calls.
+GCAL_BATCH_MAX_REQUESTS = 50
+GCAL_OUTBOX_MAX_ATTEMPTS = 5
+# A drain that dies mid-send leaves its rows in ``sending``; they are
+# returned to the queue once the claim is this old.
+GCAL_OUTBOX_CLAIM_TIMEOUT = timedelta(minutes=15)
+
+
+def _insert_outbox_row(payload: dict) -> bool:
+    row = with_owner(payload)
+    if not row.get("user_id"):
         return False
     try:
-        service.events().delete(calendarId="primary", eventId=event_id).execute()
+        get_sb().table(GCAL_OUTBOX_TABLE).insert(row).execute()
         return True
     except Exception:
         return False
 
 
-def update_gcal_event(
-    event_id: str,
+def enqueue_gcal_create(
     student: str,
     start_dt: datetime,
     duration_minutes: int = 60,
     note: str = "",
+    *,
+    original_date: Optional[date] = None,
+    override_id: Optional[int] = None,
 ) -> bool:
-    service = _get_calendar_service()
-    if not service or not event_id:
+    """Queue an event create; the drain worker writes the event id back to the override."""
+    return _insert_outbox_row(
+        {
+            "op": "create",
+            "student": str(student or "").strip(),
+            "original_date": original_date.isoformat() if original_date else None,
+            "override_id": int(override_id) if override_id else None,
+            "event_body": _build_event_body(student, start_dt, duration_minutes, note),
+        }
+    )
+
+
+def enqueue_gcal_delete(
+    event_id: str,
+    *,
+    student: str = "",
+    original_date: Optional[date] = None,
+) -> bool:
+    if not event_id:
         return False
+    return _insert_outbox_row(
+        {
+            "op": "delete",
+            "student": str(student or "").strip(),
+            "original_date": original_date.isoformat() if original_date else None,
+            "gcal_event_id": str(event_id),
+        }
+    )
 
-    event_body = _build_event_body(student, start_dt, duration_minutes, note)
 
+def supersede_pending_gcal_creates(student: str, original_date: date) -> None:
+    """Drop queued or in-flight creates for a lesson that is being rescheduled (see ``drain_gcal_outbox``)."""
+    uid = str(get_current_user_id() or "").strip()
+    if not uid:
+        return
     try:
-        service.events().patch(
-            calendarId="primary", eventId=event_id, body=event_body,
-            sendUpdates="all",
-        ).execute()
-        return True
+        (
+            get_sb().table(GCAL_OUTBOX_TABLE)
+            .update({"status": "superseded"})
+            .eq("user_id", uid)
+            .eq("student", str(student or "").strip())
+            .eq("original_date", original_date.isoformat())
+            .eq("op", "create")
+            .in_("status", ["pending", "sending"])
+            .execute()
+        )
     except Exception:
-        return False
+        pass
+
+
+def supersede_pending_gcal_creates_for_override(override_id: int) -> None:
+    """Drop queued or in-flight creates for an override that is being deleted, so no orphan event is kept."""
+    uid = str(get_current_user_id() or "").strip()
+    if not uid or not override_id:
+        return
+    try:
+        (
+            get_sb().table(GCAL_OUTBOX_TABLE)
+            .update({"status": "superseded"})
+            .eq("user_id", uid)
+            .eq("override_id", int(override_id))
+            .eq("op", "create")
+            .in_("status", ["pending", "sending"])
+            .execute()
+        )
+    except Exception:
+        pass
+
+
+def _http_status(exc: Exception) -> int:
+    try:
+        return int(getattr(getattr(exc, "resp", None), "status", 0) or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _outbox_request(service, row: dict):
+    if row.get("op") == "delete":
+        return service.events().delete(calendarId="primary", eventId=str(row.get("gcal_event_id") or ""))
+    return service.events().insert(
+        calendarId="primary",
+        body=row.get("event_body") or {},
+        sendUpdates="all",
+    )
+
+
+def _send_outbox_batches(service, rows: list[dict]) -> tuple[dict[int, tuple[bool, Any]], int]:
+    """Send ``rows`` in Calendar batch requests; returns ``({row_id: (ok, event_id_or_error)}, batch_count)``."""
+    results: dict[int, tuple[bool, Any]] = {}
+    batches = 0
+    by_request_id = {str(row["id"]): row for row in rows}
+
+    def _callback(request_id, response, exception):
+        row = by_request_id.get(str(request_id)) or {}
+        if exception is None:
+            results[int(row["id"])] = (True, (response or {}).get("id") if isinstance(response, dict) else None)
+        elif row.get("op") == "delete" and _http_status(exception) in {404, 410}:
+            results[int(row["id"])] = (True, None)
+        else:
+            results[int(row["id"])] = (False, str(exception))
+
+    for start in range(0, len(rows), GCAL_BATCH_MAX_REQUESTS):
+        chunk = rows[start:start + GCAL_BATCH_MAX_REQUESTS]
+        batch = service.new_batch_http_request(callback=_callback)
+        for row in chunk:
+            batch.add(_outbox_request(service, row), request_id=str(row["id"]))
+        try:
+            batch.execute()
+        except Exception as exc:
+            for row in chunk:
+                results.setdefault(int(row["id"]), (False, str(exc)))
+        batches += 1
+    return results, batches
+
+
+def _load_tokens_by_user(sb, user_ids: list[str]) -> dict[str, dict]:
+    if not user_ids:
+        return {}
+    res = sb.table("profiles").select("user_id,gcal_tokens").in_("user_id", user_ids).execute()
+    out: dict[str, dict] = {}
+    for row in getattr(res, "data", None) or []:
+        raw = row.get("gcal_tokens")
+        try:
+            tokens = json.loads(raw) if isinstance(raw, str) else raw
+        except ValueError:
+            tokens = None
+        if isinstance(tokens, dict) and tokens.get("refresh_token"):
+            out[str(row.get("user_id"))] = tokens
+    return out
+
+
+def _write_back_event_id(sb, row: dict, event_id: str) -> None:
+    query = sb.table("calendar_overrides").update({"gcal_event_id": event_id})
+    if row.get("override_id"):
+        query.eq("id", int(row["override_id"])).eq("user_id", row["user_id"]).execute()
+        return
+    if not row.get("student") or not row.get("original_date"):
+        return
+    (
+        query.eq("user_id", row["user_id"])
+        .eq("student", row["student"])
+        .eq("original_date", row["original_date"])
+        .order("id", desc=True)
+        .limit(1)
+        .execute()
+    )
+
+
+def _release_stale_outbox_claims(sb, now: datetime) -> None:
+    """Return rows claimed by a drain that died mid-send to the queue."""
+    (
+        sb.table(GCAL_OUTBOX_TABLE)
+        .update({"status": "pending"})
+        .eq("status", "sending")
+        .lt("claimed_at", (now - GCAL_OUTBOX_CLAIM_TIMEOUT).isoformat())
+        .execute()
+    )
+
+
+def _claim_pending_outbox_rows(sb, limit: int, claimed_at: str) -> list[dict]:
+    """Flip up to ``limit`` pending rows to ``sending`` and return the ones this drain won.
+
+    The update is conditional on ``status = 'pending'``, so when two drains
+    overlap each row is claimed, and sent, by only one of them.
+    """
+    res = sb.table(GCAL_OUTBOX_TABLE).select("id").eq("status", "pending").order("id").limit(int(limit)).execute()
+    ids = [int(row["id"]) for row in (getattr(res, "data", None) or [])]
+    if not ids:
+        return []
+    claimed = (
+        sb.table(GCAL_OUTBOX_TABLE)
+        .update({"status": "sending", "claimed_at": claimed_at})
+        .in_("id", ids)
+        .eq("status", "pending")
+        .execute()
+    )
+    return sorted((dict(row) for row in (getattr(claimed, "data", None) or [])), key=lambda row: int(row["id"]))
+
+
+def _finish_outbox_rows(sb, ids: list[int], payload: dict) -> int:
+    """Settle claimed rows; rows superseded while in flight are left alone. Returns rows updated."""
+    if not ids:
+        return 0
+    res = sb.table(GCAL_OUTBOX_TABLE).update(payload).in_("id", ids).eq("status", "sending").execute()
+    return len(getattr(res, "data", None) or [])
+
+
+def drain_gcal_outbox(
+    sb=None,
+    *,
+    limit: int = 500,
+    service_factory: Optional[Callable[[dict], Any]] = None,
+) -> dict[str, int]:
+    """Send pending outbox rows to Google, one batch request per teacher per 50 rows.
+
+    Needs a client that can read every teacher's rows and tokens (service
+    role). Rows are claimed (``sending``) before they are sent and settled
+    only while still claimed, so overlapping drains never send a row twice.
+    A create superseded while it was in flight has its new event deleted
+    again. Failed rows go back to pending until ``GCAL_OUTBOX_MAX_ATTEMPTS``.
+    """
+    sb = sb or get_sb()
+    now = utc_now()
+    processed_at = now.isoformat()
+    _release_stale_outbox_claims(sb, now)
+    rows = _claim_pending_outbox_rows(sb, limit, processed_at)
+    summary = {"processed": len(rows), "done": 0, "failed": 0, "skipped": 0, "superseded": 0, "batches": 0}
+    if not rows:
+        return summary
+
+    rows_by_user: dict[str, list[dict]] = {}
+    for row in rows:
+        rows_by_user.setdefault(str(row.get("user_id") or ""), []).append(row)
+    tokens_by_user = _load_tokens_by_user(sb, [uid for uid in rows_by_user if uid])
+
+    done_ids: list[int] = []
+    skipped_ids: list[int] = []
+    for uid, user_rows in rows_by_user.items():
+        with calendar_service(tokens_by_user.get(uid) or {}, factory=service_factory) as service:
+            if service is None:
+                skipped_ids.extend(int(row["id"]) for row in user_rows)
+                continue
+            results, batches = _send_outbox_batches(service, user_rows)
+            summary["batches"] += batches
+            orphans: list[dict] = []
+            for row in user_rows:
+                ok, detail = results.get(int(row["id"]), (False, "no batch response"))
+                if ok and row.get("op") == "create" and detail:
+                    finished = _finish_outbox_rows(
+                        sb,
+                        [int(row["id"])],
+                        {"status": "done", "gcal_event_id": str(detail), "processed_at": processed_at},
+                    )
+                    if not finished:
+                        orphans.append({"id": int(row["id"]), "op": "delete", "gcal_event_id": str(detail)})
+                        continue
+                    try:
+                        _write_back_event_id(sb, row, str(detail))
+                    except Exception:
+                        pass
+                    summary["done"] += 1
+                elif ok:
+                    done_ids.append(int(row["id"]))
+                else:
+                    attempts = int(row.get("attempts") or 0) + 1
+                    summary["failed"] += _finish_outbox_rows(
+                        sb,
+                        [int(row["id"])],
+                        {
+                            "status": "failed" if attempts >= GCAL_OUTBOX_MAX_ATTEMPTS else "pending",
+                            "attempts": attempts,
+                            "last_error": str(detail or "")[:500],
+                            "processed_at": processed_at,
+                        },
+                    )
+            if orphans:
+                # Superseded while in flight: nothing links to these events any more.
+                _orphan_results, batches = _send_outbox_batches(service, orphans)
+                summary["batches"] += batches
+                summary["superseded"] += len(orphans)
+
+    summary["done"] += _finish_outbox_rows(sb, done_ids, {"status": "done", "processed_at": processed_at})
+    summary["skipped"] += _finish_outbox_rows(
+        sb,
+        skipped_ids,
+        {"status": "skipped", "last_error": "calendar not connected", "processed_at": processed_at},
+    )
+    return summary
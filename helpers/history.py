@@ -4,10 +4,16 @@ import pandas as pd
 from core.i18n import t
 from core.state import get_current_user_id
 from core.timezone import now_local
-from core.database import LESSON_NOTE_DEFAULT_TOKEN, load_table_filtered
+from core.database import (
+    LESSON_NOTE_DEFAULT_TOKEN,
+    _execute_query_with_diagnostics,
+    get_sb,
+    register_cache,
+    show_data_load_error,
+)
 from typing import Tuple
 from helpers.ui_components import to_dt_naive
-from helpers.language import translate_modality_value, translate_language_value
+from helpers.language import translate_modality_series
 
 
 def _display_lesson_note_for_table(value) -> str:
@@ -16,62 +22,74 @@ def _display_lesson_note_for_table(value) -> str:
         return "—"
     return text
 
+
+def _display_lesson_notes(notes: pd.Series) -> pd.Series:
+    """``_display_lesson_note_for_table`` for a whole column."""
+    text = notes.fillna("").astype(str).str.strip()
+    return text.mask(text.eq("") | text.eq(LESSON_NOTE_DEFAULT_TOKEN), "—")
+
 # 07.8) HISTORY HELPERS
 # =========================
-def show_student_history(student: str) -> Tuple[pd.DataFrame, pd.DataFrame]:
-    student = str(student).strip()
-
-    classes = load_table_filtered(
-        "classes",
-        columns="id,student,number_of_lesson,lesson_date,modality,note,subject",
-        filters=[("eq", "student", student)],
-        limit=2000,
-        page_size=500,
-        order_by="lesson_date",
-        order_desc=True,
-    )
-    payments = load_table_filtered(
-        "payments",
-        columns=(
-            "id,student,number_of_lesson,payment_date,paid_amount,modality,subject,"
-            "package_start_date,package_expiry_date,lesson_adjustment_units,"
-            "package_normalized,normalized_note,normalized_at"
-        ),
-        filters=[("eq", "student", student)],
-        limit=2000,
-        page_size=500,
-        order_by="payment_date",
-        order_desc=True,
-    )
-
-    if classes.empty:
-        classes = pd.DataFrame(columns=["id", "student", "number_of_lesson", "lesson_date", "modality", "note", "subject"])
-    if payments.empty:
-        payments = pd.DataFrame(columns=[
-            "id","student","number_of_lesson","payment_date","paid_amount","modality","subject",
-            "package_start_date","package_expiry_date",
-            "lesson_adjustment_units","package_normalized","normalized_note","normalized_at"
-        ])
+_HISTORY_ROW_LIMIT = 2000
+_HISTORY_PAGE_SIZE = 500
+_HISTORY_CLASS_COLUMNS = ["id", "number_of_lesson", "lesson_date", "modality", "note", "subject"]
+_HISTORY_PAYMENT_COLUMNS = [
+    "id", "number_of_lesson", "payment_date", "paid_amount", "modality", "subject",
+    "package_start_date", "package_expiry_date",
+    "lesson_adjustment_units", "package_normalized", "normalized_note", "normalized_at",
+]
+
+
+def _fetch_student_rows(table_name: str, columns: list[str], uid: str, student: str, order_by: str) -> pd.DataFrame:
+    """One student's rows from ``table_name``, newest first, paged."""
+    sb = get_sb()
+    rows: list[dict] = []
+    offset = 0
+    while offset < _HISTORY_ROW_LIMIT:
+        batch = _execute_query_with_diagnostics(
+            sb.table(table_name)
+            .select(",".join(columns))
+            .eq("user_id", uid)
+            .eq("student", student)
+            .order(order_by, desc=True)
+            .range(offset, min(offset + _HISTORY_PAGE_SIZE, _HISTORY_ROW_LIMIT) - 1),
+            function_name="_fetch_student_rows",
+            source_name=table_name,
+        ).data or []
+        rows.extend(batch)
+        if len(batch) < _HISTORY_PAGE_SIZE:
+            break
+        offset += _HISTORY_PAGE_SIZE
+    return pd.DataFrame(rows, columns=columns)
+
+
+def _build_student_history(
+    classes: pd.DataFrame,
+    payments: pd.DataFrame,
+    student: str,
+    lang: str,
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Display-ready lessons and payments for one student."""
+    classes = classes.copy()
+    payments = payments.copy()
 
     # Ensure columns exist
-    for col in ["id","student","number_of_lesson","lesson_date","modality","note","subject"]:
+    for col in _HISTORY_CLASS_COLUMNS:
         if col not in classes.columns:
             classes[col] = None
-
-    for col in [
-        "id","student","number_of_lesson","payment_date","paid_amount","modality","subject",
-        "package_start_date","package_expiry_date",
-        "lesson_adjustment_units","package_normalized","normalized_note","normalized_at"
-    ]:
+    for col in _HISTORY_PAYMENT_COLUMNS:
         if col not in payments.columns:
             payments[col] = None
 
-    # Filter by student
-    classes["student"] = classes["student"].astype(str).str.strip()
-    payments["student"] = payments["student"].astype(str).str.strip()
+    # Rows fetched by student already match; frames that still carry the
+    # student column are filtered the way the table loader's rows were.
+    if "student" in classes.columns:
+        classes = classes[classes["student"].astype(str).str.strip() == student]
+    if "student" in payments.columns:
+        payments = payments[payments["student"].astype(str).str.strip() == student]
 
-    lessons_df = classes[classes["student"] == student].copy()
-    payments_df = payments[payments["student"] == student].copy()
+    lessons_df = classes[_HISTORY_CLASS_COLUMNS].copy()
+    payments_df = payments[_HISTORY_PAYMENT_COLUMNS].copy()
 
     # Parse dates (tz-naive)
     lessons_df["lesson_date"] = to_dt_naive(lessons_df["lesson_date"], utc=True)
@@ -88,7 +106,7 @@ def show_student_history(student: str) -> Tuple[pd.DataFrame, pd.DataFrame]:
     lessons_df = lessons_df.sort_values(["lesson_date","id"], ascending=[False, False]).reset_index(drop=True)
     payments_df = payments_df.sort_values(["payment_date","id"], ascending=[False, False]).reset_index(drop=True)
 
-    # Select + rename to stable internal keys (snake_case)
+    # Rename to stable internal keys (snake_case)
     lessons_df = lessons_df.rename(columns={
         "id": "lesson_id",
         "number_of_lesson": "lessons",
@@ -105,19 +123,48 @@ def show_student_history(student: str) -> Tuple[pd.DataFrame, pd.DataFrame]:
     ]]
 
     # Format dates for display (safe on Series)
-    lessons_df["lesson_date"] = pd.to_datetime(lessons_df["lesson_date"], errors="coerce").dt.strftime("%Y-%m-%d")
-    payments_df["payment_date"] = pd.to_datetime(payments_df["payment_date"], errors="coerce").dt.strftime("%Y-%m-%d")
-    payments_df["package_start_date"] = pd.to_datetime(payments_df["package_start_date"], errors="coerce").dt.strftime("%Y-%m-%d")
-    payments_df["package_expiry_date"] = pd.to_datetime(payments_df["package_expiry_date"], errors="coerce").dt.strftime("%Y-%m-%d")
+    lessons_df["lesson_date"] = lessons_df["lesson_date"].dt.strftime("%Y-%m-%d")
+    payments_df["payment_date"] = payments_df["payment_date"].dt.strftime("%Y-%m-%d")
+    payments_df["package_start_date"] = payments_df["package_start_date"].dt.strftime("%Y-%m-%d")
+    payments_df["package_expiry_date"] = payments_df["package_expiry_date"].dt.strftime("%Y-%m-%d")
 
-    # Translate coded values (optional)
-    lessons_df["modality"] = lessons_df["modality"].apply(translate_modality_value)
+    # Translate coded values
+    lessons_df["modality"] = translate_modality_series(lessons_df["modality"], lang)
     lessons_df["subject"] = lessons_df["subject"].fillna("").astype(str)
-    lessons_df["note"] = lessons_df["note"].apply(_display_lesson_note_for_table)
+    lessons_df["note"] = _display_lesson_notes(lessons_df["note"])
 
-    payments_df["modality"] = payments_df["modality"].apply(translate_modality_value)
+    payments_df["modality"] = translate_modality_series(payments_df["modality"], lang)
     payments_df["subject"] = payments_df["subject"].fillna("").astype(str)
 
     return lessons_df, payments_df
 
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _load_student_history_cached(uid: str, student: str, lang: str) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    # Errors propagate so a failed fetch is not cached.
+    classes = _fetch_student_rows("classes", _HISTORY_CLASS_COLUMNS, uid, student, "lesson_date")
+    payments = _fetch_student_rows("payments", _HISTORY_PAYMENT_COLUMNS, uid, student, "payment_date")
+    return _build_student_history(classes, payments, student, lang)
+
+
+register_cache(_load_student_history_cached, "classes", "payments", "students")
+
+
+def show_student_history(student: str) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Lessons and payments for ``student``, formatted for display.
+
+    Cached per (teacher, student, language); adding, editing or deleting a
+    lesson or payment clears it.
+    """
+    student = str(student).strip()
+    uid = str(get_current_user_id() or "")
+    lang = st.session_state.get("ui_lang", "en")
+    if uid:
+        try:
+            return _load_student_history_cached(uid, student, lang)
+        except Exception as exc:
+            show_data_load_error(exc)
+    empty = pd.DataFrame(columns=[])
+    return _build_student_history(empty, empty, student, lang)
+
 # =========================
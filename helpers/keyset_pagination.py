@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+import logging
+import threading
+from typing import Callable, NamedTuple
+
+logger = logging.getLogger(__name__)
+
+LIBRARY_PAGE_SIZE = 120
+
+_PREFETCH_EXECUTOR = ThreadPoolExecutor(max_workers=2, thread_name_prefix="keyset-prefetch")
+_PREFETCH_INFLIGHT: set[tuple[int, str, str, int]] = set()
+_PREFETCH_LOCK = threading.Lock()
+
+
+@dataclass(frozen=True)
+class KeysetCursor:
+    """Position after a row in (created_at desc, id desc) order."""
+
+    created_at: str
+    id: str
+
+    def token(self) -> str:
+        return f"{self.created_at}|{self.id}"
+
+    @classmethod
+    def from_token(cls, token: str) -> "KeysetCursor | None":
+        created_at, sep, row_id = str(token or "").rpartition("|")
+        if not sep or not created_at or not row_id:
+            return None
+        return cls(created_at=created_at, id=row_id)
+
+    @classmethod
+    def after(cls, row: dict) -> "KeysetCursor | None":
+        created_at = str(row.get("created_at") or "").strip()
+        row_id = str(row.get("id") or "").strip()
+        if not created_at or not row_id:
+            return None
+        return cls(created_at=created_at, id=row_id)
+
+
+class KeysetPage(NamedTuple):
+    rows: list[dict]
+    next_token: str
+
+
+def fetch_keyset_page(query, cursor_token: str = "", page_size: int = LIBRARY_PAGE_SIZE) -> KeysetPage:
+    """Run ``query`` (already scoped with select/eq filters) for one keyset page.
+
+    Reads one row past ``page_size`` to learn whether another page exists,
+    so the cost of a page is the same at row 100 and at row 10,000.
+    """
+    cursor = KeysetCursor.from_token(cursor_token)
+    if cursor is not None:
+        # The redundant ``created_at <=`` bound is what lets the planner seek
+        # the (created_at, id) index instead of filtering from the top.
+        query = query.lte("created_at", cursor.created_at).or_(
+            f'created_at.lt."{cursor.created_at}",'
+            f'and(created_at.eq."{cursor.created_at}",id.lt."{cursor.id}")'
+        )
+    res = query.order("created_at", desc=True).order("id", desc=True).limit(int(page_size) + 1).execute()
+    rows = list(getattr(res, "data", None) or [])
+    if len(rows) <= page_size:
+        return KeysetPage(rows, "")
+    rows = rows[:page_size]
+    next_cursor = KeysetCursor.after(rows[-1])
+    return KeysetPage(rows, next_cursor.token() if next_cursor else "")
+
+
+class KeysetFeed:
+    """A library listing read one cached keyset page at a time.
+
+    ``load_page(scope, cursor_token, page_size)`` is the per-page cached
+    loader; ``scope`` is whatever the listing is filtered by (the owner id,
+    or "" for public listings).
+    """
+
+    def __init__(self, load_page: Callable[[str, str, int], KeysetPage], *, page_size: int = LIBRARY_PAGE_SIZE):
+        self.load_page = load_page
+        self.page_size = int(page_size)
+
+    def window(self, scope: str, pages: int = 1, *, page_size: int | None = None) -> tuple[list[dict], bool]:
+        """Rows of the first ``pages`` pages and whether more remain."""
+        size = int(page_size or self.page_size)
+        rows: list[dict] = []
+        token = ""
+        for _ in range(max(1, int(pages or 1))):
+            page = self.load_page(scope, token, size)
+            rows.extend(page.rows)
+            token = page.next_token
+            if not token:
+                return rows, False
+        return rows, True
+
+    def next_token(self, scope: str, pages: int = 1, *, page_size: int | None = None) -> str:
+        size = int(page_size or self.page_size)
+        token = ""
+        for _ in range(max(1, int(pages or 1))):
+            token = self.load_page(scope, token, size).next_token
+            if not token:
+                return ""
+        return token
+
+    def has_more(self, scope: str, pages: int = 1, *, page_size: int | None = None) -> bool:
+        return bool(self.next_token(scope, pages, page_size=page_size))
+
+    def prefetch(self, scope: str, pages: int = 1, *, page_size: int | None = None) -> bool:
+        """Warm the page after the first ``pages`` in the background."""
+        size = int(page_size or self.page_size)
+        token = self.next_token(scope, pages, page_size=size)
+        if not token:
+            return False
+        key = (id(self), str(scope), token, size)
+        with _PREFETCH_LOCK:
+            if key in _PREFETCH_INFLIGHT:
+                return False
+            _PREFETCH_INFLIGHT.add(key)
+
+        def _run() -> None:
+            try:
+                self.load_page(scope, token, size)
+            except Exception:
+                logger.debug("Keyset prefetch failed", exc_info=True)
+            finally:
+                with _PREFETCH_LOCK:
+                    _PREFETCH_INFLIGHT.discard(key)
+
+        _PREFETCH_EXECUTOR.submit(_run)
+        return True
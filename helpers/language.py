@@ -1,3 +1,6 @@
+import functools
+
+import pandas as pd
 import streamlit as st
 from core.i18n import t
 from core.database import load_table
@@ -61,6 +64,18 @@ def translate_modality_value(x: str) -> str:
     return str(x or "").strip()
 
 
+@functools.lru_cache(maxsize=8)
+def _modality_labels(lang: str) -> dict[str, str]:
+    return {"online": t("online", lang), "offline": t("offline", lang)}
+
+
+def translate_modality_series(values: pd.Series, lang: str | None = None) -> pd.Series:
+    """``translate_modality_value`` for a whole column, with labels memoized per language."""
+    lang = lang or st.session_state.get("ui_lang", "en")
+    text = values.fillna("").astype(str).str.strip()
+    return text.str.casefold().map(_modality_labels(lang)).fillna(text)
+
+
 def translate_language_value(x: str) -> str:
     v = str(x or "").strip()
     if v == LANG_EN:
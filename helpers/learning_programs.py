@@ -17,6 +17,7 @@ from core.database import clear_app_caches, get_sb, load_profile_row, register_c
 from core.i18n import t
 from core.state import get_current_user_id, with_owner
 from helpers.action_feedback import action_spinner
+from helpers.ai_response_cache import CACHE_HIT, CACHE_HIT_LOG_STATUS, cached_ai_generation, provider_request_rows
 from helpers.archive_utils import ARCHIVED_STATUS, DELETED_STATUS, filter_archived_rows, is_archived_status, truthy_flag
 from helpers.generation_guidance import build_expert_panel_prompt_blurb
 from helpers.native_language import NATIVE_LANGUAGE_OPTIONS, is_language_subject, native_language_label, normalize_native_language
@@ -34,6 +35,7 @@ from core.navigation import clear_open_resource_previews, clear_smart_tool_resul
 AI_PROGRAM_DAILY_LIMIT = 1
 AI_PROGRAM_COOLDOWN_SECONDS = 10
 AI_PROGRAM_LIMITS_ENABLED = False
+LEARNING_PROGRAM_PROMPT_VERSION = "1"
 
 
 def _lp():
@@ -102,6 +104,81 @@ _LEARNING_PROGRAM_LIST_COLUMNS = ",".join([
     "updated_at",
 ])
 
+_LEARNING_PROGRAM_DETAIL_COLUMNS = ",".join([
+    "id",
+    "user_id",
+    "title",
+    "slug",
+    "subject",
+    "custom_subject_name",
+    "learner_stage",
+    "level_or_band",
+    "program_language",
+    "student_material_language",
+    "program_overview",
+    "teacher_rationale",
+    "student_summary",
+    "assessment_strategy",
+    "resource_strategy",
+    "best_practice_frameworks",
+    "source_type",
+    "generation_mode",
+    "visibility",
+    "is_public",
+    "status",
+    "total_units",
+    "total_topics",
+    "builder_config",
+    "program_data",
+    "parent_program_id",
+    "sequence_group_id",
+    "sequence_order",
+    "prerequisite_summary",
+    "entry_profile",
+    "exit_profile",
+    "created_at",
+    "updated_at",
+])
+
+_LEARNING_PROGRAM_UNIT_COLUMNS = ",".join([
+    "id",
+    "program_id",
+    "unit_number",
+    "title",
+    "overview",
+    "unit_objectives",
+    "recommended_lesson_purposes",
+    "recommended_worksheet_types",
+    "recommended_exam_exercise_types",
+    "estimated_lessons",
+])
+
+_LEARNING_PROGRAM_TOPIC_COLUMNS = ",".join([
+    "id",
+    "program_id",
+    "unit_id",
+    "unit_number",
+    "topic_number",
+    "title",
+    "subtopic",
+    "lesson_focus",
+    "lesson_purpose",
+    "learning_objectives",
+    "success_criteria",
+    "student_can_do",
+    "suggested_worksheet_types",
+    "suggested_exam_exercise_types",
+    "homework_idea",
+    "teacher_notes",
+    "student_summary",
+    "estimated_lessons",
+])
+
+LEARNING_PROGRAM_VERSION_CONFLICT = "learning_program_version_conflict"
+
+# PostgREST default max-rows; reads that can exceed it page with ``.range``.
+_LEARNING_PROGRAM_PAGE_SIZE = 1000
+
 _LANGUAGE_LEVEL_ORDER = ["A1", "A2", "B1", "B2", "C1", "C2"]
 _ACADEMIC_LEVEL_ORDER = ["beginner_band", "intermediate_band", "advanced_band"]
 
@@ -1942,41 +2019,69 @@ def _run_learning_program_json_generation(
     generate_with_openai,
     log_ai_usage,
     meta: dict,
+    cache_inputs: Optional[dict] = None,
+    force_fresh: bool = False,
 ) -> tuple[dict, str, list[str]]:
-    errors: list[str] = []
-    for provider in providers:
-        try:
-            log_ai_usage(
-                request_kind="learning_program_ai_stage",
-                status="requested",
-                meta={**meta, "provider": provider},
-            )
-            raw_text = _call_learning_program_provider(
-                provider,
-                system_prompt,
-                user_prompt,
-                generate_with_gemini,
-                generate_with_openrouter,
-                generate_with_openai,
-            )
-            parsed = extract_json_object_from_text(raw_text)
-            log_ai_usage(
-                request_kind="learning_program_ai_stage",
-                status="success",
-                meta={**meta, "provider": provider},
-            )
-            return parsed, provider, errors
-        except Exception as e:
-            errors.append(f"{provider}: {e}")
+    cache_label = "bypass" if force_fresh or cache_inputs is None else "miss"
+
+    def _generate() -> dict:
+        errors: list[str] = []
+        for provider in providers:
             try:
                 log_ai_usage(
                     request_kind="learning_program_ai_stage",
-                    status="failed",
-                    meta={**meta, "provider": provider, "error": str(e)},
+                    status="requested",
+                    meta={**meta, "provider": provider},
                 )
-            except Exception:
-                pass
-    raise ValueError(" | ".join(errors) if errors else "Unknown AI generation error")
+                raw_text = _call_learning_program_provider(
+                    provider,
+                    system_prompt,
+                    user_prompt,
+                    generate_with_gemini,
+                    generate_with_openrouter,
+                    generate_with_openai,
+                )
+                parsed = extract_json_object_from_text(raw_text)
+                log_ai_usage(
+                    request_kind="learning_program_ai_stage",
+                    status="success",
+                    meta={**meta, "provider": provider, "cache": cache_label},
+                )
+                return {"parsed": parsed, "provider": provider, "errors": errors}
+            except Exception as e:
+                errors.append(f"{provider}: {e}")
+                try:
+                    log_ai_usage(
+                        request_kind="learning_program_ai_stage",
+                        status="failed",
+                        meta={**meta, "provider": provider, "error": str(e)},
+                    )
+                except Exception:
+                    pass
+        raise ValueError(" | ".join(errors) if errors else "Unknown AI generation error")
+
+    if cache_inputs is None:
+        result = _generate()
+        return result["parsed"], result["provider"], result["errors"]
+
+    result, cache_status = cached_ai_generation(
+        "learning_program_ai",
+        {**cache_inputs, "stage": meta.get("stage"), "unit_number": meta.get("unit_number")},
+        _generate,
+        template_version=LEARNING_PROGRAM_PROMPT_VERSION,
+        force_fresh=force_fresh,
+    )
+    if cache_status != CACHE_HIT:
+        return result["parsed"], result["provider"], result["errors"]
+    try:
+        log_ai_usage(
+            request_kind="learning_program_ai_stage",
+            status=CACHE_HIT_LOG_STATUS,
+            meta={**meta, "provider": result.get("provider"), "cache": cache_status, "used_ai": False},
+        )
+    except Exception:
+        pass
+    return result["parsed"], str(result.get("provider") or ""), []
 
 
 def _merge_program_unit(base_unit: dict, enriched_unit: dict, *, prefer_enriched_topics: bool = False) -> dict:
@@ -2157,6 +2262,8 @@ def generate_ai_learning_program_skeleton(
     additional_notes: str = "",
     previous_program: Optional[dict] = None,
     student_native_language: str = "",
+    *,
+    force_fresh: bool = False,
 ) -> tuple[dict, str, Optional[str], dict]:
     structure = clamp_program_structure(subject, learner_stage, requested_units, requested_lessons_per_unit)
     fallback = _fallback_program_payload(
@@ -2221,6 +2328,8 @@ def generate_ai_learning_program_skeleton(
             generate_with_openai=_generate_with_openai,
             log_ai_usage=log_ai_usage,
             meta={"subject": subject, "learner_stage": learner_stage, "level_or_band": level_or_band, "stage": "skeleton"},
+            cache_inputs={"payload": payload},
+            force_fresh=force_fresh,
         )
         parsed = normalize_learning_program_output(skeleton_raw)
         if not parsed.get("units"):
@@ -2260,6 +2369,7 @@ def generate_ai_learning_program_unit(
     additional_notes: str = "",
     previous_program: Optional[dict] = None,
     payload: Optional[dict] = None,
+    force_fresh: bool = False,
 ) -> tuple[dict, str, Optional[str]]:
     program = normalize_learning_program_output(program)
     payload = payload or _build_program_generation_payload(
@@ -2333,6 +2443,8 @@ def generate_ai_learning_program_unit(
             generate_with_openai=_generate_with_openai,
             log_ai_usage=log_ai_usage,
             meta={"subject": subject, "learner_stage": learner_stage, "level_or_band": level_or_band, "stage": "unit_enrichment", "unit_number": int(unit_number)},
+            cache_inputs={"payload": payload, "program": program, "unit": unit_context},
+            force_fresh=force_fresh,
         )
         enriched_unit = _normalize_unit_record(enriched_raw, target_idx + 1)
         merged = _merge_program_unit(target_unit, enriched_unit)
@@ -2359,6 +2471,8 @@ def generate_ai_learning_program(
     additional_notes: str = "",
     previous_program: Optional[dict] = None,
     student_native_language: str = "",
+    *,
+    force_fresh: bool = False,
 ) -> tuple[dict, str, Optional[str]]:
     structure = clamp_program_structure(subject, learner_stage, requested_units, requested_lessons_per_unit)
     fallback = _fallback_program_payload(
@@ -2441,6 +2555,8 @@ def generate_ai_learning_program(
                 "level_or_band": level_or_band,
                 "stage": "skeleton",
             },
+            cache_inputs={"payload": payload},
+            force_fresh=force_fresh,
         )
         parsed = normalize_learning_program_output(skeleton_raw)
         if not parsed.get("units"):
@@ -2487,6 +2603,8 @@ def generate_ai_learning_program(
                     "stage": "unit_enrichment",
                     "unit_number": int(unit.get("unit_number") or idx + 1),
                 },
+                cache_inputs={"payload": payload, "program": parsed, "unit": unit},
+                force_fresh=force_fresh,
             )
             partial_errors.extend(unit_errors)
             enriched_unit = _normalize_unit_record(enriched_raw, idx + 1)
@@ -2547,7 +2665,9 @@ def get_ai_learning_program_usage_status() -> dict:
     today_df = program_df[(program_df["created_at"].notna()) & (program_df["created_at"] >= today_start_utc)].copy()
     used_today = int(len(today_df))
 
-    cooldown_df = df[df["feature_name"] == "learning_program_ai"].dropna(subset=["created_at"]).sort_values("created_at")
+    cooldown_df = provider_request_rows(
+        df[df["feature_name"] == "learning_program_ai"].dropna(subset=["created_at"]).sort_values("created_at")
+    )
     cooldown_ok = True
     seconds_left = 0
     last_request_at = None
@@ -2595,6 +2715,8 @@ def _learning_program_user_error(error: str) -> str:
     lowered = text.lower()
     if "learning_program_topics_unique_order" in text or "duplicate key value violates unique constraint" in lowered or "23505" in lowered:
         return t("learning_program_update_conflict")
+    if text == LEARNING_PROGRAM_VERSION_CONFLICT:
+        return t("learning_program_version_conflict")
     return t("learning_program_update_retry_generic")
 
 
@@ -2842,6 +2964,22 @@ def save_learning_program(
         return False, None, str(e)
 
 
+def _program_row_changed(existing: dict, payload: dict) -> bool:
+    """True when any payload column differs from the stored row (missing columns count as changed)."""
+    return any(key not in existing or existing.get(key) != value for key, value in payload.items())
+
+
+def _same_program_version(left, right) -> bool:
+    def _parse(value):
+        text = str(value or "").strip()
+        try:
+            return datetime.fromisoformat(text.replace("Z", "+00:00"))
+        except ValueError:
+            return text
+
+    return _parse(left) == _parse(right)
+
+
 def update_learning_program(
     *,
     program_id: int,
@@ -2861,6 +2999,7 @@ def update_learning_program(
     sequence_group_id: str = "",
     sequence_order: Optional[int] = None,
     prerequisite_summary: str = "",
+    expected_updated_at: Optional[str] = None,
 ) -> tuple[bool, str]:
     payload, units_payload, topics_payload = _program_record_payload(
         subject=subject,
@@ -2885,25 +3024,20 @@ def update_learning_program(
     uid = str(get_current_user_id() or "").strip()
     if not uid or int(program_id or 0) <= 0:
         return False, "missing_program"
+    program_id = int(program_id)
 
     try:
         sb = get_sb()
-        sb.table("learning_programs").update(payload).eq("id", int(program_id)).eq("user_id", uid).execute()
-
-        existing_units = _rows(
-            sb.table("learning_program_units")
-            .select("id,unit_number")
-            .eq("program_id", int(program_id))
-            .order("id")
-            .execute()
-        )
-        existing_topics = _rows(
-            sb.table("learning_program_topics")
-            .select("id,unit_id,unit_number,topic_number")
-            .eq("program_id", int(program_id))
-            .order("id")
-            .execute()
-        )
+        program_row, existing_units, existing_topics = _fetch_learning_program_tree(sb, program_id)
+        if not program_row or str(program_row.get("user_id") or "").strip() != uid:
+            return False, "missing_program"
+        current_version = program_row.get("updated_at")
+        if expected_updated_at and not _same_program_version(expected_updated_at, current_version):
+            return False, LEARNING_PROGRAM_VERSION_CONFLICT
+
+        # Legacy duplicate slots resolve to the oldest row, as they always have.
+        existing_units = sorted(existing_units, key=lambda row: int(row.get("id") or 0))
+        existing_topics = sorted(existing_topics, key=lambda row: int(row.get("id") or 0))
         unit_lookup_by_number: dict[int, int] = {}
         unit_rows_by_id: dict[int, dict] = {}
         for row in existing_units:
@@ -2923,10 +3057,13 @@ def update_learning_program(
                 topic_rows_by_id[topic_id] = row
             if unit_number > 0 and topic_number > 0 and topic_id > 0:
                 topic_lookup_by_position.setdefault((unit_number, topic_number), topic_id)
+
+        # Plan every row against what is stored before writing anything, so
+        # only changed, new and removed rows reach the database.
         kept_unit_ids: set[int] = set()
         kept_topic_ids: set[int] = set()
-        unit_ids_by_number: dict[int, int] = {}
-        topic_ids_by_position: dict[tuple[int, int], int] = {}
+        unit_plans: list[tuple[int, int, dict]] = []
+        topic_plans: list[tuple[int, int, int, dict]] = []
         for unit in units_payload:
             target_unit_number = int(unit.get("unit_number") or 0)
             existing_unit_id = _resolve_existing_program_unit_id(
@@ -2936,54 +3073,18 @@ def update_learning_program(
                 unit_rows_by_id=unit_rows_by_id,
                 claimed_unit_ids=kept_unit_ids,
             )
-            unit_payload = {
-                key: value
-                for key, value in unit.items()
-                if key != "existing_unit_id"
-            }
-            unit_row = None
             if existing_unit_id > 0:
+                kept_unit_ids.add(existing_unit_id)
+            unit_plans.append(
                 (
-                    sb.table("learning_program_units")
-                    .update(
-                        {
-                            **unit_payload,
-                            "updated_at": _now_iso(),
-                        }
-                    )
-                    .eq("id", existing_unit_id)
-                    .eq("program_id", int(program_id))
-                    .execute()
+                    target_unit_number,
+                    existing_unit_id,
+                    {key: value for key, value in unit.items() if key != "existing_unit_id"},
                 )
-                unit_row = {
-                    "id": existing_unit_id,
-                    "unit_number": int(unit_payload.get("unit_number") or unit.get("unit_number") or 0),
-                }
-            unit_insert = (
-                None
-                if unit_row is not None
-                else sb.table("learning_program_units")
-                .insert(
-                    {
-                        "program_id": int(program_id),
-                        **unit_payload,
-                        "created_at": _now_iso(),
-                        "updated_at": _now_iso(),
-                    }
-                )
-                .execute()
             )
-            if unit_row is None:
-                unit_rows = _rows(unit_insert)
-                if not unit_rows:
+            for topic in topics_payload:
+                if int(topic["unit_number"]) != target_unit_number:
                     continue
-                unit_row = unit_rows[0]
-            unit_id = int(unit_row["id"])
-            unit_number = int(unit_row["unit_number"])
-            kept_unit_ids.add(unit_id)
-            unit_ids_by_number[unit_number] = unit_id
-            unit_topics = [topic for topic in topics_payload if int(topic["unit_number"]) == unit_number]
-            for topic in unit_topics:
                 target_topic_number = int(topic.get("topic_number") or 0)
                 existing_topic_id = int(topic.get("existing_topic_id") or 0)
                 if existing_topic_id > 0:
@@ -3004,62 +3105,113 @@ def update_learning_program(
                     )
                     if existing_topic_id in kept_topic_ids:
                         existing_topic_id = 0
-                topic_payload = {
-                    key: value
-                    for key, value in topic.items()
-                    if key not in {"existing_topic_id", "existing_unit_id"}
-                }
                 if existing_topic_id > 0:
-                    sb.table("learning_program_topics").update(
-                        {
-                            **topic_payload,
-                            "unit_id": unit_id,
-                            "program_id": int(program_id),
-                            "updated_at": _now_iso(),
-                        }
-                    ).eq("id", existing_topic_id).eq("program_id", int(program_id)).execute()
                     kept_topic_ids.add(existing_topic_id)
-                    topic_ids_by_position[(target_unit_number, target_topic_number)] = existing_topic_id
-                else:
-                    inserted_topic = (
-                        sb.table("learning_program_topics")
-                        .insert(
-                            {
-                                "program_id": int(program_id),
-                                "unit_id": unit_id,
-                                **topic_payload,
-                                "created_at": _now_iso(),
-                                "updated_at": _now_iso(),
-                            }
-                        )
-                        .execute()
+                topic_plans.append(
+                    (
+                        target_unit_number,
+                        target_topic_number,
+                        existing_topic_id,
+                        {
+                            key: value
+                            for key, value in topic.items()
+                            if key not in {"existing_topic_id", "existing_unit_id"}
+                        },
                     )
-                    inserted_topic_rows = _rows(inserted_topic)
-                    if inserted_topic_rows:
-                        inserted_topic_id = int(inserted_topic_rows[0].get("id") or 0)
-                        kept_topic_ids.add(inserted_topic_id)
-                        topic_ids_by_position[(target_unit_number, target_topic_number)] = inserted_topic_id
-
-        for topic_row in existing_topics:
-            topic_id = int(topic_row.get("id") or 0)
-            if topic_id > 0 and topic_id not in kept_topic_ids:
-                sb.table("learning_program_topics").delete().eq("id", topic_id).eq("program_id", int(program_id)).execute()
-        for unit_row in existing_units:
-            unit_id = int(unit_row.get("id") or 0)
-            if unit_id > 0 and unit_id not in kept_unit_ids:
-                sb.table("learning_program_units").delete().eq("id", unit_id).eq("program_id", int(program_id)).execute()
+                )
 
-        canonical_program = _canonicalize_program_identifiers(
-            program_payload,
-            unit_ids_by_number=unit_ids_by_number,
-            topic_ids_by_position=topic_ids_by_position,
+        unit_ids_by_number: dict[int, int] = {
+            unit_number: unit_id for unit_number, unit_id, _unit_payload in unit_plans if unit_id > 0
+        }
+        topic_ids_by_position: dict[tuple[int, int], int] = {
+            (unit_number, topic_number): topic_id
+            for unit_number, topic_number, topic_id, _topic_payload in topic_plans
+            if topic_id > 0
+        }
+        has_inserts = any(unit_id <= 0 for _number, unit_id, _payload in unit_plans) or any(
+            topic_id <= 0 for _unit, _topic, topic_id, _payload in topic_plans
         )
-        sb.table("learning_programs").update(
-            {
-                "program_data": canonical_program,
-                "updated_at": _now_iso(),
-            }
-        ).eq("id", int(program_id)).eq("user_id", uid).execute()
+
+        # Claim the version first: a concurrent save that got here earlier
+        # has moved updated_at and this write matches no row.
+        if not has_inserts:
+            payload["program_data"] = _canonicalize_program_identifiers(
+                program_payload,
+                unit_ids_by_number=unit_ids_by_number,
+                topic_ids_by_position=topic_ids_by_position,
+            )
+        program_update = sb.table("learning_programs").update(payload).eq("id", program_id).eq("user_id", uid)
+        if current_version:
+            program_update = program_update.eq("updated_at", current_version)
+        if not _rows(program_update.execute()):
+            return False, LEARNING_PROGRAM_VERSION_CONFLICT
+
+        now = _now_iso()
+        changed_units = [
+            {"id": unit_id, "program_id": program_id, **unit_payload, "updated_at": now}
+            for _number, unit_id, unit_payload in unit_plans
+            if unit_id > 0 and _program_row_changed(unit_rows_by_id.get(unit_id) or {}, unit_payload)
+        ]
+        if changed_units:
+            sb.table("learning_program_units").upsert(changed_units, on_conflict="id").execute()
+        new_units = [
+            {"program_id": program_id, **unit_payload, "created_at": now, "updated_at": now}
+            for _number, unit_id, unit_payload in unit_plans
+            if unit_id <= 0
+        ]
+        if new_units:
+            for row in _rows(sb.table("learning_program_units").insert(new_units).execute()):
+                if int(row.get("id") or 0) > 0:
+                    unit_ids_by_number[int(row.get("unit_number") or 0)] = int(row["id"])
+                    kept_unit_ids.add(int(row["id"]))
+
+        changed_topics: list[dict] = []
+        new_topics: list[dict] = []
+        for unit_number, _topic_number, topic_id, topic_payload in topic_plans:
+            unit_id = unit_ids_by_number.get(unit_number)
+            if not unit_id:
+                continue
+            topic_row = {**topic_payload, "unit_id": unit_id, "program_id": program_id}
+            if topic_id <= 0:
+                new_topics.append({**topic_row, "created_at": now, "updated_at": now})
+            elif _program_row_changed(topic_rows_by_id.get(topic_id) or {}, topic_row):
+                changed_topics.append({"id": topic_id, **topic_row, "updated_at": now})
+        if changed_topics:
+            sb.table("learning_program_topics").upsert(changed_topics, on_conflict="id").execute()
+        if new_topics:
+            for row in _rows(sb.table("learning_program_topics").insert(new_topics).execute()):
+                topic_id = int(row.get("id") or 0)
+                if topic_id > 0:
+                    kept_topic_ids.add(topic_id)
+                    topic_ids_by_position[(int(row.get("unit_number") or 0), int(row.get("topic_number") or 0))] = topic_id
+
+        removed_topic_ids = [
+            int(row.get("id") or 0)
+            for row in existing_topics
+            if int(row.get("id") or 0) > 0 and int(row.get("id") or 0) not in kept_topic_ids
+        ]
+        if removed_topic_ids:
+            sb.table("learning_program_topics").delete().in_("id", removed_topic_ids).eq("program_id", program_id).execute()
+        removed_unit_ids = [
+            int(row.get("id") or 0)
+            for row in existing_units
+            if int(row.get("id") or 0) > 0 and int(row.get("id") or 0) not in kept_unit_ids
+        ]
+        if removed_unit_ids:
+            sb.table("learning_program_units").delete().in_("id", removed_unit_ids).eq("program_id", program_id).execute()
+
+        if has_inserts:
+            canonical_program = _canonicalize_program_identifiers(
+                program_payload,
+                unit_ids_by_number=unit_ids_by_number,
+                topic_ids_by_position=topic_ids_by_position,
+            )
+            sb.table("learning_programs").update(
+                {
+                    "program_data": canonical_program,
+                    "updated_at": _now_iso(),
+                }
+            ).eq("id", program_id).eq("user_id", uid).execute()
 
         clear_app_caches()
         return True, "updated"
@@ -3344,126 +3496,266 @@ def load_progression_candidates(subject: str, learner_stage: str, custom_subject
     return out.reset_index(drop=True)
 
 
-@st.cache_data(ttl=120, show_spinner=False)
-def load_learning_program(program_id: int) -> dict:
-    try:
-        sb = get_sb()
-        program_rows = _rows(sb.table("learning_programs").select("*").eq("id", int(program_id)).limit(1).execute())
-        if not program_rows:
-            return {}
-        program_row = program_rows[0]
+def _fetch_learning_program_tree(sb, program_id: int) -> tuple[dict, list[dict], list[dict]]:
+    """Program row with its unit and topic rows, ordered by position.
 
-        unit_rows = _rows(
-            sb.table("learning_program_units")
-            .select("*")
-            .eq("program_id", int(program_id))
-            .order("unit_number")
-            .execute()
-        )
-        topic_rows = _rows(
-            sb.table("learning_program_topics")
-            .select("*")
-            .eq("program_id", int(program_id))
-            .order("unit_number")
-            .order("topic_number")
+    One nested select when PostgREST can embed both child tables; otherwise
+    (e.g. a database that has not run every column migration yet) the three
+    flat ``select *`` queries.
+    """
+    try:
+        nested_rows = _rows(
+            sb.table("learning_programs")
+            .select(
+                f"{_LEARNING_PROGRAM_DETAIL_COLUMNS},"
+                f"units:learning_program_units({_LEARNING_PROGRAM_UNIT_COLUMNS}),"
+                f"topics:learning_program_topics({_LEARNING_PROGRAM_TOPIC_COLUMNS})"
+            )
+            .eq("id", int(program_id))
+            .limit(1)
             .execute()
         )
+    except Exception:
+        nested_rows = None
+    if nested_rows is not None:
+        if not nested_rows:
+            return {}, [], []
+        program_row = dict(nested_rows[0])
+        unit_rows = program_row.pop("units", None)
+        topic_rows = program_row.pop("topics", None)
+        if isinstance(unit_rows, list) and isinstance(topic_rows, list):
+            unit_rows = sorted(unit_rows, key=lambda row: int(row.get("unit_number") or 0))
+            topic_rows = sorted(
+                topic_rows,
+                key=lambda row: (int(row.get("unit_number") or 0), int(row.get("topic_number") or 0)),
+            )
+            return program_row, unit_rows, topic_rows
 
-        topics_by_unit_position: dict[tuple[int, int], list[dict]] = {}
-        for topic in topic_rows:
-            unit_id = int(topic.get("unit_id") or 0)
-            topic_unit_number = int(topic.get("unit_number") or 0)
-            unit_topics = topics_by_unit_position.setdefault(
-                (unit_id, topic_unit_number),
-                [],
+    program_rows = _rows(sb.table("learning_programs").select("*").eq("id", int(program_id)).limit(1).execute())
+    if not program_rows:
+        return {}, [], []
+    unit_rows = _rows(
+        sb.table("learning_program_units")
+        .select("*")
+        .eq("program_id", int(program_id))
+        .order("unit_number")
+        .execute()
+    )
+    topic_rows = _rows(
+        sb.table("learning_program_topics")
+        .select("*")
+        .eq("program_id", int(program_id))
+        .order("unit_number")
+        .order("topic_number")
+        .execute()
+    )
+    return program_rows[0], unit_rows, topic_rows
+
+
+def _paged_rows(build_query) -> list[dict]:
+    """All rows of ``build_query()``, read in ``.range`` pages.
+
+    PostgREST caps every response at ``_LEARNING_PROGRAM_PAGE_SIZE`` rows, so
+    an unpaged ``in`` filter over many parents would be truncated silently.
+    ``build_query`` must return a fresh, stably ordered query on each call.
+    """
+    rows: list[dict] = []
+    offset = 0
+    while True:
+        batch = _rows(build_query().range(offset, offset + _LEARNING_PROGRAM_PAGE_SIZE - 1).execute())
+        rows.extend(batch)
+        if len(batch) < _LEARNING_PROGRAM_PAGE_SIZE:
+            return rows
+        offset += _LEARNING_PROGRAM_PAGE_SIZE
+
+
+def _fetch_learning_program_trees(sb, program_ids: list[int]) -> dict[int, tuple[dict, list[dict], list[dict]]]:
+    """``_fetch_learning_program_tree`` for many programs in one nested select.
+
+    Falls back to one flat, paged query per table (filtered with ``in``) when the
+    embed is unavailable, so the round trips never scale with the number of
+    programs.
+    """
+    ids = sorted({int(program_id) for program_id in program_ids if int(program_id or 0) > 0})
+    if not ids:
+        return {}
+    try:
+        nested_rows = _rows(
+            sb.table("learning_programs")
+            .select(
+                f"{_LEARNING_PROGRAM_DETAIL_COLUMNS},"
+                f"units:learning_program_units({_LEARNING_PROGRAM_UNIT_COLUMNS}),"
+                f"topics:learning_program_topics({_LEARNING_PROGRAM_TOPIC_COLUMNS})"
             )
-            unit_topics.append(
-                {
-                    "topic_number": len(unit_topics) + 1,
-                    "unit_number": topic_unit_number or 1,
-                    "unit_id": unit_id,
-                    "title": _clean_display_text(topic.get("title")),
-                    "subtopic": _clean_display_text(topic.get("subtopic")),
-                    "lesson_focus": _clean_display_text(topic.get("lesson_focus") or topic.get("title")),
-                    "lesson_purpose": _clean_text(topic.get("lesson_purpose")),
-                    "learning_objectives": topic.get("learning_objectives") or [],
-                    "success_criteria": topic.get("success_criteria") or [],
-                    "student_can_do": topic.get("student_can_do") or [],
-                    "suggested_worksheet_types": topic.get("suggested_worksheet_types") or [],
-                    "suggested_exam_exercise_types": topic.get("suggested_exam_exercise_types") or [],
-                    "homework_idea": _clean_text(topic.get("homework_idea")),
-                    "teacher_notes": _clean_text(topic.get("teacher_notes")),
-                    "student_summary": _clean_text(topic.get("student_summary")),
-                    "estimated_lessons": int(topic.get("estimated_lessons") or 1),
-                    "topic_id": int(topic.get("id") or 0),
-                }
+            .in_("id", ids)
+            .execute()
+        )
+    except Exception:
+        nested_rows = None
+    if nested_rows is not None and all(
+        isinstance(row.get("units"), list) and isinstance(row.get("topics"), list) for row in nested_rows
+    ):
+        trees: dict[int, tuple[dict, list[dict], list[dict]]] = {}
+        for row in nested_rows:
+            program_row = dict(row)
+            unit_rows = program_row.pop("units")
+            topic_rows = program_row.pop("topics")
+            trees[int(program_row.get("id") or 0)] = (
+                program_row,
+                sorted(unit_rows, key=lambda unit: int(unit.get("unit_number") or 0)),
+                sorted(
+                    topic_rows,
+                    key=lambda topic: (int(topic.get("unit_number") or 0), int(topic.get("topic_number") or 0)),
+                ),
             )
+        return trees
+
+    program_rows = _rows(sb.table("learning_programs").select("*").in_("id", ids).execute())
+    if not program_rows:
+        return {}
+    unit_rows = _paged_rows(
+        lambda: sb.table("learning_program_units")
+        .select("*")
+        .in_("program_id", ids)
+        .order("program_id")
+        .order("unit_number")
+        .order("id")
+    )
+    topic_rows = _paged_rows(
+        lambda: sb.table("learning_program_topics")
+        .select("*")
+        .in_("program_id", ids)
+        .order("program_id")
+        .order("unit_number")
+        .order("topic_number")
+        .order("id")
+    )
+    units_by_program: dict[int, list[dict]] = {}
+    for unit in sorted(unit_rows, key=lambda row: int(row.get("unit_number") or 0)):
+        units_by_program.setdefault(int(unit.get("program_id") or 0), []).append(unit)
+    topics_by_program: dict[int, list[dict]] = {}
+    for topic in sorted(
+        topic_rows,
+        key=lambda row: (int(row.get("unit_number") or 0), int(row.get("topic_number") or 0)),
+    ):
+        topics_by_program.setdefault(int(topic.get("program_id") or 0), []).append(topic)
+    return {
+        int(row.get("id") or 0): (
+            row,
+            units_by_program.get(int(row.get("id") or 0), []),
+            topics_by_program.get(int(row.get("id") or 0), []),
+        )
+        for row in program_rows
+    }
 
-        units = []
-        for unit in unit_rows:
-            unit_id = int(unit.get("id") or 0)
-            unit_number = int(unit.get("unit_number") or 1)
-            units.append(
-                {
-                    "unit_number": unit_number,
-                    "title": _clean_display_text(unit.get("title")),
-                    "overview": _clean_text(unit.get("overview")),
-                    "unit_objectives": unit.get("unit_objectives") or [],
-                    "recommended_lesson_purposes": unit.get("recommended_lesson_purposes") or [],
-                    "recommended_worksheet_types": unit.get("recommended_worksheet_types") or [],
-                    "recommended_exam_exercise_types": unit.get("recommended_exam_exercise_types") or [],
-                    "estimated_lessons": int(unit.get("estimated_lessons") or 1),
-                    "unit_id": unit_id,
-                    # Both foreign-key identity and the denormalized unit
-                    # position must agree. Legacy rows can otherwise attach
-                    # Unit 1 topics to a reused Unit 7 row.
-                    "topics": topics_by_unit_position.get(
-                        (unit_id, unit_number),
-                        [],
-                    ),
-                }
-            )
 
-        program_data = normalize_learning_program_output(
-            program_row.get("program_data") if isinstance(program_row.get("program_data"), dict) else {}
+def _assemble_learning_program(program_row: dict, unit_rows: list[dict], topic_rows: list[dict]) -> dict:
+    """Build the loaded program dict from its row and ordered unit/topic rows."""
+    topics_by_unit_position: dict[tuple[int, int], list[dict]] = {}
+    for topic in topic_rows:
+        unit_id = int(topic.get("unit_id") or 0)
+        topic_unit_number = int(topic.get("unit_number") or 0)
+        unit_topics = topics_by_unit_position.setdefault(
+            (unit_id, topic_unit_number),
+            [],
         )
-        loaded_program = {
-            **program_row,
-            "cover_image": program_row.get("cover_image") or program_data.get("cover_image") or {},
-            "subject_display": _subject_display(program_row.get("subject"), program_row.get("custom_subject_name")),
-            "tagline": _program_tagline(
-                program_row.get("subject"),
-                program_row.get("learner_stage"),
-                program_row.get("level_or_band"),
-                program_row.get("custom_subject_name"),
-            ),
-            "units": units,
-        }
-        if _count_ready_program_units(program_data) > 0:
-            db_units_by_number = {
-                int(unit.get("unit_number") or 0): unit
-                for unit in units
-                if int(unit.get("unit_number") or 0) > 0
+        unit_topics.append(
+            {
+                "topic_number": len(unit_topics) + 1,
+                "unit_number": topic_unit_number or 1,
+                "unit_id": unit_id,
+                "title": _clean_display_text(topic.get("title")),
+                "subtopic": _clean_display_text(topic.get("subtopic")),
+                "lesson_focus": _clean_display_text(topic.get("lesson_focus") or topic.get("title")),
+                "lesson_purpose": _clean_text(topic.get("lesson_purpose")),
+                "learning_objectives": topic.get("learning_objectives") or [],
+                "success_criteria": topic.get("success_criteria") or [],
+                "student_can_do": topic.get("student_can_do") or [],
+                "suggested_worksheet_types": topic.get("suggested_worksheet_types") or [],
+                "suggested_exam_exercise_types": topic.get("suggested_exam_exercise_types") or [],
+                "homework_idea": _clean_text(topic.get("homework_idea")),
+                "teacher_notes": _clean_text(topic.get("teacher_notes")),
+                "student_summary": _clean_text(topic.get("student_summary")),
+                "estimated_lessons": int(topic.get("estimated_lessons") or 1),
+                "topic_id": int(topic.get("id") or 0),
             }
-            merged_units = []
-            seen_unit_numbers: set[int] = set()
-            for program_data_unit in program_data.get("units") or []:
-                unit_number = int(program_data_unit.get("unit_number") or 0)
-                seen_unit_numbers.add(unit_number)
-                base_unit = db_units_by_number.get(unit_number, program_data_unit)
-                merged_units.append(
-                    _merge_program_unit(
-                        base_unit,
-                        program_data_unit,
-                        prefer_enriched_topics=True,
-                    )
+        )
+
+    units = []
+    for unit in unit_rows:
+        unit_id = int(unit.get("id") or 0)
+        unit_number = int(unit.get("unit_number") or 1)
+        units.append(
+            {
+                "unit_number": unit_number,
+                "title": _clean_display_text(unit.get("title")),
+                "overview": _clean_text(unit.get("overview")),
+                "unit_objectives": unit.get("unit_objectives") or [],
+                "recommended_lesson_purposes": unit.get("recommended_lesson_purposes") or [],
+                "recommended_worksheet_types": unit.get("recommended_worksheet_types") or [],
+                "recommended_exam_exercise_types": unit.get("recommended_exam_exercise_types") or [],
+                "estimated_lessons": int(unit.get("estimated_lessons") or 1),
+                "unit_id": unit_id,
+                # Both foreign-key identity and the denormalized unit
+                # position must agree. Legacy rows can otherwise attach
+                # Unit 1 topics to a reused Unit 7 row.
+                "topics": topics_by_unit_position.get(
+                    (unit_id, unit_number),
+                    [],
+                ),
+            }
+        )
+
+    program_data = normalize_learning_program_output(
+        program_row.get("program_data") if isinstance(program_row.get("program_data"), dict) else {}
+    )
+    loaded_program = {
+        **program_row,
+        "cover_image": program_row.get("cover_image") or program_data.get("cover_image") or {},
+        "subject_display": _subject_display(program_row.get("subject"), program_row.get("custom_subject_name")),
+        "tagline": _program_tagline(
+            program_row.get("subject"),
+            program_row.get("learner_stage"),
+            program_row.get("level_or_band"),
+            program_row.get("custom_subject_name"),
+        ),
+        "units": units,
+    }
+    if _count_ready_program_units(program_data) > 0:
+        db_units_by_number = {
+            int(unit.get("unit_number") or 0): unit
+            for unit in units
+            if int(unit.get("unit_number") or 0) > 0
+        }
+        merged_units = []
+        seen_unit_numbers: set[int] = set()
+        for program_data_unit in program_data.get("units") or []:
+            unit_number = int(program_data_unit.get("unit_number") or 0)
+            seen_unit_numbers.add(unit_number)
+            base_unit = db_units_by_number.get(unit_number, program_data_unit)
+            merged_units.append(
+                _merge_program_unit(
+                    base_unit,
+                    program_data_unit,
+                    prefer_enriched_topics=True,
                 )
-            for unit in units:
-                unit_number = int(unit.get("unit_number") or 0)
-                if unit_number > 0 and unit_number not in seen_unit_numbers:
-                    merged_units.append(unit)
-            loaded_program["units"] = merged_units
-        return _sanitize_loaded_program_identifiers(loaded_program)
+            )
+        for unit in units:
+            unit_number = int(unit.get("unit_number") or 0)
+            if unit_number > 0 and unit_number not in seen_unit_numbers:
+                merged_units.append(unit)
+        loaded_program["units"] = merged_units
+    return _sanitize_loaded_program_identifiers(loaded_program)
+
+
+@st.cache_data(ttl=120, show_spinner=False)
+def load_learning_program(program_id: int) -> dict:
+    try:
+        sb = get_sb()
+        program_row, unit_rows, topic_rows = _fetch_learning_program_tree(sb, int(program_id))
+        if not program_row:
+            return {}
+        return _assemble_learning_program(program_row, unit_rows, topic_rows)
     except Exception as exc:
         show_data_load_error(exc)
         return {}
@@ -3472,6 +3764,36 @@ def load_learning_program(program_id: int) -> dict:
 register_cache(load_learning_program, "learning_programs", "resources")
 
 
+@st.cache_data(ttl=120, show_spinner=False)
+def _load_learning_programs_cached(program_ids: tuple[int, ...]) -> dict[int, dict]:
+    try:
+        trees = _fetch_learning_program_trees(get_sb(), list(program_ids))
+    except Exception as exc:
+        show_data_load_error(exc)
+        return {}
+    programs: dict[int, dict] = {}
+    for program_id, (program_row, unit_rows, topic_rows) in trees.items():
+        try:
+            programs[program_id] = _assemble_learning_program(program_row, unit_rows, topic_rows)
+        except Exception as exc:
+            show_data_load_error(exc)
+    return programs
+
+
+register_cache(_load_learning_programs_cached, "learning_programs", "resources")
+
+
+def load_learning_programs(program_ids) -> dict[int, dict]:
+    """Programs keyed by id, each shaped exactly like ``load_learning_program``.
+
+    Missing or unreadable programs are simply absent from the result.
+    """
+    ids = tuple(sorted({int(program_id or 0) for program_id in program_ids or []} - {0}))
+    if not ids:
+        return {}
+    return _load_learning_programs_cached(ids)
+
+
 def assign_learning_program(
     *,
     program_id: int,
@@ -3838,6 +4160,38 @@ def load_assignment_progress_map(assignment_id: int) -> dict[int, dict]:
 register_cache(load_assignment_progress_map, "learning_programs", "assignments", "practice")
 
 
+@st.cache_data(ttl=45, show_spinner=False)
+def _load_assignment_progress_maps_cached(assignment_ids: tuple[int, ...]) -> dict[int, dict[int, dict]]:
+    try:
+        sb = get_sb()
+        rows = _paged_rows(
+            lambda: sb.table("learning_program_progress")
+            .select("*")
+            .in_("assignment_id", list(assignment_ids))
+            .order("assignment_id")
+            .order("topic_id")
+        )
+    except Exception:
+        return {}
+    progress_maps: dict[int, dict[int, dict]] = {assignment_id: {} for assignment_id in assignment_ids}
+    for row in rows:
+        assignment_id = int(row.get("assignment_id") or 0)
+        if assignment_id in progress_maps:
+            progress_maps[assignment_id][int(row.get("topic_id") or 0)] = row
+    return progress_maps
+
+
+register_cache(_load_assignment_progress_maps_cached, "learning_programs", "assignments", "practice")
+
+
+def load_assignment_progress_maps(assignment_ids) -> dict[int, dict[int, dict]]:
+    """``load_assignment_progress_map`` for many assignments in one paged query."""
+    ids = tuple(sorted({int(assignment_id or 0) for assignment_id in assignment_ids or []} - {0}))
+    if not ids:
+        return {}
+    return _load_assignment_progress_maps_cached(ids)
+
+
 def set_assignment_topic_progress(
     *,
     assignment_id: int,
@@ -4841,6 +5195,7 @@ def _render_learning_program_unit_editor(
                     sequence_group_id=saved_program_meta.get("sequence_group_id") or "",
                     sequence_order=saved_program_meta.get("sequence_order"),
                     prerequisite_summary=saved_program_meta.get("prerequisite_summary") or "",
+                    expected_updated_at=saved_program_meta.get("updated_at"),
                 )
                 if ok:
                     st.success(t("unit_changes_saved"))
@@ -4882,6 +5237,7 @@ def _render_learning_program_unit_editor(
                             additional_notes=t("unit_refine_prompt_wrapped", prompt=refine_prompt),
                             previous_program=load_learning_program(int((saved_program_meta or {}).get("parent_program_id") or 0)) if int((saved_program_meta or {}).get("parent_program_id") or 0) > 0 else None,
                             payload=None,
+                            force_fresh=True,
                         )
                         status.update(label=t("learning_program_loading_ready"), state="complete")
                 if saved_program_id and saved_program_meta:
@@ -4903,6 +5259,7 @@ def _render_learning_program_unit_editor(
                         sequence_group_id=saved_program_meta.get("sequence_group_id") or "",
                         sequence_order=saved_program_meta.get("sequence_order"),
                         prerequisite_summary=saved_program_meta.get("prerequisite_summary") or "",
+                        expected_updated_at=saved_program_meta.get("updated_at"),
                     )
                     if ok:
                         if warning:
@@ -5160,6 +5517,7 @@ def render_saved_learning_program_workspace(program: dict, program_id: int, *, n
             sequence_group_id=original_program.get("sequence_group_id") or "",
             sequence_order=original_program.get("sequence_order"),
             prerequisite_summary=original_program.get("prerequisite_summary") or "",
+            expected_updated_at=original_program.get("updated_at"),
         )
         st.session_state.pop(pending_unit_key, None)
         if ok:
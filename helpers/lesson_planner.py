@@ -3,13 +3,19 @@
 import json
 import os
 import re
-from typing import Optional
+from typing import Callable, Optional, TypeVar
 
 import streamlit as st
 from openai import OpenAI
 
 from core.i18n import t
-from helpers.ai_retry import run_with_ai_retries
+from helpers.ai_response_cache import CACHE_HIT, CACHE_HIT_LOG_STATUS, cached_ai_generation
+from helpers.ai_clients import (
+    call_ai_provider,
+    get_ai_hedge_delay_seconds,
+    get_pooled_ai_client,
+    run_provider_chain,
+)
 from helpers.generation_guidance import (
     build_expert_panel_prompt_blurb,
     build_generation_profile_guidance,
@@ -62,6 +68,12 @@ LESSON_PURPOSES = [
 
 AI_DAILY_LIMIT = 3
 AI_COOLDOWN_SECONDS = 10
+_OPENROUTER_BASE_URL = "https://openrouter.ai/api/v1"
+# Bump when the lesson plan prompt or its post-processing changes so cached
+# AI generations from the previous template are no longer reused.
+LESSON_PLAN_PROMPT_VERSION = "1"
+
+_T = TypeVar("_T")
 
 # ============================================================
 # Core helpers
@@ -2251,7 +2263,12 @@ def _generate_with_openrouter(system_prompt: str, user_prompt: str) -> str:
         raise RuntimeError(t("missing_openrouter_api_key"))
 
     def _request() -> str:
-        client = OpenAI(api_key=api_key, base_url="https://openrouter.ai/api/v1")
+        client = get_pooled_ai_client(
+            "openrouter",
+            api_key,
+            lambda: OpenAI(api_key=api_key, base_url=_OPENROUTER_BASE_URL),
+            base_url=_OPENROUTER_BASE_URL,
+        )
         response = client.chat.completions.create(
             model=get_ai_model_for_provider("openrouter"),
             messages=[
@@ -2265,7 +2282,7 @@ def _generate_with_openrouter(system_prompt: str, user_prompt: str) -> str:
             raise ValueError(t("empty_ai_response"))
         return raw_text
 
-    return run_with_ai_retries(_request)
+    return call_ai_provider("openrouter", _request)
 
 
 def _generate_with_gemini(system_prompt: str, user_prompt: str) -> str:
@@ -2284,7 +2301,7 @@ def _generate_with_gemini(system_prompt: str, user_prompt: str) -> str:
         raise RuntimeError(t("missing_gemini_api_key"))
 
     def _request() -> str:
-        client = genai.Client(api_key=api_key)
+        client = get_pooled_ai_client("gemini", api_key, lambda: genai.Client(api_key=api_key))
         response = client.models.generate_content(
             model=get_ai_model_for_provider("gemini"),
             contents=f"{system_prompt}\n\n{user_prompt}",
@@ -2294,7 +2311,7 @@ def _generate_with_gemini(system_prompt: str, user_prompt: str) -> str:
             raise ValueError(t("empty_gemini_response"))
         return raw_text
 
-    return run_with_ai_retries(_request)
+    return call_ai_provider("gemini", _request)
 
 
 def _generate_with_openai(system_prompt: str, user_prompt: str) -> str:
@@ -2311,7 +2328,7 @@ def _generate_with_openai(system_prompt: str, user_prompt: str) -> str:
         raise RuntimeError(t("missing_openai_api_key"))
 
     def _request() -> str:
-        client = OpenAI(api_key=api_key)
+        client = get_pooled_ai_client("openai", api_key, lambda: OpenAI(api_key=api_key))
         response = client.chat.completions.create(
             model=get_ai_model_for_provider("openai"),
             messages=[
@@ -2325,7 +2342,36 @@ def _generate_with_openai(system_prompt: str, user_prompt: str) -> str:
             raise ValueError(t("empty_ai_response"))
         return raw_text
 
-    return run_with_ai_retries(_request)
+    return call_ai_provider("openai", _request)
+
+
+def _generate_with_provider(provider: str, system_prompt: str, user_prompt: str) -> str:
+    if provider == "gemini":
+        return _generate_with_gemini(system_prompt, user_prompt)
+    if provider == "openrouter":
+        return _generate_with_openrouter(system_prompt, user_prompt)
+    return _generate_with_openai(system_prompt, user_prompt)
+
+
+def run_ai_provider_chain(
+    system_prompt: str,
+    user_prompt: str,
+    parse: Callable[[str, str], _T],
+) -> _T:
+    """Generate with the product provider chain and return the first valid parse.
+
+    ``parse(raw_text, provider)`` must raise when the output is unusable so the
+    chain moves on. When ``AI_HEDGE_ENABLED`` is set, a slow first provider is
+    hedged with the next one after its observed latency percentile.
+    """
+    provider_order = get_ai_provider_order()
+    hedge_delay = get_ai_hedge_delay_seconds(provider_order[0]) if provider_order else None
+    result, _provider, _errors = run_provider_chain(
+        provider_order,
+        lambda p: parse(_generate_with_provider(p, system_prompt, user_prompt), p),
+        hedge_delay_seconds=hedge_delay,
+    )
+    return result
 
 
 def generate_ai_lesson_plan(
@@ -2337,6 +2383,8 @@ def generate_ai_lesson_plan(
     plan_language: str,
     student_material_language: str,
     student_profile: dict | None = None,
+    *,
+    force_fresh: bool = False,
 ) -> dict:
     prompt_payload = {
         "subject": subject,
@@ -2371,36 +2419,36 @@ def generate_ai_lesson_plan(
         "student_profile": student_profile or {},
     }
 
-    system_prompt, user_prompt = _build_ai_prompts(prompt_payload)
-    provider_order = get_ai_provider_order()
-    errors = []
+    def _parse(raw_text: str, p: str) -> dict:
+        parsed = _extract_json_object_from_text(raw_text)
+        normalized = _sanitize_generated_lesson_plan(parsed, subject)
+        quality_issues = _lesson_plan_quality_issues(
+            normalized,
+            subject=subject,
+            learner_stage=learner_stage,
+            level_or_band=level_or_band,
+            lesson_purpose=lesson_purpose,
+        )
+        if quality_issues:
+            raise ValueError("; ".join(quality_issues))
+        if isinstance(normalized, dict):
+            normalized["_ai_provider"] = p
+        return normalized
 
-    for p in provider_order:
-        try:
-            if p == "gemini":
-                raw_text = _generate_with_gemini(system_prompt, user_prompt)
-            elif p == "openrouter":
-                raw_text = _generate_with_openrouter(system_prompt, user_prompt)
-            else:
-                raw_text = _generate_with_openai(system_prompt, user_prompt)
-            parsed = _extract_json_object_from_text(raw_text)
-            normalized = _sanitize_generated_lesson_plan(parsed, subject)
-            quality_issues = _lesson_plan_quality_issues(
-                normalized,
-                subject=subject,
-                learner_stage=learner_stage,
-                level_or_band=level_or_band,
-                lesson_purpose=lesson_purpose,
-            )
-            if quality_issues:
-                raise ValueError("; ".join(quality_issues))
-            if isinstance(normalized, dict):
-                normalized["_ai_provider"] = p
-            return normalized
-        except Exception as e:
-            errors.append(f"{p}: {e}")
+    def _generate() -> dict:
+        system_prompt, user_prompt = _build_ai_prompts(prompt_payload)
+        return run_ai_provider_chain(system_prompt, user_prompt, _parse)
 
-    raise RuntimeError(" | ".join(errors))
+    plan, cache_status = cached_ai_generation(
+        "quick_lesson_ai",
+        prompt_payload,
+        _generate,
+        template_version=LESSON_PLAN_PROMPT_VERSION,
+        force_fresh=force_fresh,
+    )
+    if isinstance(plan, dict):
+        plan["_ai_cache"] = cache_status
+    return plan
 
 
 def generate_quick_lesson_plan_with_fallback(
@@ -2411,6 +2459,8 @@ def generate_quick_lesson_plan_with_fallback(
     lesson_purpose: str,
     topic: str,
     student_profile: dict | None = None,
+    *,
+    force_fresh: bool = False,
 ) -> tuple[dict, str, Optional[str]]:
     template_plan = normalize_planner_output(
         build_quick_lesson_plan(
@@ -2474,15 +2524,18 @@ def generate_quick_lesson_plan_with_fallback(
             plan_language=get_plan_language(),
             student_material_language=get_student_material_language(subject),
             student_profile=student_profile or {},
+            force_fresh=force_fresh,
         )
         provider = str(ai_plan.pop("_ai_provider", "") or "") if isinstance(ai_plan, dict) else ""
+        cache_status = str(ai_plan.pop("_ai_cache", "") or "") if isinstance(ai_plan, dict) else ""
         ai_plan = normalize_planner_output(ai_plan)
 
-        log_ai_usage(
-            request_kind="quick_lesson_ai",
-            status="success",
-            meta={"subject": subject, "topic": topic, "lesson_purpose": lesson_purpose, "provider": provider},
-        )
+        meta = {"subject": subject, "topic": topic, "lesson_purpose": lesson_purpose, "provider": provider, "cache": cache_status}
+        if cache_status == CACHE_HIT:
+            log_ai_usage(request_kind="quick_lesson_ai", status=CACHE_HIT_LOG_STATUS, meta={**meta, "used_ai": False})
+            return ai_plan, "ai", None
+
+        log_ai_usage(request_kind="quick_lesson_ai", status="success", meta=meta)
         increment_usage(None, "ai_generations")
         return ai_plan, "ai", None
 
@@ -9,8 +9,9 @@ import pandas as pd
 import streamlit as st
 
 from core.i18n import t
-from core.database import register_cache
+from core.database import register_cache, shared_cache
 from core.state import get_current_user_id
+from helpers.minhash_lsh import MinHashLSHIndex
 from helpers.recommendation_models import resource_semantic_affinity
 from helpers.resource_affinity_runtime import resource_affinity_score
 
@@ -235,6 +236,34 @@ def _resource_tokens(row: dict, kind: str) -> set[str]:
     return tokens
 
 
+# Pools smaller than this are scanned linearly; the exact classifier is cheap enough there.
+MATERIAL_LSH_MIN_POOL_SIZE = 300
+_SHINGLE_PREFIX_CHARS = 5
+
+
+def _topic_shingles(*values: Any) -> set[str]:
+    # Token prefixes catch inflections ("animal"/"animals"); character 4-grams
+    # approximate the fuzzy SequenceMatcher/semantic topic checks.
+    shingles: set[str] = set()
+    for token in _topic_tokens(*values):
+        shingles.add(token[:_SHINGLE_PREFIX_CHARS])
+        shingles.update(f"#{token[i:i + 4]}" for i in range(len(token) - 3))
+    return shingles
+
+
+def _resource_shingles(row: dict) -> set[str]:
+    return _topic_shingles(row.get("title"), row.get("topic"), row.get("description"))
+
+
+def _request_shingles(request: dict) -> set[str]:
+    return _topic_shingles(
+        request.get("topic"),
+        request.get("objective"),
+        " ".join(request.get("next_topics") or []),
+        " ".join(request.get("weak_topics") or []),
+    )
+
+
 def _load_df(loader) -> pd.DataFrame:
     try:
         df = loader()
@@ -244,7 +273,8 @@ def _load_df(loader) -> pd.DataFrame:
 
 
 @st.cache_data(show_spinner=False, ttl=600)
-def _load_material_pool_cached(uid: str) -> list[dict]:
+@shared_cache("recommendations", "resources", ttl=600)
+def _load_material_pool_cached(uid: str) -> dict[str, Any]:
     from helpers.archive_utils import is_archived_status
     from helpers.planner_storage import load_my_lesson_plans, load_public_lesson_plans
     from helpers.quick_exam_storage import load_my_exams, load_public_exams
@@ -291,14 +321,32 @@ def _load_material_pool_cached(uid: str) -> list[dict]:
                     "tokens": _resource_tokens(row, kind),
                 }
             )
-    return pool
+    index = MinHashLSHIndex([_resource_shingles(item["row"]) for item in pool]) if len(pool) >= MATERIAL_LSH_MIN_POOL_SIZE else None
+    return {"resources": pool, "index": index}
 
 
 register_cache(_load_material_pool_cached, "recommendations", "resources")
 
 
 def load_material_pool() -> list[dict]:
-    return _load_material_pool_cached(str(get_current_user_id() or ""))
+    return _load_material_pool_cached(str(get_current_user_id() or ""))["resources"]
+
+
+def _material_candidates(request: dict) -> list[dict]:
+    """Resources worth classifying exactly: LSH candidates, or the whole pool.
+
+    The index only retrieves resources sharing topic shingles with the
+    request; requests without a topic fall back to the full scan.
+    """
+    cached = _load_material_pool_cached(str(get_current_user_id() or ""))
+    pool = cached["resources"]
+    index = cached.get("index")
+    if index is None:
+        return pool
+    positions = index.query(_request_shingles(request))
+    if positions is None:
+        return pool
+    return [pool[int(position)] for position in positions]
 
 
 def build_generation_request(
@@ -526,7 +574,7 @@ def find_similar_materials(
     min_score: float = 0.0,
 ) -> list[dict]:
     ranked: list[dict] = []
-    for resource in load_material_pool():
+    for resource in _material_candidates(request):
         classified = _classify_recommendation_bucket(resource, request)
         if not classified:
             continue
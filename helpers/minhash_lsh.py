@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+from typing import Iterable, Sequence
+import zlib
+
+import numpy as np
+
+
+_EMPTY_SLOT = np.uint64(np.iinfo(np.uint64).max)
+_MIX_1 = np.uint64(0xBF58476D1CE4E5B9)
+_MIX_2 = np.uint64(0x94D049BB133111EB)
+_SHINGLE_CHUNK = 16384
+
+
+def _shingle_hashes(shingles: Iterable[str]) -> np.ndarray:
+    return np.fromiter(
+        (zlib.crc32(str(shingle).encode("utf-8")) for shingle in shingles),
+        dtype=np.uint64,
+    )
+
+
+class MinHashLSHIndex:
+    """MinHash signatures with banded LSH buckets for Jaccard candidate retrieval.
+
+    Documents land in the same bucket of a band when all ``rows_per_band``
+    min-hashes of that band agree, so the chance a document with Jaccard
+    similarity ``s`` to the query becomes a candidate is
+    ``1 - (1 - s ** rows_per_band) ** bands``. Buckets are stored as sorted
+    key arrays (one per band) rather than dicts, so the index pickles cheaply
+    through ``st.cache_data``. Documents without shingles cannot be hashed
+    and are always returned as candidates.
+    """
+
+    def __init__(
+        self,
+        shingle_sets: Sequence[Iterable[str]],
+        *,
+        num_perm: int = 64,
+        rows_per_band: int = 1,
+        seed: int = 1,
+    ):
+        self.rows_per_band = max(1, int(rows_per_band))
+        self.bands = max(1, int(num_perm) // self.rows_per_band)
+        self.num_perm = self.bands * self.rows_per_band
+        rng = np.random.default_rng(seed)
+        self._seeds = rng.integers(0, np.iinfo(np.uint64).max, size=self.num_perm, dtype=np.uint64, endpoint=True)
+        self._band_mix = rng.integers(1, np.iinfo(np.uint64).max, size=self.rows_per_band, dtype=np.uint64)
+
+        hashes_per_doc = [_shingle_hashes(set(shingles)) for shingles in shingle_sets]
+        self.size = len(hashes_per_doc)
+        signatures = np.full((self.size, self.num_perm), _EMPTY_SLOT, dtype=np.uint64)
+        lengths = np.array([len(item) for item in hashes_per_doc], dtype=np.int64)
+        doc_ids = np.flatnonzero(lengths > 0)
+        if len(doc_ids):
+            flat = np.concatenate([hashes_per_doc[doc_id] for doc_id in doc_ids])
+            ends = np.cumsum(lengths[doc_ids])
+            starts = ends - lengths[doc_ids]
+            # Permute whole documents in chunks of ~_SHINGLE_CHUNK shingles and
+            # take each document's column-wise minimum with one reduceat.
+            first = 0
+            while first < len(doc_ids):
+                last = max(first + 1, int(np.searchsorted(ends, starts[first] + _SHINGLE_CHUNK, side="right")))
+                lo, hi = starts[first], ends[last - 1]
+                permuted = self._permute(flat[lo:hi])
+                signatures[doc_ids[first:last]] = np.minimum.reduceat(permuted, starts[first:last] - lo, axis=0)
+                first = last
+        self._unindexed = np.flatnonzero(lengths == 0).astype(np.int32)
+
+        band_keys = self._band_keys(signatures)
+        self._band_order: list[np.ndarray] = []
+        self._band_sorted_keys: list[np.ndarray] = []
+        for band in range(self.bands):
+            keys = band_keys[doc_ids, band]
+            order = np.argsort(keys, kind="stable")
+            self._band_order.append(doc_ids[order].astype(np.int32))
+            self._band_sorted_keys.append(keys[order])
+
+    def _permute(self, hashes: np.ndarray) -> np.ndarray:
+        # One splitmix64 finaliser per seed stands in for a random permutation;
+        # uint64 multiplication wraps, which is what the mixer relies on.
+        x = hashes[:, None] ^ self._seeds[None, :]
+        x = (x ^ (x >> np.uint64(30))) * _MIX_1
+        x = (x ^ (x >> np.uint64(27))) * _MIX_2
+        return x ^ (x >> np.uint64(31))
+
+    def _band_keys(self, signatures: np.ndarray) -> np.ndarray:
+        shaped = signatures.reshape(len(signatures), self.bands, self.rows_per_band)
+        # uint64 arithmetic wraps, which is fine for a bucket key.
+        return (shaped * self._band_mix[None, None, :]).sum(axis=2, dtype=np.uint64)
+
+    def signature(self, shingles: Iterable[str]) -> np.ndarray | None:
+        hashes = _shingle_hashes(set(shingles))
+        if not len(hashes):
+            return None
+        return self._permute(hashes).min(axis=0)
+
+    def query(self, shingles: Iterable[str]) -> np.ndarray | None:
+        """Return sorted candidate positions, or None when the query has no shingles."""
+        signature = self.signature(shingles)
+        if signature is None:
+            return None
+        query_keys = self._band_keys(signature[None, :])[0]
+        hits = [self._unindexed]
+        for band, key in enumerate(query_keys):
+            sorted_keys = self._band_sorted_keys[band]
+            lo = np.searchsorted(sorted_keys, key, side="left")
+            hi = np.searchsorted(sorted_keys, key, side="right")
+            if hi > lo:
+                hits.append(self._band_order[band][lo:hi])
+        return np.unique(np.concatenate(hits))
@@ -0,0 +1,263 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+import logging
+
+import streamlit as st
+
+from core.database import clear_cache_domains, get_sb, register_cache
+from core.state import get_current_user_id
+
+logger = logging.getLogger(__name__)
+
+INBOX_ASSIGNMENT_ASSIGNED = "assignment_assigned"
+INBOX_REVIEW_REQUESTED = "review_requested"
+INBOX_REVIEW_COMPLETED = "review_completed"
+INBOX_PACKAGE_ENDING = "package_ending"
+
+INBOX_PAGE_SIZE = 50
+
+_INBOX_COLUMNS = "id,kind,source_id,payload,event_at,read_at"
+
+
+def _uid() -> str:
+    return str(get_current_user_id() or "").strip()
+
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _rows(result) -> list[dict]:
+    return getattr(result, "data", None) or []
+
+
+def record_inbox_event(
+    *,
+    user_id: str,
+    kind: str,
+    source_id,
+    payload: dict | None = None,
+    event_at: str | None = None,
+    sb=None,
+) -> bool:
+    """Append one event to ``user_id``'s inbox.
+
+    Never raises: the mutation that produced the event has already been
+    saved, and a duplicate (same user, kind and source) or a database that
+    has not run the inbox migration must not turn it into a failure.
+    """
+    user_id = str(user_id or "").strip()
+    source_id = str(source_id or "").strip()
+    if not user_id or not kind or not source_id:
+        return False
+    row = {
+        "user_id": user_id,
+        "kind": kind,
+        "source_id": source_id,
+        "payload": payload or {},
+        "event_at": event_at or _now_iso(),
+    }
+    actor_id = _uid()
+    if actor_id:
+        row["actor_id"] = actor_id
+    try:
+        (sb or get_sb()).table("notification_inbox").insert(row).execute()
+    except Exception:
+        logger.debug("Notification inbox insert skipped", extra={"kind": kind, "source_id": source_id}, exc_info=True)
+        return False
+    clear_cache_domains("notifications", include_data_cache=False)
+    return True
+
+
+@st.cache_data(ttl=45, show_spinner=False)
+def _load_notification_inbox_page_cached(uid: str, limit: int) -> list[dict] | None:
+    if not uid:
+        return []
+    try:
+        return _rows(
+            get_sb()
+            .table("notification_inbox")
+            .select(_INBOX_COLUMNS)
+            .eq("user_id", uid)
+            .is_("resolved_at", "null")
+            .order("event_at", desc=True)
+            .order("id", desc=True)
+            .limit(int(limit))
+            .execute()
+        )
+    except Exception:
+        return None
+
+
+register_cache(_load_notification_inbox_page_cached, "notifications")
+
+
+def load_notification_inbox_page(limit: int = INBOX_PAGE_SIZE) -> list[dict] | None:
+    """Newest unresolved inbox rows for the current user, or None when the inbox is unavailable."""
+    return _load_notification_inbox_page_cached(_uid(), int(limit))
+
+
+@st.cache_data(ttl=45, show_spinner=False)
+def _load_notification_unread_count_cached(uid: str) -> int | None:
+    if not uid:
+        return 0
+    try:
+        rows = _rows(
+            get_sb()
+            .table("notification_inbox_counters")
+            .select("unread_count")
+            .eq("user_id", uid)
+            .limit(1)
+            .execute()
+        )
+    except Exception:
+        return None
+    return max(0, int((rows[0] if rows else {}).get("unread_count") or 0))
+
+
+register_cache(_load_notification_unread_count_cached, "notifications")
+
+
+def load_notification_unread_count() -> int | None:
+    return _load_notification_unread_count_cached(_uid())
+
+
+def mark_notification_inbox_read() -> None:
+    uid = _uid()
+    if not uid:
+        return
+    try:
+        (
+            get_sb()
+            .table("notification_inbox")
+            .update({"read_at": _now_iso()})
+            .eq("user_id", uid)
+            .is_("read_at", "null")
+            .execute()
+        )
+    except Exception:
+        return
+    clear_cache_domains("notifications", include_data_cache=False)
+
+
+def inbox_rows_by_kind(rows: list[dict] | None, kind: str) -> list[dict]:
+    """Payloads of one kind, newest first, with ``id`` set to the source id."""
+    out = []
+    for row in rows or []:
+        if row.get("kind") != kind:
+            continue
+        payload = dict(row.get("payload") or {})
+        source_id = str(row.get("source_id") or "")
+        payload["id"] = int(source_id) if source_id.isdigit() else source_id
+        payload.setdefault("event_at", row.get("event_at"))
+        out.append(payload)
+    return out
+
+
+def _package_ending_source_id(package_key: str, raised_at: str) -> str:
+    # The inbox is unique on (user, kind, source_id); keying on the time the
+    # notice was raised lets a package that drops below the threshold again
+    # after being resolved get a fresh row.
+    return f"{package_key}@{raised_at}"
+
+
+def sync_package_ending_inbox(user_id: str, packages: dict[str, str], *, inbox_rows: list[dict] | None) -> None:
+    """Reconcile package-ending rows with the packages that are nearly used up.
+
+    ``packages`` maps a stable package key (student plus package start) to
+    the student's display name.
+
+    Package state is derived from class and payment totals rather than a
+    single mutation, so rows are added and resolved from the dashboard frame
+    the teacher page already builds, and only when the set changes.
+    """
+    user_id = str(user_id or "").strip()
+    if not user_id or inbox_rows is None:
+        return
+    current = {str(key): str(student) for key, student in packages.items() if str(key).strip()}
+    stored: dict[str, list[str]] = {}
+    for row in inbox_rows:
+        if row.get("kind") != INBOX_PACKAGE_ENDING:
+            continue
+        source_id = str(row.get("source_id") or "")
+        package_key = str((row.get("payload") or {}).get("package_key") or source_id)
+        stored.setdefault(package_key, []).append(source_id)
+    for key, student in current.items():
+        if key not in stored:
+            raised_at = _now_iso()
+            record_inbox_event(
+                user_id=user_id,
+                kind=INBOX_PACKAGE_ENDING,
+                source_id=_package_ending_source_id(key, raised_at),
+                payload={"student": student, "package_key": key},
+                event_at=raised_at,
+            )
+    stale = [source_id for key, source_ids in stored.items() if key not in current for source_id in source_ids]
+    if not stale:
+        return
+    try:
+        (
+            get_sb()
+            .table("notification_inbox")
+            .update({"resolved_at": _now_iso()})
+            .eq("user_id", user_id)
+            .eq("kind", INBOX_PACKAGE_ENDING)
+            .in_("source_id", stale)
+            .execute()
+        )
+    except Exception:
+        return
+    clear_cache_domains("notifications", include_data_cache=False)
+
+
+def inbox_backfill_rows(
+    *,
+    assignments: list[dict],
+    review_requests: list[dict],
+    profile_names: dict[str, str],
+) -> list[dict]:
+    """Inbox rows for events that predate the inbox, in the shape the write hooks produce."""
+    rows: list[dict] = []
+    for assignment in assignments:
+        if str(assignment.get("status") or "").strip().lower() != "assigned":
+            continue
+        rows.append(
+            {
+                "user_id": str(assignment.get("student_id") or "").strip(),
+                "kind": INBOX_ASSIGNMENT_ASSIGNED,
+                "source_id": str(assignment.get("id")),
+                "event_at": assignment.get("created_at"),
+                "payload": {
+                    "title": assignment.get("title") or "",
+                    "assignment_type": assignment.get("assignment_type") or "",
+                    "teacher_name": profile_names.get(str(assignment.get("teacher_id") or "").strip(), "—"),
+                },
+            }
+        )
+    for review in review_requests:
+        status = str(review.get("status") or "").strip().lower()
+        teacher_id = str(review.get("teacher_id") or "").strip()
+        student_id = str(review.get("student_id") or "").strip()
+        common = {"title": review.get("title") or "", "source_type": review.get("source_type") or ""}
+        if status == "requested":
+            rows.append(
+                {
+                    "user_id": teacher_id,
+                    "kind": INBOX_REVIEW_REQUESTED,
+                    "source_id": str(review.get("id")),
+                    "event_at": review.get("requested_at") or review.get("created_at"),
+                    "payload": {**common, "student_id": student_id, "student_name": profile_names.get(student_id, "—")},
+                }
+            )
+        elif status == "reviewed" and review.get("reviewed_at"):
+            rows.append(
+                {
+                    "user_id": student_id,
+                    "kind": INBOX_REVIEW_COMPLETED,
+                    "source_id": str(review.get("id")),
+                    "event_at": review.get("reviewed_at"),
+                    "payload": {**common, "teacher_name": profile_names.get(teacher_id, "—")},
+                }
+            )
+    return [row for row in rows if row["user_id"] and row["event_at"]]
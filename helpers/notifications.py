@@ -27,6 +27,16 @@ from helpers.teacher_student_integration import (
     load_teacher_assignment_progress,
 )
 from helpers.learning_programs import load_learning_program, load_program_assignments_for_teacher
+from helpers.notification_inbox import (
+    INBOX_ASSIGNMENT_ASSIGNED,
+    INBOX_REVIEW_COMPLETED,
+    INBOX_REVIEW_REQUESTED,
+    inbox_rows_by_kind,
+    load_notification_inbox_page,
+    load_notification_unread_count,
+    mark_notification_inbox_read,
+    sync_package_ending_inbox,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -388,6 +398,40 @@ def _teacher_learning_program_help_requests(limit: int = 5) -> list[dict]:
         return []
 
 
+def _within_days(value, now, days: int) -> bool:
+    dt = _parse_dt(value)
+    return dt is not None and (pd.Timestamp(now.date()) - pd.Timestamp(dt.date())).days <= days
+
+
+def _teacher_review_request_notification(review_requests: list[dict], first_name: str) -> dict:
+    teacher_review_student = _safe_title_case(review_requests[0].get("student_name", ""))
+    if not teacher_review_student:
+        try:
+            student_id = str(review_requests[0].get("student_id") or "").strip()
+            from helpers.teacher_student_integration import _load_profiles_map, _profile_label
+
+            prof = _load_profiles_map([student_id]).get(student_id, {})
+            teacher_review_student = _safe_title_case(_profile_label(prof))
+        except Exception:
+            teacher_review_student = ""
+    return _notification(
+        signature="teacher_review_request_" + "_".join(str(r.get("id")) for r in review_requests[:5]),
+        category="assignments",
+        priority=9,
+        cloud=True,
+        tone="action",
+        message=t(
+            "notif_teacher_review_request_many" if len(review_requests) > 1 else "notif_teacher_review_request_one"
+        ).format(
+            name=first_name,
+            student=teacher_review_student,
+            count=len(review_requests),
+            kind=_review_kind_label(review_requests[0].get("source_type", "")),
+            title=_safe_title_case(review_requests[0].get("title", "")),
+        ),
+    )
+
+
 def get_teacher_notifications_from_context(
     *,
     dashboard_df: pd.DataFrame | None = None,
@@ -401,6 +445,7 @@ def get_teacher_notifications_from_context(
     notifications: list[dict] = []
     today = today_local()
     now = now_local()
+    inbox = load_notification_inbox_page()
 
     requests = load_incoming_teacher_requests()
     if requests:
@@ -415,39 +460,19 @@ def get_teacher_notifications_from_context(
             message=t(key).format(name=first_name, student=student_name, count=len(requests)),
         ))
 
-    review_requests = []
-    for row in _load_teacher_review_requests_for_notifications(teacher_id=uid):
-        status = _clean(row.get("status")).lower()
-        requested_at = _parse_dt(row.get("requested_at") or row.get("created_at"))
-        if status == "requested" and requested_at is not None and (pd.Timestamp(now.date()) - pd.Timestamp(requested_at.date())).days <= 14:
-            review_requests.append(row)
+    if inbox is not None:
+        review_requests = [
+            row for row in inbox_rows_by_kind(inbox, INBOX_REVIEW_REQUESTED)
+            if _within_days(row.get("event_at"), now, 14)
+        ]
+    else:
+        review_requests = []
+        for row in _load_teacher_review_requests_for_notifications(teacher_id=uid):
+            status = _clean(row.get("status")).lower()
+            if status == "requested" and _within_days(row.get("requested_at") or row.get("created_at"), now, 14):
+                review_requests.append(row)
     if review_requests:
-        teacher_review_student = _safe_title_case(review_requests[0].get("student_name", ""))
-        if not teacher_review_student:
-            try:
-                student_id = str(review_requests[0].get("student_id") or "").strip()
-                from helpers.teacher_student_integration import _load_profiles_map, _profile_label
-
-                prof = _load_profiles_map([student_id]).get(student_id, {})
-                teacher_review_student = _safe_title_case(_profile_label(prof))
-            except Exception:
-                teacher_review_student = ""
-        notifications.append(_notification(
-            signature="teacher_review_request_" + "_".join(str(r.get("id")) for r in review_requests[:5]),
-            category="assignments",
-            priority=9,
-            cloud=True,
-            tone="action",
-            message=t(
-                "notif_teacher_review_request_many" if len(review_requests) > 1 else "notif_teacher_review_request_one"
-            ).format(
-                name=first_name,
-                student=teacher_review_student,
-                count=len(review_requests),
-                kind=_review_kind_label(review_requests[0].get("source_type", "")),
-                title=_safe_title_case(review_requests[0].get("title", "")),
-            ),
-        ))
+        notifications.append(_teacher_review_request_notification(review_requests, first_name))
 
     help_requests = _teacher_learning_program_help_requests(limit=5)
     if help_requests:
@@ -558,6 +583,16 @@ def get_teacher_notifications_from_context(
         d = dash.copy()
         d["Status"] = d.get("Status", "").fillna("").astype(str).str.strip().str.casefold()
         due_df = d[d["Status"] == "almost_finished"].copy()
+        if inbox is not None:
+            sync_package_ending_inbox(
+                uid,
+                {
+                    f"{_norm(row.get('Student'))}:{_clean(row.get('Package_Start_Date'))}": _safe_title_case(row.get("Student"))
+                    for row in due_df.to_dict("records")
+                    if _norm(row.get("Student"))
+                },
+                inbox_rows=inbox,
+            )
         if not due_df.empty:
             due_names = [_safe_title_case(v) for v in due_df.get("Student", []).tolist() if _clean(v)]
             key = "notif_teacher_package_ending_many" if len(due_df) > 1 else "notif_teacher_package_ending_one"
@@ -730,6 +765,35 @@ def get_teacher_notifications() -> list[dict]:
     return get_teacher_notifications_from_context()
 
 
+def _student_review_completed_notification(reviewed_requests: list[dict], first_name: str) -> dict:
+    teacher_name = _safe_title_case(reviewed_requests[0].get("teacher_name", ""))
+    if not teacher_name:
+        try:
+            teacher_id = str(reviewed_requests[0].get("teacher_id") or "").strip()
+            from helpers.teacher_student_integration import _load_profiles_map, _profile_label
+
+            prof = _load_profiles_map([teacher_id]).get(teacher_id, {})
+            teacher_name = _safe_title_case(_profile_label(prof))
+        except Exception:
+            teacher_name = ""
+    return _notification(
+        signature="student_review_completed_" + "_".join(str(r.get("id")) for r in reviewed_requests[:5]),
+        category="assignments",
+        priority=11,
+        cloud=True,
+        tone="success",
+        message=t(
+            "notif_student_review_completed_many" if len(reviewed_requests) > 1 else "notif_student_review_completed_one"
+        ).format(
+            name=first_name,
+            teacher=teacher_name,
+            count=len(reviewed_requests),
+            kind=_review_kind_label(reviewed_requests[0].get("source_type", "")),
+            title=_safe_title_case(reviewed_requests[0].get("title", "")),
+        ),
+    )
+
+
 def get_student_notifications() -> list[dict]:
     uid = _uid()
     _, first_name = _load_name()
@@ -737,22 +801,19 @@ def get_student_notifications() -> list[dict]:
     today = today_local()
     now = now_local()
 
+    inbox = load_notification_inbox_page()
     assignments = load_student_assignments(statuses=["assigned", "started", "submitted", "graded", "completed", "overdue"])
     assigned = []
     due_soon = []
     overdue = []
     graded = []
-    topics = []
     exam_continue = []
     for row in assignments:
         status = _clean(row.get("status")).lower()
-        created_at = _parse_dt(row.get("created_at"))
         due_at = _parse_dt(row.get("due_at"))
         assignment_type = _clean(row.get("assignment_type")).lower()
-        if status == "assigned" and created_at is not None and (pd.Timestamp(now.date()) - pd.Timestamp(created_at.date())).days <= 7:
+        if inbox is None and status == "assigned" and _within_days(row.get("created_at"), now, 7):
             assigned.append(row)
-            if assignment_type == "lesson_plan_topic":
-                topics.append(row)
         if due_at is not None and status in {"assigned", "started"}:
             delta_days = (pd.Timestamp(due_at.date()) - pd.Timestamp(today)).days
             if 0 <= delta_days <= 2:
@@ -764,6 +825,12 @@ def get_student_notifications() -> list[dict]:
         if assignment_type == "exam" and (status == "started" or load_in_progress_practice_session("exam", row.get("id"))):
             exam_continue.append(row)
 
+    if inbox is not None:
+        assigned = [
+            row for row in inbox_rows_by_kind(inbox, INBOX_ASSIGNMENT_ASSIGNED)
+            if _within_days(row.get("event_at"), now, 7)
+        ]
+    topics = [row for row in assigned if _clean(row.get("assignment_type")).lower() == "lesson_plan_topic"]
     if assigned:
         regular_assigned = [r for r in assigned if _clean(r.get("assignment_type")).lower() != "lesson_plan_topic"]
         if regular_assigned:
@@ -844,38 +911,18 @@ def get_student_notifications() -> list[dict]:
             message=t(key).format(name=first_name, teacher=_safe_title_case(accepted[0].get("teacher_name", "")), count=len(accepted)),
         ))
 
-    reviewed_requests = []
-    for row in _load_teacher_review_requests_for_notifications(student_id=uid):
-        status = _clean(row.get("status")).lower()
-        reviewed_at = _parse_dt(row.get("reviewed_at"))
-        if status == "reviewed" and reviewed_at is not None and (pd.Timestamp(now.date()) - pd.Timestamp(reviewed_at.date())).days <= 14:
-            reviewed_requests.append(row)
+    if inbox is not None:
+        reviewed_requests = [
+            row for row in inbox_rows_by_kind(inbox, INBOX_REVIEW_COMPLETED)
+            if _within_days(row.get("event_at"), now, 14)
+        ]
+    else:
+        reviewed_requests = [
+            row for row in _load_teacher_review_requests_for_notifications(student_id=uid)
+            if _clean(row.get("status")).lower() == "reviewed" and _within_days(row.get("reviewed_at"), now, 14)
+        ]
     if reviewed_requests:
-        teacher_name = ""
-        try:
-            teacher_id = str(reviewed_requests[0].get("teacher_id") or "").strip()
-            from helpers.teacher_student_integration import _load_profiles_map, _profile_label
-
-            prof = _load_profiles_map([teacher_id]).get(teacher_id, {})
-            teacher_name = _safe_title_case(_profile_label(prof))
-        except Exception:
-            teacher_name = ""
-        notifications.append(_notification(
-            signature="student_review_completed_" + "_".join(str(r.get("id")) for r in reviewed_requests[:5]),
-            category="assignments",
-            priority=11,
-            cloud=True,
-            tone="success",
-            message=t(
-                "notif_student_review_completed_many" if len(reviewed_requests) > 1 else "notif_student_review_completed_one"
-            ).format(
-                name=first_name,
-                teacher=teacher_name,
-                count=len(reviewed_requests),
-                kind=_review_kind_label(reviewed_requests[0].get("source_type", "")),
-                title=_safe_title_case(reviewed_requests[0].get("title", "")),
-            ),
-        ))
+        notifications.append(_student_review_completed_notification(reviewed_requests, first_name))
 
     smart_plan = _smart_plan_state()
     if smart_plan.get("setup_complete"):
@@ -1180,16 +1227,29 @@ def render_lazy_notification_panel(
     toggle_key: str,
     loader,
     title_text: str | None = None,
+    unread_loader=None,
 ) -> None:
+    """Heading plus a toggle that runs ``loader`` only when opened.
+
+    ``unread_loader`` (e.g. ``load_notification_unread_count``) feeds the
+    badge from the inbox counter, so the closed panel costs one indexed read.
+    """
     _inject_notification_styles()
     if title_text is None:
         title_text = t("notifications")
 
+    unread_count = 0
+    if unread_loader is not None:
+        try:
+            unread_count = int(unread_loader() or 0)
+        except Exception:
+            unread_count = 0
     st.markdown(
         (
             "<div class='classio-notification-panel-heading'>"
             f"<div class='classio-notification-panel-heading-text'>{html.escape(title_text)}</div>"
-            "</div>"
+            + (f"<div class='classio-notification-badge'>{unread_count}</div>" if unread_count > 0 else "")
+            + "</div>"
         ),
         unsafe_allow_html=True,
     )
@@ -1207,6 +1267,8 @@ def render_lazy_notification_panel(
     except Exception:
         logger.exception("Notification panel loader failed", extra={"scope": scope, "toggle_key": toggle_key})
         notifications = []
+    if unread_count > 0:
+        mark_notification_inbox_read()
     render_notification_panel(
         notifications,
         scope=scope,
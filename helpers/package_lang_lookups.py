@@ -1,3 +1,6 @@
+import re
+
+import pandas as pd
 import streamlit as st
 from core.i18n import t
 from core.state import get_current_user_id
@@ -36,13 +39,28 @@ def latest_payment_languages_for_student(student: str) -> str:
         return LANG_ES
 
 
+_FREE_NOTE_MARKERS = ("[FREE]", "[DEMO]", "[DONT COUNT]", "[DON'T COUNT]")
+_FREE_NOTE_RE = "|".join(re.escape(marker) for marker in _FREE_NOTE_MARKERS)
+
+
 def _units_multiplier(modality: str) -> int:
     return 1
 
 
 def _is_free_note(note: str) -> bool:
     n = str(note or "").upper()
-    return ("[FREE]" in n) or ("[DEMO]" in n) or ("[DONT COUNT]" in n) or ("[DON'T COUNT]" in n)
+    return any(marker in n for marker in _FREE_NOTE_MARKERS)
+
+
+def _free_note_mask(notes: pd.Series) -> pd.Series:
+    """``_is_free_note`` for a whole column at once."""
+    return notes.fillna("").astype(str).str.upper().str.contains(_FREE_NOTE_RE, regex=True)
+
+
+def _units_multipliers(modalities: pd.Series) -> pd.Series:
+    """``_units_multiplier`` for a whole column, evaluated once per distinct modality."""
+    values = modalities.fillna("").astype(str)
+    return values.map({modality: _units_multiplier(modality) for modality in values.unique()}).astype(int)
 
 
 # =========================
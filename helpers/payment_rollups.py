@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import logging
+
+import pandas as pd
+import streamlit as st
+
+from core.database import get_sb, load_table_filtered, register_cache
+from core.state import get_current_user_id
+from helpers.ui_components import to_dt_naive
+
+logger = logging.getLogger(__name__)
+
+PAYMENT_ROLLUP_COLUMNS = ["period", "subject", "modality", "paid_amount", "payment_count", "lesson_count"]
+_ROLLUP_PAGE_SIZE = 1000
+_PAYMENT_SOURCE_COLUMNS = "student,payment_date,paid_amount,number_of_lesson,modality,subject"
+
+
+def _empty_rollups() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "period": pd.Series(dtype="datetime64[ns]"),
+            "subject": pd.Series(dtype=object),
+            "modality": pd.Series(dtype=object),
+            "paid_amount": pd.Series(dtype=float),
+            "payment_count": pd.Series(dtype=int),
+            "lesson_count": pd.Series(dtype=int),
+        }
+    )
+
+
+def rollup_payments(payments: pd.DataFrame | None) -> pd.DataFrame:
+    """Group payment rows the way the ``payment_rollups`` trigger does.
+
+    One row per (payment day, subject, modality). Payments without a
+    student or a parseable date are left out, and a missing modality counts
+    as "Online", matching the income analytics filters.
+    """
+    if payments is None or payments.empty:
+        return _empty_rollups()
+    frame = pd.DataFrame(
+        {
+            "student": payments.get("student", pd.Series("", index=payments.index)).fillna("").astype(str).str.strip(),
+            "period": to_dt_naive(payments.get("payment_date", pd.Series(None, index=payments.index)), utc=True).dt.normalize(),
+            "subject": payments.get("subject", pd.Series("", index=payments.index)).fillna("").astype(str).str.strip(),
+            "modality": payments.get("modality", pd.Series(None, index=payments.index)).fillna("Online").astype(str).str.strip(),
+            "paid_amount": pd.to_numeric(payments.get("paid_amount", 0.0), errors="coerce"),
+            "lesson_count": pd.to_numeric(payments.get("number_of_lesson", 0), errors="coerce"),
+        }
+    )
+    frame = frame[frame["period"].notna() & (frame["student"].str.len() > 0)]
+    if frame.empty:
+        return _empty_rollups()
+    frame["paid_amount"] = frame["paid_amount"].fillna(0.0).astype(float)
+    frame["lesson_count"] = frame["lesson_count"].fillna(0).astype(int)
+    return (
+        frame.groupby(["period", "subject", "modality"], as_index=False, sort=True)
+        .agg(
+            paid_amount=("paid_amount", "sum"),
+            payment_count=("paid_amount", "size"),
+            lesson_count=("lesson_count", "sum"),
+        )[PAYMENT_ROLLUP_COLUMNS]
+    )
+
+
+def normalize_payment_rollups(rows: pd.DataFrame | list[dict] | None) -> pd.DataFrame:
+    frame = pd.DataFrame(rows) if not isinstance(rows, pd.DataFrame) else rows.copy()
+    if frame.empty:
+        return _empty_rollups()
+    for column, default in {"subject": "", "modality": "Online", "paid_amount": 0.0, "payment_count": 0, "lesson_count": 0}.items():
+        if column not in frame.columns:
+            frame[column] = default
+    frame["period"] = to_dt_naive(frame.get("period"), utc=True).dt.normalize()
+    frame["subject"] = frame["subject"].fillna("").astype(str)
+    frame["modality"] = frame["modality"].fillna("Online").astype(str)
+    frame["paid_amount"] = pd.to_numeric(frame["paid_amount"], errors="coerce").fillna(0.0).astype(float)
+    frame["payment_count"] = pd.to_numeric(frame["payment_count"], errors="coerce").fillna(0).astype(int)
+    frame["lesson_count"] = pd.to_numeric(frame["lesson_count"], errors="coerce").fillna(0).astype(int)
+    frame = frame.dropna(subset=["period"])
+    return frame[PAYMENT_ROLLUP_COLUMNS].sort_values(["period", "subject", "modality"]).reset_index(drop=True)
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _load_payment_rollups_cached(uid: str) -> pd.DataFrame | None:
+    """The teacher's rollup rows, or None when the table is not available yet."""
+    if not uid:
+        return _empty_rollups()
+    rows: list[dict] = []
+    try:
+        sb = get_sb()
+        offset = 0
+        while True:
+            batch = (
+                sb.table("payment_rollups")
+                .select(",".join(PAYMENT_ROLLUP_COLUMNS))
+                .eq("user_id", uid)
+                # The primary key after user_id: a unique order, so no row is
+                # repeated or skipped at a page boundary.
+                .order("period")
+                .order("subject")
+                .order("modality")
+                .range(offset, offset + _ROLLUP_PAGE_SIZE - 1)
+                .execute()
+            ).data or []
+            rows.extend(batch)
+            if len(batch) < _ROLLUP_PAGE_SIZE:
+                break
+            offset += _ROLLUP_PAGE_SIZE
+    except Exception:
+        logger.info("payment_rollups unavailable; rolling up payments in Python", exc_info=True)
+        return None
+    return normalize_payment_rollups(rows)
+
+
+register_cache(_load_payment_rollups_cached, "payments", "dashboard")
+
+
+def load_payment_rollups() -> pd.DataFrame:
+    """Daily income rollups for the current teacher.
+
+    Reads the trigger-maintained ``payment_rollups`` table. Before its
+    migration has run, the same rows are computed from the payments table.
+    """
+    rollups = _load_payment_rollups_cached(str(get_current_user_id() or ""))
+    if rollups is not None:
+        return rollups
+    payments = load_table_filtered(
+        "payments",
+        columns=_PAYMENT_SOURCE_COLUMNS,
+        limit=200000,
+        order_by="payment_date",
+        order_desc=True,
+    )
+    return rollup_payments(payments)
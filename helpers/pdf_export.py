@@ -0,0 +1,246 @@
+from __future__ import annotations
+
+import hashlib
+import importlib
+import json
+import multiprocessing
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Optional, Sequence
+
+import streamlit as st
+
+
+# Bump when a builder change alters the rendered output for unchanged inputs.
+PDF_RENDER_VERSION = "1"
+
+DEFAULT_PDF_CACHE_MAX_ENTRIES = 256
+DEFAULT_PDF_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+PDF_BUILDERS: dict[str, tuple[str, str]] = {
+    "worksheet": ("helpers.worksheet_storage", "build_worksheet_pdf_bytes"),
+    "exam": ("helpers.quick_exam_storage", "build_exam_pdf_bytes"),
+    "exam_answer_key": ("helpers.quick_exam_storage", "build_exam_answer_pdf_bytes"),
+    "lesson_plan": ("helpers.planner_storage", "build_lesson_plan_pdf_bytes"),
+}
+
+
+class PDFBytesCache:
+    """In-process LRU of rendered PDF bytes keyed by a content hash.
+
+    Bounded by both an entry count and a total byte budget so a handful of
+    image-heavy worksheets cannot pin unbounded memory.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = DEFAULT_PDF_CACHE_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_PDF_CACHE_MAX_BYTES,
+    ):
+        self.max_entries = max(1, int(max_entries))
+        self.max_bytes = max(1, int(max_bytes))
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, cache_key: str) -> Optional[bytes]:
+        with self._lock:
+            data = self._entries.get(cache_key)
+            if data is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(cache_key)
+            self.hits += 1
+            return data
+
+    def put(self, cache_key: str, data: bytes) -> None:
+        data = bytes(data or b"")
+        if not data or len(data) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(cache_key, None)
+            if previous is not None:
+                self._total_bytes -= len(previous)
+            self._entries[cache_key] = data
+            self._total_bytes += len(data)
+            while self._entries and (
+                len(self._entries) > self.max_entries or self._total_bytes > self.max_bytes
+            ):
+                _key, evicted = self._entries.popitem(last=False)
+                self._total_bytes -= len(evicted)
+
+    def size(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def total_bytes(self) -> int:
+        with self._lock:
+            return self._total_bytes
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+            self.hits = 0
+            self.misses = 0
+
+
+_PDF_CACHE = PDFBytesCache()
+
+
+def get_pdf_cache() -> PDFBytesCache:
+    return _PDF_CACHE
+
+
+def build_pdf_cache_key(kind: str, builder_kwargs: dict[str, Any], branding: dict, ui_lang: str) -> str:
+    """Hash everything that can change the rendered document.
+
+    Branding and the UI language are part of the key because the builders
+    read both (fonts, header/footer, untranslated fallback labels).
+    """
+    payload = {
+        "kind": str(kind or ""),
+        "render_version": PDF_RENDER_VERSION,
+        "kwargs": builder_kwargs or {},
+        "branding": branding or {},
+        "ui_lang": str(ui_lang or ""),
+    }
+    encoded = json.dumps(payload, ensure_ascii=False, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def _resolve_builder(kind: str):
+    try:
+        module_name, func_name = PDF_BUILDERS[kind]
+    except KeyError:
+        raise ValueError(f"Unknown PDF export kind: {kind!r}") from None
+    return getattr(importlib.import_module(module_name), func_name)
+
+
+def _current_ui_lang() -> str:
+    try:
+        return str(st.session_state.get("ui_lang", "en") or "en")
+    except Exception:
+        return "en"
+
+
+def _resolve_branding(branding: Optional[dict]) -> dict:
+    if branding is not None:
+        return dict(branding)
+    from helpers.branding import get_user_branding
+
+    return dict(get_user_branding() or {})
+
+
+def cached_pdf_bytes(
+    kind: str,
+    *,
+    branding: Optional[dict] = None,
+    cache: Optional[PDFBytesCache] = None,
+    **builder_kwargs: Any,
+) -> bytes:
+    """Render ``kind`` through its builder, reusing bytes for identical content.
+
+    Repeated download clicks and Streamlit reruns hit the cache instead of
+    re-running ReportLab.
+    """
+    store = cache or get_pdf_cache()
+    resolved_branding = _resolve_branding(branding)
+    cache_key = build_pdf_cache_key(kind, builder_kwargs, resolved_branding, _current_ui_lang())
+    cached = store.get(cache_key)
+    if cached is not None:
+        return cached
+    data = _resolve_builder(kind)(branding=resolved_branding, **builder_kwargs)
+    store.put(cache_key, data)
+    return data
+
+
+# ---------------------------------------------------------------------------
+# Batch export
+# ---------------------------------------------------------------------------
+
+def _init_pdf_worker(font_key: str, ui_lang: str) -> None:
+    """Per-process setup: register the export font once and pin the UI language."""
+    try:
+        st.session_state["ui_lang"] = ui_lang
+    except Exception:
+        pass
+    from helpers.font_manager import register_font_for_pdf
+
+    register_font_for_pdf(font_key)
+
+
+def _render_pdf_job(kind: str, builder_kwargs: dict[str, Any], branding: dict) -> bytes:
+    return _resolve_builder(kind)(branding=branding, **builder_kwargs)
+
+
+def _default_worker_count(job_count: int) -> int:
+    try:
+        configured = int(os.getenv("PDF_EXPORT_MAX_WORKERS", "") or 0)
+    except ValueError:
+        configured = 0
+    workers = configured or (os.cpu_count() or 1)
+    return max(1, min(workers, job_count))
+
+
+def export_pdfs_batch(
+    jobs: Sequence[tuple[str, dict[str, Any]]],
+    *,
+    branding: Optional[dict] = None,
+    ui_lang: Optional[str] = None,
+    max_workers: Optional[int] = None,
+    cache: Optional[PDFBytesCache] = None,
+) -> list[bytes]:
+    """Render ``(kind, builder_kwargs)`` jobs, returning PDF bytes in job order.
+
+    Branding and language are resolved once here, in the caller's session,
+    and shipped to the worker processes, which have no Streamlit session or
+    Supabase auth of their own. Cached and duplicate documents are not
+    re-rendered; the remaining ones are spread over a process pool.
+    """
+    store = cache or get_pdf_cache()
+    resolved_branding = _resolve_branding(branding)
+    lang = str(ui_lang or _current_ui_lang())
+
+    keys: list[str] = []
+    results: dict[str, bytes] = {}
+    pending: dict[str, tuple[str, dict[str, Any]]] = {}
+    for kind, builder_kwargs in jobs:
+        _resolve_builder(kind)
+        cache_key = build_pdf_cache_key(kind, builder_kwargs, resolved_branding, lang)
+        keys.append(cache_key)
+        if cache_key in results or cache_key in pending:
+            continue
+        cached = store.get(cache_key)
+        if cached is not None:
+            results[cache_key] = cached
+        else:
+            pending[cache_key] = (kind, dict(builder_kwargs))
+
+    workers = max_workers or _default_worker_count(len(pending))
+    if pending and (workers <= 1 or len(pending) == 1):
+        for cache_key, (kind, builder_kwargs) in pending.items():
+            results[cache_key] = _render_pdf_job(kind, builder_kwargs, resolved_branding)
+            store.put(cache_key, results[cache_key])
+    elif pending:
+        # spawn, not fork: the Streamlit server process is multi-threaded.
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(pending)),
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_pdf_worker,
+            initargs=(str(resolved_branding.get("branding_font") or "dejavu"), lang),
+        ) as executor:
+            futures = {
+                cache_key: executor.submit(_render_pdf_job, kind, builder_kwargs, resolved_branding)
+                for cache_key, (kind, builder_kwargs) in pending.items()
+            }
+            for cache_key, future in futures.items():
+                results[cache_key] = future.result()
+                store.put(cache_key, results[cache_key])
+
+    return [results[cache_key] for cache_key in keys]
@@ -8,7 +8,7 @@ import re
 from contextlib import nullcontext
 from datetime import datetime as _dt, timezone
 from io import BytesIO
-from typing import Optional
+from typing import Any, Optional
 
 import pandas as pd
 import streamlit as st
@@ -18,7 +18,9 @@ from core.navigation import clear_open_resource_previews, clear_smart_tool_resul
 from core.state import get_current_user_id, with_owner
 from core.timezone import get_app_tz, today_local
 from services.ai_usage_service import log_ai_usage_event
+from helpers.ai_response_cache import provider_request_rows
 from helpers.archive_utils import ACTIVE_STATUS, ARCHIVED_STATUS, filter_archived_rows, is_archived_status
+from helpers.keyset_pagination import LIBRARY_PAGE_SIZE, KeysetFeed, KeysetPage, fetch_keyset_page
 from helpers.student_personalization import (
     NATIVE_LANGUAGE_OPTIONS,
     apply_native_language_context,
@@ -36,9 +38,12 @@ from helpers.material_recommendations import (
     render_generation_recommendations,
 )
 from helpers.resource_gallery import (
-    extract_gallery_language_label,
+    GALLERY_META_COLUMN,
+    build_gallery_meta,
     extract_gallery_image_url,
+    gallery_card_media,
     inject_resource_gallery_styles,
+    list_columns_without_gallery_meta,
     render_gallery_card_html,
 )
 from helpers.resource_deletion import render_archive_delete_button, render_archive_delete_confirmation
@@ -68,7 +73,10 @@ _LESSON_PLAN_LIST_COLUMNS = ",".join([
     "is_public",
     "status",
     "created_at",
+    GALLERY_META_COLUMN,
 ])
+# Schemas before add_resource_gallery_meta.sql have no projection column.
+_LESSON_PLAN_LEGACY_LIST_COLUMNS = list_columns_without_gallery_meta(_LESSON_PLAN_LIST_COLUMNS)
 
 # ============================================================
 # Cleanup helpers
@@ -552,7 +560,7 @@ def planner_payload_from_inputs(
 
     branding = get_user_branding()
 
-    return with_owner(
+    payload = with_owner(
         {
             "subject": str(subject).strip(),
             "topic": _clean_display_text(topic),
@@ -572,6 +580,8 @@ def planner_payload_from_inputs(
             "created_at": _dt.now(timezone.utc).isoformat(),
         }
     )
+    payload[GALLERY_META_COLUMN] = build_gallery_meta(payload, kind="lesson_plan")
+    return payload
 
 
 def save_lesson_plan_record(
@@ -597,6 +607,7 @@ def save_lesson_plan_record(
             "lesson_plans",
             payload,
             clear_cache=True,
+            optional_columns=(GALLERY_META_COLUMN,),
             context={
                 "resource_type": "lesson_plan",
                 "subject": str(subject).strip(),
@@ -615,9 +626,9 @@ def save_lesson_plan_record(
         return False
 
 
-def load_my_lesson_plans(*, include_archived: bool = False, archived_only: bool = False) -> pd.DataFrame:
+def load_my_lesson_plans(*, include_archived: bool = False, archived_only: bool = False, pages: int = 1) -> pd.DataFrame:
     try:
-        df = _load_my_lesson_plans_cached(str(get_current_user_id() or ""))
+        df = _load_my_lesson_plans_cached(str(get_current_user_id() or ""), pages=pages)
         if df is None or df.empty:
             return pd.DataFrame()
         return filter_archived_rows(
@@ -636,49 +647,63 @@ def _normalize_lesson_plan_frame(rows: list[dict] | None) -> pd.DataFrame:
         return pd.DataFrame()
     if "created_at" in df.columns:
         df["created_at"] = pd.to_datetime(df["created_at"], errors="coerce")
-        df = df.sort_values("created_at", ascending=False, na_position="last")
+        df = df.sort_values("created_at", ascending=False, na_position="last", kind="stable")
     return df
 
 
+def _load_lesson_plan_list_rows(scope_column: str, scope_value: Any, cursor_token: str = "", page_size: int = LIBRARY_PAGE_SIZE) -> KeysetPage:
+    try:
+        query = get_sb().table("lesson_plans").select(_LESSON_PLAN_LIST_COLUMNS).eq(scope_column, scope_value)
+        return fetch_keyset_page(query, cursor_token, page_size)
+    except Exception:
+        query = get_sb().table("lesson_plans").select(_LESSON_PLAN_LEGACY_LIST_COLUMNS).eq(scope_column, scope_value)
+        return fetch_keyset_page(query, cursor_token, page_size)
+
+
+@st.cache_data(ttl=120, show_spinner=False)
+def _load_my_lesson_plans_page_cached(uid: str, cursor_token: str = "", page_size: int = LIBRARY_PAGE_SIZE) -> KeysetPage:
+    if not uid:
+        return KeysetPage([], "")
+    return _load_lesson_plan_list_rows("user_id", uid, cursor_token, page_size)
+
+
+register_cache(_load_my_lesson_plans_page_cached, "lesson_plans", "resources")
+
+
+@st.cache_data(ttl=180, show_spinner=False)
+def _load_public_lesson_plans_page_cached(_scope: str = "", cursor_token: str = "", page_size: int = LIBRARY_PAGE_SIZE) -> KeysetPage:
+    return _load_lesson_plan_list_rows("is_public", True, cursor_token, page_size)
+
+
+register_cache(_load_public_lesson_plans_page_cached, "lesson_plans", "resources")
+
+MY_LESSON_PLANS_FEED = KeysetFeed(_load_my_lesson_plans_page_cached)
+PUBLIC_LESSON_PLANS_FEED = KeysetFeed(_load_public_lesson_plans_page_cached)
+
+
 @st.cache_data(ttl=120, show_spinner=False)
-def _load_my_lesson_plans_cached(uid: str, limit: int = 120) -> pd.DataFrame:
+def _load_my_lesson_plans_cached(uid: str, limit: int = LIBRARY_PAGE_SIZE, pages: int = 1) -> pd.DataFrame:
     if not uid:
         return pd.DataFrame()
-    res = (
-        get_sb()
-        .table("lesson_plans")
-        .select(_LESSON_PLAN_LIST_COLUMNS)
-        .eq("user_id", uid)
-        .order("created_at", desc=True)
-        .limit(limit)
-        .execute()
-    )
-    return _normalize_lesson_plan_frame(getattr(res, "data", None) or [])
+    rows, _has_more = MY_LESSON_PLANS_FEED.window(uid, pages, page_size=limit)
+    return _normalize_lesson_plan_frame(rows)
 
 
 register_cache(_load_my_lesson_plans_cached, "lesson_plans", "resources")
 
 
 @st.cache_data(ttl=180, show_spinner=False)
-def _load_public_lesson_plans_cached(limit: int = 120) -> pd.DataFrame:
-    res = (
-        get_sb()
-        .table("lesson_plans")
-        .select(_LESSON_PLAN_LIST_COLUMNS)
-        .eq("is_public", True)
-        .order("created_at", desc=True)
-        .limit(limit)
-        .execute()
-    )
-    return _normalize_lesson_plan_frame(getattr(res, "data", None) or [])
+def _load_public_lesson_plans_cached(limit: int = LIBRARY_PAGE_SIZE, pages: int = 1) -> pd.DataFrame:
+    rows, _has_more = PUBLIC_LESSON_PLANS_FEED.window("", pages, page_size=limit)
+    return _normalize_lesson_plan_frame(rows)
 
 
 register_cache(_load_public_lesson_plans_cached, "lesson_plans", "resources")
 
 
-def load_public_lesson_plans() -> pd.DataFrame:
+def load_public_lesson_plans(*, pages: int = 1) -> pd.DataFrame:
     try:
-        return filter_archived_rows(_load_public_lesson_plans_cached())
+        return filter_archived_rows(_load_public_lesson_plans_cached(pages=pages))
     except Exception as exc:
         show_data_load_error(exc)
         return pd.DataFrame()
@@ -713,6 +738,22 @@ def load_lesson_plan_record(plan_id) -> dict:
 register_cache(load_lesson_plan_record, "lesson_plans", "resources")
 
 
+def _update_lesson_plan_row(safe_id: Any, uid: str, payload: dict) -> None:
+    """Update one lesson plan, retrying without columns older schemas lack."""
+    attempts = [
+        payload,
+        {key: value for key, value in payload.items() if key != "updated_at"},
+        {key: value for key, value in payload.items() if key not in {"updated_at", GALLERY_META_COLUMN}},
+    ]
+    for attempt in attempts[:-1]:
+        try:
+            get_sb().table("lesson_plans").update(attempt).eq("id", safe_id).eq("user_id", uid).execute()
+            return
+        except Exception:
+            continue
+    get_sb().table("lesson_plans").update(attempts[-1]).eq("id", safe_id).eq("user_id", uid).execute()
+
+
 def _persist_lesson_plan_cover(plan_id: int | str, plan: dict) -> bool:
     uid = str(get_current_user_id() or "").strip()
     if not uid or plan_id in (None, "", 0, "0"):
@@ -722,17 +763,15 @@ def _persist_lesson_plan_cover(plan_id: int | str, plan: dict) -> bool:
     existing_row = load_lesson_plan_record(safe_id) or {}
     clean_plan = preserve_generated_media_fields(clean_plan, existing_row.get("plan_json") or existing_row)
     try:
-        try:
-            get_sb().table("lesson_plans").update(
-                {
-                    "plan_json": clean_plan,
-                    "updated_at": _dt.now(timezone.utc).isoformat(),
-                }
-            ).eq("id", safe_id).eq("user_id", uid).execute()
-        except Exception:
-            get_sb().table("lesson_plans").update(
-                {"plan_json": clean_plan}
-            ).eq("id", safe_id).eq("user_id", uid).execute()
+        _update_lesson_plan_row(
+            safe_id,
+            uid,
+            {
+                "plan_json": clean_plan,
+                GALLERY_META_COLUMN: build_gallery_meta({**existing_row, "plan_json": clean_plan}, kind="lesson_plan"),
+                "updated_at": _dt.now(timezone.utc).isoformat(),
+            },
+        )
         _clear_lesson_plan_caches()
         try:
             load_lesson_plan_record.clear()
@@ -752,22 +791,19 @@ def _persist_lesson_plan_resource(plan_id: int | str, plan: dict) -> bool:
         return False
     safe_id = int(str(plan_id).strip()) if str(plan_id).strip().isdigit() else plan_id
     clean_plan = _clean_plan_data(plan)
+    existing_row = load_lesson_plan_record(safe_id) or {}
+    title = _clean_display_text(clean_plan.get("title") or "")
     try:
-        try:
-            get_sb().table("lesson_plans").update(
-                {
-                    "plan_json": clean_plan,
-                    "title": _clean_display_text(clean_plan.get("title") or ""),
-                    "updated_at": _dt.now(timezone.utc).isoformat(),
-                }
-            ).eq("id", safe_id).eq("user_id", uid).execute()
-        except Exception:
-            get_sb().table("lesson_plans").update(
-                {
-                    "plan_json": clean_plan,
-                    "title": _clean_display_text(clean_plan.get("title") or ""),
-                }
-            ).eq("id", safe_id).eq("user_id", uid).execute()
+        _update_lesson_plan_row(
+            safe_id,
+            uid,
+            {
+                "plan_json": clean_plan,
+                "title": title,
+                GALLERY_META_COLUMN: build_gallery_meta({**existing_row, "plan_json": clean_plan, "title": title}, kind="lesson_plan"),
+                "updated_at": _dt.now(timezone.utc).isoformat(),
+            },
+        )
         _clear_lesson_plan_caches()
         try:
             load_lesson_plan_record.clear()
@@ -988,12 +1024,7 @@ def render_plan_library_cards(
             safe_title = html.escape(title)
             safe_author = html.escape(author_name)
             preview_text = html.escape((topic or t("no_description_available"))[:180])
-            full_payload = dict(row or {})
-            if not extract_gallery_image_url(full_payload) and plan_id not in (None, "", 0, "0"):
-                full_row = load_lesson_plan_record(plan_id) or {}
-                full_payload = full_row or full_payload
-            hero_image = extract_gallery_image_url(full_payload)
-            language_label = extract_gallery_language_label(full_payload)
+            hero_image, language_label = gallery_card_media(row, load_lesson_plan_record)
 
             chips = "".join(
                 [
@@ -1200,7 +1231,9 @@ def get_ai_planner_usage_status() -> dict:
     today_df = planner_df[(planner_df["created_at"].notna()) & (planner_df["created_at"] >= today_start_utc)].copy()
     used_today = int(len(today_df))
 
-    cooldown_df = df[df["feature_name"] == "quick_lesson_ai"].dropna(subset=["created_at"]).sort_values("created_at")
+    cooldown_df = provider_request_rows(
+        df[df["feature_name"] == "quick_lesson_ai"].dropna(subset=["created_at"]).sort_values("created_at")
+    )
     cooldown_ok = True
     seconds_left = 0
     last_request_at = None
@@ -1396,7 +1429,10 @@ def render_quick_lesson_plan_result(
                 st.markdown(f"**{label}**")
                 _render_material_body(label, value, style, key, action_key_prefix)
 
-    pdf_bytes = build_lesson_plan_pdf_bytes(
+    from helpers.pdf_export import cached_pdf_bytes
+
+    pdf_bytes = cached_pdf_bytes(
+        "lesson_plan",
         plan=plan,
         subject=subject,
         learner_stage=learner_stage,
@@ -1626,6 +1662,7 @@ def build_lesson_plan_pdf_bytes(
     level_or_band: str = "",
     lesson_purpose: str = "",
     topic: str = "",
+    branding: dict | None = None,
 ) -> bytes:
     plan = _clean_plan_data(plan)
 
@@ -1655,7 +1692,7 @@ def build_lesson_plan_pdf_bytes(
 
     # Use user's font/size preference
     from helpers.branding import get_user_branding as _get_branding
-    _branding_cfg = _get_branding()
+    _branding_cfg = branding if branding is not None else _get_branding()
     _font_key = _branding_cfg.get("branding_font", "dejavu")
     _size_key = _branding_cfg.get("branding_font_size", "standard")
 
@@ -1757,7 +1794,7 @@ def build_lesson_plan_pdf_bytes(
     # Header/logo — branding-aware (no school layout for lesson plans)
     from helpers.branding import get_user_branding, build_pdf_footer_handler, has_custom_branding, LOGO_MAX_HEIGHT_CM
 
-    _branding = get_user_branding()
+    _branding = branding if branding is not None else get_user_branding()
     _header_enabled = _branding.get("header_enabled", False)
     _logo_url = str(_branding.get("header_logo_url") or "").strip()
     _brand_name = str(_branding.get("brand_name") or "").strip()
@@ -2126,6 +2163,11 @@ def render_quick_lesson_planner_expander(*, embedded: bool = False) -> None:
             else t("generate_plan")
         )
 
+        force_fresh_plan = (
+            st.checkbox(t("ai_force_fresh_generation"), key="quick_plan_force_fresh", help=t("ai_force_fresh_generation_help"))
+            if quick_plan_mode == "ai"
+            else False
+        )
         if st.button(generate_plan_label, key="btn_generate_quick_plan", use_container_width=True):
             if subject == "other" and not other_subject_name:
                 st.error(t("enter_subject_name"))
@@ -2213,6 +2255,7 @@ def render_quick_lesson_planner_expander(*, embedded: bool = False) -> None:
                         lesson_purpose=lesson_purpose,
                         topic=effective_topic,
                         student_profile=student_profile,
+                        force_fresh=force_fresh_plan,
                     )
 
                     debug_baseline_plan = {}
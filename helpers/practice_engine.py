@@ -12,7 +12,10 @@ import json
 import ast
 import html
 import copy
+import hashlib
+import threading
 import unicodedata
+from collections import OrderedDict
 import streamlit as st
 import pandas as pd
 from datetime import datetime as _dt, timezone
@@ -338,7 +341,13 @@ def worksheet_to_exercises(ws: dict, *, row_id: int | None = None) -> dict:
         normalized_words = _normalize_wordsearch_words(words) if _normalize_wordsearch_words else [str(w).strip().upper() for w in words if str(w).strip()]
         if normalized_words and _generate_wordsearch_grid:
             seed = "|".join(normalized_words)
-            grid, placed_words, placements = _generate_wordsearch_grid(normalized_words, seed=seed)
+            from helpers.wordsearch_layout import wordsearch_layout_version
+
+            grid, placed_words, placements = _generate_wordsearch_grid(
+                normalized_words,
+                seed=seed,
+                layout_version=wordsearch_layout_version(ws),
+            )
             if grid and placed_words:
                 exercises.append({
                     "type": "word_search_vocab",
@@ -658,50 +667,43 @@ def _fold_text(value) -> str:
     return "".join(ch for ch in normalized if not unicodedata.combining(ch))
 
 
+_ANSWER_QUOTE_TRANSLATION = str.maketrans({"’": "'", "‘": "'", "“": '"', "”": '"', "—": "-", "–": "-"})
+_ANSWER_PUNCTUATION_RE = re.compile(r"[^\w\s'/-]", flags=re.UNICODE)
+_ANSWER_WHITESPACE_RE = re.compile(r"\s+")
+_ANSWER_SPACE_BEFORE_PUNCTUATION_RE = re.compile(r"\s+([,;:.!?])")
+_ANSWER_TRAILING_STOP_RE = re.compile(r"[.!?]+$")
+_ANSWER_WORD_RE = re.compile(r"[a-z0-9]+")
+_ANSWER_STOP_WORDS = frozenset({
+    "a", "an", "the", "is", "are", "was", "were", "be", "been", "being",
+    "it", "its", "to", "of", "in", "on", "at", "for", "and", "or", "but",
+    "by", "as", "with", "from", "that", "this", "also", "very", "than",
+    "not", "no", "do", "does", "did", "has", "have", "had", "will",
+    "can", "could", "would", "should", "may", "might",
+})
+
+
 def _normalize_answer(s: str) -> str:
     """Normalize an answer for comparison across multilingual open-text inputs."""
-    text = (
-        str(s or "")
-        .replace("’", "'")
-        .replace("‘", "'")
-        .replace("“", '"')
-        .replace("”", '"')
-        .replace("—", "-")
-        .replace("–", "-")
-    )
+    text = str(s or "").translate(_ANSWER_QUOTE_TRANSLATION)
     text = _fold_text(text).lower()
-    text = re.sub(r"[^\w\s'/-]", " ", text, flags=re.UNICODE)
-    return re.sub(r"\s+", " ", text).strip()
+    text = _ANSWER_PUNCTUATION_RE.sub(" ", text)
+    return _ANSWER_WHITESPACE_RE.sub(" ", text).strip()
 
 
 def _normalize_error_correction_answer(s: str) -> str:
     """Normalize a rewritten correction while keeping the wording strict."""
     text = _fold_text(str(s or "").strip()).lower()
-    text = (
-        text.replace("’", "'")
-        .replace("‘", "'")
-        .replace("“", '"')
-        .replace("”", '"')
-        .replace("—", "-")
-        .replace("–", "-")
-    )
-    text = re.sub(r"\s+", " ", text)
-    text = re.sub(r"\s+([,;:.!?])", r"\1", text)
-    text = re.sub(r"[.!?]+$", "", text).strip()
+    text = text.translate(_ANSWER_QUOTE_TRANSLATION)
+    text = _ANSWER_WHITESPACE_RE.sub(" ", text)
+    text = _ANSWER_SPACE_BEFORE_PUNCTUATION_RE.sub(r"\1", text)
+    text = _ANSWER_TRAILING_STOP_RE.sub("", text).strip()
     return text
 
 
 def _answer_words(s: str) -> set[str]:
     """Extract meaningful words from a normalized answer, dropping stop words."""
-    _STOP = {
-        "a", "an", "the", "is", "are", "was", "were", "be", "been", "being",
-        "it", "its", "to", "of", "in", "on", "at", "for", "and", "or", "but",
-        "by", "as", "with", "from", "that", "this", "also", "very", "than",
-        "not", "no", "do", "does", "did", "has", "have", "had", "will",
-        "can", "could", "would", "should", "may", "might",
-    }
-    words = set(re.findall(r"[a-z0-9]+", _normalize_answer(s)))
-    return words - _STOP
+    words = set(_ANSWER_WORD_RE.findall(_normalize_answer(s)))
+    return words - _ANSWER_STOP_WORDS
 
 
 def _strip_leading_number(text: str) -> str:
@@ -882,16 +884,22 @@ def _is_short_text_type(ex_type: str) -> bool:
     }
 
 
-def _canonical_true_false(value: str) -> str:
-    text = _normalize_answer(value)
-    truthy = {
+def _true_false_vocabulary() -> tuple[frozenset[str], frozenset[str]]:
+    """Normalized spellings of true and false, including the current UI labels."""
+    truthy = frozenset({
         _normalize_answer(t("quick_exam_true_label")),
         "true", "t", "yes", "dogru", "doğru", "verdadero",
-    }
-    falsy = {
+    })
+    falsy = frozenset({
         _normalize_answer(t("quick_exam_false_label")),
         "false", "f", "no", "yanlis", "yanlış", "falso",
-    }
+    })
+    return truthy, falsy
+
+
+def _canonical_true_false(value: str, vocabulary: tuple[frozenset[str], frozenset[str]] | None = None) -> str:
+    text = _normalize_answer(value)
+    truthy, falsy = vocabulary or _true_false_vocabulary()
     if text in truthy:
         return "true"
     if text in falsy:
@@ -909,10 +917,12 @@ def _sentence_count(text: str) -> int:
 
 
 def _writing_prompt_feedback(student: str, correct) -> dict:
-    expected = _comparison_answer_text(correct)
-    expected_display = _display_answer_text(correct)
+    expected_norm = _normalize_answer(_comparison_answer_text(correct))
+    return _writing_prompt_feedback_for(student, _display_answer_text(correct), _answer_words(expected_norm))
+
+
+def _writing_prompt_feedback_for(student: str, expected_display: str, expected_words: set[str]) -> dict:
     student_norm = _normalize_answer(student)
-    expected_norm = _normalize_answer(expected)
 
     if not student_norm:
         return {
@@ -922,7 +932,6 @@ def _writing_prompt_feedback(student: str, correct) -> dict:
             "feedback_lines": [t("writing_feedback_missing_response")],
         }
 
-    expected_words = _answer_words(expected_norm)
     student_words = _answer_words(student_norm)
     overlap_ratio = (len(expected_words & student_words) / len(expected_words)) if expected_words else 0.0
     words = _word_count(student)
@@ -1002,7 +1011,10 @@ def _normalize_wordsearch_words(value) -> list[str]:
 
 
 def _wordsearch_feedback(student: str, correct) -> dict:
-    expected_words = _normalize_wordsearch_words(correct)
+    return _wordsearch_feedback_for(student, _normalize_wordsearch_words(correct))
+
+
+def _wordsearch_feedback_for(student: str, expected_words: list[str]) -> dict:
     found_words = _normalize_wordsearch_words(student)
     if not expected_words:
         return {
@@ -1353,6 +1365,7 @@ def render_practice_session(exercise_data: dict, session_key: str = "practice")
     correct_q  = 0
     cur_streak = 0
     best_streak = 0
+    answer_key = compile_answer_key(exercise_data) if is_submitted else None
 
     for ex_idx, exercise in enumerate(exercises):
         ex_type    = exercise.get("type", "")
@@ -1404,7 +1417,7 @@ def render_practice_session(exercise_data: dict, session_key: str = "practice")
             student_answers[q_key] = student_ans
 
             if is_submitted:
-                evaluation = _evaluate_answer(ex_type, student_ans, correct)
+                evaluation = answer_key.evaluate(ex_idx, 0, student_ans)
                 persisted_review = review_question_state.get(q_key) if isinstance(review_question_state, dict) else None
                 if review_mode and isinstance(persisted_review, dict):
                     evaluation["is_correct"] = bool(persisted_review.get("is_correct"))
@@ -1459,7 +1472,7 @@ def render_practice_session(exercise_data: dict, session_key: str = "practice")
                         "expected": str(persisted_review.get("expected") or _display_answer_text(correct)),
                     }
                 else:
-                    evaluation = _evaluate_answer(ex_type, student_ans, correct)
+                    evaluation = answer_key.evaluate(ex_idx, q_idx, student_ans)
                 if ex_type == "true_false" and not persisted_review and not _canonical_true_false(_comparison_answer_text(correct)):
                     cur_streak = 0
                     st.warning(t("true_false_feedback_missing_answer_key"))
@@ -2072,48 +2085,163 @@ def _render_wordsearch_question(question, q_key: str, is_submitted: bool) -> str
 
 def _check_answer(ex_type: str, student: str, correct) -> bool:
     """Compare student answer to correct answer. Returns True if correct."""
-    s = _normalize_answer(student)
-    if not s:
-        return False
+    return _CompiledAnswer(ex_type, correct, _true_false_vocabulary()).check(student)
 
-    if ex_type == "true_false":
-        s = _canonical_true_false(student)
-        c = _canonical_true_false(_comparison_answer_text(correct))
-    else:
-        c = _normalize_answer(_comparison_answer_text(correct))
 
-    if not c:
-        return False
+class _CompiledAnswer:
+    """One expected answer with everything derived from the key precomputed.
+
+    Only the student's side is normalized per check; the outcome is the same
+    as comparing against the raw key.
+    """
 
-    if ex_type in ("multiple_choice", "true_false", "matching"):
-        return s == c
+    __slots__ = ("ex_type", "display", "norm", "canonical", "exact", "words", "wordsearch_words", "vocabulary")
 
-    if ex_type == "error_correction":
-        student_exact = _normalize_error_correction_answer(student)
-        correct_exact = _normalize_error_correction_answer(_comparison_answer_text(correct))
-        if not correct_exact:
+    def __init__(self, ex_type: str, correct, vocabulary: tuple[frozenset[str], frozenset[str]]):
+        self.ex_type = ex_type
+        self.vocabulary = vocabulary
+        self.display = _display_answer_text(correct)
+        self.canonical = ""
+        self.exact = ""
+        self.wordsearch_words: list[str] = []
+        if ex_type == "word_search_vocab":
+            self.wordsearch_words = _normalize_wordsearch_words(correct)
+            self.norm = ""
+            self.words: set[str] = set()
+            return
+        comparison = _comparison_answer_text(correct)
+        self.norm = _normalize_answer(comparison)
+        self.words = _answer_words(self.norm)
+        if ex_type == "true_false":
+            self.canonical = _canonical_true_false(comparison, vocabulary)
+        elif ex_type == "error_correction":
+            self.exact = _normalize_error_correction_answer(comparison)
+
+    def check(self, student: str) -> bool:
+        s = _normalize_answer(student)
+        if not s:
             return False
-        return student_exact == correct_exact
 
-    # Flexible text comparison for fill-in, matching, vocabulary, etc.
-    if s == c:
-        return True
+        if self.ex_type == "true_false":
+            s = _canonical_true_false(student, self.vocabulary)
+            c = self.canonical
+        else:
+            c = self.norm
 
-    # Check if student answer is contained in correct (handles extra words)
-    if c in s or s in c:
-        return True
+        if not c:
+            return False
+
+        if self.ex_type in ("multiple_choice", "true_false", "matching"):
+            return s == c
+
+        if self.ex_type == "error_correction":
+            if not self.exact:
+                return False
+            return _normalize_error_correction_answer(student) == self.exact
 
-    # Word-overlap scoring for short_answer / reading_comprehension / open types
-    # Accept if ≥55% of the key words from the correct answer appear in the
-    # student response. This handles paraphrasing, quoting from a passage, etc.
-    c_words = _answer_words(c)
-    if c_words:
-        s_words = _answer_words(s)
-        overlap = len(c_words & s_words)
-        if overlap / len(c_words) >= 0.55:
+        # Flexible text comparison for fill-in, matching, vocabulary, etc.
+        if s == c:
             return True
 
-    return False
+        # Check if student answer is contained in correct (handles extra words)
+        if c in s or s in c:
+            return True
+
+        # Word-overlap scoring for short_answer / reading_comprehension / open types
+        # Accept if ≥55% of the key words from the correct answer appear in the
+        # student response. This handles paraphrasing, quoting from a passage, etc.
+        if self.words:
+            s_words = _answer_words(s)
+            overlap = len(self.words & s_words)
+            if overlap / len(self.words) >= 0.55:
+                return True
+
+        return False
+
+    def evaluate(self, student: str) -> dict:
+        if self.ex_type == "writing_prompt":
+            return _writing_prompt_feedback_for(student, self.display, self.words)
+        if self.ex_type == "word_search_vocab":
+            return _wordsearch_feedback_for(student, self.wordsearch_words)
+        is_correct = self.check(student)
+        return {
+            "is_correct": is_correct,
+            "score": 1.0 if is_correct else 0.0,
+            "expected": self.display,
+            "feedback_lines": [],
+        }
+
+
+class AnswerKeyMatcher:
+    """A resource's answer key compiled once for repeated scoring.
+
+    ``evaluate`` returns exactly what ``_evaluate_answer`` returns for the
+    same exercise type, student answer and key entry.
+    """
+
+    def __init__(self, exercise_data: dict, vocabulary: tuple[frozenset[str], frozenset[str]] | None = None):
+        vocabulary = vocabulary or _true_false_vocabulary()
+        self._answers: dict[tuple[int, int], _CompiledAnswer] = {}
+        for ex_idx, exercise in enumerate((exercise_data or {}).get("exercises") or []):
+            ex_type = str(exercise.get("type") or "")
+            correct_answers = exercise.get("answers") or []
+            for q_idx in range(len(exercise.get("questions") or [])):
+                correct = correct_answers[q_idx] if q_idx < len(correct_answers) else ""
+                self._answers[(ex_idx, q_idx)] = _CompiledAnswer(ex_type, correct, vocabulary)
+            if ex_type == "word_search_vocab" and (ex_idx, 0) not in self._answers:
+                # A word search is scored as one item even without a question row.
+                self._answers[(ex_idx, 0)] = _CompiledAnswer(ex_type, correct_answers[0] if correct_answers else [], vocabulary)
+
+    def answer(self, ex_idx: int, q_idx: int) -> _CompiledAnswer | None:
+        return self._answers.get((ex_idx, q_idx))
+
+    def evaluate(self, ex_idx: int, q_idx: int, student: str) -> dict:
+        return self._answers[(ex_idx, q_idx)].evaluate(student)
+
+    def is_correct(self, ex_idx: int, q_idx: int, student: str) -> bool:
+        compiled = self._answers[(ex_idx, q_idx)]
+        if compiled.ex_type in ("writing_prompt", "word_search_vocab"):
+            return bool(compiled.evaluate(student)["is_correct"])
+        return compiled.check(student)
+
+    def expected_display(self, ex_idx: int, q_idx: int) -> str:
+        return self._answers[(ex_idx, q_idx)].display
+
+
+_ANSWER_MATCHER_CACHE: OrderedDict[tuple, AnswerKeyMatcher] = OrderedDict()
+_ANSWER_MATCHER_CACHE_SIZE = 256
+_ANSWER_MATCHER_LOCK = threading.Lock()
+
+
+def _answer_key_version(exercise_data: dict) -> str:
+    key_material = [
+        (exercise.get("type"), exercise.get("answers"), len(exercise.get("questions") or []))
+        for exercise in (exercise_data or {}).get("exercises") or []
+    ]
+    raw = json.dumps(key_material, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def compile_answer_key(exercise_data: dict) -> AnswerKeyMatcher:
+    """The compiled matcher for ``exercise_data``, shared by every session of the same key.
+
+    Matchers are cached by a hash of the answer key (the resource version as
+    far as scoring is concerned) and the true/false labels in use, which
+    depend on the UI language.
+    """
+    vocabulary = _true_false_vocabulary()
+    cache_key = (_answer_key_version(exercise_data), vocabulary)
+    with _ANSWER_MATCHER_LOCK:
+        matcher = _ANSWER_MATCHER_CACHE.get(cache_key)
+        if matcher is not None:
+            _ANSWER_MATCHER_CACHE.move_to_end(cache_key)
+            return matcher
+    matcher = AnswerKeyMatcher(exercise_data, vocabulary)
+    with _ANSWER_MATCHER_LOCK:
+        _ANSWER_MATCHER_CACHE[cache_key] = matcher
+        while len(_ANSWER_MATCHER_CACHE) > _ANSWER_MATCHER_CACHE_SIZE:
+            _ANSWER_MATCHER_CACHE.popitem(last=False)
+    return matcher
 
 
 # ════════════════════════════════════════════════════════════════
@@ -2309,6 +2437,7 @@ def save_practice_answers(
         return
 
     exercises = exercise_data.get("exercises") or []
+    answer_key = compile_answer_key(exercise_data)
     rows = []
 
     for ex_idx, exercise in enumerate(exercises):
@@ -2322,9 +2451,8 @@ def save_practice_answers(
                 student_answers.get(q_key, ""),
                 ex_type=ex_type,
             )
-            correct_ans = correct_answers[q_idx] if q_idx < len(correct_answers) else ""
-            correct_str = _display_answer_text(correct_ans)
-            is_correct = _evaluate_answer(ex_type, student_ans, correct_ans)["is_correct"]
+            correct_str = answer_key.expected_display(ex_idx, q_idx)
+            is_correct = answer_key.is_correct(ex_idx, q_idx, student_ans)
 
             rows.append({
                 "session_id": session_id,
@@ -2469,6 +2597,7 @@ def update_practice_progress(
     # Aggregate by exercise type
     type_stats: dict[str, dict] = {}
     exercises = exercise_data.get("exercises") or []
+    answer_key = compile_answer_key(exercise_data)
 
     for ex_idx, exercise in enumerate(exercises):
         ex_type = exercise.get("type", "unknown")
@@ -2484,8 +2613,7 @@ def update_practice_progress(
                 student_answers.get(q_key, ""),
                 ex_type=ex_type,
             )
-            correct_ans = correct_answers[q_idx] if q_idx < len(correct_answers) else ""
-            is_right = _evaluate_answer(ex_type, student_ans, correct_ans)["is_correct"]
+            is_right = answer_key.is_correct(ex_idx, q_idx, student_ans)
 
             type_stats[ex_type]["attempted"] += 1
             if is_right:
@@ -3596,7 +3724,9 @@ def _evaluate_saved_practice_answers(
     *,
     previous_exercise_data: dict | None = None,
     teacher_overrides: dict[tuple[int, int], bool] | None = None,
+    answer_key: AnswerKeyMatcher | None = None,
 ) -> tuple[list[dict], dict]:
+    answer_key = answer_key or compile_answer_key(exercise_data)
     answers_by_position = _reconcile_saved_answer_rows(
         exercise_data,
         answer_rows,
@@ -3615,7 +3745,6 @@ def _evaluate_saved_practice_answers(
     for ex_idx, exercise in enumerate(exercise_data.get("exercises") or []):
         ex_type = str(exercise.get("type") or "")
         questions = exercise.get("questions") or []
-        correct_answers = exercise.get("answers") or []
 
         if ex_type == "word_search_vocab":
             old_position, old_row = answers_by_position.get((ex_idx, 0), ((ex_idx, 0), {}))
@@ -3623,10 +3752,10 @@ def _evaluate_saved_practice_answers(
                 old_row.get("student_answer"),
                 ex_type=ex_type,
             )
-            correct = correct_answers[0] if correct_answers else []
-            evaluation = _evaluate_answer(ex_type, student_ans, correct)
+            compiled = answer_key.answer(ex_idx, 0)
+            evaluation = compiled.evaluate(student_ans)
             found_count = int(evaluation.get("correct_count", 0))
-            total_count = int(evaluation.get("total_count", len(_normalize_wordsearch_words(correct))))
+            total_count = int(evaluation.get("total_count", len(compiled.wordsearch_words)))
             if old_position in teacher_overrides:
                 evaluation["is_correct"] = bool(teacher_overrides[old_position])
                 found_count = total_count if evaluation["is_correct"] else 0
@@ -3645,7 +3774,7 @@ def _evaluate_saved_practice_answers(
                     "question_idx": 0,
                     "exercise_type": ex_type,
                     "student_answer": student_ans,
-                    "correct_answer": _display_answer_text(correct),
+                    "correct_answer": compiled.display,
                     "is_correct": bool(evaluation.get("is_correct")),
                     "answered_at": str(old_row.get("answered_at") or _dt.now(timezone.utc).isoformat()),
                 }
@@ -3658,12 +3787,12 @@ def _evaluate_saved_practice_answers(
                 old_row.get("student_answer"),
                 ex_type=ex_type,
             )
-            correct = correct_answers[q_idx] if q_idx < len(correct_answers) else ""
-            evaluation = _evaluate_answer(ex_type, student_ans, correct)
+            compiled = answer_key.answer(ex_idx, q_idx)
+            evaluation = compiled.evaluate(student_ans)
             if old_position in teacher_overrides:
                 evaluation["is_correct"] = bool(teacher_overrides[old_position])
             total_q += 1
-            if ex_type == "true_false" and not _canonical_true_false(_comparison_answer_text(correct)):
+            if ex_type == "true_false" and not compiled.canonical:
                 cur_streak = 0
             elif evaluation["is_correct"]:
                 correct_q += 1
@@ -3679,7 +3808,7 @@ def _evaluate_saved_practice_answers(
                     "question_idx": q_idx,
                     "exercise_type": ex_type,
                     "student_answer": student_ans,
-                    "correct_answer": _display_answer_text(correct),
+                    "correct_answer": compiled.display,
                     "is_correct": bool(evaluation.get("is_correct")),
                     "answered_at": str(old_row.get("answered_at") or _dt.now(timezone.utc).isoformat()),
                 }
@@ -3991,6 +4120,9 @@ def rescore_practice_sessions_for_resource(source_type: str, resource_id, exerci
         answers_by_session.setdefault(int(row.get("session_id") or 0), []).append(row)
 
     teacher_overrides = _teacher_overrides_by_session(session_ids)
+    # Every rescored session shares the resource's exercises, so its answer
+    # key is compiled once for the whole pass.
+    answer_key = compile_answer_key(exercise_data)
 
     rescored_session_ids: list[int] = []
     impacted_user_ids: set[str] = set()
@@ -4018,6 +4150,7 @@ def rescore_practice_sessions_for_resource(source_type: str, resource_id, exerci
             session_answer_rows,
             previous_exercise_data=_coerce_exercise_data(session_row.get("exercise_data")),
             teacher_overrides=teacher_overrides.get(session_id),
+            answer_key=answer_key,
         )
         try:
             (
@@ -6,7 +6,7 @@ from core.state import get_current_user_id
 from core.database import get_sb, clear_app_caches
 from core.timezone import now_local
 from core.database import get_sb, load_table, load_students
-from core.database import clear_app_caches
+from core.database import clear_app_caches, register_cache
 from helpers.currency import CURRENCIES, CURRENCY_CODES, get_preferred_currency, currency_symbol, format_currency
 
 # 07.6) PRICING ITEMS HELPERS
@@ -54,6 +54,9 @@ def _load_pricing_items_cached(uid: str) -> pd.DataFrame:
     return df
 
 
+register_cache(_load_pricing_items_cached, "pricing")
+
+
 def load_pricing_items() -> pd.DataFrame:
     uid = get_current_user_id()
     return _load_pricing_items_cached(uid)
@@ -11,6 +11,7 @@ from collections import OrderedDict
 from core.i18n import t
 from services.ai_usage_service import with_provider_chain
 from translations import I18N
+from helpers.ai_response_cache import CACHE_HIT, CACHE_HIT_LOG_STATUS, cached_ai_generation
 from helpers.answer_key_utils import clean_answer_key_item, split_answer_key_items
 from helpers.generation_guidance import (
     build_expert_panel_prompt_blurb,
@@ -39,6 +40,7 @@ from helpers.visual_support import enrich_exam_with_visuals
 
 AI_EXAM_DAILY_LIMIT = 3
 AI_EXAM_COOLDOWN_SECONDS = 10
+EXAM_PROMPT_VERSION = "1"
 
 EXAM_LENGTHS = ["short", "medium", "long"]
 
@@ -1353,6 +1355,7 @@ def generate_ai_exam(
     student_profile: dict | None = None,
     *,
     include_visuals: bool = True,
+    force_fresh: bool = False,
 ) -> tuple[dict, dict]:
     subject_group = get_subject_group(subject)
 
@@ -1371,40 +1374,42 @@ def generate_ai_exam(
         "student_profile": student_profile or {},
     }
 
-    system_prompt, user_prompt = _build_exam_prompts(payload)
-    provider_order = _lp().get_ai_provider_order()
-
-    errors = []
-    for p in provider_order:
-        try:
-            if p == "gemini":
-                raw = _lp()._generate_with_gemini(system_prompt, user_prompt)
-            elif p == "openrouter":
-                raw = _lp()._generate_with_openrouter(system_prompt, user_prompt)
-            else:
-                raw = _lp()._generate_with_openai(system_prompt, user_prompt)
-
-            parsed = _lp()._extract_json_object_from_text(raw)
-            exam_data, answer_key = normalize_exam_output(parsed)
-            exam_data["title"] = exam_data["title"] or exam_title or "Exam"
-            exam_data["instructions"] = exam_data["instructions"] or instructions
-            quality_issues = _exam_quality_issues(exam_data, answer_key)
-            if quality_issues:
-                raise ValueError("; ".join(quality_issues))
-            if include_visuals:
-                exam_data = enrich_exam_with_visuals(
-                    exam_data,
-                    subject=subject,
-                    learner_stage=learner_stage,
-                    topic=topic,
-                )
-            if isinstance(exam_data, dict):
-                exam_data["_ai_provider"] = p
-            return exam_data, answer_key
-        except Exception as e:
-            errors.append(f"{p}: {e}")
-
-    raise RuntimeError(" | ".join(errors))
+    def _parse(raw: str, p: str) -> tuple[dict, dict]:
+        parsed = _lp()._extract_json_object_from_text(raw)
+        exam_data, answer_key = normalize_exam_output(parsed)
+        exam_data["title"] = exam_data["title"] or exam_title or "Exam"
+        exam_data["instructions"] = exam_data["instructions"] or instructions
+        quality_issues = _exam_quality_issues(exam_data, answer_key)
+        if quality_issues:
+            raise ValueError("; ".join(quality_issues))
+        if include_visuals:
+            exam_data = enrich_exam_with_visuals(
+                exam_data,
+                subject=subject,
+                learner_stage=learner_stage,
+                topic=topic,
+            )
+        if isinstance(exam_data, dict):
+            exam_data["_ai_provider"] = p
+        return exam_data, answer_key
+
+    def _generate() -> dict:
+        system_prompt, user_prompt = _build_exam_prompts(payload)
+        exam_data, answer_key = _lp().run_ai_provider_chain(system_prompt, user_prompt, _parse)
+        return {"exam_data": exam_data, "answer_key": answer_key}
+
+    generated, cache_status = cached_ai_generation(
+        "quick_exam_ai",
+        {**payload, "include_visuals": bool(include_visuals)},
+        _generate,
+        template_version=EXAM_PROMPT_VERSION,
+        force_fresh=force_fresh,
+    )
+    exam_data = generated.get("exam_data") or {}
+    answer_key = generated.get("answer_key") or {}
+    if isinstance(exam_data, dict):
+        exam_data["_ai_cache"] = cache_status
+    return exam_data, answer_key
 
 
 def generate_exam_with_limit(
@@ -1417,6 +1422,8 @@ def generate_exam_with_limit(
     exercise_types: list[str],
     instructions: str = "",
     student_profile: dict | None = None,
+    *,
+    force_fresh: bool = False,
 ) -> tuple[dict, dict, str | None]:
     from helpers.quick_exam_storage import get_ai_exam_usage_status, log_exam_ai_usage
     from services.permissions_service import can_use_ai_tool, increment_usage
@@ -1457,10 +1464,19 @@ def generate_exam_with_limit(
             plan_language=get_plan_language(),
             student_material_language=get_student_material_language(subject),
             student_profile=student_profile or {},
+            force_fresh=force_fresh,
         )
         provider = str(exam_data.pop("_ai_provider", "") or "") if isinstance(exam_data, dict) else ""
+        cache_status = str(exam_data.pop("_ai_cache", "") or "") if isinstance(exam_data, dict) else ""
+
+        if cache_status == CACHE_HIT:
+            log_exam_ai_usage(
+                CACHE_HIT_LOG_STATUS,
+                {"subject": subject, "topic": topic, "provider": provider, "cache": cache_status, "used_ai": False},
+            )
+            return exam_data, answer_key, None
 
-        log_exam_ai_usage("success", {"subject": subject, "topic": topic, "provider": provider})
+        log_exam_ai_usage("success", {"subject": subject, "topic": topic, "provider": provider, "cache": cache_status})
         increment_usage(None, "ai_generations")
         return exam_data, answer_key, None
 
@@ -1672,6 +1688,7 @@ def render_quick_exam_builder_expander(*, embedded: bool = False) -> None:
             else (t("generate_exam") if t("generate_exam") != "generate_exam" else "Generate Exam")
         )
 
+        force_fresh_exam = st.checkbox(t("ai_force_fresh_generation"), key="quick_exam_force_fresh", help=t("ai_force_fresh_generation_help"))
         if st.button(
             generate_exam_label,
             key="btn_gen_exam",
@@ -1731,6 +1748,7 @@ def render_quick_exam_builder_expander(*, embedded: bool = False) -> None:
                         exercise_types=selected_types,
                         instructions=instructions,
                         student_profile=student_profile,
+                        force_fresh=force_fresh_exam,
                     )
 
                     debug_baseline_exam = {}
@@ -3,7 +3,7 @@
 import streamlit as st
 import json, re, math, os, html
 import ast
-from typing import Optional
+from typing import Any, Optional
 from datetime import datetime as _dt, timezone
 import pandas as pd
 from io import BytesIO
@@ -34,12 +34,18 @@ from helpers.visual_support import (
     render_visual_support_status_group,
     preserve_generated_media_fields,
 )
+from helpers.ai_response_cache import provider_request_rows
 from helpers.archive_utils import ACTIVE_STATUS, ARCHIVED_STATUS, filter_archived_rows, is_archived_status
+from helpers.keyset_pagination import LIBRARY_PAGE_SIZE, KeysetFeed, KeysetPage, fetch_keyset_page
 from helpers.resource_gallery import (
-    extract_gallery_language_label,
+    GALLERY_META_COLUMN,
+    build_gallery_meta,
     extract_gallery_image_url,
+    gallery_card_media,
     inject_resource_gallery_styles,
+    list_columns_without_gallery_meta,
     render_gallery_card_html,
+    without_gallery_meta,
 )
 from helpers.resource_deletion import render_archive_delete_button, render_archive_delete_confirmation
 from helpers.recommendation_models import log_teacher_material_open
@@ -66,7 +72,10 @@ _QUICK_EXAM_LIST_COLUMNS = ",".join([
     "status",
     "created_at",
     "updated_at",
+    GALLERY_META_COLUMN,
 ])
+# Schemas before add_resource_gallery_meta.sql have no projection column.
+_QUICK_EXAM_LEGACY_LIST_COLUMNS = list_columns_without_gallery_meta(_QUICK_EXAM_LIST_COLUMNS)
 
 
 def _eb():
@@ -246,10 +255,12 @@ def save_exam_record(
             "status": ACTIVE_STATUS,
             "created_at": _dt.now(timezone.utc).isoformat(),
         })
+        payload[GALLERY_META_COLUMN] = build_gallery_meta(payload, kind="exam")
         resp = insert_row_with_retries(
             "quick_exams",
             payload,
             clear_cache=True,
+            optional_columns=(GALLERY_META_COLUMN,),
             context={
                 "resource_type": "exam",
                 "subject": str(subject).strip(),
@@ -278,34 +289,56 @@ def _normalize_exam_frame(rows: list[dict] | None) -> pd.DataFrame:
         df["updated_at"] = pd.to_datetime(df["updated_at"], errors="coerce")
     if "created_at" in df.columns:
         df["created_at"] = pd.to_datetime(df["created_at"], errors="coerce")
-    sort_col = "updated_at" if "updated_at" in df.columns else "created_at"
-    if sort_col in df.columns:
-        df = df.sort_values(sort_col, ascending=False, na_position="last")
+        df = df.sort_values("created_at", ascending=False, na_position="last", kind="stable")
+    elif "updated_at" in df.columns:
+        df = df.sort_values("updated_at", ascending=False, na_position="last")
     return df
 
 
+def _load_exam_list_rows(scope_column: str, scope_value: Any, cursor_token: str = "", page_size: int = LIBRARY_PAGE_SIZE) -> KeysetPage:
+    try:
+        query = get_sb().table("quick_exams").select(_QUICK_EXAM_LIST_COLUMNS).eq(scope_column, scope_value)
+        return fetch_keyset_page(query, cursor_token, page_size)
+    except Exception:
+        query = get_sb().table("quick_exams").select(_QUICK_EXAM_LEGACY_LIST_COLUMNS).eq(scope_column, scope_value)
+        return fetch_keyset_page(query, cursor_token, page_size)
+
+
 @st.cache_data(ttl=120, show_spinner=False)
-def _load_my_exams_cached(uid: str, limit: int = 120) -> pd.DataFrame:
+def _load_my_exams_page_cached(uid: str, cursor_token: str = "", page_size: int = LIBRARY_PAGE_SIZE) -> KeysetPage:
+    if not uid:
+        return KeysetPage([], "")
+    return _load_exam_list_rows("user_id", uid, cursor_token, page_size)
+
+
+register_cache(_load_my_exams_page_cached, "exams", "resources")
+
+
+@st.cache_data(ttl=180, show_spinner=False)
+def _load_public_exams_page_cached(_scope: str = "", cursor_token: str = "", page_size: int = LIBRARY_PAGE_SIZE) -> KeysetPage:
+    return _load_exam_list_rows("is_public", True, cursor_token, page_size)
+
+
+register_cache(_load_public_exams_page_cached, "exams", "resources")
+
+MY_EXAMS_FEED = KeysetFeed(_load_my_exams_page_cached)
+PUBLIC_EXAMS_FEED = KeysetFeed(_load_public_exams_page_cached)
+
+
+@st.cache_data(ttl=120, show_spinner=False)
+def _load_my_exams_cached(uid: str, limit: int = LIBRARY_PAGE_SIZE, pages: int = 1) -> pd.DataFrame:
     if not uid:
         return pd.DataFrame()
-    res = (
-        get_sb()
-        .table("quick_exams")
-        .select(_QUICK_EXAM_LIST_COLUMNS)
-        .eq("user_id", uid)
-        .order("updated_at", desc=True)
-        .limit(limit)
-        .execute()
-    )
-    return _normalize_exam_frame(getattr(res, "data", None) or [])
+    rows, _has_more = MY_EXAMS_FEED.window(uid, pages, page_size=limit)
+    return _normalize_exam_frame(rows)
 
 
 register_cache(_load_my_exams_cached, "exams", "resources")
 
 
-def load_my_exams(*, include_archived: bool = False, archived_only: bool = False) -> pd.DataFrame:
+def load_my_exams(*, include_archived: bool = False, archived_only: bool = False, pages: int = 1) -> pd.DataFrame:
     try:
-        df = _load_my_exams_cached(str(get_current_user_id() or ""))
+        df = _load_my_exams_cached(str(get_current_user_id() or ""), pages=pages)
         if df is None or df.empty:
             return pd.DataFrame()
         return filter_archived_rows(
@@ -319,25 +352,17 @@ def load_my_exams(*, include_archived: bool = False, archived_only: bool = False
 
 
 @st.cache_data(ttl=180, show_spinner=False)
-def _load_public_exams_cached(limit: int = 120) -> pd.DataFrame:
-    res = (
-        get_sb()
-        .table("quick_exams")
-        .select(_QUICK_EXAM_LIST_COLUMNS)
-        .eq("is_public", True)
-        .order("updated_at", desc=True)
-        .limit(limit)
-        .execute()
-    )
-    return _normalize_exam_frame(getattr(res, "data", None) or [])
+def _load_public_exams_cached(limit: int = LIBRARY_PAGE_SIZE, pages: int = 1) -> pd.DataFrame:
+    rows, _has_more = PUBLIC_EXAMS_FEED.window("", pages, page_size=limit)
+    return _normalize_exam_frame(rows)
 
 
 register_cache(_load_public_exams_cached, "exams", "resources")
 
 
-def load_public_exams(*, show_errors: bool = True) -> pd.DataFrame:
+def load_public_exams(*, show_errors: bool = True, pages: int = 1) -> pd.DataFrame:
     try:
-        return filter_archived_rows(_load_public_exams_cached())
+        return filter_archived_rows(_load_public_exams_cached(pages=pages))
     except Exception as exc:
         if show_errors:
             show_data_load_error(exc)
@@ -583,11 +608,7 @@ def render_exam_library_cards(
             safe_title = html.escape(title)
             safe_author = html.escape(author_name)
             preview_text = html.escape((topic or t("no_description_available"))[:180])
-            full_payload = dict(row or {})
-            if not extract_gallery_image_url(full_payload) and exam_id not in (None, "", 0, "0"):
-                full_payload = load_exam_record(exam_id) or full_payload
-            hero_image = extract_gallery_image_url(full_payload)
-            language_label = extract_gallery_language_label(full_payload)
+            hero_image, language_label = gallery_card_media(row, load_exam_record)
 
             chips = "".join([
                 f'<span class="cm-resource-chip">🌐 {html.escape(language_label)}</span>' if language_label else "",
@@ -756,7 +777,9 @@ def get_ai_exam_usage_status() -> dict:
     today_df = feat_df[(feat_df["created_at"].notna()) & (feat_df["created_at"] >= today_start_utc)]
     used_today = int(len(today_df))
 
-    cd_df = df[df["feature_name"] == "quick_exam_ai"].dropna(subset=["created_at"]).sort_values("created_at")
+    cd_df = provider_request_rows(
+        df[df["feature_name"] == "quick_exam_ai"].dropna(subset=["created_at"]).sort_values("created_at")
+    )
     cooldown_ok = True
     seconds_left = 0
     last_request_at = None
@@ -785,6 +808,7 @@ def build_exam_pdf_bytes(
     topic: str = "",
     learner_stage: str = "",
     level_or_band: str = "",
+    branding: dict | None = None,
 ) -> bytes:
     """Build the student exam PDF (no answers)."""
     from reportlab.lib.pagesizes import A4
@@ -799,7 +823,7 @@ def build_exam_pdf_bytes(
 
     # Use user's font/size preference
     from helpers.branding import get_user_branding as _get_branding_cfg
-    _branding_cfg = _get_branding_cfg()
+    _branding_cfg = branding if branding is not None else _get_branding_cfg()
     _font_key = _branding_cfg.get("branding_font", "dejavu")
     _size_key = _branding_cfg.get("branding_font_size", "standard")
 
@@ -822,7 +846,7 @@ def build_exam_pdf_bytes(
             return t(key, **kw)
 
     from helpers.branding import get_user_branding, build_worksheet_header
-    _branding = get_user_branding()
+    _branding = branding if branding is not None else get_user_branding()
 
     ws_stub = {"title": exam_data.get("title", t("quick_exam_generic_exam_title"))}
     build_worksheet_header(
@@ -1040,6 +1064,7 @@ def build_exam_answer_pdf_bytes(
     topic: str = "",
     learner_stage: str = "",
     level_or_band: str = "",
+    branding: dict | None = None,
 ) -> bytes:
     """Build the teacher answer key PDF."""
     from reportlab.lib.pagesizes import A4
@@ -1050,7 +1075,7 @@ def build_exam_answer_pdf_bytes(
     body_font, bold_font = ensure_pdf_fonts_registered()
 
     from helpers.branding import get_user_branding as _get_branding_cfg2
-    _branding_cfg2 = _get_branding_cfg2()
+    _branding_cfg2 = branding if branding is not None else _get_branding_cfg2()
     _font_key2 = _branding_cfg2.get("branding_font", "dejavu")
     _size_key2 = _branding_cfg2.get("branding_font_size", "standard")
 
@@ -1071,7 +1096,7 @@ def build_exam_answer_pdf_bytes(
             return t(key, **kw)
 
     from helpers.branding import get_user_branding, build_worksheet_header
-    _branding = get_user_branding()
+    _branding = branding if branding is not None else get_user_branding()
 
     title_text = exam_data.get("title", t("quick_exam_generic_exam_title")) + " — " + _t_pdf("ws_answer_key")
     ws_stub = {"title": title_text}
@@ -1483,8 +1508,10 @@ def render_exam_result(
         level_or_band=level_or_band,
     )
 
-    student_pdf = build_exam_pdf_bytes(exam_data, **_pdf_kwargs)
-    answer_pdf = build_exam_answer_pdf_bytes(exam_data, answer_key, **_pdf_kwargs)
+    from helpers.pdf_export import cached_pdf_bytes
+
+    student_pdf = cached_pdf_bytes("exam", exam_data=exam_data, **_pdf_kwargs)
+    answer_pdf = cached_pdf_bytes("exam_answer_key", exam_data=exam_data, answer_key=answer_key, **_pdf_kwargs)
     from helpers.docx_generator import generate_docx_exam
     student_docx = generate_docx_exam(exam_data, answer_key, student_only=True)
     teacher_docx = generate_docx_exam(exam_data, answer_key, student_only=False)
@@ -1602,6 +1629,16 @@ def render_quick_exam_builder_expander(*, embedded: bool = False) -> None:
     return _eb().render_quick_exam_builder_expander(embedded=embedded)
 
 
+def _update_exam_row(safe_id: Any, uid: str, payload: dict) -> None:
+    """Update one exam, retrying without ``gallery_meta`` on older schemas."""
+    try:
+        get_sb().table("quick_exams").update(payload).eq("id", safe_id).eq("user_id", uid).execute()
+    except Exception:
+        if GALLERY_META_COLUMN not in payload:
+            raise
+        get_sb().table("quick_exams").update(without_gallery_meta(payload)).eq("id", safe_id).eq("user_id", uid).execute()
+
+
 def _persist_saved_exam_visuals(exam_id: int | str, exam_data: dict) -> bool:
     uid = str(get_current_user_id() or "").strip()
     if not uid or exam_id in (None, "", 0, "0"):
@@ -1612,14 +1649,15 @@ def _persist_saved_exam_visuals(exam_id: int | str, exam_data: dict) -> bool:
         if not stripped:
             return False
         safe_id = int(stripped) if stripped.isdigit() else stripped
+    existing_row = load_exam_record(safe_id) or {}
     try:
-        (
-            get_sb()
-            .table("quick_exams")
-            .update({"exam_data": exam_data})
-            .eq("id", safe_id)
-            .eq("user_id", uid)
-            .execute()
+        _update_exam_row(
+            safe_id,
+            uid,
+            {
+                "exam_data": exam_data,
+                GALLERY_META_COLUMN: build_gallery_meta({**existing_row, "exam_data": exam_data}, kind="exam"),
+            },
         )
         try:
             saved_row = load_exam_record(safe_id) or {}
@@ -1687,23 +1725,16 @@ def _persist_saved_exam_resource(exam_id: int | str, exam_data: dict, answer_key
         fallback_plan_language=plan_language_fallback,
         fallback_student_language=student_material_language_fallback,
     )
+    update_payload = {
+        "exam_data": exam_data,
+        "answer_key": answer_key,
+        "title": str(exam_data.get("title") or "").strip(),
+        "plan_language": plan_language,
+        "student_material_language": student_material_language,
+    }
+    update_payload[GALLERY_META_COLUMN] = build_gallery_meta({**existing_row, **update_payload}, kind="exam")
     try:
-        (
-            get_sb()
-            .table("quick_exams")
-            .update(
-                {
-                    "exam_data": exam_data,
-                    "answer_key": answer_key,
-                    "title": str(exam_data.get("title") or "").strip(),
-                    "plan_language": plan_language,
-                    "student_material_language": student_material_language,
-                }
-            )
-            .eq("id", safe_id)
-            .eq("user_id", uid)
-            .execute()
-        )
+        _update_exam_row(safe_id, uid, update_payload)
         try:
             from helpers.practice_engine import exam_to_exercises, rescore_practice_sessions_for_resource
             from helpers.teacher_student_integration import sync_assignment_copies_for_resource
@@ -5,12 +5,14 @@ from difflib import SequenceMatcher
 import math
 import os
 import re
+import threading
 from typing import Any
 
+import numpy as np
 import pandas as pd
 import streamlit as st
 
-from core.database import _execute_query_with_diagnostics, get_sb, register_cache
+from core.database import _execute_query_with_diagnostics, get_sb, register_cache, shared_cache
 from core.i18n import t
 from core.state import get_current_user_id, with_owner
 from helpers.archive_utils import truthy_flag
@@ -224,6 +226,52 @@ def _fit_linear_model(
     return weights
 
 
+def _sigmoid_array(values: np.ndarray) -> np.ndarray:
+    out = np.empty_like(values, dtype=float)
+    positive = values >= 0
+    out[positive] = 1.0 / (1.0 + np.exp(-values[positive]))
+    z = np.exp(values[~positive])
+    out[~positive] = z / (1.0 + z)
+    return out
+
+
+def _fit_linear_model_matrix(
+    matrix: np.ndarray,
+    targets: np.ndarray,
+    feature_names: list[str],
+    *,
+    base_weights: dict[str, float] | None = None,
+    steps: int = 140,
+    learning_rate: float = 0.16,
+    l2: float = 0.01,
+) -> dict[str, float]:
+    """Same gradient descent as :func:`_fit_linear_model` over a dense design matrix.
+
+    ``matrix`` holds one row per sample and one column per name in
+    ``feature_names``, with absent features as 0.
+    """
+    if not len(targets):
+        return dict(base_weights or {"bias": 0.0})
+
+    names = ["bias"] + [name for name in dict.fromkeys([*feature_names, *(base_weights or {})]) if name != "bias"]
+    columns = {name: idx for idx, name in enumerate(feature_names)}
+    design = np.zeros((len(targets), len(names)), dtype=float)
+    design[:, 0] = 1.0
+    for idx, name in enumerate(names[1:], start=1):
+        if name in columns:
+            design[:, idx] = matrix[:, columns[name]]
+    weights = np.array([_safe_float((base_weights or {}).get(name), 0.0) for name in names], dtype=float)
+    penalty_mask = np.ones(len(names), dtype=float)
+    penalty_mask[0] = 0.0
+    clipped = np.clip(np.asarray(targets, dtype=float), 0.0, 1.0)
+    scale = 1.0 / max(1, len(targets))
+
+    for _ in range(steps):
+        error = _sigmoid_array(design @ weights) - clipped
+        weights = weights - learning_rate * ((design.T @ error) * scale + l2 * weights * penalty_mask)
+    return {name: float(value) for name, value in zip(names, weights)}
+
+
 def _score_linear_model(weights: dict[str, float], features: dict[str, float]) -> float:
     row_features = {"bias": 1.0, **features}
     return _sigmoid(sum(_safe_float(weights.get(name), 0.0) * _safe_float(value) for name, value in row_features.items()))
@@ -363,7 +411,7 @@ def clear_recommendation_model_caches() -> None:
         _load_teacher_recommendation_events,
         build_teacher_recommendation_model,
         build_teacher_material_feed_profile,
-        _load_student_history_rows,
+        _load_student_history_rows_cached,
     ):
         try:
             fn.clear()
@@ -569,27 +617,29 @@ def build_explicit_topic_resource_model(
 register_cache(build_explicit_topic_resource_model, "recommendations", "resources", "learning_programs")
 
 
-def topic_resource_alignment_features(
-    kind: str,
-    resource_id: Any,
-    topic_ids: list[int] | set[int] | tuple[int, ...],
-    *,
-    teacher_id: str | None = None,
-    student_id: str | None = None,
-) -> dict[str, float]:
+_EMPTY_TOPIC_ALIGNMENT = {
+    "explicit_topic_match": 0.0,
+    "explicit_topic_support": 0.0,
+    "direct_topic_link": 0.0,
+    "topic_kind_prior": 0.0,
+    "topic_match_ambiguity": 0.0,
+}
+
+
+def _topic_alignment_key(kind: Any, resource_id: Any, topic_ids: Any) -> tuple[str, str, tuple[int, ...]] | None:
     topic_list = [int(item or 0) for item in (topic_ids or []) if int(item or 0) > 0]
     resource_id_key = _resource_id_key(resource_id)
     if not kind or not resource_id_key or resource_id_key in {"0", "None", "nan"} or not topic_list:
-        return {
-            "explicit_topic_match": 0.0,
-            "explicit_topic_support": 0.0,
-            "direct_topic_link": 0.0,
-            "topic_kind_prior": 0.0,
-            "topic_match_ambiguity": 0.0,
-    }
-    model = build_explicit_topic_resource_model(teacher_id=teacher_id, student_id=student_id)
-    kind_key = _norm_key(kind)
-    resource_key = (kind_key, resource_id_key)
+        return None
+    return (_norm_key(kind), resource_id_key, tuple(sorted(set(topic_list))))
+
+
+def _topic_alignment_from_model(model: dict[str, Any], key: tuple[str, str, tuple[int, ...]]) -> dict[str, float]:
+    kind_key, resource_id_key, topic_list = key
+    pair_prior = model.get("pair_prior") or {}
+    pair_support = model.get("pair_support") or {}
+    kind_topic_prior = model.get("kind_topic_prior") or {}
+    direct_pairs = model.get("direct_pairs") or set()
 
     explicit_topic_match = 0.0
     explicit_topic_support = 0.0
@@ -597,13 +647,13 @@ def topic_resource_alignment_features(
     topic_kind_prior = 0.0
     for topic_id in topic_list:
         signature = _pair_signature(kind_key, resource_id_key, topic_id)
-        explicit_topic_match = max(explicit_topic_match, _safe_float((model.get("pair_prior") or {}).get(signature), 0.0))
-        explicit_topic_support = max(explicit_topic_support, _safe_float((model.get("pair_support") or {}).get(signature), 0.0))
-        topic_kind_prior = max(topic_kind_prior, _safe_float((model.get("kind_topic_prior") or {}).get((kind_key, topic_id)), 0.0))
-        if signature in (model.get("direct_pairs") or set()):
+        explicit_topic_match = max(explicit_topic_match, _safe_float(pair_prior.get(signature), 0.0))
+        explicit_topic_support = max(explicit_topic_support, _safe_float(pair_support.get(signature), 0.0))
+        topic_kind_prior = max(topic_kind_prior, _safe_float(kind_topic_prior.get((kind_key, topic_id)), 0.0))
+        if signature in direct_pairs:
             direct_topic_link = 1.0
 
-    topic_span = int((model.get("resource_topic_span") or {}).get(resource_key, 0))
+    topic_span = int((model.get("resource_topic_span") or {}).get((kind_key, resource_id_key), 0))
     ambiguity = _clamp((max(0, topic_span - 1)) / 4.0) if explicit_topic_match < 0.45 and direct_topic_link < 1.0 else 0.0
     return {
         "explicit_topic_match": explicit_topic_match,
@@ -614,7 +664,43 @@ def topic_resource_alignment_features(
     }
 
 
+def topic_resource_alignment_features(
+    kind: str,
+    resource_id: Any,
+    topic_ids: list[int] | set[int] | tuple[int, ...],
+    *,
+    teacher_id: str | None = None,
+    student_id: str | None = None,
+) -> dict[str, float]:
+    key = _topic_alignment_key(kind, resource_id, topic_ids)
+    if key is None:
+        return dict(_EMPTY_TOPIC_ALIGNMENT)
+    model = build_explicit_topic_resource_model(teacher_id=teacher_id, student_id=student_id)
+    return _topic_alignment_from_model(model, key)
+
+
+def topic_resource_alignment_batch(
+    requests: list[tuple[str, Any, Any]],
+    *,
+    teacher_id: str | None = None,
+    student_id: str | None = None,
+) -> list[dict[str, float]]:
+    """Align many ``(kind, resource_id, topic_ids)`` requests against one model load.
+
+    Results follow the order of ``requests`` and match
+    :func:`topic_resource_alignment_features` call by call; repeated
+    requests share one lookup.
+    """
+    keys = [_topic_alignment_key(kind, resource_id, topic_ids) for kind, resource_id, topic_ids in requests]
+    if not any(key is not None for key in keys):
+        return [dict(_EMPTY_TOPIC_ALIGNMENT) for _ in keys]
+    model = build_explicit_topic_resource_model(teacher_id=teacher_id, student_id=student_id)
+    resolved = {key: _topic_alignment_from_model(model, key) for key in dict.fromkeys(keys) if key is not None}
+    return [dict(resolved[key]) if key is not None else dict(_EMPTY_TOPIC_ALIGNMENT) for key in keys]
+
+
 @st.cache_data(ttl=300, show_spinner=False)
+@shared_cache("recommendations", "resources", ttl=300)
 def _load_teacher_material_activity_rows(teacher_id: str) -> list[dict]:
     teacher_id = str(teacher_id or "").strip()
     if not teacher_id:
@@ -648,6 +734,7 @@ register_cache(_load_teacher_material_activity_rows, "recommendations", "resourc
 
 
 @st.cache_data(ttl=300, show_spinner=False)
+@shared_cache("recommendations", "assignments", ttl=300)
 def _load_teacher_recommendation_events(teacher_id: str) -> list[dict]:
     teacher_id = str(teacher_id or "").strip()
     if not teacher_id:
@@ -1222,13 +1309,17 @@ def log_teacher_material_open(
         pass
 
 
-@st.cache_data(ttl=180, show_spinner=False)
-def _load_student_history_rows(student_id: str) -> dict[str, list[dict]]:
+_STUDENT_HISTORY_TTL_SECONDS = 180
+
+
+@st.cache_data(ttl=_STUDENT_HISTORY_TTL_SECONDS, show_spinner=False)
+@shared_cache("recommendations", "practice", "assignments", ttl=_STUDENT_HISTORY_TTL_SECONDS)
+def _load_student_history_rows_cached(student_id: str) -> dict[str, Any]:
     safe_student_id = str(student_id or "").strip()
     if not safe_student_id:
         return {"practice_sessions": [], "teacher_assignments": [], "recommendation_activity": []}
 
-    rows = {"practice_sessions": [], "teacher_assignments": [], "recommendation_activity": []}
+    rows = {"practice_sessions": [], "teacher_assignments": [], "recommendation_activity": [], "loaded_at": _now_iso()}
     cutoff_iso = _history_cutoff_iso()
     try:
         rows["practice_sessions"] = getattr(
@@ -1295,7 +1386,79 @@ def _load_student_history_rows(student_id: str) -> dict[str, list[dict]]:
     return rows
 
 
-register_cache(_load_student_history_rows, "recommendations", "practice", "assignments")
+register_cache(_load_student_history_rows_cached, "recommendations", "practice", "assignments")
+
+
+# Recommendation activity a student logged in this process after their cached
+# history was loaded, plus a per-student generation bumped on every append.
+# Impressions extend one student's history here instead of clearing the
+# history cache for every student. Rows older than the history cache TTL are
+# dropped on append (any load that could miss them has expired by then), and
+# each student keeps at most RECOMMENDATION_STUDENT_ACTIVITY_LIMIT rows.
+_STUDENT_ACTIVITY_APPENDS: dict[str, list[dict]] = {}
+_STUDENT_HISTORY_GENERATIONS: dict[str, int] = {}
+_STUDENT_HISTORY_LOCK = threading.Lock()
+
+
+def student_history_generation(student_id: str) -> int:
+    """Counter that changes whenever ``student_id``'s history changes in this process."""
+    with _STUDENT_HISTORY_LOCK:
+        return _STUDENT_HISTORY_GENERATIONS.get(str(student_id or "").strip(), 0)
+
+
+def append_student_recommendation_activity(student_id: str, rows: list[dict]) -> int:
+    """Add freshly logged activity rows to one student's cached history.
+
+    Returns the student's new history generation.
+    """
+    safe_student_id = str(student_id or "").strip()
+    activity = [
+        {
+            "activity_type": row.get("activity_type"),
+            "meta_json": row.get("meta_json"),
+            "created_at": str(row.get("created_at") or _now_iso()),
+        }
+        for row in rows or []
+        if isinstance(row, dict)
+    ]
+    stale_before = (datetime.now(timezone.utc) - timedelta(seconds=_STUDENT_HISTORY_TTL_SECONDS)).isoformat()
+    limit = _history_row_limit("RECOMMENDATION_STUDENT_ACTIVITY_LIMIT", 800)
+    with _STUDENT_HISTORY_LOCK:
+        if safe_student_id and activity:
+            _STUDENT_ACTIVITY_APPENDS.setdefault(safe_student_id, []).extend(activity)
+        for key in list(_STUDENT_ACTIVITY_APPENDS):
+            fresh = [row for row in _STUDENT_ACTIVITY_APPENDS[key] if row["created_at"] > stale_before][-limit:]
+            if fresh:
+                _STUDENT_ACTIVITY_APPENDS[key] = fresh
+            else:
+                _STUDENT_ACTIVITY_APPENDS.pop(key, None)
+        generation = _STUDENT_HISTORY_GENERATIONS.get(safe_student_id, 0) + 1
+        _STUDENT_HISTORY_GENERATIONS[safe_student_id] = generation
+    return generation
+
+
+def _load_student_history_rows(student_id: str) -> dict[str, Any]:
+    safe_student_id = str(student_id or "").strip()
+    history = _load_student_history_rows_cached(safe_student_id)
+    loaded_at = str(history.get("loaded_at") or "")
+    with _STUDENT_HISTORY_LOCK:
+        appended = _STUDENT_ACTIVITY_APPENDS.get(safe_student_id) or []
+        # Rows older than the cached load are already part of it.
+        pending = [row for row in appended if row["created_at"] > loaded_at]
+        if len(pending) != len(appended):
+            if pending:
+                _STUDENT_ACTIVITY_APPENDS[safe_student_id] = pending
+            else:
+                _STUDENT_ACTIVITY_APPENDS.pop(safe_student_id, None)
+    if not pending:
+        return history
+    activity = sorted(pending, key=lambda row: row["created_at"], reverse=True) + list(
+        history.get("recommendation_activity") or []
+    )
+    return {
+        **history,
+        "recommendation_activity": activity[: _history_row_limit("RECOMMENDATION_STUDENT_ACTIVITY_LIMIT", 800)],
+    }
 
 
 def build_student_recommendation_model(
@@ -172,6 +172,8 @@ REPRESENTATION_FILES = {
 }
 DEFAULT_NEIGHBOR_TOP_K = 5
 DEFAULT_ANCHOR_CANDIDATE_TOP_K = 8
+# Cells per similarity block in the neighbour search (~64 MB of float64).
+NEIGHBOR_BLOCK_MAX_CELLS = 8_000_000
 DEFAULT_CONFIDENCE_THRESHOLDS = (0.60, 0.70, 0.72, 0.80, 0.90)
 CANONICAL_ALIASES = {
     "subject": {
@@ -1097,23 +1099,62 @@ def evaluate_unsupervised_models(
     return comparison.reset_index(drop=True), labels_by_model
 
 
+def _top_k_cosine_neighbors(
+    vectors: Any,
+    top_k: int,
+    *,
+    max_block_cells: int = NEIGHBOR_BLOCK_MAX_CELLS,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Return ``(indices, scores)`` of each row's ``top_k`` cosine neighbours, self excluded.
+
+    Query rows are scored in blocks against the whole matrix, so peak memory
+    is ``block_rows x N`` instead of ``N x N``. Rows are ordered by descending
+    similarity with ties broken by ascending index.
+    """
+    from sklearn.preprocessing import normalize
+    from sklearn.utils.extmath import safe_sparse_dot
+
+    normalized = normalize(vectors)
+    n_rows = int(normalized.shape[0])
+    k = max(0, min(int(top_k), n_rows - 1))
+    indices = np.zeros((n_rows, k), dtype=np.int64)
+    scores = np.zeros((n_rows, k), dtype=np.float64)
+    if k == 0:
+        return indices, scores
+    block_rows = max(1, int(max_block_cells) // max(1, n_rows))
+    for start in range(0, n_rows, block_rows):
+        stop = min(n_rows, start + block_rows)
+        block = np.asarray(safe_sparse_dot(normalized[start:stop], normalized.T, dense_output=True), dtype=np.float64)
+        local = np.arange(stop - start)
+        block[local, start + local] = -np.inf
+        candidate_cols = np.sort(np.argpartition(block, n_rows - k, axis=1)[:, n_rows - k:], axis=1)
+        candidate_scores = np.take_along_axis(block, candidate_cols, axis=1)
+        order = np.argsort(-candidate_scores, axis=1, kind="stable")
+        indices[start:stop] = np.take_along_axis(candidate_cols, order, axis=1)
+        scores[start:stop] = np.take_along_axis(candidate_scores, order, axis=1)
+        kth_scores = candidate_scores.min(axis=1)
+        # Rows where ties straddle the k-th score: argpartition picked an
+        # arbitrary subset of the tied columns, so redo them over every tie.
+        for offset in np.flatnonzero(np.count_nonzero(block >= kth_scores[:, None], axis=1) > k):
+            row = block[offset]
+            cols = np.flatnonzero(row >= kth_scores[offset])
+            ranked = cols[np.lexsort((cols, -row[cols]))[:k]]
+            indices[start + offset] = ranked
+            scores[start + offset] = row[ranked]
+    return indices, scores
+
+
 def _top_neighbors(profile_df: pd.DataFrame, vectors: np.ndarray, labels: np.ndarray | None = None, *, top_k: int = DEFAULT_NEIGHBOR_TOP_K) -> pd.DataFrame:
     if profile_df.empty or len(profile_df) < 2:
         return pd.DataFrame()
-    sk = _sklearn_imports()
-    sim = sk["cosine_similarity"](vectors)
+    neighbor_indexes, neighbor_scores = _top_k_cosine_neighbors(vectors, top_k)
     rows: list[dict[str, Any]] = []
     records = profile_df.to_dict("records")
     for i, source in enumerate(records):
-        order = np.argsort(-sim[i])
-        emitted = 0
-        for j in order:
-            if i == int(j):
-                continue
-            target = records[int(j)]
-            score = float(sim[i, int(j)])
+        for j, score in zip(neighbor_indexes[i].tolist(), neighbor_scores[i].tolist()):
+            target = records[j]
             source_cluster = int(labels[i]) if labels is not None and len(labels) > i else None
-            target_cluster = int(labels[int(j)]) if labels is not None and len(labels) > int(j) else None
+            target_cluster = int(labels[j]) if labels is not None and len(labels) > j else None
             rows.append(
                 {
                     "source_resource_key": source["resource_key"],
@@ -1124,7 +1165,7 @@ def _top_neighbors(profile_df: pd.DataFrame, vectors: np.ndarray, labels: np.nda
                     "target_resource_type": target["resource_type"],
                     "target_resource_role": target.get("resource_role", ""),
                     "target_title": target["title"],
-                    "similarity_score": round(score, 6),
+                    "similarity_score": round(float(score), 6),
                     "same_subject": _clean_text(source.get("subject_normalized")) == _clean_text(target.get("subject_normalized")),
                     "same_language": _clean_text(source.get("language_normalized")) == _clean_text(target.get("language_normalized")) if source.get("language_normalized") and target.get("language_normalized") else None,
                     "same_level": _clean_text(source.get("level_normalized")) == _clean_text(target.get("level_normalized")) if source.get("level_normalized") and target.get("level_normalized") else None,
@@ -1134,9 +1175,6 @@ def _top_neighbors(profile_df: pd.DataFrame, vectors: np.ndarray, labels: np.nda
                     "reciprocal": False,
                 }
             )
-            emitted += 1
-            if emitted >= top_k:
-                break
     frame = pd.DataFrame(rows)
     if not frame.empty:
         edges = set(zip(frame["source_resource_key"], frame["target_resource_key"]))
@@ -5,11 +5,20 @@ from typing import Any
 
 import streamlit as st
 
-from core.database import clear_app_caches, get_sb
+from core.database import _execute_query_with_diagnostics, clear_app_caches, get_sb
 from core.i18n import t
 from core.state import get_current_user_id
 from helpers.archive_utils import ARCHIVED_STATUS, DELETED_STATUS, is_archived_status
 
+# kind -> (table, assignment_type, source_type), as the library pages pass them.
+RESOURCE_DELETE_KINDS: dict[str, tuple[str, str, str]] = {
+    "lesson_plan": ("lesson_plans", "lesson_plan_topic", "lesson_plan_builder"),
+    "worksheet": ("worksheets", "worksheet", "worksheet_builder"),
+    "exam": ("quick_exams", "exam", "exam_builder"),
+    "video": ("videos", "video", "video_library"),
+    "profile": ("professional_profiles", "", ""),
+}
+
 
 def _now_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
@@ -192,6 +201,97 @@ def delete_archived_resource(
     return ok, msg, summary
 
 
+_DELETE_OUTCOMES_OK = {"deleted", "detached"}
+
+
+def _batch_summary(row: dict) -> dict[str, int]:
+    return {
+        key: int(row.get(key) or 0)
+        for key in ("assignment_count", "student_count", "active_assignment_count")
+    }
+
+
+def _delete_archived_resources_one_by_one(
+    table_name: str,
+    ids: list[Any],
+    assignment_type: str,
+    source_type: str,
+) -> dict[str, tuple[bool, str, dict[str, int]]]:
+    teacher_id = str(get_current_user_id() or "").strip()
+    try:
+        rows = _rows(get_sb().table(table_name).select("*").eq("user_id", teacher_id).in_("id", ids).execute())
+    except Exception as exc:
+        return {str(record_id): (False, str(exc), {}) for record_id in ids}
+    by_id = {str(row.get("id")): row for row in rows}
+    outcomes = {}
+    for record_id in ids:
+        row = by_id.get(str(record_id))
+        if row is None:
+            outcomes[str(record_id)] = (False, "not_owner", {})
+            continue
+        outcomes[str(record_id)] = delete_archived_resource(
+            table_name=table_name,
+            row=row,
+            assignment_type=assignment_type,
+            source_type=source_type,
+        )
+    return outcomes
+
+
+def delete_archived_resources(kind: str, ids) -> dict[str, tuple[bool, str, dict[str, int]]]:
+    """Delete several archived resources of one ``kind`` in one round trip.
+
+    Returns ``{str(id): (ok, message, assignment_summary)}`` with the same
+    messages as :func:`delete_archived_resource`. Falls back to the per-row
+    path when the ``classio_delete_archived_resources`` function is missing.
+    """
+    if kind not in RESOURCE_DELETE_KINDS:
+        raise ValueError(f"unknown resource kind: {kind}")
+    table_name, assignment_type, source_type = RESOURCE_DELETE_KINDS[kind]
+    safe_ids = []
+    outcomes: dict[str, tuple[bool, str, dict[str, int]]] = {}
+    for record_id in ids or []:
+        safe_id = _safe_record_id(record_id)
+        if safe_id is None:
+            outcomes[str(record_id)] = (False, "invalid_id", {})
+        elif str(safe_id) not in outcomes:
+            safe_ids.append(safe_id)
+            outcomes[str(safe_id)] = (False, "not_owner", {})
+    if not safe_ids:
+        return outcomes
+    if not str(get_current_user_id() or "").strip():
+        outcomes.update({str(safe_id): (False, "auth_required", {}) for safe_id in safe_ids})
+        return outcomes
+
+    try:
+        rows = _rows(
+            _execute_query_with_diagnostics(
+                get_sb().rpc(
+                    "classio_delete_archived_resources",
+                    {
+                        "p_table": table_name,
+                        "p_ids": [str(safe_id) for safe_id in safe_ids],
+                        "p_assignment_type": assignment_type or None,
+                        "p_source_type": source_type or None,
+                    },
+                ),
+                function_name="delete_archived_resources",
+                source_name="classio_delete_archived_resources",
+            )
+        )
+    except Exception:
+        outcomes.update(_delete_archived_resources_one_by_one(table_name, safe_ids, assignment_type, source_type))
+        return outcomes
+
+    for row in rows:
+        outcome = str(row.get("outcome") or "")
+        ok = outcome in _DELETE_OUTCOMES_OK
+        outcomes[str(row.get("resource_id"))] = (ok, "ok" if ok else outcome, _batch_summary(row))
+    if any(ok for ok, _msg, _summary in outcomes.values()):
+        clear_app_caches()
+    return outcomes
+
+
 def _delete_state_keys(key_prefix: str, record_id: Any) -> tuple[str, str, str, str]:
     safe_key = f"{key_prefix}_{record_id}"
     return (
@@ -338,6 +338,73 @@ def extract_gallery_language_label(payload: Any) -> str:
     return extract_resource_language_value(payload).upper()
 
 
+GALLERY_META_COLUMN = "gallery_meta"
+
+
+def build_gallery_meta(payload: Any, *, kind: str, title: str = "") -> dict[str, Any]:
+    """Compact card projection stored next to a resource when it is saved.
+
+    Only http(s) images are stored by URL. An inline data-URI visual can be
+    hundreds of KB, and every library list read selects this column, so it
+    is recorded as ``has_inline_image`` and loaded with the full record.
+    """
+    payload = _parse_jsonish(payload)
+    if not title and isinstance(payload, dict):
+        title = payload.get("title") or ""
+    image_url = extract_gallery_image_url(payload)
+    has_inline_image = image_url.startswith("data:")
+    return {
+        "kind": normalize_resource_kind(kind),
+        "title": str(title or "").strip(),
+        "image_url": "" if has_inline_image else image_url,
+        "has_inline_image": has_inline_image,
+        "language": extract_resource_language_value(payload),
+    }
+
+
+def without_gallery_meta(payload: dict) -> dict:
+    """``payload`` minus the projection, for schemas without the ``gallery_meta`` column."""
+    return {key: value for key, value in payload.items() if key != GALLERY_META_COLUMN}
+
+
+def list_columns_without_gallery_meta(columns: str) -> str:
+    """A ``select`` column list minus ``gallery_meta``; cards then fall back to the record."""
+    return ",".join(column for column in columns.split(",") if column != GALLERY_META_COLUMN)
+
+
+def read_gallery_meta(row: Any) -> dict | None:
+    """The row's stored ``gallery_meta``, or ``None`` when it has not been computed yet."""
+    if not isinstance(row, dict):
+        return None
+    meta = _parse_jsonish(row.get(GALLERY_META_COLUMN))
+    if isinstance(meta, dict) and "image_url" in meta and "language" in meta:
+        return meta
+    return None
+
+
+def gallery_card_media(row: dict, load_full_record=None) -> tuple[str, str]:
+    """(hero image, language label) for a library card.
+
+    Reads the stored ``gallery_meta`` projection. Inline images are not part
+    of it, so those cards load the full record with ``load_full_record(id)``,
+    as do rows saved before the projection existed when the list row carries
+    no image.
+    """
+    meta = read_gallery_meta(row)
+    full_payload = dict(row or {})
+    record_id = full_payload.get("id")
+    if meta is not None:
+        language_label = str(meta.get("language") or "").upper()
+        if not meta.get("has_inline_image"):
+            return str(meta.get("image_url") or ""), language_label
+        if callable(load_full_record) and record_id not in (None, "", 0, "0"):
+            return extract_gallery_image_url(load_full_record(record_id) or {}), language_label
+        return "", language_label
+    if callable(load_full_record) and not extract_gallery_image_url(full_payload) and record_id not in (None, "", 0, "0"):
+        full_payload = load_full_record(record_id) or full_payload
+    return extract_gallery_image_url(full_payload), extract_gallery_language_label(full_payload)
+
+
 def render_gallery_card_html(
     *,
     kind: str,
@@ -1,6 +1,7 @@
 import streamlit as st
 import datetime
 import re as _re
+import threading
 from core.i18n import t
 from core.state import get_current_user_id
 from core.timezone import now_local, get_app_tz
@@ -12,6 +13,7 @@ from core.database import (
     show_data_load_error,
 )
 from typing import Optional
+import numpy as np
 import pandas as pd
 from datetime import date
 from core.timezone import UTC_TZ, DEFAULT_TZ_NAME
@@ -353,7 +355,7 @@ def add_override(
     status: str = "scheduled",
     note: str = "",
     gcal_event_id: Optional[str] = None,
-) -> None:
+) -> Optional[int]:
     student = str(student).strip()
     ensure_student(student)
 
@@ -370,8 +372,13 @@ def add_override(
     if gcal_event_id:
         payload["gcal_event_id"] = gcal_event_id
 
-    get_sb().table("calendar_overrides").insert(payload).execute()
+    res = get_sb().table("calendar_overrides").insert(payload).execute()
     clear_app_caches()
+    rows = getattr(res, "data", None) or []
+    try:
+        return int(rows[0].get("id")) if rows and rows[0].get("id") is not None else None
+    except (TypeError, ValueError):
+        return None
 
 
 def find_gcal_event_id(student: str, original_date: date) -> Optional[str]:
@@ -392,6 +399,12 @@ def find_gcal_event_id(student: str, original_date: date) -> Optional[str]:
 
 def delete_override(override_id: int) -> None:
     uid = get_current_user_id()
+    # A create still waiting in the outbox would make an event nothing deletes.
+    try:
+        from helpers.google_calendar import supersede_pending_gcal_creates_for_override
+        supersede_pending_gcal_creates_for_override(int(override_id))
+    except Exception:
+        pass
     # Look up gcal_event_id before deleting
     try:
         row = (
@@ -403,8 +416,8 @@ def delete_override(override_id: int) -> None:
         )
         gcal_eid = (row.data[0].get("gcal_event_id") if row.data else None)
         if gcal_eid:
-            from helpers.google_calendar import delete_gcal_event
-            delete_gcal_event(gcal_eid)
+            from helpers.google_calendar import enqueue_gcal_delete
+            enqueue_gcal_delete(gcal_eid)
     except Exception:
         pass
 
@@ -415,4 +428,175 @@ def delete_override(override_id: int) -> None:
     clear_app_caches()
 
 
+# Next lesson index (home indicator)
+_NEXT_LESSON_HORIZON_WEEKS = 12
+
+
+def _weekly_occurrences(schedules: pd.DataFrame | None, now: pd.Timestamp, weeks: int = _NEXT_LESSON_HORIZON_WEEKS) -> pd.DataFrame:
+    """Weekly slots of the active schedules for the next ``weeks`` weeks.
+
+    Slots are placed in each schedule's own timezone and returned as naive
+    times in ``now``'s timezone, the same way the calendar places them.
+    """
+    if schedules is None or schedules.empty:
+        return pd.DataFrame({"Student": pd.Series(dtype=object), "DateTime": pd.Series(dtype="datetime64[ns]")})
+    active = schedules.copy()
+    for c, default in {"student": "", "weekday": -1, "time": "", "active": True, "timezone": _legacy_schedule_fallback_tz_name()}.items():
+        if c not in active.columns:
+            active[c] = default
+    active = active[active["active"] == True]
+
+    parts = active["time"].astype(str).str.extract(r"^\s*(\d+)(?::(\d+))?")
+    hours = pd.to_numeric(parts[0], errors="coerce").fillna(0)
+    minutes = pd.to_numeric(parts[1], errors="coerce").fillna(0)
+    weekdays = pd.to_numeric(active["weekday"], errors="coerce")
+    valid = weekdays.between(0, 6) & hours.between(0, 23) & minutes.between(0, 59)
+    active = active[valid].assign(
+        _weekday=weekdays[valid].astype(int),
+        _slot=pd.to_timedelta(hours[valid] * 60 + minutes[valid], unit="min"),
+        _tz=active.loc[valid, "timezone"].fillna("").astype(str).str.strip(),
+    )
+
+    # pandas localizes by zone name in one vectorized pass; ZoneInfo objects
+    # fall back to a per-element path.
+    display_tz = getattr(now.tz, "key", None) or str(now.tz)
+    offsets = pd.to_timedelta(np.arange(weeks + 1) * 7, unit="D")
+    frames = []
+    for tz_name, group in active.groupby("_tz", sort=False):
+        source_tz = tz_name if _is_valid_timezone_name(tz_name) else _legacy_schedule_fallback_tz_name()
+        source_today = now.tz_convert(source_tz).tz_localize(None).normalize()
+        first = source_today + pd.to_timedelta((group["_weekday"] - source_today.weekday()) % 7, unit="D") + group["_slot"]
+        local = pd.DatetimeIndex(np.repeat(first.to_numpy(), len(offsets))) + np.tile(offsets, len(group))
+        # Same DST reading as a zoneinfo datetime (fold=0): repeated wall
+        # times take the first offset, skipped ones move past the gap.
+        placed = local.tz_localize(source_tz, ambiguous=np.ones(len(local), dtype=bool), nonexistent=pd.Timedelta(hours=1))
+        frames.append(
+            pd.DataFrame(
+                {
+                    "Student": np.repeat(group["student"].fillna("").astype(str).str.strip().to_numpy(), len(offsets)),
+                    "DateTime": placed.tz_convert(display_tz).tz_localize(None),
+                }
+            )
+        )
+    if not frames:
+        return _weekly_occurrences(None, now)
+    return pd.concat(frames, ignore_index=True)
+
+
+def _next_lesson_from_frames(
+    schedules: pd.DataFrame | None,
+    overrides: pd.DataFrame | None,
+    freezes: pd.DataFrame | None,
+    now: pd.Timestamp,
+) -> pd.Timestamp | None:
+    """Earliest lesson at or after ``now`` (naive, in ``now``'s timezone).
+
+    Follows ``build_calendar_events``: any override removes the recurring
+    slot on its original date, scheduled overrides add their new slot, and
+    active freezes hide the student's lessons inside the freeze dates.
+    """
+    now_naive = now.tz_localize(None)
+    events = _weekly_occurrences(schedules, now)
+    events = events[events["DateTime"] >= now_naive]
+
+    if overrides is not None and not overrides.empty:
+        ov = overrides.copy()
+        for c in ["student", "status", "new_datetime", "original_date"]:
+            if c not in ov.columns:
+                ov[c] = None
+        ov["student"] = ov["student"].fillna("").astype(str).str.strip()
+        moved = pd.DataFrame(
+            {"Student": ov["student"], "_date": pd.to_datetime(ov["original_date"], errors="coerce").dt.normalize(), "_moved": True}
+        ).dropna(subset=["_date"]).drop_duplicates()
+        if not moved.empty and not events.empty:
+            keyed = events.assign(_date=events["DateTime"].dt.normalize())
+            hit = keyed.merge(moved, on=["Student", "_date"], how="left")["_moved"].notna().to_numpy()
+            events = events[~hit]
+        new_dt = pd.to_datetime(ov["new_datetime"], errors="coerce")
+        scheduled = ov["status"].fillna("").astype(str).str.strip().str.lower().eq("scheduled") & new_dt.notna() & (new_dt >= now_naive)
+        if scheduled.any():
+            events = pd.concat([events, pd.DataFrame({"Student": ov.loc[scheduled, "student"], "DateTime": new_dt[scheduled]})], ignore_index=True)
+
+    if events.empty:
+        return None
+
+    if freezes is not None and not freezes.empty:
+        fz = freezes.copy()
+        for c, default in {"student": "", "start_date": None, "end_date": None, "active": True}.items():
+            if c not in fz.columns:
+                fz[c] = default
+        fz = fz[fz["active"] == True]
+        fz = pd.DataFrame(
+            {
+                "_key": fz["student"].fillna("").astype(str).str.strip().str.casefold(),
+                "_start": pd.to_datetime(fz["start_date"], errors="coerce"),
+                "_end": pd.to_datetime(fz["end_date"], errors="coerce"),
+            }
+        )
+        fz = fz[fz["_key"].str.len() > 0]
+        if not fz.empty:
+            events = events.reset_index(drop=True)
+            keyed = pd.DataFrame(
+                {
+                    "_row": events.index,
+                    "_key": events["Student"].astype(str).str.strip().str.casefold(),
+                    "_date": events["DateTime"].dt.normalize(),
+                }
+            ).merge(fz, on="_key", how="inner")
+            frozen = (keyed["_start"].isna() | (keyed["_date"] >= keyed["_start"])) & (keyed["_end"].isna() | (keyed["_date"] <= keyed["_end"]))
+            events = events.drop(index=keyed.loc[frozen, "_row"].unique())
+
+    if events.empty:
+        return None
+    return pd.Timestamp(events["DateTime"].min())
+
+
+class _NextLessonIndex:
+    """Next lesson start per (teacher, timezone), kept until that lesson starts."""
+
+    def __init__(self):
+        self._entries: dict[tuple[str, str], tuple[pd.Timestamp, pd.Timestamp | None]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple[str, str], now: pd.Timestamp) -> tuple[bool, pd.Timestamp | None]:
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None or now >= entry[0]:
+            return False, None
+        return True, entry[1]
+
+    def put(self, key: tuple[str, str], value: pd.Timestamp | None, expires_at: pd.Timestamp) -> None:
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_NEXT_LESSON_INDEX = _NextLessonIndex()
+# add_schedule, add_override and add_schedule_freeze clear every registered cache.
+register_cache(_NEXT_LESSON_INDEX, "schedule", "calendar")
+
+
+def next_lesson_datetime() -> pd.Timestamp | None:
+    """Start of the current teacher's next lesson, naive in the app timezone.
+
+    The answer is cached until that lesson starts (or, with no lesson
+    ahead, until local midnight) and dropped whenever schedules, overrides
+    or freezes change.
+    """
+    uid = str(get_current_user_id() or "")
+    tz_name = getattr(get_app_tz(), "key", "") or DEFAULT_TZ_NAME
+    now = pd.Timestamp(now_local())
+    now_naive = now.tz_localize(None)
+    hit, value = _NEXT_LESSON_INDEX.get((uid, tz_name), now_naive)
+    if hit:
+        return value
+    value = _next_lesson_from_frames(load_schedules(), load_overrides(), load_schedule_freezes(), now)
+    expires_at = value if value is not None else now_naive.normalize() + pd.Timedelta(days=1)
+    _NEXT_LESSON_INDEX.put((uid, tz_name), value, expires_at)
+    return value
+
+
 # =========================
@@ -2,8 +2,9 @@ from __future__ import annotations
 
 from collections import Counter
 from datetime import datetime, timezone
-from typing import Any
+from typing import Any, NamedTuple
 
+import numpy as np
 import pandas as pd
 import streamlit as st
 
@@ -16,7 +17,7 @@ from helpers.exposure_telemetry import (
     record_exposure_event,
 )
 from helpers.recommendation_models import (
-    _fit_linear_model,
+    _fit_linear_model_matrix,
     _load_student_history_rows,
     _norm_key,
     _norm_text,
@@ -24,12 +25,21 @@ from helpers.recommendation_models import (
     _safe_float,
     _score_linear_model,
     _tokenize,
+    append_student_recommendation_activity,
     clear_recommendation_model_caches,
     normalize_subject,
-    topic_resource_alignment_features,
+    student_history_generation,
+    topic_resource_alignment_batch,
 )
 
 
+class StudentRecommendationDesign(NamedTuple):
+    samples: list[dict[str, Any]]
+    matrix: np.ndarray
+    targets: np.ndarray
+    feature_names: list[str]
+
+
 def _clamp(value: float, low: float = 0.0, high: float = 1.0) -> float:
     return max(low, min(high, float(value)))
 
@@ -194,14 +204,42 @@ def _compute_metrics(labels: list[int], scores: list[float], threshold: float =
     }
 
 
-def _train_weights(samples: list[dict[str, Any]]) -> dict[str, float]:
-    rows = [(dict(sample.get("features") or {}), _safe_float(sample.get("target"), 0.0)) for sample in samples]
-    if not rows:
-        return _base_student_weights()
-    return _fit_linear_model(rows, base_weights=_base_student_weights())
+def _samples_design(samples: list[dict[str, Any]]) -> tuple[np.ndarray, np.ndarray, list[str]]:
+    features = [dict(sample.get("features") or {}) for sample in samples]
+    feature_names = list(dict.fromkeys(name for row in features for name in row))
+    matrix = np.array(
+        [[_safe_float(row.get(name), 0.0) for name in feature_names] for row in features],
+        dtype=float,
+    ).reshape(len(features), len(feature_names))
+    targets = np.array([_safe_float(sample.get("target"), 0.0) for sample in samples], dtype=float)
+    return matrix, targets, feature_names
 
 
-def summarize_student_recommendation_samples(samples: list[dict[str, Any]]) -> dict[str, Any]:
+def _train_weights(
+    samples: list[dict[str, Any]],
+    *,
+    design: StudentRecommendationDesign | None = None,
+    rows: list[int] | None = None,
+) -> dict[str, float]:
+    if not samples:
+        return _base_student_weights()
+    if design is None or rows is None:
+        matrix, targets, feature_names = _samples_design(samples)
+    else:
+        # Only features seen in the training rows take part, as with dict samples.
+        seen = {name for sample in samples for name in (sample.get("features") or {})}
+        columns = [idx for idx, name in enumerate(design.feature_names) if name in seen]
+        matrix = design.matrix[np.ix_(rows, columns)]
+        targets = design.targets[rows]
+        feature_names = [design.feature_names[idx] for idx in columns]
+    return _fit_linear_model_matrix(matrix, targets, feature_names, base_weights=_base_student_weights())
+
+
+def summarize_student_recommendation_samples(
+    samples: list[dict[str, Any]],
+    *,
+    design: StudentRecommendationDesign | None = None,
+) -> dict[str, Any]:
     sample_count = len(samples)
     if sample_count < 6:
         return {
@@ -217,7 +255,8 @@ def summarize_student_recommendation_samples(samples: list[dict[str, Any]]) -> d
             "counts_by_source": dict(Counter(str(sample.get("source") or "") for sample in samples)),
         }
 
-    ordered_samples = sorted(samples, key=lambda item: str(item.get("timestamp") or ""))
+    order = sorted(range(sample_count), key=lambda idx: str(samples[idx].get("timestamp") or ""))
+    ordered_samples = [samples[idx] for idx in order]
     split_idx = max(4, int(sample_count * 0.7))
     if split_idx >= sample_count:
         split_idx = sample_count - 1
@@ -227,7 +266,9 @@ def summarize_student_recommendation_samples(samples: list[dict[str, Any]]) -> d
         train_rows = ordered_samples[:-1]
         test_rows = ordered_samples[-1:]
 
-    weights = _train_weights(train_rows)
+    if design is not None and len(design.samples) != sample_count:
+        design = None
+    weights = _train_weights(train_rows, design=design, rows=order[: len(train_rows)])
     labels = [int(row.get("label") or 0) for row in test_rows]
     scores = [_score_linear_model(weights, dict(row.get("features") or {})) for row in test_rows]
     metrics = _compute_metrics(labels, scores)
@@ -257,145 +298,248 @@ def summarize_student_recommendation_samples(samples: list[dict[str, Any]]) -> d
     }
 
 
-def build_student_recommendation_samples(
+_PRACTICE_FEATURES = ("subject_in_program", "level_fit", "topic_in_program")
+_ASSIGNMENT_FEATURES = (
+    "subject_in_program",
+    "topic_in_program",
+    "explicit_topic_match",
+    "explicit_topic_support",
+    "direct_topic_link",
+    "topic_kind_prior",
+    "topic_match_ambiguity",
+)
+_ACTIVITY_FEATURES = (
+    "subject_in_program",
+    "level_fit",
+    "topic_in_program",
+    "program_type_fit",
+    "completion_fit",
+    "topic_need",
+)
+_ASSIGNMENT_KINDS = {"worksheet": "worksheet", "exam": "exam", "video": "video"}
+
+
+def _column(rows: list[dict[str, Any]], key: str) -> pd.Series:
+    return pd.Series([row.get(key) for row in rows], dtype=object)
+
+
+def _coalesce_text(*columns: pd.Series) -> pd.Series:
+    return pd.Series(
+        [str(next((value for value in values if value), "")) for values in zip(*columns)],
+        index=columns[0].index,
+        dtype=object,
+    )
+
+
+def _map_distinct(values: pd.Series, fn) -> pd.Series:
+    # History columns repeat heavily (kinds, subjects, topics), so each
+    # distinct value goes through the scalar helper once.
+    try:
+        mapping = {value: fn(value) for value in dict.fromkeys(values)}
+    except TypeError:
+        return values.map(fn)
+    return pd.Series([mapping[value] for value in values], index=values.index, dtype=object)
+
+
+def _program_fit_columns(
+    frame: pd.DataFrame,
+    level: pd.Series | None,
+    *,
+    subjects_in_program: set[str],
+    topic_tokens: set[str],
+    subject_levels: dict[str, Any],
+) -> None:
+    subject = frame["subject"]
+    frame["subject_in_program"] = (subject.ne("") & subject.isin(list(subjects_in_program))).astype(float)
+    frame["topic_in_program"] = _map_distinct(frame["topic"], lambda topic: _overlap_score(_tokenize(topic), topic_tokens)).astype(float)
+    if level is not None:
+        level_key = _map_distinct(level, _norm_key)
+        program_level_key = _map_distinct(subject, lambda item: _norm_key(subject_levels.get(item, "")))
+        frame["level_fit"] = (level_key.ne("") & level_key.eq(program_level_key)).astype(float)
+
+
+def _practice_frame(rows: list[dict[str, Any]], **program) -> pd.DataFrame:
+    kind = _map_distinct(_column(rows, "source_type"), _norm_key)
+    keep = kind.isin(["worksheet", "exam", "video"]).to_numpy()
+    rows = [row for row, kept in zip(rows, keep) if kept]
+    frame = pd.DataFrame({"kind": kind[keep].reset_index(drop=True)})
+    frame["subject"] = _map_distinct(_column(rows, "subject"), normalize_subject)
+    frame["topic"] = _map_distinct(_column(rows, "topic"), _norm_text)
+    frame["timestamp"] = _coalesce_text(_column(rows, "completed_at"), _column(rows, "created_at"))
+    score = _map_distinct(_column(rows, "score_pct"), _safe_float).astype(float) / 100.0
+    frame["target"] = 0.3 + 0.7 * score
+    frame["source"] = "practice_session"
+    _program_fit_columns(frame, _column(rows, "level"), **program)
+    return frame
+
+
+def _assignment_frame(rows: list[dict[str, Any]], *, student_id: str, active_topic_ids: set[int], **program) -> pd.DataFrame:
+    kind = _map_distinct(_column(rows, "assignment_type"), lambda value: _ASSIGNMENT_KINDS.get(_norm_key(value), ""))
+    keep = kind.ne("").to_numpy()
+    rows = [row for row, kept in zip(rows, keep) if kept]
+    frame = pd.DataFrame({"kind": kind[keep].reset_index(drop=True)})
+    frame["subject"] = _map_distinct(_column(rows, "subject_key"), normalize_subject)
+    frame["topic"] = _map_distinct(_column(rows, "topic"), _norm_text)
+    frame["timestamp"] = _coalesce_text(_column(rows, "updated_at"), _column(rows, "created_at"))
+    score = (_map_distinct(_column(rows, "score_pct"), _safe_float).astype(float) / 100.0).to_numpy()
+    status = _map_distinct(_column(rows, "status"), _norm_key)
+    is_video = frame["kind"].eq("video").to_numpy()
+    frame["target"] = np.select(
+        [
+            status.isin(["graded", "completed"]).to_numpy(),
+            status.isin(["started", "submitted"]).to_numpy(),
+            status.isin(["assigned", "overdue"]).to_numpy() & is_video,
+        ],
+        [0.4 + 0.6 * score, 0.45, 0.3],
+        default=0.2,
+    )
+    frame["source"] = "teacher_assignment"
+    _program_fit_columns(frame, None, **program)
+
+    # One model load for every (kind, source_record_id) in the history.
+    active_topics = tuple(sorted(active_topic_ids))
+    topic_ids = _map_distinct(_column(rows, "learning_program_topic_id"), lambda value: int(value or 0))
+    alignment = topic_resource_alignment_batch(
+        [
+            (kind, row.get("source_record_id"), (topic_id,) if topic_id > 0 else active_topics)
+            for kind, row, topic_id in zip(frame["kind"], rows, topic_ids)
+        ],
+        student_id=student_id,
+    )
+    for name in _ASSIGNMENT_FEATURES[2:]:
+        frame[name] = np.array([item[name] for item in alignment], dtype=float)
+    return frame
+
+
+def _activity_frame(rows: list[dict[str, Any]], **program) -> pd.DataFrame:
+    activity_type = _map_distinct(_column(rows, "activity_type"), _norm_key)
+    metas = [row.get("meta_json") if isinstance(row.get("meta_json"), dict) else {} for row in rows]
+    kind = _map_distinct(_column(metas, "resource_kind"), _norm_key)
+    keep = (activity_type.isin(["student_recommendation_impression", "student_recommendation_open"]) & kind.ne("")).to_numpy()
+    rows = [row for row, kept in zip(rows, keep) if kept]
+    metas = [meta for meta, kept in zip(metas, keep) if kept]
+    activity_type = activity_type[keep].reset_index(drop=True)
+    frame = pd.DataFrame({"kind": kind[keep].reset_index(drop=True)})
+    frame["subject"] = _map_distinct(_column(metas, "subject"), normalize_subject)
+    frame["topic"] = _map_distinct(_column(metas, "topic"), _norm_text)
+    frame["timestamp"] = _coalesce_text(_column(rows, "created_at"))
+    frame["target"] = np.where(activity_type.eq("student_recommendation_open").to_numpy(), 0.78, 0.16)
+    frame["source"] = activity_type
+    _program_fit_columns(frame, _column(metas, "level"), **program)
+    frame["program_type_fit"] = _map_distinct(_column(metas, "assigned_resource"), bool).astype(float)
+    frame["completion_fit"] = _map_distinct(_column(metas, "ml_blend_weight"), _safe_float).astype(float)
+    frame["topic_need"] = _map_distinct(_column(metas, "ml_score"), _safe_float).astype(float)
+    return frame
+
+
+def _frame_samples(frame: pd.DataFrame, feature_columns: tuple[str, ...]) -> list[dict[str, Any]]:
+    if frame.empty:
+        return []
+    targets = frame["target"].astype(float).tolist()
+    feature_rows = zip(*(frame[name].astype(float).tolist() for name in feature_columns))
+    return [
+        {
+            "kind": kind,
+            "subject": subject,
+            "topic": topic,
+            "timestamp": timestamp,
+            "target": target,
+            "label": _target_to_label(target),
+            "features": {f"kind_{kind}": 1.0, **dict(zip(feature_columns, values))},
+            "source": source,
+        }
+        for kind, subject, topic, timestamp, target, source, values in zip(
+            frame["kind"], frame["subject"], frame["topic"], frame["timestamp"], targets, frame["source"], feature_rows
+        )
+    ]
+
+
+def build_student_recommendation_design(
     student_profile: dict[str, Any],
     *,
     student_id: str | None = None,
-) -> list[dict[str, Any]]:
+) -> StudentRecommendationDesign:
+    """Build the student's training samples and the matching dense design matrix.
+
+    ``matrix`` rows follow ``samples``; its columns are ``feature_names``
+    with absent features as 0, and ``targets`` holds each sample's target.
+    """
     safe_student_id = str(student_id or get_current_user_id() or "").strip()
     history = _load_student_history_rows(safe_student_id)
-    practice_rows = history.get("practice_sessions") or []
-    assignment_rows = history.get("teacher_assignments") or []
-    activity_rows = history.get("recommendation_activity") or []
     program_signals = student_profile.get("program_signals") or {}
-    subjects_in_program = set(program_signals.get("subjects") or set())
-    topic_tokens = set(program_signals.get("topic_tokens") or set())
-    subject_levels = program_signals.get("subject_levels") or {}
-    active_topic_ids = set(program_signals.get("active_topic_ids") or set())
+    program = {
+        "subjects_in_program": set(program_signals.get("subjects") or set()),
+        "topic_tokens": set(program_signals.get("topic_tokens") or set()),
+        "subject_levels": program_signals.get("subject_levels") or {},
+    }
 
-    samples: list[dict[str, Any]] = []
+    blocks = [
+        (_practice_frame(history.get("practice_sessions") or [], **program), _PRACTICE_FEATURES),
+        (
+            _assignment_frame(
+                history.get("teacher_assignments") or [],
+                student_id=safe_student_id,
+                active_topic_ids=set(program_signals.get("active_topic_ids") or set()),
+                **program,
+            ),
+            _ASSIGNMENT_FEATURES,
+        ),
+        (_activity_frame(history.get("recommendation_activity") or [], **program), _ACTIVITY_FEATURES),
+    ]
+    samples = [sample for frame, columns in blocks for sample in _frame_samples(frame, columns)]
+
+    kinds = sorted({f"kind_{kind}" for frame, _columns in blocks for kind in frame["kind"]})
+    feature_names = kinds + sorted({name for _frame, columns in blocks for name in columns})
+    feature_index = {name: idx for idx, name in enumerate(feature_names)}
+    matrix = np.zeros((len(samples), len(feature_names)), dtype=float)
+    offset = 0
+    for frame, columns in blocks:
+        rows = np.arange(offset, offset + len(frame))
+        if len(frame):
+            matrix[rows, [feature_index[f"kind_{kind}"] for kind in frame["kind"]]] = 1.0
+            for name in columns:
+                matrix[rows, feature_index[name]] = frame[name].astype(float).to_numpy()
+        offset += len(frame)
+
+    order = sorted(range(len(samples)), key=lambda idx: samples[idx]["timestamp"])
+    samples = [samples[idx] for idx in order]
+    matrix = matrix[order] if samples else matrix
+    targets = np.array([sample["target"] for sample in samples], dtype=float)
+    return StudentRecommendationDesign(samples, matrix, targets, feature_names)
 
-    for row in practice_rows:
-        kind = _norm_key(row.get("source_type"))
-        if kind not in {"worksheet", "exam", "video"}:
-            continue
-        subject = normalize_subject(row.get("subject"))
-        topic = _norm_text(row.get("topic"))
-        score = _safe_float(row.get("score_pct")) / 100.0
-        target = 0.3 + 0.7 * score
-        features = {
-            f"kind_{kind}": 1.0 if kind else 0.0,
-            "subject_in_program": 1.0 if subject and subject in subjects_in_program else 0.0,
-            "level_fit": 1.0
-            if _norm_key(row.get("level")) and _norm_key(row.get("level")) == _norm_key(subject_levels.get(subject, ""))
-            else 0.0,
-            "topic_in_program": _overlap_score(_tokenize(topic), topic_tokens),
-        }
-        samples.append(
-            {
-                "kind": kind,
-                "subject": subject,
-                "topic": topic,
-                "timestamp": str(row.get("completed_at") or row.get("created_at") or ""),
-                "target": target,
-                "label": _target_to_label(target),
-                "features": features,
-                "source": "practice_session",
-            }
-        )
 
-    for row in assignment_rows:
-        assignment_type = _norm_key(row.get("assignment_type"))
-        kind = "worksheet" if assignment_type == "worksheet" else ("exam" if assignment_type == "exam" else "")
-        if assignment_type == "video":
-            kind = "video"
-        if not kind:
-            continue
-        subject = normalize_subject(row.get("subject_key"))
-        topic = _norm_text(row.get("topic"))
-        score = _safe_float(row.get("score_pct")) / 100.0
-        status = _norm_key(row.get("status"))
-        topic_id = int(row.get("learning_program_topic_id") or 0)
-        topic_alignment = topic_resource_alignment_features(
-            kind,
-            row.get("source_record_id"),
-            [topic_id] if topic_id > 0 else list(active_topic_ids),
-            student_id=safe_student_id,
-        )
-        target = 0.2
-        if status in {"graded", "completed"}:
-            target = 0.4 + 0.6 * score
-        elif status in {"started", "submitted"}:
-            target = 0.45
-        elif status in {"assigned", "overdue"} and kind == "video":
-            target = 0.3
-        features = {
-            f"kind_{kind}": 1.0,
-            "subject_in_program": 1.0 if subject and subject in subjects_in_program else 0.0,
-            "topic_in_program": _overlap_score(_tokenize(topic), topic_tokens),
-            "explicit_topic_match": topic_alignment["explicit_topic_match"],
-            "explicit_topic_support": topic_alignment["explicit_topic_support"],
-            "direct_topic_link": topic_alignment["direct_topic_link"],
-            "topic_kind_prior": topic_alignment["topic_kind_prior"],
-            "topic_match_ambiguity": topic_alignment["topic_match_ambiguity"],
-        }
-        samples.append(
-            {
-                "kind": kind,
-                "subject": subject,
-                "topic": topic,
-                "timestamp": str(row.get("updated_at") or row.get("created_at") or ""),
-                "target": target,
-                "label": _target_to_label(target),
-                "features": features,
-                "source": "teacher_assignment",
-            }
-        )
+def build_student_recommendation_samples(
+    student_profile: dict[str, Any],
+    *,
+    student_id: str | None = None,
+) -> list[dict[str, Any]]:
+    return build_student_recommendation_design(student_profile, student_id=student_id).samples
 
-    for row in activity_rows:
-        meta = row.get("meta_json") if isinstance(row.get("meta_json"), dict) else {}
-        activity_type = _norm_key(row.get("activity_type"))
-        kind = _norm_key(meta.get("resource_kind"))
-        if activity_type not in {"student_recommendation_impression", "student_recommendation_open"} or not kind:
-            continue
-        subject = normalize_subject(meta.get("subject"))
-        topic = _norm_text(meta.get("topic"))
-        target = 0.78 if activity_type == "student_recommendation_open" else 0.16
-        features = {
-            f"kind_{kind}": 1.0,
-            "subject_in_program": 1.0 if subject and subject in subjects_in_program else 0.0,
-            "level_fit": 1.0
-            if _norm_key(meta.get("level")) and _norm_key(meta.get("level")) == _norm_key(subject_levels.get(subject, ""))
-            else 0.0,
-            "topic_in_program": _overlap_score(_tokenize(topic), topic_tokens),
-            "program_type_fit": 1.0 if bool(meta.get("assigned_resource")) else 0.0,
-            "completion_fit": _safe_float(meta.get("ml_blend_weight"), 0.0),
-            "topic_need": _safe_float(meta.get("ml_score"), 0.0),
-        }
-        samples.append(
-            {
-                "kind": kind,
-                "subject": subject,
-                "topic": topic,
-                "timestamp": str(row.get("created_at") or ""),
-                "target": target,
-                "label": _target_to_label(target),
-                "features": features,
-                "source": activity_type,
-            }
-        )
 
-    samples.sort(key=lambda item: str(item.get("timestamp") or ""))
-    return samples
+@st.cache_data(ttl=120, show_spinner=False)
+def _evaluate_student_recommendation_pipeline_cached(
+    student_id: str,
+    profile_snapshot: dict[str, Any],
+    history_generation: int,
+) -> dict[str, Any]:
+    design = build_student_recommendation_design(profile_snapshot, student_id=student_id)
+    return summarize_student_recommendation_samples(design.samples, design=design)
+
+
+register_cache(_evaluate_student_recommendation_pipeline_cached, "recommendations", "practice", "assignments")
 
 
-@st.cache_data(ttl=120, show_spinner=False)
 def evaluate_student_recommendation_pipeline(
     student_id: str,
     profile_snapshot: dict[str, Any],
 ) -> dict[str, Any]:
-    samples = build_student_recommendation_samples(profile_snapshot, student_id=student_id)
-    return summarize_student_recommendation_samples(samples)
+    # Keyed by the student's history generation so their own new activity
+    # re-evaluates their pipeline without touching anyone else's entry.
+    return _evaluate_student_recommendation_pipeline_cached(
+        student_id,
+        profile_snapshot,
+        student_history_generation(student_id),
+    )
 
 
 def student_recommendation_blend_weight(student_id: str, profile_snapshot: dict[str, Any]) -> float:
@@ -403,9 +547,6 @@ def student_recommendation_blend_weight(student_id: str, profile_snapshot: dict[
     return float(diagnostics.get("blend_weight") or 0.42)
 
 
-register_cache(evaluate_student_recommendation_pipeline, "recommendations", "practice", "assignments")
-
-
 def _student_reco_meta(item: dict[str, Any], surface: str) -> dict[str, Any]:
     row = item.get("row") or {}
     return {
@@ -464,8 +605,7 @@ def log_student_recommendation_impressions(rows: list[dict[str, Any]], *, surfac
     st.session_state["_student_reco_impressions_seen"] = list(seen)
     try:
         get_sb().table("user_activity_log").insert(payloads).execute()
-        _load_student_history_rows.clear()
-        evaluate_student_recommendation_pipeline.clear()
+        append_student_recommendation_activity(user_id, payloads)
     except Exception:
         pass
 
@@ -509,6 +649,6 @@ def log_student_recommendation_open(item: dict[str, Any], *, surface: str) -> No
         seen.add(signature)
         st.session_state["_student_reco_open_seen"] = list(seen)
         clear_recommendation_model_caches()
-        evaluate_student_recommendation_pipeline.clear()
+        _evaluate_student_recommendation_pipeline_cached.clear()
     except Exception:
         pass
@@ -9,7 +9,7 @@ from typing import Any
 import pandas as pd
 import streamlit as st
 
-from core.database import _execute_query_with_diagnostics, get_sb, load_profile_row, register_cache
+from core.database import _execute_query_with_diagnostics, get_sb, load_profile_row, register_cache, shared_cache
 from core.i18n import t
 from core.state import get_current_user_id
 from helpers.archive_utils import truthy_flag
@@ -435,6 +435,7 @@ def _format_activity_label(value: Any) -> str:
 
 
 @st.cache_data(ttl=45, show_spinner=False)
+@shared_cache("recommendations", "assignments", "practice", ttl=45)
 def _load_student_assignment_signal_rows(student_id: str) -> list[dict[str, Any]]:
     safe_student_id = str(student_id or "").strip()
     if not safe_student_id:
@@ -20,6 +20,91 @@ def _logo_abs() -> str:
 
 # ── Student report PDF ────────────────────────────────────────────────
 
+# Rows per Table flowable. Each chunk repeats the header and is laid out on
+# its own, so a long history costs linear layout work instead of re-measuring
+# every remaining row at each page break. Even, so row shading stays aligned.
+_REPORT_TABLE_CHUNK_ROWS = 40
+
+
+def _escape_markup(text: pd.Series) -> pd.Series:
+    return text.str.replace("&", "&amp;", regex=False).str.replace("<", "&lt;", regex=False).str.replace(">", "&gt;", regex=False)
+
+
+def _format_report_cells(
+    frame: pd.DataFrame,
+    columns: list[str],
+    *,
+    money_columns: tuple[str, ...] = (),
+    wrap_columns: tuple[str, ...] = (),
+) -> list[list]:
+    """Display text for ``columns``, one list per row.
+
+    Dates print as YYYY-MM-DD, money columns with thousands separators and
+    two decimals, and missing values as blanks. Columns in ``wrap_columns``
+    are escaped for Paragraph markup; the caller wraps those cells.
+    """
+    texts = []
+    for column in columns:
+        values = frame[column] if column in frame.columns else pd.Series(None, index=frame.index, dtype=object)
+        missing = values.isna()
+        if column in money_columns:
+            amounts = pd.to_numeric(values, errors="coerce")
+            missing |= amounts.isna()
+            text = amounts.map("{:,.2f}".format)
+        elif pd.api.types.is_datetime64_any_dtype(values):
+            text = values.dt.strftime("%Y-%m-%d")
+        else:
+            text = values.astype(str)
+        text = text.where(~missing, "")
+        if column in wrap_columns:
+            text = _escape_markup(text)
+        texts.append(text.to_numpy(dtype=object))
+    if not texts:
+        return []
+    return [list(row) for row in zip(*texts)]
+
+
+def _report_tables(
+    headers: list[str],
+    cells: list[list],
+    *,
+    wrap_indexes: list[int],
+    width: float,
+    sty_hdr_cell,
+    sty_cell,
+) -> list:
+    """Chunked ReportLab tables for one report section."""
+    from reportlab.lib import colors
+    from reportlab.platypus import Paragraph, Table, TableStyle
+
+    for row in cells:
+        for idx in wrap_indexes:
+            if row[idx]:
+                row[idx] = Paragraph(row[idx], sty_cell)
+
+    header_row = [Paragraph(h, sty_hdr_cell) for h in headers]
+    col_widths = [width / max(1, len(headers))] * len(headers)
+    style = TableStyle([
+        ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#1D4ED8")),
+        ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
+        ("TEXTCOLOR", (0, 1), (-1, -1), colors.HexColor("#1E293B")),
+        ("FONTSIZE", (0, 0), (-1, -1), 9),
+        ("GRID", (0, 0), (-1, -1), 0.4, colors.HexColor("#CBD5E1")),
+        ("ROWBACKGROUNDS", (0, 1), (-1, -1), [colors.white, colors.HexColor("#F1F5F9")]),
+        ("VALIGN", (0, 0), (-1, -1), "TOP"),
+        ("LEFTPADDING", (0, 0), (-1, -1), 4),
+        ("RIGHTPADDING", (0, 0), (-1, -1), 4),
+        ("TOPPADDING", (0, 0), (-1, -1), 3),
+        ("BOTTOMPADDING", (0, 0), (-1, -1), 3),
+    ])
+    tables = []
+    for start in range(0, len(cells), _REPORT_TABLE_CHUNK_ROWS):
+        tbl = Table([header_row] + cells[start:start + _REPORT_TABLE_CHUNK_ROWS], colWidths=col_widths, repeatRows=1)
+        tbl.setStyle(style)
+        tables.append(tbl)
+    return tables
+
+
 def build_student_report_pdf(
     student_name: str,
     lessons_df: pd.DataFrame,
@@ -31,7 +116,7 @@ def build_student_report_pdf(
     from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
     from reportlab.lib.units import cm
     from reportlab.platypus import (
-        SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle,
+        SimpleDocTemplate, Paragraph, Spacer,
         HRFlowable, Image as RLImage,
     )
     from reportlab.lib import colors
@@ -57,6 +142,19 @@ def build_student_report_pdf(
     sty_cell = ParagraphStyle("RptCell", parent=styles["Normal"], fontSize=9, leading=11,
                               textColor=colors.HexColor("#1E293B"))
 
+    def section_tables(frame, cols, headers, *, money_columns=(), wrap_columns=()):
+        # Short values (dates, counts, amounts) are drawn as plain strings;
+        # only free-text columns pay for Paragraph wrapping.
+        cells = _format_report_cells(frame, cols, money_columns=money_columns, wrap_columns=wrap_columns)
+        return _report_tables(
+            headers,
+            cells,
+            wrap_indexes=[cols.index(c) for c in wrap_columns],
+            width=doc.width,
+            sty_hdr_cell=sty_hdr_cell,
+            sty_cell=sty_cell,
+        )
+
     story: list = []
 
     # ── Top-left logo, then left-aligned header ────────────────────────
@@ -82,23 +180,7 @@ def build_student_report_pdf(
     if lessons_df.empty:
         story.append(Paragraph(t("no_data"), sty_body))
     else:
-        tdata = [[Paragraph(h, sty_hdr_cell) for h in l_headers]]
-        for _, row in lessons_df.iterrows():
-            tdata.append([Paragraph(str(row.get(c, "") or ""), sty_cell) for c in l_cols])
-        tbl = Table(tdata, repeatRows=1)
-        tbl.setStyle(TableStyle([
-            ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#1D4ED8")),
-            ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
-            ("FONTSIZE", (0, 0), (-1, -1), 9),
-            ("GRID", (0, 0), (-1, -1), 0.4, colors.HexColor("#CBD5E1")),
-            ("ROWBACKGROUNDS", (0, 1), (-1, -1), [colors.white, colors.HexColor("#F1F5F9")]),
-            ("VALIGN", (0, 0), (-1, -1), "TOP"),
-            ("LEFTPADDING", (0, 0), (-1, -1), 4),
-            ("RIGHTPADDING", (0, 0), (-1, -1), 4),
-            ("TOPPADDING", (0, 0), (-1, -1), 3),
-            ("BOTTOMPADDING", (0, 0), (-1, -1), 3),
-        ]))
-        story.append(tbl)
+        story.extend(section_tables(lessons_df, l_cols, l_headers, wrap_columns=("subject", "note")))
 
     story.append(Spacer(1, 12))
 
@@ -114,23 +196,7 @@ def build_student_report_pdf(
     if payments_df.empty:
         story.append(Paragraph(t("no_data"), sty_body))
     else:
-        tdata = [[Paragraph(h, sty_hdr_cell) for h in p_headers]]
-        for _, row in payments_df.iterrows():
-            tdata.append([Paragraph(str(row.get(c, "") or ""), sty_cell) for c in p_cols])
-        tbl = Table(tdata, repeatRows=1)
-        tbl.setStyle(TableStyle([
-            ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#1D4ED8")),
-            ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
-            ("FONTSIZE", (0, 0), (-1, -1), 9),
-            ("GRID", (0, 0), (-1, -1), 0.4, colors.HexColor("#CBD5E1")),
-            ("ROWBACKGROUNDS", (0, 1), (-1, -1), [colors.white, colors.HexColor("#F1F5F9")]),
-            ("VALIGN", (0, 0), (-1, -1), "TOP"),
-            ("LEFTPADDING", (0, 0), (-1, -1), 4),
-            ("RIGHTPADDING", (0, 0), (-1, -1), 4),
-            ("TOPPADDING", (0, 0), (-1, -1), 3),
-            ("BOTTOMPADDING", (0, 0), (-1, -1), 3),
-        ]))
-        story.append(tbl)
+        story.extend(section_tables(payments_df, p_cols, p_headers, money_columns=("paid_amount",), wrap_columns=("subject",)))
 
     # ── Current package balance ────────────────────────────────────────
     if package_df is not None and not package_df.empty:
@@ -143,28 +209,7 @@ def build_student_report_pdf(
         pkg_headers = [t("subject"), t("modality"), t("lessons_paid"),
                        t("lessons_taken"), t("lessons_left")]
 
-        # ensure columns exist
-        for c in pkg_cols:
-            if c not in package_df.columns:
-                package_df[c] = ""
-
-        tdata = [[Paragraph(h, sty_hdr_cell) for h in pkg_headers]]
-        for _, row in package_df.iterrows():
-            tdata.append([Paragraph(str(row.get(c, "") or ""), sty_cell) for c in pkg_cols])
-        tbl = Table(tdata, repeatRows=1)
-        tbl.setStyle(TableStyle([
-            ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#1D4ED8")),
-            ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
-            ("FONTSIZE", (0, 0), (-1, -1), 9),
-            ("GRID", (0, 0), (-1, -1), 0.4, colors.HexColor("#CBD5E1")),
-            ("ROWBACKGROUNDS", (0, 1), (-1, -1), [colors.white, colors.HexColor("#F1F5F9")]),
-            ("VALIGN", (0, 0), (-1, -1), "TOP"),
-            ("LEFTPADDING", (0, 0), (-1, -1), 4),
-            ("RIGHTPADDING", (0, 0), (-1, -1), 4),
-            ("TOPPADDING", (0, 0), (-1, -1), 3),
-            ("BOTTOMPADDING", (0, 0), (-1, -1), 3),
-        ]))
-        story.append(tbl)
+        story.extend(section_tables(package_df, pkg_cols, pkg_headers, wrap_columns=("Subject",)))
 
     # ── Summary row ───────────────────────────────────────────────────
     story.append(Spacer(1, 10))
@@ -11,7 +11,7 @@ import pandas as pd
 from core.database import _execute_query_with_diagnostics, get_sb
 from core.state import get_current_user_id
 from helpers.archive_utils import truthy_flag
-from helpers.learning_programs import _load_program_assignments_for_teacher_cached, load_assignment_progress_map, load_learning_program
+from helpers.learning_programs import _load_program_assignments_for_teacher_cached, load_assignment_progress_maps, load_learning_programs
 from helpers.teacher_student_integration import _load_teacher_assignment_progress_cached
 from helpers.recommendation_models import (
     _fit_linear_model,
@@ -286,6 +286,17 @@ def _teacher_objective_candidate_features(candidate: dict[str, Any]) -> dict[str
     }
 
 
+def _group_progress_rows_by_student_subject(progress_df: pd.DataFrame) -> dict[tuple[str, str], list[dict[str, Any]]]:
+    """Assignment progress records keyed by (student_id, subject_key) as strings."""
+    if progress_df is None or progress_df.empty or not {"student_id", "subject_key"}.issubset(progress_df.columns):
+        return {}
+    grouped: dict[tuple[str, str], list[dict[str, Any]]] = {}
+    keys = zip(progress_df["student_id"].astype(str), progress_df["subject_key"].astype(str))
+    for key, record in zip(keys, progress_df.to_dict("records")):
+        grouped.setdefault(key, []).append(record)
+    return grouped
+
+
 def build_teacher_objective_samples(teacher_id: str | None = None) -> list[dict[str, Any]]:
     safe_teacher_id = str(teacher_id or get_current_user_id() or "").strip()
     if not safe_teacher_id:
@@ -295,28 +306,28 @@ def build_teacher_objective_samples(teacher_id: str | None = None) -> list[dict[
         return []
     teacher_assignments = _load_teacher_assignment_progress_cached(safe_teacher_id)
     teacher_assignments_df = pd.DataFrame(teacher_assignments) if teacher_assignments else pd.DataFrame()
+    progress_rows_by_student_subject = _group_progress_rows_by_student_subject(teacher_assignments_df)
     objective_events = _summarize_teacher_objective_events(_load_teacher_objective_events(safe_teacher_id))
     samples: list[dict[str, Any]] = []
 
-    for row in assignments_df.to_dict("records"):
+    assignment_rows = [
+        row
+        for row in assignments_df.to_dict("records")
+        if int(row.get("id") or 0) > 0 and int(row.get("program_id") or 0) > 0
+    ]
+    programs = load_learning_programs(int(row.get("program_id") or 0) for row in assignment_rows)
+    progress_maps = load_assignment_progress_maps(int(row.get("id") or 0) for row in assignment_rows)
+
+    for row in assignment_rows:
         assignment_id = int(row.get("id") or 0)
         program_id = int(row.get("program_id") or 0)
         student_id = str(row.get("student_user_id") or "").strip()
-        if assignment_id <= 0 or program_id <= 0:
-            continue
-        program = load_learning_program(program_id)
+        program = programs.get(program_id)
         if not isinstance(program, dict) or not program:
             continue
-        progress_map = load_assignment_progress_map(assignment_id)
+        progress_map = progress_maps.get(assignment_id, {})
         subject_key = str(program.get("subject") or row.get("subject_key") or "").strip()
-        student_progress_rows = (
-            teacher_assignments_df[
-                (teacher_assignments_df["student_id"].astype(str) == student_id)
-                & (teacher_assignments_df["subject_key"].astype(str) == subject_key)
-            ].to_dict("records")
-            if not teacher_assignments_df.empty and {"student_id", "subject_key"}.issubset(teacher_assignments_df.columns)
-            else []
-        )
+        student_progress_rows = progress_rows_by_student_subject.get((student_id, subject_key), [])
         overall_signal = _build_recommendation_signal(student_progress_rows)
         total_topics = sum(len(unit.get("topics") or []) for unit in (program.get("units") or []))
         completed_topics = len([1 for item in progress_map.values() if item.get("teacher_done")])
@@ -11,6 +11,12 @@ from core.database import clear_cache_domains, get_sb, register_cache
 from core.i18n import t
 from core.state import get_current_user_id
 from helpers.archive_utils import truthy_flag
+from helpers.notification_inbox import (
+    INBOX_ASSIGNMENT_ASSIGNED,
+    INBOX_REVIEW_COMPLETED,
+    INBOX_REVIEW_REQUESTED,
+    record_inbox_event,
+)
 from helpers.recommendation_memory import (
     clear_active_recommendation_context,
     recommendation_context_for_assignment,
@@ -1055,6 +1061,17 @@ def create_teacher_assignment(
         if assignment_rows:
             created_row = {**payload, **assignment_rows[0]}
             record_assignment_exposure_from_assignment_row(created_row)
+            record_inbox_event(
+                user_id=payload["student_id"],
+                kind=INBOX_ASSIGNMENT_ASSIGNED,
+                source_id=created_row.get("id"),
+                event_at=now,
+                payload={
+                    "title": payload["title"],
+                    "assignment_type": assignment_type,
+                    "teacher_name": _profile_label(_load_profiles_map([teacher_id]).get(teacher_id, {})),
+                },
+            )
         _clear_teacher_student_caches()
         return True, "assignment_created"
     except Exception:
@@ -2173,6 +2190,24 @@ def _serialize_review_item(exercise: dict, question: Any, answer_row: dict, corr
     }
 
 
+def _record_review_requested_inbox_event(inserted_rows: list[dict], payload: dict) -> None:
+    if not inserted_rows:
+        return
+    student_id = str(payload.get("student_id") or "").strip()
+    record_inbox_event(
+        user_id=payload.get("teacher_id"),
+        kind=INBOX_REVIEW_REQUESTED,
+        source_id=inserted_rows[0].get("id"),
+        event_at=payload.get("requested_at"),
+        payload={
+            "student_id": student_id,
+            "student_name": _profile_label(_load_profiles_map([student_id]).get(student_id, {})),
+            "title": payload.get("title") or "",
+            "source_type": payload.get("source_type") or "",
+        },
+    )
+
+
 def create_teacher_review_request(
     *,
     practice_session_id: int,
@@ -2241,7 +2276,8 @@ def create_teacher_review_request(
         "updated_at": _now_iso(),
     }
     try:
-        get_sb().table("teacher_review_requests").insert(payload).execute()
+        res = get_sb().table("teacher_review_requests").insert(payload).execute()
+        _record_review_requested_inbox_event(_rows(res), payload)
         _clear_teacher_student_caches()
         return True, "teacher_review_requested"
     except Exception:
@@ -2317,8 +2353,9 @@ def ensure_teacher_review_request_for_attempt(
     }
     try:
         res = get_sb().table("teacher_review_requests").insert(payload).execute()
-        _clear_teacher_student_caches()
         rows = _rows(res)
+        _record_review_requested_inbox_event(rows, payload)
+        _clear_teacher_student_caches()
         review_id = int(rows[0].get("id") or 0) if rows else None
         return True, "teacher_review_started", review_id
     except Exception:
@@ -2531,6 +2568,17 @@ def submit_teacher_review(
                 "updated_at": now,
             }
         ).eq("id", int(review_id)).eq("teacher_id", teacher_id).execute()
+        record_inbox_event(
+            user_id=student_id,
+            kind=INBOX_REVIEW_COMPLETED,
+            source_id=int(review_id),
+            event_at=now,
+            payload={
+                "teacher_name": _profile_label(_load_profiles_map([teacher_id]).get(teacher_id, {})),
+                "title": detail.get("title") or "",
+                "source_type": detail.get("source_type") or "",
+            },
+        )
 
         assignment_id = detail.get("assignment_id")
         if assignment_id:
@@ -2,17 +2,20 @@ from __future__ import annotations
 
 import html
 import re
+import threading
+import time
 from datetime import datetime, timezone
-from typing import Any
+from typing import Any, Callable
 
 import pandas as pd
 import streamlit as st
 
-from core.database import clear_cache_domains, get_sb, load_profile_row, register_cache
+from core.database import clear_cache_domains, get_sb, register_cache
 from core.i18n import t
 from core.navigation import clear_open_resource_previews, clear_smart_tool_result_state, go_to
 from core.state import get_current_user_id
 from helpers.archive_utils import filter_archived_rows, is_archived_status
+from helpers.keyset_pagination import LIBRARY_PAGE_SIZE, KeysetFeed, KeysetPage, fetch_keyset_page
 from helpers.resource_deletion import render_archive_delete_button, render_archive_delete_confirmation
 from helpers.recommendation_models import log_teacher_material_open
 from helpers.resource_gallery import extract_resource_language_value, inject_resource_gallery_styles, render_gallery_card_html
@@ -90,22 +93,82 @@ def _rows(result) -> list[dict]:
     return getattr(result, "data", None) or []
 
 
+class _TTLKeyCache:
+    """Per-key TTL cache shared by every session in the process.
+
+    Batch loaders look up many keys at once, fetch only the misses, and store
+    each result (including empty ones) so later pages and detail views reuse
+    them. ``clear()`` makes it usable with ``register_cache``.
+    """
+
+    def __init__(self, ttl_seconds: float, *, max_entries: int = 5000, timer: Callable[[], float] = time.monotonic):
+        self.ttl_seconds = float(ttl_seconds)
+        self.max_entries = int(max_entries)
+        self._timer = timer
+        self._lock = threading.Lock()
+        self._entries: dict[Any, tuple[float, Any]] = {}
+
+    def get_many(self, keys) -> tuple[dict[Any, Any], list[Any]]:
+        now = self._timer()
+        hits: dict[Any, Any] = {}
+        missing: list[Any] = []
+        with self._lock:
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is not None and entry[0] > now:
+                    hits[key] = entry[1]
+                else:
+                    missing.append(key)
+        return hits, missing
+
+    def put_many(self, values: dict[Any, Any]) -> None:
+        expires_at = self._timer() + self.ttl_seconds
+        with self._lock:
+            if len(self._entries) + len(values) > self.max_entries:
+                now = self._timer()
+                self._entries = {key: entry for key, entry in self._entries.items() if entry[0] > now}
+                if len(self._entries) + len(values) > self.max_entries:
+                    self._entries.clear()
+            for key, value in values.items():
+                self._entries[key] = (expires_at, value)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+PROFILE_NAME_CACHE_TTL_SECONDS = 300
+VIDEO_TOPIC_LINK_CACHE_TTL_SECONDS = 45
+
+_PROFILE_NAME_CACHE = _TTLKeyCache(PROFILE_NAME_CACHE_TTL_SECONDS)
+register_cache(_PROFILE_NAME_CACHE, "profiles")
+
+
 def _profile_name_map(user_ids: list[str]) -> dict[str, dict]:
-    ids = [str(item or "").strip() for item in user_ids if str(item or "").strip()]
+    ids = list(dict.fromkeys(str(item or "").strip() for item in user_ids if str(item or "").strip()))
     if not ids:
         return {}
-    try:
-        rows = _rows(
-            get_sb()
-            .table("profiles")
-            .select("user_id,display_name,username,email")
-            .in_("user_id", ids)
-            .limit(max(1, len(ids)))
-            .execute()
-        )
-        return {str(row.get("user_id") or "").strip(): row for row in rows}
-    except Exception:
-        return {}
+    profiles, missing = _PROFILE_NAME_CACHE.get_many(ids)
+    if missing:
+        try:
+            rows = _rows(
+                get_sb()
+                .table("profiles")
+                .select("user_id,display_name,username,email")
+                .in_("user_id", missing)
+                .limit(max(1, len(missing)))
+                .execute()
+            )
+        except Exception:
+            return {key: value for key, value in profiles.items() if value}
+        fetched = {str(row.get("user_id") or "").strip(): row for row in rows}
+        _PROFILE_NAME_CACHE.put_many({user_id: fetched.get(user_id, {}) for user_id in missing})
+        profiles.update(fetched)
+    return {key: value for key, value in profiles.items() if value}
+
+
+def _profile_author_name(profile: dict) -> str:
+    return profile.get("display_name") or profile.get("username") or profile.get("email") or ""
 
 
 def _now_iso() -> str:
@@ -235,17 +298,44 @@ def video_material_language_label(value: Any) -> str:
     return key.upper() if key else ""
 
 
-@st.cache_data(ttl=45, show_spinner=False)
-def load_video_topic_links(video_record_id: int | str) -> list[dict]:
-    safe_id = str(video_record_id or "").strip()
-    if not safe_id:
-        return []
+_TOPIC_LINK_PROGRAM_COLUMNS = "id,title,subject,custom_subject_name,learner_stage,level_or_band,student_material_language,program_language"
+_TOPIC_LINK_TOPIC_COLUMNS = "id,title,lesson_focus,unit_number,topic_number"
+_VIDEO_TOPIC_LINK_CACHE = _TTLKeyCache(VIDEO_TOPIC_LINK_CACHE_TTL_SECONDS)
+register_cache(_VIDEO_TOPIC_LINK_CACHE, "videos", "resources", "learning_programs")
+
+
+def _safe_video_ids(video_ids) -> list[int]:
+    safe_ids = []
+    for value in video_ids or []:
+        text = str(value or "").strip()
+        if text.isdigit() and int(text) > 0:
+            safe_ids.append(int(text))
+    return list(dict.fromkeys(safe_ids))
+
+
+def _fetch_video_topic_link_rows(video_ids: list[int]) -> list[dict]:
+    """One nested select for every link row; falls back to three flat queries."""
+    try:
+        return _rows(
+            get_sb()
+            .table("learning_program_topic_videos")
+            .select(
+                "id,video_id,program_id,topic_id,created_at,"
+                f"program:learning_programs({_TOPIC_LINK_PROGRAM_COLUMNS}),"
+                f"topic:learning_program_topics({_TOPIC_LINK_TOPIC_COLUMNS})"
+            )
+            .in_("video_id", video_ids)
+            .order("created_at", desc=False)
+            .execute()
+        )
+    except Exception:
+        pass
     try:
         link_rows = _rows(
             get_sb()
             .table("learning_program_topic_videos")
-            .select("id,program_id,topic_id,created_at")
-            .eq("video_id", int(safe_id) if safe_id.isdigit() else safe_id)
+            .select("id,video_id,program_id,topic_id,created_at")
+            .in_("video_id", video_ids)
             .order("created_at", desc=False)
             .execute()
         )
@@ -262,7 +352,7 @@ def load_video_topic_links(video_record_id: int | str) -> list[dict]:
             program_rows = _rows(
                 get_sb()
                 .table("learning_programs")
-                .select("id,title,subject,custom_subject_name,learner_stage,level_or_band,student_material_language,program_language")
+                .select(_TOPIC_LINK_PROGRAM_COLUMNS)
                 .in_("id", program_ids)
                 .execute()
             )
@@ -274,25 +364,52 @@ def load_video_topic_links(video_record_id: int | str) -> list[dict]:
             topic_rows = _rows(
                 get_sb()
                 .table("learning_program_topics")
-                .select("id,title,lesson_focus,unit_number,topic_number")
+                .select(_TOPIC_LINK_TOPIC_COLUMNS)
                 .in_("id", topic_ids)
                 .execute()
             )
             topic_lookup = {int(row.get("id") or 0): row for row in topic_rows if int(row.get("id") or 0) > 0}
         except Exception:
             topic_lookup = {}
-    contexts: list[dict] = []
-    for row in link_rows:
-        program_id = int(row.get("program_id") or 0)
-        topic_id = int(row.get("topic_id") or 0)
-        contexts.append(
-            {
-                **row,
-                "program": program_lookup.get(program_id, {}),
-                "topic": topic_lookup.get(topic_id, {}),
-            }
-        )
-    return contexts
+    return [
+        {
+            **row,
+            "program": program_lookup.get(int(row.get("program_id") or 0), {}),
+            "topic": topic_lookup.get(int(row.get("topic_id") or 0), {}),
+        }
+        for row in link_rows
+    ]
+
+
+def load_video_topic_links_many(video_ids) -> dict[int, list[dict]]:
+    """Program/topic link contexts for a page of videos, keyed by video id."""
+    safe_ids = _safe_video_ids(video_ids)
+    if not safe_ids:
+        return {}
+    contexts, missing = _VIDEO_TOPIC_LINK_CACHE.get_many(safe_ids)
+    if missing:
+        fetched: dict[int, list[dict]] = {video_id: [] for video_id in missing}
+        for row in _fetch_video_topic_link_rows(missing):
+            video_id = int(row.get("video_id") or 0)
+            if video_id not in fetched:
+                continue
+            fetched[video_id].append(
+                {
+                    **row,
+                    "program": dict(row.get("program") or {}),
+                    "topic": dict(row.get("topic") or {}),
+                }
+            )
+        _VIDEO_TOPIC_LINK_CACHE.put_many(fetched)
+        contexts.update(fetched)
+    return {video_id: list(contexts.get(video_id) or []) for video_id in safe_ids}
+
+
+def load_video_topic_links(video_record_id: int | str) -> list[dict]:
+    safe_ids = _safe_video_ids([video_record_id])
+    if not safe_ids:
+        return []
+    return load_video_topic_links_many(safe_ids).get(safe_ids[0], [])
 
 
 def _video_row_to_card(row: dict) -> str:
@@ -503,6 +620,8 @@ def update_video_resource(
         except Exception:
             pass
         try:
+            _load_my_videos_page_cached.clear()
+            _load_public_videos_page_cached.clear()
             _load_my_videos_cached.clear()
             _load_public_videos_cached.clear()
         except Exception:
@@ -516,36 +635,50 @@ def update_video_resource(
         return False, "save_failed"
 
 
-def _load_video_list_rows(scope_column: str, scope_value: Any, limit: int) -> list[dict]:
+def _load_video_list_rows(scope_column: str, scope_value: Any, cursor_token: str = "", page_size: int = LIBRARY_PAGE_SIZE) -> KeysetPage:
     for columns in (_VIDEO_LIST_COLUMNS, "*"):
         try:
-            return _rows(
-                get_sb()
-                .table("videos")
-                .select(columns)
-                .eq(scope_column, scope_value)
-                .order("updated_at", desc=True)
-                .limit(limit)
-                .execute()
-            )
+            query = get_sb().table("videos").select(columns).eq(scope_column, scope_value)
+            return fetch_keyset_page(query, cursor_token, page_size)
         except Exception:
             continue
-    return []
+    return KeysetPage([], "")
+
+
+@st.cache_data(ttl=45, show_spinner=False)
+def _load_my_videos_page_cached(uid: str, cursor_token: str = "", page_size: int = LIBRARY_PAGE_SIZE) -> KeysetPage:
+    if not uid:
+        return KeysetPage([], "")
+    return _load_video_list_rows("user_id", uid, cursor_token, page_size)
+
+
+register_cache(_load_my_videos_page_cached, "videos", "resources")
+
+
+@st.cache_data(ttl=180, show_spinner=False)
+def _load_public_videos_page_cached(_scope: str = "", cursor_token: str = "", page_size: int = LIBRARY_PAGE_SIZE) -> KeysetPage:
+    return _load_video_list_rows("is_public", True, cursor_token, page_size)
+
+
+register_cache(_load_public_videos_page_cached, "videos", "resources")
+
+MY_VIDEOS_FEED = KeysetFeed(_load_my_videos_page_cached)
+PUBLIC_VIDEOS_FEED = KeysetFeed(_load_public_videos_page_cached)
 
 
 @st.cache_data(ttl=45, show_spinner=False)
-def _load_my_videos_cached(uid: str, limit: int = 120) -> pd.DataFrame:
+def _load_my_videos_cached(uid: str, limit: int = LIBRARY_PAGE_SIZE, pages: int = 1) -> pd.DataFrame:
     if not uid:
         return pd.DataFrame()
-    rows = _load_video_list_rows("user_id", uid, limit)
+    rows, _has_more = MY_VIDEOS_FEED.window(uid, pages, page_size=limit)
     return pd.DataFrame([_normalize_video_row(row) for row in rows])
 
 
 register_cache(_load_my_videos_cached, "videos", "resources")
 
 
-def load_my_videos(*, include_archived: bool = False, archived_only: bool = False) -> pd.DataFrame:
-    df = _load_my_videos_cached(str(get_current_user_id() or ""))
+def load_my_videos(*, include_archived: bool = False, archived_only: bool = False, pages: int = 1) -> pd.DataFrame:
+    df = _load_my_videos_cached(str(get_current_user_id() or ""), pages=pages)
     if df.empty:
         return df
     if archived_only:
@@ -556,28 +689,21 @@ def load_my_videos(*, include_archived: bool = False, archived_only: bool = Fals
 
 
 @st.cache_data(ttl=180, show_spinner=False)
-def _load_public_videos_cached(limit: int = 120) -> pd.DataFrame:
-    rows = _load_video_list_rows("is_public", True, limit)
+def _load_public_videos_cached(limit: int = LIBRARY_PAGE_SIZE, pages: int = 1) -> pd.DataFrame:
+    rows, _has_more = PUBLIC_VIDEOS_FEED.window("", pages, page_size=limit)
     profiles = _profile_name_map([str(row.get("user_id") or "") for row in rows])
     normalized_rows = []
     for row in rows:
         profile = profiles.get(str(row.get("user_id") or "").strip()) or {}
-        normalized_rows.append(
-            _normalize_video_row(
-                {
-                    **row,
-                    "author_name": profile.get("display_name") or profile.get("username") or profile.get("email") or "",
-                }
-            )
-        )
+        normalized_rows.append(_normalize_video_row({**row, "author_name": _profile_author_name(profile)}))
     return pd.DataFrame(normalized_rows)
 
 
 register_cache(_load_public_videos_cached, "videos", "resources")
 
 
-def load_public_videos() -> pd.DataFrame:
-    return filter_archived_rows(_load_public_videos_cached()).reset_index(drop=True)
+def load_public_videos(*, pages: int = 1) -> pd.DataFrame:
+    return filter_archived_rows(_load_public_videos_cached(pages=pages)).reset_index(drop=True)
 
 
 @st.cache_data(ttl=120, show_spinner=False)
@@ -694,6 +820,13 @@ def render_video_library_cards(
 
     inject_resource_gallery_styles()
     rows = [_normalize_video_row(row) for row in df.reset_index(drop=True).to_dict("records")]
+    current_user_id = str(get_current_user_id() or "").strip()
+    if current_user_id:
+        # Warm topic-link contexts for the owned videos on this page in one
+        # query, so opening any of them in render_video_detail is a cache hit.
+        load_video_topic_links_many(
+            [row.get("id") for row in rows if str(row.get("user_id") or "").strip() == current_user_id]
+        )
     for idx in range(0, len(rows), 3):
         trio = rows[idx: idx + 3]
         cols = st.columns(3, gap="medium")
@@ -704,7 +837,7 @@ def render_video_library_cards(
                 if not show_author:
                     display_row["author_name"] = ""
                 st.markdown(_video_row_to_card(display_row), unsafe_allow_html=True)
-                is_owner = str(row.get("user_id") or "").strip() == str(get_current_user_id() or "").strip()
+                is_owner = str(row.get("user_id") or "").strip() == current_user_id
                 show_owner_controls = is_owner and (allow_visibility_toggle or allow_archive_toggle)
                 show_delete_control = bool(show_owner_controls and is_archived_status(row.get("status")) and not bool(row.get("is_public")))
                 action_cols = st.columns([1, 1, 1, 1, 1] if show_delete_control else ([1, 1, 1, 1] if show_owner_controls else [1, 1]))
@@ -1070,20 +1203,14 @@ def load_videos_by_ids(video_ids: list[int]) -> list[dict]:
         return []
     try:
         rows = _rows(get_sb().table("videos").select("*").in_("id", safe_ids).execute())
-        normalized = []
-        for row in rows:
-            if is_archived_status(row.get("status")):
-                continue
-            profile = load_profile_row(str(row.get("user_id") or ""))
-            normalized.append(
-                _normalize_video_row(
-                    {
-                        **row,
-                        "author_name": profile.get("display_name") or profile.get("username") or profile.get("email") or "",
-                    }
-                )
+        rows = [row for row in rows if not is_archived_status(row.get("status"))]
+        profiles = _profile_name_map([str(row.get("user_id") or "") for row in rows])
+        return [
+            _normalize_video_row(
+                {**row, "author_name": _profile_author_name(profiles.get(str(row.get("user_id") or "").strip()) or {})}
             )
-        return normalized
+            for row in rows
+        ]
     except Exception:
         return []
 
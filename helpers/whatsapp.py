@@ -1,11 +1,12 @@
 import streamlit as st
-import datetime, re, urllib.parse
+import datetime, hashlib, re, urllib.parse
 from core.i18n import t
 from core.state import get_current_user_id
 from core.timezone import now_local, today_local, get_app_tz
-from core.database import get_sb, load_table, load_students
+from core.database import get_sb, load_table, load_students, register_cache
+import numpy as np
 import pandas as pd
-from helpers.pricing import load_pricing_items, money_try
+from helpers.pricing import _load_pricing_items_cached, money_try
 
 # 07.4) WHATSAPP HELPERS
 # =========================
@@ -145,9 +146,24 @@ def build_msg_package_header(name: str, lang: str, status: str) -> str:
     )
 
 
-def _get_pricing_snapshot() -> dict:
+_EMPTY_PRICING_SNAPSHOT = {
+    "online_hourly": 0,
+    "offline_hourly": 0,
+    "online_packages": [],
+    "offline_packages": [],
+}
+_PRICING_MODALITIES = ("online", "offline")
+
+
+def _numeric_column(df: pd.DataFrame, column: str, fill=0) -> np.ndarray:
+    if column not in df.columns:
+        return np.full(len(df), fill, dtype=float)
+    return pd.to_numeric(df[column], errors="coerce").to_numpy(dtype=float)
+
+
+def _pricing_snapshot_from_items(df: pd.DataFrame) -> dict:
     """
-    Loads active pricing from Supabase via load_pricing_items().
+    Normalizes a pricing_items frame into the WhatsApp pricing snapshot.
 
     Returns:
       {
@@ -155,64 +171,61 @@ def _get_pricing_snapshot() -> dict:
         "offline_hourly": int,
         "online_packages": [(hours:int, price:int, per:int), ...],
         "offline_packages": [(hours:int, price:int, per:int), ...],
+        "version": str,
       }
     """
-    df = load_pricing_items()
     if df is None or df.empty:
-        return {
-            "online_hourly": 0,
-            "offline_hourly": 0,
-            "online_packages": [],
-            "offline_packages": [],
-        }
-
-    df = df.copy()
+        return {**_EMPTY_PRICING_SNAPSHOT, "version": "empty"}
+
     if "active" in df.columns:
-        df = df[df["active"] == True].copy()
+        df = df[(df["active"] == True).to_numpy()]
 
-    # normalize
-    df["modality"] = df["modality"].fillna("").astype(str).str.strip().str.lower()
-    df["kind"] = df["kind"].fillna("").astype(str).str.strip().str.lower()
+    modality = df["modality"].fillna("").astype(str).str.strip().str.lower().to_numpy()
+    kind = df["kind"].fillna("").astype(str).str.strip().str.lower().to_numpy()
     # Support both old column name (price_try) and new renamed column (price)
     price_col = "price" if "price" in df.columns else "price_try"
-    df["price_try"] = pd.to_numeric(df[price_col], errors="coerce").fillna(0).astype(int)
-    df["hours"] = pd.to_numeric(df["hours"], errors="coerce")  # NaN ok for hourly
-
-    def _hourly(mod: str) -> int:
-        h = df[(df["modality"] == mod) & (df["kind"] == "hourly")].copy()
-        if h.empty:
-            return 0
-        if "sort_order" in h.columns:
-            h["sort_order"] = pd.to_numeric(h["sort_order"], errors="coerce").fillna(0).astype(int)
-            h = h.sort_values(["sort_order", "id"], na_position="last")
-        return int(h.iloc[0].get("price_try") or 0)
-
-    def _packages(mod: str) -> list:
-        p = df[(df["modality"] == mod) & (df["kind"] == "package")].copy()
-        if p.empty:
-            return []
-        p["hours"] = pd.to_numeric(p["hours"], errors="coerce").fillna(0).astype(int)
-        p["sort_order"] = pd.to_numeric(p.get("sort_order", 0), errors="coerce").fillna(0).astype(int)
-
-        # Sort packages: sort_order ascending, then hours descending (e.g., 44, 20, 10, 5)
-        p = p.sort_values(["sort_order", "hours"], ascending=[True, False], na_position="last")
-
-        out = []
-        for _, r in p.iterrows():
-            hours = int(r.get("hours") or 0)
-            price = int(r.get("price_try") or 0)
-            if hours <= 0:
-                continue
-            per = int(round(price / hours))
-            out.append((hours, price, per))
-        return out
-
-    return {
-        "online_hourly": _hourly("online"),
-        "offline_hourly": _hourly("offline"),
-        "online_packages": _packages("online"),
-        "offline_packages": _packages("offline"),
-    }
+    price = np.nan_to_num(_numeric_column(df, price_col), nan=0.0).astype(int)
+    hours = np.nan_to_num(_numeric_column(df, "hours"), nan=0.0).astype(int)
+    sort_order = np.nan_to_num(_numeric_column(df, "sort_order"), nan=0.0).astype(int)
+    row_id = np.nan_to_num(_numeric_column(df, "id", fill=np.nan), nan=np.inf)
+
+    snapshot = dict(_EMPTY_PRICING_SNAPSHOT)
+
+    # Hourly: first row per modality by (sort_order, id).
+    hourly_rows = np.flatnonzero(kind == "hourly")
+    if "sort_order" in df.columns:
+        hourly_rows = hourly_rows[np.lexsort((row_id[hourly_rows], sort_order[hourly_rows]))]
+    for mod in _PRICING_MODALITIES:
+        first = hourly_rows[modality[hourly_rows] == mod]
+        snapshot[f"{mod}_hourly"] = int(price[first[0]]) if len(first) else 0
+
+    # Packages: one sort by (modality, sort_order asc, hours desc), then split.
+    package_rows = np.flatnonzero((kind == "package") & (hours > 0))
+    package_rows = package_rows[np.lexsort((-hours[package_rows], sort_order[package_rows]))]
+    per_hour = np.zeros(len(df), dtype=int)
+    per_hour[package_rows] = np.rint(price[package_rows] / hours[package_rows]).astype(int)
+    for mod in _PRICING_MODALITIES:
+        rows = package_rows[modality[package_rows] == mod]
+        snapshot[f"{mod}_packages"] = list(
+            zip(hours[rows].tolist(), price[rows].tolist(), per_hour[rows].tolist())
+        )
+
+    fingerprint = repr([snapshot[key] for key in sorted(_EMPTY_PRICING_SNAPSHOT)])
+    snapshot["version"] = hashlib.sha1(fingerprint.encode("utf-8")).hexdigest()[:16]
+    return snapshot
+
+
+@st.cache_data(ttl=45, show_spinner=False)
+def _load_pricing_snapshot_cached(uid: str) -> dict:
+    return _pricing_snapshot_from_items(_load_pricing_items_cached(uid))
+
+
+register_cache(_load_pricing_snapshot_cached, "pricing")
+
+
+def _get_pricing_snapshot() -> dict:
+    """Active pricing for the current teacher, normalized once per pricing change."""
+    return _load_pricing_snapshot_cached(get_current_user_id())
 
 
 def build_pricing_block(lang: str = "tr") -> str:
@@ -221,7 +234,19 @@ def build_pricing_block(lang: str = "tr") -> str:
     Prints both online and offline sections (matches your original Turkish message style).
     """
     s = _get_pricing_snapshot()
+    return _render_pricing_block_cached(lang, str(s.get("version") or ""), s)
+
+
+@st.cache_data(max_entries=256, show_spinner=False)
+def _render_pricing_block_cached(lang: str, version: str, _snapshot: dict) -> str:
+    # Keyed on (lang, version) only: the version is a digest of the snapshot.
+    return _render_pricing_block(lang, _snapshot)
+
+
+register_cache(_render_pricing_block_cached, "pricing")
+
 
+def _render_pricing_block(lang: str, s: dict) -> str:
     online_hourly = int(s.get("online_hourly") or 0)
     offline_hourly = int(s.get("offline_hourly") or 0)
     online_pk = s.get("online_packages") or []
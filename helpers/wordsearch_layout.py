@@ -0,0 +1,263 @@
+from __future__ import annotations
+
+import hashlib
+import random
+from functools import lru_cache
+from typing import Sequence
+
+import numpy as np
+
+
+# Reading directions offered to students: right, down, down-right, up-right.
+WORDSEARCH_DIRECTIONS: tuple[tuple[int, int], ...] = ((0, 1), (1, 0), (1, 1), (-1, 1))
+
+# Candidate weight is 1 + OVERLAP_WEIGHT * shared letters, so crossings are
+# preferred without every word stacking onto the previous one.
+OVERLAP_WEIGHT = 4.0
+BACKTRACK_BRANCHING = 3
+
+# Grids are rebuilt from (words, seed) on every render and export, so a
+# worksheet keeps the placer it was generated with: version 1 is the
+# random-trial placer, 2 this engine. Worksheets without the key predate it.
+WORDSEARCH_LAYOUT_KEY = "wordsearch_layout_version"
+WORDSEARCH_LAYOUT_VERSION = 2
+
+
+def wordsearch_layout_version(worksheet: dict | None) -> int:
+    """The placer version a saved worksheet was generated with (1 when unrecorded)."""
+    try:
+        return int((worksheet or {}).get(WORDSEARCH_LAYOUT_KEY) or 1)
+    except (TypeError, ValueError):
+        return 1
+
+
+def stamp_wordsearch_layout(worksheet: dict) -> dict:
+    """Record the current placer on a newly generated word-search worksheet."""
+    if isinstance(worksheet, dict) and worksheet.get("worksheet_type") == "word_search_vocab":
+        worksheet.setdefault(WORDSEARCH_LAYOUT_KEY, WORDSEARCH_LAYOUT_VERSION)
+    return worksheet
+
+
+def wordsearch_rng(seed: str | int | None, words: Sequence[str]) -> np.random.Generator:
+    """Stable NumPy generator for a seed; defaults to the word list itself."""
+    text = str(seed) if seed is not None else "|".join(words)
+    return np.random.default_rng(int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "big"))
+
+
+@lru_cache(maxsize=256)
+def _placement_table(size: int, length: int) -> np.ndarray:
+    """Flat cell indices of every in-bounds placement of a word of ``length``, one row each."""
+    starts: list[np.ndarray] = []
+    for direction, (dr, dc) in enumerate(WORDSEARCH_DIRECTIONS):
+        row_lo = (length - 1) if dr < 0 else 0
+        row_hi = size - (length - 1) * max(dr, 0)
+        col_hi = size - (length - 1) * max(dc, 0)
+        if row_hi <= row_lo or col_hi <= 0:
+            continue
+        rows, cols = np.meshgrid(np.arange(row_lo, row_hi), np.arange(col_hi), indexing="ij")
+        starts.append(np.stack([np.full(rows.size, direction), rows.ravel(), cols.ravel()], axis=1))
+    if not starts:
+        return np.empty((0, length), dtype=np.int64)
+    table = np.concatenate(starts)
+    steps = np.array(WORDSEARCH_DIRECTIONS)[table[:, 0]]
+    offsets = np.arange(length)
+    flat = (table[:, 1:2] + steps[:, 0:1] * offsets) * size + table[:, 2:3] + steps[:, 1:2] * offsets
+    flat.setflags(write=False)
+    return flat
+
+
+def _candidate_positions(grid: np.ndarray, codes: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Legal placements for a word (flat cell indices) and how many letters each shares.
+
+    One gather over the precomputed start table checks every position and
+    direction at once, so the cost does not depend on how full the grid is.
+    """
+    flat = _placement_table(grid.shape[0], len(codes))
+    cells = grid.ravel()[flat]
+    same = cells == codes
+    fits = (same | (cells == 0)).all(axis=1)
+    return flat[fits], same[fits].sum(axis=1)
+
+
+def _ranked_candidates(grid: np.ndarray, codes: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    candidates, shared = _candidate_positions(grid, codes)
+    if not len(candidates):
+        return candidates
+    # Weighted shuffle without replacement (Efraimidis-Spirakis keys).
+    weights = 1.0 + OVERLAP_WEIGHT * shared
+    keys = rng.random(len(candidates)) ** (1.0 / weights)
+    return candidates[np.argsort(-keys, kind="stable")]
+
+
+def layout_wordsearch(
+    words: Sequence[str],
+    size: int,
+    alphabet: Sequence[str],
+    *,
+    seed: str | int | None = None,
+    max_backtracks: int | None = None,
+) -> tuple[list[list[str]], list[str], list[dict]]:
+    """Place words longest-first on a ``size`` x ``size`` grid and fill the rest.
+
+    Placement is a depth-first search over each word's legal positions,
+    trying at most ``BACKTRACK_BRANCHING`` ranked candidates per word and
+    ``max_backtracks`` placements overall. When the budget runs out the
+    remaining words are placed greedily and any word with no legal position
+    left is dropped, so the returned word list is always exactly what the
+    grid contains.
+    """
+    words = [str(word) for word in words if str(word)]
+    if not words or size <= 0:
+        return [], [], []
+    order = sorted(range(len(words)), key=lambda idx: -len(words[idx]))
+    letters = sorted(set(alphabet) | {ch for word in words for ch in word})
+    code_of = {ch: idx + 1 for idx, ch in enumerate(letters)}
+    lookup = np.array([""] + letters, dtype=object)
+    encoded = {idx: np.array([code_of[ch] for ch in words[idx]], dtype=np.int32) for idx in order}
+
+    rng = wordsearch_rng(seed, words)
+    grid = np.zeros((size, size), dtype=np.int32)
+    placed: dict[int, np.ndarray] = {}
+    budget = [max_backtracks if max_backtracks is not None else 200 + 20 * len(words)]
+
+    cells_of = grid.ravel()
+
+    def place(cells: np.ndarray, idx: int) -> np.ndarray:
+        previous = cells_of[cells].copy()
+        cells_of[cells] = encoded[idx]
+        placed[idx] = cells
+        return previous
+
+    def unplace(cells: np.ndarray, idx: int, previous: np.ndarray) -> None:
+        cells_of[cells] = previous
+        placed.pop(idx, None)
+
+    def search(position: int) -> bool:
+        if position == len(order):
+            return True
+        idx = order[position]
+        for candidate in _ranked_candidates(grid, encoded[idx], rng)[:BACKTRACK_BRANCHING]:
+            if budget[0] <= 0:
+                return False
+            budget[0] -= 1
+            previous = place(candidate, idx)
+            if search(position + 1):
+                return True
+            unplace(candidate, idx, previous)
+        return False
+
+    if not search(0):
+        for idx in order:
+            if idx in placed:
+                continue
+            candidates = _ranked_candidates(grid, encoded[idx], rng)
+            if len(candidates):
+                place(candidates[0], idx)
+
+    empty = grid == 0
+    alphabet_codes = np.array([code_of[ch] for ch in sorted(set(alphabet))] or [1], dtype=np.int32)
+    grid[empty] = alphabet_codes[rng.integers(0, len(alphabet_codes), size=int(empty.sum()))]
+
+    placed_words = [words[idx] for idx in range(len(words)) if idx in placed]
+    placements = [
+        {
+            "word": words[idx],
+            "coords": [(int(cell) // size, int(cell) % size) for cell in placed[idx]],
+        }
+        for idx in range(len(words))
+        if idx in placed
+    ]
+    return lookup[grid].tolist(), placed_words, placements
+
+
+def layout_wordsearch_v1(
+    words: Sequence[str],
+    size: int,
+    alphabet: Sequence[str],
+    *,
+    seed: str | int | None = None,
+) -> tuple[list[list[str]], list[str], list[dict]]:
+    """The original random-trial placer, kept so version-1 worksheets keep their grids.
+
+    Up to 500 random tries per word and 20 restarts; returns an empty grid
+    (with the full word list) when a word never fits.
+    """
+    words = list(words)
+    directions = [(0, 1), (1, 0), (1, 1), (-1, 1)]
+    rng = random.Random(seed if seed is not None else "|".join(words))
+    alphabet = list(alphabet)
+
+    def try_build():
+        grid = [["" for _ in range(size)] for _ in range(size)]
+        placements = []
+
+        for word in words:
+            placed = False
+
+            for _ in range(500):
+                dr, dc = rng.choice(directions)
+
+                if dr == 0:
+                    r_min, r_max = 0, size - 1
+                elif dr == 1:
+                    r_min, r_max = 0, size - len(word)
+                else:
+                    r_min, r_max = len(word) - 1, size - 1
+
+                if dc == 0:
+                    c_min, c_max = 0, size - 1
+                elif dc == 1:
+                    c_min, c_max = 0, size - len(word)
+                else:
+                    c_min, c_max = len(word) - 1, size - 1
+
+                if r_min > r_max or c_min > c_max:
+                    continue
+
+                r = rng.randint(r_min, r_max)
+                c = rng.randint(c_min, c_max)
+
+                ok = True
+                rr, cc = r, c
+                coords = []
+
+                for ch in word:
+                    if not (0 <= rr < size and 0 <= cc < size):
+                        ok = False
+                        break
+
+                    cell = grid[rr][cc]
+                    if cell not in ("", ch):
+                        ok = False
+                        break
+
+                    coords.append((rr, cc))
+                    rr += dr
+                    cc += dc
+
+                if not ok:
+                    continue
+
+                for (rr, cc), ch in zip(coords, word):
+                    grid[rr][cc] = ch
+
+                placements.append({"word": word, "coords": coords})
+                placed = True
+                break
+
+            if not placed:
+                return None, None
+
+        for r in range(size):
+            for c in range(size):
+                if not grid[r][c]:
+                    grid[r][c] = rng.choice(alphabet)
+
+        return grid, placements
+
+    for _ in range(20):
+        built_grid, placements = try_build()
+        if built_grid is not None:
+            return built_grid, words, placements
+
+    return [], words, []
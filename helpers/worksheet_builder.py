@@ -8,6 +8,7 @@ import json, os, re
 from core.i18n import t
 from services.ai_usage_service import with_provider_chain
 from translations import I18N
+from helpers.ai_response_cache import CACHE_HIT, CACHE_HIT_LOG_STATUS, cached_ai_generation
 from helpers.answer_key_utils import normalize_answer_key_text, split_answer_key_items
 from helpers.generation_guidance import (
     build_expert_panel_prompt_blurb,
@@ -16,9 +17,11 @@ from helpers.generation_guidance import (
 )
 from helpers.student_personalization import build_student_profile_prompt_block
 from helpers.visual_support import enrich_worksheet_with_visuals
+from helpers.wordsearch_layout import stamp_wordsearch_layout
 
 AI_WORKSHEET_DAILY_LIMIT = 3
 AI_WORKSHEET_COOLDOWN_SECONDS = 10
+WORKSHEET_PROMPT_VERSION = "1"
 
 WORKSHEET_TYPES = [
     "fill_in_the_blanks",
@@ -919,6 +922,7 @@ def generate_ai_worksheet(
     student_profile: dict | None = None,
     *,
     include_visuals: bool = True,
+    force_fresh: bool = False,
 ) -> dict:
     payload = {
         "subject": subject,
@@ -931,31 +935,31 @@ def generate_ai_worksheet(
         "student_profile": student_profile or {},
     }
 
-    system_prompt, user_prompt = _build_worksheet_prompts(payload)
-    provider_order = _lp().get_ai_provider_order()
-
-    errors = []
-    for p in provider_order:
-        try:
-            if p == "gemini":
-                raw = _lp()._generate_with_gemini(system_prompt, user_prompt)
-            elif p == "openrouter":
-                raw = _lp()._generate_with_openrouter(system_prompt, user_prompt)
-            else:
-                raw = _lp()._generate_with_openai(system_prompt, user_prompt)
-
-            parsed = _lp()._extract_json_object_from_text(raw)
-            normalized = normalize_worksheet_output(parsed, include_visuals=include_visuals)
-            quality_issues = _worksheet_quality_issues(normalized)
-            if quality_issues:
-                raise ValueError("; ".join(quality_issues))
-            if isinstance(normalized, dict):
-                normalized["_ai_provider"] = p
-            return normalized
-        except Exception as e:
-            errors.append(f"{p}: {e}")
-
-    raise RuntimeError(" | ".join(errors))
+    def _parse(raw: str, p: str) -> dict:
+        parsed = _lp()._extract_json_object_from_text(raw)
+        normalized = normalize_worksheet_output(parsed, include_visuals=include_visuals)
+        quality_issues = _worksheet_quality_issues(normalized)
+        if quality_issues:
+            raise ValueError("; ".join(quality_issues))
+        if isinstance(normalized, dict):
+            normalized["_ai_provider"] = p
+        return normalized
+
+    def _generate() -> dict:
+        system_prompt, user_prompt = _build_worksheet_prompts(payload)
+        return _lp().run_ai_provider_chain(system_prompt, user_prompt, _parse)
+
+    worksheet, cache_status = cached_ai_generation(
+        "quick_worksheet_ai",
+        {**payload, "include_visuals": bool(include_visuals)},
+        _generate,
+        template_version=WORKSHEET_PROMPT_VERSION,
+        force_fresh=force_fresh,
+    )
+    if isinstance(worksheet, dict):
+        worksheet["_ai_cache"] = cache_status
+        stamp_wordsearch_layout(worksheet)
+    return worksheet
 
 
 def generate_worksheet_with_limit(
@@ -965,6 +969,8 @@ def generate_worksheet_with_limit(
     worksheet_type: str,
     topic: str,
     student_profile: dict | None = None,
+    *,
+    force_fresh: bool = False,
 ) -> tuple[dict, str | None]:
     from helpers.worksheet_storage import get_ai_worksheet_usage_status, log_ai_usage
     from services.permissions_service import can_use_ai_tool, increment_usage
@@ -1002,15 +1008,18 @@ def generate_worksheet_with_limit(
             plan_language=get_plan_language(),
             student_material_language=get_student_material_language(subject),
             student_profile=student_profile or {},
+            force_fresh=force_fresh,
         )
         provider = str(ws.pop("_ai_provider", "") or "") if isinstance(ws, dict) else ""
+        cache_status = str(ws.pop("_ai_cache", "") or "") if isinstance(ws, dict) else ""
         ws = normalize_worksheet_output(ws)
 
-        log_ai_usage(
-            request_kind="quick_worksheet_ai",
-            status="success",
-            meta={"subject": subject, "topic": topic, "worksheet_type": worksheet_type, "provider": provider},
-        )
+        meta = {"subject": subject, "topic": topic, "worksheet_type": worksheet_type, "provider": provider, "cache": cache_status}
+        if cache_status == CACHE_HIT:
+            log_ai_usage(request_kind="quick_worksheet_ai", status=CACHE_HIT_LOG_STATUS, meta={**meta, "used_ai": False})
+            return ws, None
+
+        log_ai_usage(request_kind="quick_worksheet_ai", status="success", meta=meta)
         increment_usage(None, "ai_generations")
         return ws, None
 
@@ -4,7 +4,7 @@ import streamlit as st
 import json, re, math, os
 import ast
 from contextlib import nullcontext
-from typing import Optional
+from typing import Any, Optional
 from datetime import datetime as _dt, timezone
 import pandas as pd
 from io import BytesIO
@@ -46,7 +46,10 @@ from helpers.visual_support import (
     preserve_generated_media_fields,
 )
 from helpers.answer_key_utils import normalize_answer_key_text, split_answer_key_items
+from helpers.ai_response_cache import provider_request_rows
 from helpers.archive_utils import ACTIVE_STATUS, ARCHIVED_STATUS, filter_archived_rows, is_archived_status
+from helpers.keyset_pagination import LIBRARY_PAGE_SIZE, KeysetFeed, KeysetPage, fetch_keyset_page
+from helpers.wordsearch_layout import WORDSEARCH_LAYOUT_KEY, wordsearch_layout_version
 from helpers.resource_deletion import render_archive_delete_button, render_archive_delete_confirmation
 from helpers.student_personalization import (
     NATIVE_LANGUAGE_OPTIONS,
@@ -65,10 +68,14 @@ from helpers.material_recommendations import (
     render_generation_recommendations,
 )
 from helpers.resource_gallery import (
-    extract_gallery_language_label,
+    GALLERY_META_COLUMN,
+    build_gallery_meta,
     extract_gallery_image_url,
+    gallery_card_media,
     inject_resource_gallery_styles,
+    list_columns_without_gallery_meta,
     render_gallery_card_html,
+    without_gallery_meta,
 )
 from helpers.recommendation_models import log_teacher_material_open
 from services.permissions_service import get_feature_usage_status
@@ -90,7 +97,10 @@ _WORKSHEET_LIST_COLUMNS = ",".join([
     "status",
     "created_at",
     "updated_at",
+    GALLERY_META_COLUMN,
 ])
+# Schemas before add_resource_gallery_meta.sql have no projection column.
+_WORKSHEET_LEGACY_LIST_COLUMNS = list_columns_without_gallery_meta(_WORKSHEET_LIST_COLUMNS)
 
 
 def _wb():
@@ -366,92 +376,26 @@ def _generate_wordsearch_grid(
     words: list[str],
     size: int | None = None,
     seed: str | int | None = None,
+    max_words: int = 12,
+    layout_version: int | None = None,
 ) -> tuple[list[list[str]], list[str], list[dict]]:
-    words = _normalize_wordsearch_words(words)
+    """Build a word-search grid; the same words, seed and layout version always give the same grid.
+
+    Returns ``(grid, placed_words, placements)``. Words that cannot fit are
+    left out of ``placed_words`` rather than failing the whole grid.
+    ``layout_version`` is the worksheet's ``wordsearch_layout_version``;
+    version 1 keeps the original placer so older worksheets do not change.
+    """
+    words = _normalize_wordsearch_words(words, max_words=max_words)
     if not words:
         return [], [], []
 
-    size = _resolve_wordsearch_size(words, size=size)
-    directions = [(0, 1), (1, 0), (1, 1), (-1, 1)]
-
-    import random
-    rng = random.Random(seed if seed is not None else "|".join(words))
-    alphabet = _build_wordsearch_alphabet(words)
-
-    def try_build():
-        grid = [["" for _ in range(size)] for _ in range(size)]
-        placements = []
-
-        for word in words:
-            placed = False
-
-            for _ in range(500):
-                dr, dc = rng.choice(directions)
-
-                if dr == 0:
-                    r_min, r_max = 0, size - 1
-                elif dr == 1:
-                    r_min, r_max = 0, size - len(word)
-                else:
-                    r_min, r_max = len(word) - 1, size - 1
-
-                if dc == 0:
-                    c_min, c_max = 0, size - 1
-                elif dc == 1:
-                    c_min, c_max = 0, size - len(word)
-                else:
-                    c_min, c_max = len(word) - 1, size - 1
-
-                if r_min > r_max or c_min > c_max:
-                    continue
-
-                r = rng.randint(r_min, r_max)
-                c = rng.randint(c_min, c_max)
-
-                ok = True
-                rr, cc = r, c
-                coords = []
-
-                for ch in word:
-                    if not (0 <= rr < size and 0 <= cc < size):
-                        ok = False
-                        break
-
-                    cell = grid[rr][cc]
-                    if cell not in ("", ch):
-                        ok = False
-                        break
-
-                    coords.append((rr, cc))
-                    rr += dr
-                    cc += dc
+    from helpers.wordsearch_layout import WORDSEARCH_LAYOUT_VERSION, layout_wordsearch, layout_wordsearch_v1
 
-                if not ok:
-                    continue
-
-                for (rr, cc), ch in zip(coords, word):
-                    grid[rr][cc] = ch
-
-                placements.append({"word": word, "coords": coords})
-                placed = True
-                break
-
-            if not placed:
-                return None, None
-
-        for r in range(size):
-            for c in range(size):
-                if not grid[r][c]:
-                    grid[r][c] = rng.choice(alphabet)
-
-        return grid, placements
-
-    for _ in range(20):
-        built_grid, placements = try_build()
-        if built_grid is not None:
-            return built_grid, words, placements
-
-    return [], words, []
+    size = _resolve_wordsearch_size(words, size=size)
+    if (layout_version or WORDSEARCH_LAYOUT_VERSION) < 2:
+        return layout_wordsearch_v1(words, size, _build_wordsearch_alphabet(words), seed=seed)
+    return layout_wordsearch(words, size, _build_wordsearch_alphabet(words), seed=seed)
 
 
 def _render_wordsearch_grid(grid: list[list[str]]) -> None:
@@ -871,10 +815,12 @@ def save_worksheet_record(
             "status": ACTIVE_STATUS,
             "created_at": _dt.now(timezone.utc).isoformat(),
         })
+        payload[GALLERY_META_COLUMN] = build_gallery_meta(payload, kind="worksheet")
         response = insert_row_with_retries(
             "worksheets",
             payload,
             clear_cache=True,
+            optional_columns=(GALLERY_META_COLUMN,),
             context={
                 "resource_type": "worksheet",
                 "subject": str(subject).strip(),
@@ -892,9 +838,9 @@ def save_worksheet_record(
         return False
 
 
-def load_my_worksheets(*, include_archived: bool = False, archived_only: bool = False) -> pd.DataFrame:
+def load_my_worksheets(*, include_archived: bool = False, archived_only: bool = False, pages: int = 1) -> pd.DataFrame:
     try:
-        df = _load_my_worksheets_cached(str(get_current_user_id() or ""))
+        df = _load_my_worksheets_cached(str(get_current_user_id() or ""), pages=pages)
         if df is None or df.empty:
             return pd.DataFrame()
         return filter_archived_rows(
@@ -915,51 +861,66 @@ def _normalize_worksheet_frame(rows: list[dict] | None) -> pd.DataFrame:
         df["updated_at"] = pd.to_datetime(df["updated_at"], errors="coerce")
     if "created_at" in df.columns:
         df["created_at"] = pd.to_datetime(df["created_at"], errors="coerce")
-    sort_col = "updated_at" if "updated_at" in df.columns else "created_at"
-    if sort_col in df.columns:
-        df = df.sort_values(sort_col, ascending=False, na_position="last")
+        # Keep the keyset order so appending a page never reshuffles earlier rows.
+        df = df.sort_values("created_at", ascending=False, na_position="last", kind="stable")
+    elif "updated_at" in df.columns:
+        df = df.sort_values("updated_at", ascending=False, na_position="last")
     return df
 
 
+def _load_worksheet_list_rows(scope_column: str, scope_value: Any, cursor_token: str = "", page_size: int = LIBRARY_PAGE_SIZE) -> KeysetPage:
+    try:
+        query = get_sb().table("worksheets").select(_WORKSHEET_LIST_COLUMNS).eq(scope_column, scope_value)
+        return fetch_keyset_page(query, cursor_token, page_size)
+    except Exception:
+        query = get_sb().table("worksheets").select(_WORKSHEET_LEGACY_LIST_COLUMNS).eq(scope_column, scope_value)
+        return fetch_keyset_page(query, cursor_token, page_size)
+
+
 @st.cache_data(ttl=120, show_spinner=False)
-def _load_my_worksheets_cached(uid: str, limit: int = 120) -> pd.DataFrame:
+def _load_my_worksheets_page_cached(uid: str, cursor_token: str = "", page_size: int = LIBRARY_PAGE_SIZE) -> KeysetPage:
+    if not uid:
+        return KeysetPage([], "")
+    return _load_worksheet_list_rows("user_id", uid, cursor_token, page_size)
+
+
+register_cache(_load_my_worksheets_page_cached, "worksheets", "resources")
+
+
+@st.cache_data(ttl=180, show_spinner=False)
+def _load_public_worksheets_page_cached(_scope: str = "", cursor_token: str = "", page_size: int = LIBRARY_PAGE_SIZE) -> KeysetPage:
+    return _load_worksheet_list_rows("is_public", True, cursor_token, page_size)
+
+
+register_cache(_load_public_worksheets_page_cached, "worksheets", "resources")
+
+MY_WORKSHEETS_FEED = KeysetFeed(_load_my_worksheets_page_cached)
+PUBLIC_WORKSHEETS_FEED = KeysetFeed(_load_public_worksheets_page_cached)
+
+
+@st.cache_data(ttl=120, show_spinner=False)
+def _load_my_worksheets_cached(uid: str, limit: int = LIBRARY_PAGE_SIZE, pages: int = 1) -> pd.DataFrame:
     if not uid:
         return pd.DataFrame()
-    res = (
-        get_sb()
-        .table("worksheets")
-        .select(_WORKSHEET_LIST_COLUMNS)
-        .eq("user_id", uid)
-        .order("updated_at", desc=True)
-        .limit(limit)
-        .execute()
-    )
-    return _normalize_worksheet_frame(getattr(res, "data", None) or [])
+    rows, _has_more = MY_WORKSHEETS_FEED.window(uid, pages, page_size=limit)
+    return _normalize_worksheet_frame(rows)
 
 
 register_cache(_load_my_worksheets_cached, "worksheets", "resources")
 
 
 @st.cache_data(ttl=180, show_spinner=False)
-def _load_public_worksheets_cached(limit: int = 120) -> pd.DataFrame:
-    res = (
-        get_sb()
-        .table("worksheets")
-        .select(_WORKSHEET_LIST_COLUMNS)
-        .eq("is_public", True)
-        .order("updated_at", desc=True)
-        .limit(limit)
-        .execute()
-    )
-    return _normalize_worksheet_frame(getattr(res, "data", None) or [])
+def _load_public_worksheets_cached(limit: int = LIBRARY_PAGE_SIZE, pages: int = 1) -> pd.DataFrame:
+    rows, _has_more = PUBLIC_WORKSHEETS_FEED.window("", pages, page_size=limit)
+    return _normalize_worksheet_frame(rows)
 
 
 register_cache(_load_public_worksheets_cached, "worksheets", "resources")
 
 
-def load_public_worksheets(*, show_errors: bool = True) -> pd.DataFrame:
+def load_public_worksheets(*, show_errors: bool = True, pages: int = 1) -> pd.DataFrame:
     try:
-        return filter_archived_rows(_load_public_worksheets_cached())
+        return filter_archived_rows(_load_public_worksheets_cached(pages=pages))
     except Exception as exc:
         if show_errors:
             show_data_load_error(exc)
@@ -1190,7 +1151,9 @@ def get_ai_worksheet_usage_status() -> dict:
     today_df = feat_df[(feat_df["created_at"].notna()) & (feat_df["created_at"] >= today_start_utc)]
     used_today = int(len(today_df))
 
-    cd_df = df[df["feature_name"] == "quick_worksheet_ai"].dropna(subset=["created_at"]).sort_values("created_at")
+    cd_df = provider_request_rows(
+        df[df["feature_name"] == "quick_worksheet_ai"].dropna(subset=["created_at"]).sort_values("created_at")
+    )
     cooldown_ok = True
     seconds_left = 0
     last_request_at = None
@@ -1283,11 +1246,7 @@ def render_worksheet_library_cards(
             safe_title = html.escape(title)
             safe_author = html.escape(author_name)
             preview_text = html.escape((topic or t("no_description_available"))[:180])
-            full_payload = dict(row or {})
-            if not extract_gallery_image_url(full_payload) and worksheet_id not in (None, "", 0, "0"):
-                full_payload = load_worksheet_record(worksheet_id) or full_payload
-            hero_image = extract_gallery_image_url(full_payload)
-            language_label = extract_gallery_language_label(full_payload)
+            hero_image, language_label = gallery_card_media(row, load_worksheet_record)
 
             chips = "".join([
                 f'<span class="cm-resource-chip">🌐 {html.escape(language_label)}</span>' if language_label else "",
@@ -1578,6 +1537,7 @@ def render_worksheet_result(
         wordsearch_grid, _, wordsearch_placements = _generate_wordsearch_grid(
             ws.get("vocabulary_bank", []),
             seed=wordsearch_seed,
+            layout_version=wordsearch_layout_version(ws),
         )
         _render_wordsearch_grid(wordsearch_grid)
 
@@ -1681,6 +1641,8 @@ def render_worksheet_result(
     def _apply_worksheet_edit(updated_ws: dict) -> bool:
         updated_ws = _normalize_worksheet_edit(updated_ws)
         updated_ws = preserve_generated_media_fields(updated_ws, ws)
+        if WORDSEARCH_LAYOUT_KEY in ws:
+            updated_ws.setdefault(WORDSEARCH_LAYOUT_KEY, ws[WORDSEARCH_LAYOUT_KEY])
         if _worksheet_has_student_content(ws) and not _worksheet_has_student_content(updated_ws):
             st.error(t("resource_changes_save_failed"))
             return False
@@ -1747,8 +1709,10 @@ def render_worksheet_result(
         level_or_band=level_or_band,
     )
 
-    student_pdf = build_worksheet_pdf_bytes(ws, student_only=True, **_pdf_kwargs)
-    teacher_pdf = build_worksheet_pdf_bytes(ws, student_only=False, **_pdf_kwargs)
+    from helpers.pdf_export import cached_pdf_bytes
+
+    student_pdf = cached_pdf_bytes("worksheet", ws=ws, student_only=True, **_pdf_kwargs)
+    teacher_pdf = cached_pdf_bytes("worksheet", ws=ws, student_only=False, **_pdf_kwargs)
     safe_title = re.sub(r"[^A-Za-z0-9._-]+", "_", str(ws.get("title") or "worksheet").strip()) or "worksheet"
 
     # Word exports
@@ -1900,6 +1864,16 @@ def render_worksheet_result(
                 st.rerun()
 
 
+def _update_worksheet_row(safe_id: Any, uid: str, payload: dict) -> None:
+    """Update one worksheet, retrying without ``gallery_meta`` on older schemas."""
+    try:
+        get_sb().table("worksheets").update(payload).eq("id", safe_id).eq("user_id", uid).execute()
+    except Exception:
+        if GALLERY_META_COLUMN not in payload:
+            raise
+        get_sb().table("worksheets").update(without_gallery_meta(payload)).eq("id", safe_id).eq("user_id", uid).execute()
+
+
 def _persist_saved_worksheet_visuals(worksheet_id: int | str, worksheet: dict) -> bool:
     uid = str(get_current_user_id() or "").strip()
     if not uid or worksheet_id in (None, "", 0, "0"):
@@ -1914,13 +1888,13 @@ def _persist_saved_worksheet_visuals(worksheet_id: int | str, worksheet: dict) -
     existing_row = load_worksheet_record(safe_id) or {}
     worksheet = preserve_generated_media_fields(worksheet, existing_row.get("worksheet_json") or {})
     try:
-        (
-            get_sb()
-            .table("worksheets")
-            .update({"worksheet_json": worksheet})
-            .eq("id", safe_id)
-            .eq("user_id", uid)
-            .execute()
+        _update_worksheet_row(
+            safe_id,
+            uid,
+            {
+                "worksheet_json": worksheet,
+                GALLERY_META_COLUMN: build_gallery_meta({**existing_row, "worksheet_json": worksheet}, kind="worksheet"),
+            },
         )
         try:
             from helpers.practice_engine import rescore_practice_sessions_for_resource, worksheet_to_exercises
@@ -1970,20 +1944,13 @@ def _persist_saved_worksheet_resource(worksheet_id: int | str, worksheet: dict)
         safe_id = int(stripped) if stripped.isdigit() else stripped
     worksheet = _clean_worksheet_data(_normalize_worksheet_unicode(dict(worksheet or {})))
     existing_row = load_worksheet_record(safe_id) or {}
+    update_payload = {
+        "worksheet_json": worksheet,
+        "title": _clean_display_text(worksheet.get("title") or ""),
+    }
+    update_payload[GALLERY_META_COLUMN] = build_gallery_meta({**existing_row, **update_payload}, kind="worksheet")
     try:
-        (
-            get_sb()
-            .table("worksheets")
-            .update(
-                {
-                    "worksheet_json": worksheet,
-                    "title": _clean_display_text(worksheet.get("title") or ""),
-                }
-            )
-            .eq("id", safe_id)
-            .eq("user_id", uid)
-            .execute()
-        )
+        _update_worksheet_row(safe_id, uid, update_payload)
         try:
             from helpers.teacher_student_integration import sync_assignment_copies_for_resource
             from helpers.practice_engine import rescore_practice_sessions_for_resource, worksheet_to_exercises
@@ -2026,6 +1993,7 @@ def build_worksheet_pdf_bytes(
     learner_stage: str = "",
     level_or_band: str = "",
     student_only: bool = False,
+    branding: dict | None = None,
 ) -> bytes:
     from reportlab.lib.pagesizes import A4
     from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
@@ -2057,7 +2025,7 @@ def build_worksheet_pdf_bytes(
 
     # ── Centralised font + style setup ────────────────────────
     from helpers.branding import get_user_branding as _get_branding
-    _branding_cfg = _get_branding()
+    _branding_cfg = branding if branding is not None else _get_branding()
     _font_key = _branding_cfg.get("branding_font", "dejavu")
     _size_key = _branding_cfg.get("branding_font_size", "standard")
 
@@ -2094,12 +2062,13 @@ def build_worksheet_pdf_bytes(
             ws.get("vocabulary_bank", []),
             seed=wordsearch_seed,
             size=12,
+            layout_version=wordsearch_layout_version(ws),
         )
 
     # ── Branding-aware header ─────────────────────────────────────
     from helpers.branding import get_user_branding, build_worksheet_header, has_custom_branding
 
-    _branding = get_user_branding()
+    _branding = branding if branding is not None else get_user_branding()
 
     # Student worksheet uses school header if enabled; answer key uses standard
     if student_only or not student_only:
@@ -2769,6 +2738,7 @@ def render_quick_worksheet_maker_expander(*, embedded: bool = False) -> None:
             else t("generate_worksheet")
         )
 
+        force_fresh_ws = st.checkbox(t("ai_force_fresh_generation"), key="quick_ws_force_fresh", help=t("ai_force_fresh_generation_help"))
         if st.button(generate_button_label, key="btn_gen_ws", use_container_width=True):
             if subject == "other" and not other_subject_name:
                 st.error(t("enter_subject_name"))
@@ -2809,6 +2779,7 @@ def render_quick_worksheet_maker_expander(*, embedded: bool = False) -> None:
                         worksheet_type=worksheet_type,
                         topic=effective_topic,
                         student_profile=student_profile,
+                        force_fresh=force_fresh_ws,
                     )
 
                     debug_baseline_ws = {}
@@ -0,0 +1,121 @@
+-- ============================================================
+-- CLASSIO — Batch deletion of archived library resources
+-- One call detaches assignment snapshots and deletes (or, when
+-- assignments still reference them, marks deleted) a set of
+-- archived resources in a single transaction. Each ID runs in its
+-- own sub-block so one failing row reports its error without rolling
+-- back the others. Runs as the caller, so RLS still applies.
+-- ============================================================
+
+create or replace function public.classio_delete_archived_resources(
+    p_table text,
+    p_ids text[],
+    p_assignment_type text default null,
+    p_source_type text default null
+)
+returns table(
+    resource_id text,
+    outcome text,
+    assignment_count integer,
+    student_count integer,
+    active_assignment_count integer
+)
+language plpgsql
+security invoker
+set search_path = public
+as $$
+declare
+    v_teacher text := auth.uid()::text;
+    v_now timestamptz := timezone('utc', now());
+    v_track_assignments boolean := coalesce(btrim(p_assignment_type), '') <> ''
+        and coalesce(btrim(p_source_type), '') <> '';
+    v_rows jsonb := '{}'::jsonb;
+    v_counts jsonb := '{}'::jsonb;
+    v_row jsonb;
+    v_id text;
+begin
+    if p_table not in ('lesson_plans', 'worksheets', 'quick_exams', 'professional_profiles', 'videos') then
+        raise exception 'unsupported resource table: %', p_table;
+    end if;
+
+    -- One read of the requested rows and one aggregate over their assignments.
+    execute format(
+        'select coalesce(jsonb_object_agg(r.id::text, to_jsonb(r)), ''{}''::jsonb)
+           from public.%I r
+          where r.user_id::text = $1 and r.id::text = any($2)',
+        p_table
+    ) into v_rows using v_teacher, p_ids;
+
+    if v_track_assignments then
+        select coalesce(jsonb_object_agg(c.source_record_id, to_jsonb(c)), '{}'::jsonb)
+          into v_counts
+          from (
+              select
+                  a.source_record_id,
+                  count(*)::integer as assignment_count,
+                  count(distinct nullif(btrim(a.student_id::text), ''))::integer as student_count,
+                  (count(*) filter (where lower(btrim(coalesce(a.status, ''))) <> 'archived'))::integer
+                      as active_assignment_count
+              from public.teacher_assignments a
+              where a.teacher_id::text = v_teacher
+                and a.assignment_type = p_assignment_type
+                and a.source_type = p_source_type
+                and a.source_record_id = any(p_ids)
+              group by a.source_record_id
+          ) c;
+    end if;
+
+    foreach v_id in array coalesce(p_ids, array[]::text[]) loop
+        resource_id := v_id;
+        v_row := v_rows -> v_id;
+        assignment_count := coalesce((v_counts -> v_id ->> 'assignment_count')::integer, 0);
+        student_count := coalesce((v_counts -> v_id ->> 'student_count')::integer, 0);
+        active_assignment_count := coalesce((v_counts -> v_id ->> 'active_assignment_count')::integer, 0);
+
+        if v_teacher is null then
+            outcome := 'auth_required';
+        elsif v_row is null then
+            outcome := 'not_owner';
+        elsif lower(btrim(coalesce(v_row ->> 'status', ''))) <> 'archived' then
+            outcome := 'resource_delete_requires_archive';
+        elsif lower(btrim(coalesce(v_row ->> 'is_public', ''))) in ('1', 'true', 'yes', 'on', 'public') then
+            outcome := 'resource_delete_requires_private';
+        else
+            begin
+                if assignment_count > 0 then
+                    update public.teacher_assignments a
+                       set source_record_id = null,
+                           source_archived = true,
+                           source_archived_at = v_now,
+                           updated_at = v_now
+                     where a.teacher_id::text = v_teacher
+                       and a.assignment_type = p_assignment_type
+                       and a.source_type = p_source_type
+                       and a.source_record_id = v_id;
+                    if v_row ? 'updated_at' then
+                        execute format(
+                            'update public.%I set status = ''deleted'', updated_at = $3 where id::text = $1 and user_id::text = $2',
+                            p_table
+                        ) using v_id, v_teacher, v_now;
+                    else
+                        execute format(
+                            'update public.%I set status = ''deleted'' where id::text = $1 and user_id::text = $2',
+                            p_table
+                        ) using v_id, v_teacher;
+                    end if;
+                    outcome := 'detached';
+                else
+                    execute format(
+                        'delete from public.%I where id::text = $1 and user_id::text = $2',
+                        p_table
+                    ) using v_id, v_teacher;
+                    outcome := 'deleted';
+                end if;
+            exception when others then
+                outcome := sqlerrm;
+            end;
+        end if;
+        return next;
+    end loop;
+end;
+$$;
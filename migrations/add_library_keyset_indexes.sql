@@ -0,0 +1,32 @@
+-- Keyset pagination for resource libraries.
+-- Library pages are read in (created_at desc, id desc) order and resume
+-- after the last row seen, so each list needs the id tie-breaker in its
+-- index for a page to cost the same at any depth.
+
+create index if not exists idx_quick_exams_user_created_at_id
+    on quick_exams(user_id, created_at desc, id desc);
+
+create index if not exists idx_quick_exams_public_created_at_id
+    on quick_exams(created_at desc, id desc)
+    where is_public = true;
+
+create index if not exists idx_worksheets_user_created_at_id
+    on worksheets(user_id, created_at desc, id desc);
+
+create index if not exists idx_worksheets_public_created_at_id
+    on worksheets(created_at desc, id desc)
+    where is_public = true;
+
+create index if not exists idx_lesson_plans_user_created_at_id
+    on lesson_plans(user_id, created_at desc, id desc);
+
+create index if not exists idx_lesson_plans_public_created_at_id
+    on lesson_plans(created_at desc, id desc)
+    where is_public = true;
+
+create index if not exists idx_videos_user_created_at_id
+    on videos(user_id, created_at desc, id desc);
+
+create index if not exists idx_videos_public_created_at_id
+    on videos(created_at desc, id desc)
+    where is_public = true;
@@ -0,0 +1,19 @@
+-- ============================================================
+-- CLASSIO — Library card projection
+-- Saved resources keep a small gallery_meta object next to their
+-- JSON payload: {"kind", "title", "image_url", "language"}. Library
+-- grids read it from the list query instead of loading and walking
+-- every resource's full JSON per card. The app writes it on every
+-- save; rows saved earlier are filled by
+-- scripts/backfill_gallery_meta.py and, until then, fall back to
+-- the parse path.
+-- ============================================================
+
+alter table if exists worksheets
+    add column if not exists gallery_meta jsonb;
+
+alter table if exists quick_exams
+    add column if not exists gallery_meta jsonb;
+
+alter table if exists lesson_plans
+    add column if not exists gallery_meta jsonb;
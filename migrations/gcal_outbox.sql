@@ -0,0 +1,49 @@
+-- Outbox for Google Calendar sync.
+-- Calendar saves enqueue event creates/deletes here instead of calling the
+-- Calendar API inline; scripts/drain_gcal_outbox.py (service role) drains the
+-- queue in per-teacher batch requests and writes event ids back to
+-- calendar_overrides.
+
+create table if not exists public.gcal_outbox (
+  id bigint generated by default as identity primary key,
+  user_id uuid not null references auth.users(id) on delete cascade,
+  op text not null check (op in ('create', 'delete')),
+  student text not null default '',
+  original_date date,
+  override_id bigint,
+  event_body jsonb not null default '{}'::jsonb,
+  gcal_event_id text,
+  status text not null default 'pending' check (status in ('pending', 'done', 'failed', 'superseded', 'skipped')),
+  attempts integer not null default 0,
+  last_error text not null default '',
+  created_at timestamptz not null default now(),
+  processed_at timestamptz
+);
+
+create index if not exists idx_gcal_outbox_pending
+  on public.gcal_outbox (status, user_id, id)
+  where status = 'pending';
+
+create index if not exists idx_gcal_outbox_user_student_date
+  on public.gcal_outbox (user_id, student, original_date);
+
+alter table public.gcal_outbox enable row level security;
+
+drop policy if exists "Teacher reads own gcal outbox" on public.gcal_outbox;
+create policy "Teacher reads own gcal outbox"
+on public.gcal_outbox
+for select
+using (auth.uid() = user_id);
+
+drop policy if exists "Teacher enqueues own gcal outbox" on public.gcal_outbox;
+create policy "Teacher enqueues own gcal outbox"
+on public.gcal_outbox
+for insert
+with check (auth.uid() = user_id);
+
+drop policy if exists "Teacher supersedes own gcal outbox" on public.gcal_outbox;
+create policy "Teacher supersedes own gcal outbox"
+on public.gcal_outbox
+for update
+using (auth.uid() = user_id)
+with check (auth.uid() = user_id);
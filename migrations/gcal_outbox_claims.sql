@@ -0,0 +1,18 @@
+-- Claim gcal_outbox rows before sending them.
+-- The drain used to read pending rows and send them as they were, so two
+-- overlapping drains sent the same creates twice, and a create superseded
+-- mid-send was flipped back to done. A drain now moves its rows to
+-- 'sending' with a conditional update, and settles only rows still in
+-- 'sending'. claimed_at lets a later drain requeue the rows of a drain that
+-- died mid-send.
+
+alter table public.gcal_outbox add column if not exists claimed_at timestamptz;
+
+alter table public.gcal_outbox drop constraint if exists gcal_outbox_status_check;
+alter table public.gcal_outbox
+  add constraint gcal_outbox_status_check
+  check (status in ('pending', 'sending', 'done', 'failed', 'superseded', 'skipped'));
+
+create index if not exists idx_gcal_outbox_sending
+  on public.gcal_outbox (claimed_at)
+  where status = 'sending';
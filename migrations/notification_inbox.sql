@@ -0,0 +1,147 @@
+-- Precomputed notification inbox.
+-- Mutation helpers append one row per event (assignment created, review
+-- requested/completed, package nearly used up) for the user who should see
+-- it, so the notification panel reads one indexed page plus an unread
+-- counter instead of re-aggregating every source on each render.
+-- scripts/backfill_notification_inbox.py (service role) seeds rows for
+-- events that happened before this migration.
+
+create table if not exists public.notification_inbox (
+  id bigint generated by default as identity primary key,
+  user_id uuid not null references auth.users(id) on delete cascade,
+  actor_id uuid default auth.uid(),
+  kind text not null check (kind in ('assignment_assigned', 'review_requested', 'review_completed', 'package_ending')),
+  source_id text not null,
+  payload jsonb not null default '{}'::jsonb,
+  event_at timestamptz not null default now(),
+  read_at timestamptz,
+  resolved_at timestamptz,
+  created_at timestamptz not null default now(),
+  unique (user_id, kind, source_id)
+);
+
+create index if not exists idx_notification_inbox_user_active
+  on public.notification_inbox (user_id, event_at desc, id desc)
+  where resolved_at is null;
+
+create table if not exists public.notification_inbox_counters (
+  user_id uuid primary key references auth.users(id) on delete cascade,
+  unread_count integer not null default 0,
+  updated_at timestamptz not null default now()
+);
+
+-- Keep the per-user unread counter in step with the inbox. A row counts as
+-- unread while it is neither read nor resolved.
+create or replace function public.classio_notification_inbox_count()
+returns trigger
+language plpgsql
+security definer
+set search_path = public
+as $$
+declare
+  v_old integer := 0;
+  v_new integer := 0;
+  v_user uuid;
+begin
+  if tg_op in ('UPDATE', 'DELETE') and old.read_at is null and old.resolved_at is null then
+    v_old := 1;
+  end if;
+  if tg_op in ('INSERT', 'UPDATE') and new.read_at is null and new.resolved_at is null then
+    v_new := 1;
+  end if;
+  v_user := case when tg_op = 'DELETE' then old.user_id else new.user_id end;
+  if v_new - v_old <> 0 then
+    insert into public.notification_inbox_counters as c (user_id, unread_count, updated_at)
+    values (v_user, greatest(v_new - v_old, 0), now())
+    on conflict (user_id) do update
+      set unread_count = greatest(c.unread_count + (v_new - v_old), 0),
+          updated_at = now();
+  end if;
+  return null;
+end;
+$$;
+
+drop trigger if exists trg_notification_inbox_count on public.notification_inbox;
+create trigger trg_notification_inbox_count
+after insert or update of read_at, resolved_at or delete on public.notification_inbox
+for each row execute function public.classio_notification_inbox_count();
+
+-- Resolve inbox rows when their source leaves the state that raised them,
+-- whichever helper made the change.
+create or replace function public.classio_resolve_assignment_inbox()
+returns trigger
+language plpgsql
+security definer
+set search_path = public
+as $$
+begin
+  if old.status = 'assigned' and new.status is distinct from 'assigned' then
+    update public.notification_inbox
+       set resolved_at = now()
+     where user_id::text = new.student_id::text
+       and kind = 'assignment_assigned'
+       and source_id = new.id::text
+       and resolved_at is null;
+  end if;
+  return null;
+end;
+$$;
+
+drop trigger if exists trg_resolve_assignment_inbox on public.teacher_assignments;
+create trigger trg_resolve_assignment_inbox
+after update of status on public.teacher_assignments
+for each row execute function public.classio_resolve_assignment_inbox();
+
+create or replace function public.classio_resolve_review_inbox()
+returns trigger
+language plpgsql
+security definer
+set search_path = public
+as $$
+begin
+  if old.status = 'requested' and new.status is distinct from 'requested' then
+    update public.notification_inbox
+       set resolved_at = now()
+     where user_id::text = new.teacher_id::text
+       and kind = 'review_requested'
+       and source_id = new.id::text
+       and resolved_at is null;
+  end if;
+  return null;
+end;
+$$;
+
+drop trigger if exists trg_resolve_review_inbox on public.teacher_review_requests;
+create trigger trg_resolve_review_inbox
+after update of status on public.teacher_review_requests
+for each row execute function public.classio_resolve_review_inbox();
+
+alter table public.notification_inbox enable row level security;
+alter table public.notification_inbox_counters enable row level security;
+
+drop policy if exists "Users read own notification inbox" on public.notification_inbox;
+create policy "Users read own notification inbox"
+on public.notification_inbox
+for select
+using (auth.uid() = user_id);
+
+-- The actor writes the row for the recipient (a teacher assigning work, a
+-- student asking for a review), so inserts are checked against actor_id.
+drop policy if exists "Actors append notification inbox events" on public.notification_inbox;
+create policy "Actors append notification inbox events"
+on public.notification_inbox
+for insert
+with check (auth.uid() = actor_id);
+
+drop policy if exists "Users update own notification inbox" on public.notification_inbox;
+create policy "Users update own notification inbox"
+on public.notification_inbox
+for update
+using (auth.uid() = user_id)
+with check (auth.uid() = user_id);
+
+drop policy if exists "Users read own notification counter" on public.notification_inbox_counters;
+create policy "Users read own notification counter"
+on public.notification_inbox_counters
+for select
+using (auth.uid() = user_id);
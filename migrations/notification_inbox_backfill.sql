@@ -0,0 +1,62 @@
+-- Seed the notification inbox with events from before it existed.
+-- Once notification_inbox exists, the panel reads pending assignments and
+-- review requests/reviews only from it. Without this backfill, every open
+-- notification raised before the deploy would disappear until
+-- scripts/backfill_notification_inbox.py ran. The rows match
+-- helpers.notification_inbox.inbox_backfill_rows over the same 14-day
+-- window that script uses by default. Existing rows are left alone, so the
+-- migration can be re-run. Package-ending rows are reconciled on the next
+-- dashboard render, as before.
+
+insert into public.notification_inbox (user_id, kind, source_id, payload, event_at)
+select
+  a.student_id,
+  'assignment_assigned',
+  a.id::text,
+  jsonb_build_object(
+    'title', coalesce(a.title, ''),
+    'assignment_type', coalesce(a.assignment_type, ''),
+    'teacher_name', coalesce(nullif(btrim(p.display_name), ''), nullif(btrim(p.username), ''), nullif(btrim(p.email), ''), '—')
+  ),
+  a.created_at
+from public.teacher_assignments a
+left join public.profiles p on p.user_id::text = a.teacher_id::text
+where lower(btrim(a.status)) = 'assigned'
+  and a.created_at >= now() - interval '14 days'
+on conflict (user_id, kind, source_id) do nothing;
+
+insert into public.notification_inbox (user_id, kind, source_id, payload, event_at)
+select
+  r.teacher_id,
+  'review_requested',
+  r.id::text,
+  jsonb_build_object(
+    'title', coalesce(r.title, ''),
+    'source_type', coalesce(r.source_type, ''),
+    'student_id', r.student_id::text,
+    'student_name', coalesce(nullif(btrim(p.display_name), ''), nullif(btrim(p.username), ''), nullif(btrim(p.email), ''), '—')
+  ),
+  coalesce(r.requested_at, r.created_at)
+from public.teacher_review_requests r
+left join public.profiles p on p.user_id::text = r.student_id::text
+where lower(btrim(r.status)) = 'requested'
+  and r.updated_at >= now() - interval '14 days'
+on conflict (user_id, kind, source_id) do nothing;
+
+insert into public.notification_inbox (user_id, kind, source_id, payload, event_at)
+select
+  r.student_id,
+  'review_completed',
+  r.id::text,
+  jsonb_build_object(
+    'title', coalesce(r.title, ''),
+    'source_type', coalesce(r.source_type, ''),
+    'teacher_name', coalesce(nullif(btrim(p.display_name), ''), nullif(btrim(p.username), ''), nullif(btrim(p.email), ''), '—')
+  ),
+  r.reviewed_at
+from public.teacher_review_requests r
+left join public.profiles p on p.user_id::text = r.teacher_id::text
+where lower(btrim(r.status)) = 'reviewed'
+  and r.reviewed_at is not null
+  and r.updated_at >= now() - interval '14 days'
+on conflict (user_id, kind, source_id) do nothing;
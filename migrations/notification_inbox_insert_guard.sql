@@ -0,0 +1,48 @@
+-- Tighten who may append notification inbox rows.
+-- The first policy only checked auth.uid() = actor_id, so any signed-in
+-- user could write rows into any other user's inbox and raise their unread
+-- counter. An insert must now come from the actor and name a source row
+-- that links actor and recipient: the teacher of an assignment, the student
+-- asking for a review, the teacher completing it. Package notices only ever
+-- go to the teacher's own inbox.
+
+drop policy if exists "Actors append notification inbox events" on public.notification_inbox;
+create policy "Actors append notification inbox events"
+on public.notification_inbox
+for insert
+with check (
+  auth.uid() = actor_id
+  and (
+    (notification_inbox.kind = 'package_ending' and notification_inbox.user_id = auth.uid())
+    or (
+      notification_inbox.kind = 'assignment_assigned'
+      and exists (
+        select 1
+          from public.teacher_assignments a
+         where a.id::text = notification_inbox.source_id
+           and a.teacher_id::text = auth.uid()::text
+           and a.student_id::text = notification_inbox.user_id::text
+      )
+    )
+    or (
+      notification_inbox.kind = 'review_requested'
+      and exists (
+        select 1
+          from public.teacher_review_requests r
+         where r.id::text = notification_inbox.source_id
+           and r.student_id::text = auth.uid()::text
+           and r.teacher_id::text = notification_inbox.user_id::text
+      )
+    )
+    or (
+      notification_inbox.kind = 'review_completed'
+      and exists (
+        select 1
+          from public.teacher_review_requests r
+         where r.id::text = notification_inbox.source_id
+           and r.teacher_id::text = auth.uid()::text
+           and r.student_id::text = notification_inbox.user_id::text
+      )
+    )
+  )
+);
@@ -0,0 +1,118 @@
+-- Daily income rollups per teacher.
+-- One row per (teacher, payment day, subject, modality) holding the summed
+-- amount, payment count and lessons sold. Analytics KPIs, the monthly and
+-- yearly income tables and the year-goal snapshot read these rows instead
+-- of every payment the teacher ever recorded. A trigger on payments keeps
+-- them current for every writer (add_payment, update_payment_row,
+-- delete_row, imports), and the backfill below rebuilds them from scratch
+-- so the migration can be re-run safely.
+-- Rows mirror the analytics filters: payments without a student or a
+-- payment_date are left out, a missing modality counts as 'Online'.
+
+create table if not exists public.payment_rollups (
+  user_id uuid not null references auth.users(id) on delete cascade,
+  period date not null,
+  subject text not null default '',
+  modality text not null default 'Online',
+  paid_amount numeric not null default 0,
+  payment_count integer not null default 0,
+  lesson_count integer not null default 0,
+  updated_at timestamptz not null default now(),
+  primary key (user_id, period, subject, modality)
+);
+
+create or replace function public.classio_apply_payment_rollup(
+  p_user_id uuid,
+  p_student text,
+  p_payment_date date,
+  p_subject text,
+  p_modality text,
+  p_paid_amount numeric,
+  p_lessons integer,
+  p_sign integer
+)
+returns void
+language plpgsql
+security definer
+set search_path = public
+as $$
+declare
+  v_subject text := coalesce(btrim(p_subject), '');
+  v_modality text := coalesce(btrim(p_modality), 'Online');
+begin
+  if p_user_id is null or p_payment_date is null or coalesce(btrim(p_student), '') = '' then
+    return;
+  end if;
+  insert into public.payment_rollups as r
+    (user_id, period, subject, modality, paid_amount, payment_count, lesson_count, updated_at)
+  values
+    (p_user_id, p_payment_date, v_subject, v_modality,
+     p_sign * coalesce(p_paid_amount, 0), p_sign, p_sign * coalesce(p_lessons, 0), now())
+  on conflict (user_id, period, subject, modality) do update
+    set paid_amount = r.paid_amount + excluded.paid_amount,
+        payment_count = r.payment_count + excluded.payment_count,
+        lesson_count = r.lesson_count + excluded.lesson_count,
+        updated_at = now();
+  delete from public.payment_rollups
+   where user_id = p_user_id
+     and period = p_payment_date
+     and subject = v_subject
+     and modality = v_modality
+     and payment_count <= 0;
+end;
+$$;
+
+create or replace function public.classio_payment_rollup_delta()
+returns trigger
+language plpgsql
+security definer
+set search_path = public
+as $$
+begin
+  if tg_op in ('UPDATE', 'DELETE') then
+    perform public.classio_apply_payment_rollup(
+      old.user_id, old.student, old.payment_date::date, old.subject, old.modality,
+      old.paid_amount, old.number_of_lesson, -1
+    );
+  end if;
+  if tg_op in ('INSERT', 'UPDATE') then
+    perform public.classio_apply_payment_rollup(
+      new.user_id, new.student, new.payment_date::date, new.subject, new.modality,
+      new.paid_amount, new.number_of_lesson, 1
+    );
+  end if;
+  return null;
+end;
+$$;
+
+drop trigger if exists trg_payment_rollup_delta on public.payments;
+create trigger trg_payment_rollup_delta
+after insert or delete or update of user_id, student, payment_date, subject, modality, paid_amount, number_of_lesson
+on public.payments
+for each row execute function public.classio_payment_rollup_delta();
+
+delete from public.payment_rollups;
+insert into public.payment_rollups
+  (user_id, period, subject, modality, paid_amount, payment_count, lesson_count, updated_at)
+select
+  p.user_id,
+  p.payment_date::date,
+  coalesce(btrim(p.subject), ''),
+  coalesce(btrim(p.modality), 'Online'),
+  sum(coalesce(p.paid_amount, 0)),
+  count(*),
+  sum(coalesce(p.number_of_lesson, 0)),
+  now()
+from public.payments p
+where p.user_id is not null
+  and p.payment_date is not null
+  and coalesce(btrim(p.student), '') <> ''
+group by 1, 2, 3, 4;
+
+alter table public.payment_rollups enable row level security;
+
+drop policy if exists "Users read own payment rollups" on public.payment_rollups;
+create policy "Users read own payment rollups"
+on public.payment_rollups
+for select
+using (auth.uid() = user_id);
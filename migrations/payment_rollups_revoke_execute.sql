@@ -0,0 +1,10 @@
+-- Lock down the payment rollup functions.
+-- Both run as security definer so the payments trigger can write
+-- payment_rollups past its read-only RLS policy. EXECUTE was never revoked,
+-- so any signed-in user could call classio_apply_payment_rollup over RPC
+-- with another teacher's user_id and shift their income rollups. The
+-- trigger still fires them as the table owner, which needs no grant.
+
+revoke all on function public.classio_apply_payment_rollup(uuid, text, date, text, text, numeric, integer, integer)
+    from public, anon, authenticated;
+revoke all on function public.classio_payment_rollup_delta() from public, anon, authenticated;
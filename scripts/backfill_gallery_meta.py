@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""Fill gallery_meta for worksheets, quick exams and lesson plans saved before it existed.
+
+Rows whose gallery_meta is still null, or still holds an inline data-URI
+image from before the projection was made compact, are read in id order,
+projected with the same helper the save paths use and written back one by
+one, so the script can be stopped and re-run. Run with a service-role
+SUPABASE_KEY.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+import sys
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from core.database import get_sb  # noqa: E402
+from helpers.resource_gallery import GALLERY_META_COLUMN, build_gallery_meta  # noqa: E402
+
+_SOURCES = (
+    ("worksheets", "worksheet"),
+    ("quick_exams", "exam"),
+    ("lesson_plans", "lesson_plan"),
+)
+
+
+def _missing_meta(query):
+    return query.is_(GALLERY_META_COLUMN, "null")
+
+
+def _inline_image_meta(query):
+    return query.like(f"{GALLERY_META_COLUMN}->>image_url", "data:%")
+
+
+def _pages(sb, table: str, batch: int, stale_filter):
+    last_id = None
+    while True:
+        query = stale_filter(sb.table(table).select("*")).order("id").limit(batch)
+        if last_id is not None:
+            query = query.gt("id", last_id)
+        rows = query.execute().data or []
+        if not rows:
+            return
+        yield rows
+        last_id = rows[-1]["id"]
+        if len(rows) < batch:
+            return
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--batch", type=int, default=100, help="Rows read per request; resource JSON can be large.")
+    parser.add_argument("--dry-run", action="store_true", help="Count rows without writing.")
+    args = parser.parse_args(argv)
+
+    sb = get_sb()
+    summary = {}
+    for table, kind in _SOURCES:
+        counts = {"read": 0, "with_image": 0, "written": 0}
+        pages = (page for stale_filter in (_missing_meta, _inline_image_meta) for page in _pages(sb, table, max(1, args.batch), stale_filter))
+        for page in pages:
+            for row in page:
+                counts["read"] += 1
+                meta = build_gallery_meta(row, kind=kind)
+                counts["with_image"] += bool(meta["image_url"] or meta["has_inline_image"])
+                if args.dry_run:
+                    continue
+                sb.table(table).update({GALLERY_META_COLUMN: meta}).eq("id", row["id"]).execute()
+                counts["written"] += 1
+        summary[table] = counts
+    print(json.dumps(summary), flush=True)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
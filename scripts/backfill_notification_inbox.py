@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""Seed notification_inbox with events that happened before the inbox existed.
+
+Open assignments and teacher review requests/reviews from the last
+``--days`` days are written in the same shape the mutation helpers use;
+rows that already exist are left alone, so the script can be re-run. Run
+with a service-role SUPABASE_KEY. Package-ending rows are not backfilled:
+they are reconciled the next time each teacher's dashboard renders.
+
+migrations/notification_inbox_backfill.sql already seeds the default
+14-day window; this script is for a longer ``--days`` reach.
+"""
+
+from __future__ import annotations
+
+import argparse
+from datetime import datetime, timedelta, timezone
+import json
+from pathlib import Path
+import sys
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from core.database import get_sb  # noqa: E402
+from helpers.notification_inbox import inbox_backfill_rows  # noqa: E402
+from helpers.teacher_student_integration import _load_profiles_map, _profile_label  # noqa: E402
+
+
+def _pages(sb, table: str, columns: str, since_column: str, since_iso: str, batch: int):
+    last_id = 0
+    while True:
+        rows = (
+            sb.table(table)
+            .select(columns)
+            .gte(since_column, since_iso)
+            .gt("id", last_id)
+            .order("id")
+            .limit(batch)
+            .execute()
+            .data
+            or []
+        )
+        if not rows:
+            return
+        yield rows
+        last_id = int(rows[-1]["id"])
+        if len(rows) < batch:
+            return
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--days", type=int, default=14, help="How far back to look for events.")
+    parser.add_argument("--batch", type=int, default=500, help="Rows read and written per request.")
+    parser.add_argument("--dry-run", action="store_true", help="Count rows without writing.")
+    args = parser.parse_args(argv)
+
+    sb = get_sb()
+    since_iso = (datetime.now(timezone.utc) - timedelta(days=max(1, args.days))).isoformat()
+    sources = [
+        ("teacher_assignments", "id,teacher_id,student_id,status,title,assignment_type,created_at", "created_at", "assignments"),
+        (
+            "teacher_review_requests",
+            "id,teacher_id,student_id,status,title,source_type,requested_at,reviewed_at,created_at",
+            "updated_at",
+            "review_requests",
+        ),
+    ]
+    summary = {"read": 0, "written": 0}
+    for table, columns, since_column, kind in sources:
+        for page in _pages(sb, table, columns, since_column, since_iso, max(1, args.batch)):
+            summary["read"] += len(page)
+            profile_ids = {str(row.get(key) or "").strip() for row in page for key in ("teacher_id", "student_id")}
+            profiles = _load_profiles_map(sorted(profile_ids))
+            rows = inbox_backfill_rows(
+                assignments=page if kind == "assignments" else [],
+                review_requests=page if kind == "review_requests" else [],
+                profile_names={user_id: _profile_label(profiles.get(user_id, {})) for user_id in profile_ids},
+            )
+            if rows and not args.dry_run:
+                (
+                    sb.table("notification_inbox")
+                    .upsert(rows, on_conflict="user_id,kind,source_id", ignore_duplicates=True)
+                    .execute()
+                )
+            summary["written"] += len(rows)
+    print(json.dumps(summary), flush=True)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
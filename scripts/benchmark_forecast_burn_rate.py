@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+import random
+import sys
+import time
+from unittest.mock import patch
+
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from helpers import forecast  # noqa: E402
+from helpers.package_lang_lookups import _is_free_note, _units_multiplier  # noqa: E402
+from helpers.ui_components import to_dt_naive, ts_today_naive  # noqa: E402
+
+_NOTES = ["", "", "", "homework set", "[FREE] trial", "[demo]", "[Don't count] reschedule", "[DONT COUNT]", "makeup"]
+
+
+def _classes(count: int, students: int = 400, seed: int = 1, days: int = 365 * 3) -> pd.DataFrame:
+    rng = random.Random(seed)
+    today = ts_today_naive()
+    return pd.DataFrame(
+        {
+            "id": list(range(1, count + 1)),
+            "student": [f" Student {rng.randint(1, students)}" for _ in range(count)],
+            "lesson_date": [(today - pd.Timedelta(days=rng.randint(0, days))).strftime("%Y-%m-%d") for _ in range(count)],
+            "number_of_lesson": [rng.choice([1, 1, 1, 2, "2", None]) for _ in range(count)],
+            "modality": [rng.choice(["Online", "Offline", " Online "]) for _ in range(count)],
+            "note": [rng.choice(_NOTES) for _ in range(count)],
+            "subject": [rng.choice(["English", "Spanish"]) for _ in range(count)],
+        }
+    )
+
+
+def _dashboard(students: int, seed: int = 1) -> pd.DataFrame:
+    rng = random.Random(seed)
+    today = ts_today_naive()
+    day = lambda offset: (today - pd.Timedelta(days=offset)).strftime("%Y-%m-%d")
+    return pd.DataFrame(
+        {
+            "Student": [f"Student {idx}" for idx in range(1, students + 1)],
+            "Status": [rng.choice(["active", "almost_finished", "finished"]) for _ in range(students)],
+            "Payment_Date": [day(rng.randint(0, 300)) for _ in range(students)],
+            "Package_Start_Date": [day(rng.randint(0, 300)) for _ in range(students)],
+            "Package_Expiry_Date": [day(-rng.randint(-30, 200)) for _ in range(students)],
+            "Last_Lesson_Date": [day(rng.randint(0, 200)) for _ in range(students)],
+            "Lessons_Left_Units": [rng.randint(0, 12) for _ in range(students)],
+            "Overused_Units": [0] * students,
+            "Modality": [rng.choice(["Online", "Offline"]) for _ in range(students)],
+            "Languages": ["English"] * students,
+        }
+    )
+
+
+# Previous burn-rate step: clean the whole class history, then score row by row.
+def _legacy_recent_class_units(classes: pd.DataFrame, rate_cutoff: pd.Timestamp) -> pd.DataFrame:
+    classes["student"] = classes["student"].fillna("").astype(str).str.strip()
+    classes["lesson_date"] = to_dt_naive(classes["lesson_date"], utc=True)
+    classes["number_of_lesson"] = pd.to_numeric(classes["number_of_lesson"], errors="coerce").fillna(0).astype(int)
+    classes["modality"] = classes["modality"].fillna("Online").astype(str).str.strip()
+    classes["note"] = classes["note"].fillna("").astype(str)
+
+    def _units_row(r) -> int:
+        if _is_free_note(r.get("note", "")):
+            return 0
+        return int(r.get("number_of_lesson", 0)) * _units_multiplier(r.get("modality", ""))
+
+    recent = classes.dropna(subset=["lesson_date"]).copy()
+    recent = recent[recent["lesson_date"] >= rate_cutoff]
+    if recent.empty:
+        return pd.DataFrame(columns=["Student", "Units_Last_Lookback"])
+    recent["Units_Last_Lookback"] = recent.apply(_units_row, axis=1)
+    return recent.groupby("student", as_index=False)["Units_Last_Lookback"].sum().rename(columns={"student": "Student"})
+
+
+def _legacy_build_forecast_table(dashboard: pd.DataFrame, classes: pd.DataFrame, **kwargs) -> pd.DataFrame:
+    with patch.object(forecast, "_recent_class_units", _legacy_recent_class_units):
+        return forecast.build_forecast_table(dashboard_df=dashboard, classes_df=classes, **kwargs)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the forecast burn-rate step: row-wise apply vs windowed, vectorized units.")
+    parser.add_argument("--classes", type=int, default=100_000)
+    parser.add_argument("--students", type=int, default=400)
+    parser.add_argument("--lookback-days", type=int, default=56)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    classes = _classes(max(1, args.classes), students=max(1, args.students), seed=args.seed)
+    dashboard = _dashboard(max(1, args.students), seed=args.seed)
+    repeats = max(1, args.repeats)
+    rate_cutoff = ts_today_naive() - pd.Timedelta(days=int(args.lookback_days))
+
+    timings = {"row_wise": 0.0, "vectorized": 0.0}
+    for _ in range(repeats):
+        started = time.perf_counter()
+        legacy = _legacy_build_forecast_table(dashboard, classes.copy(), lookback_days_for_rate=args.lookback_days)
+        timings["row_wise"] += time.perf_counter() - started
+
+        started = time.perf_counter()
+        current = forecast.build_forecast_table(dashboard_df=dashboard, classes_df=classes, lookback_days_for_rate=args.lookback_days)
+        timings["vectorized"] += time.perf_counter() - started
+
+    window_rows = int((to_dt_naive(classes["lesson_date"], utc=True) >= rate_cutoff).sum())
+    identical = legacy.equals(current)
+    print(
+        json.dumps(
+            {
+                "classes": len(classes),
+                "window_rows": window_rows,
+                "forecast_rows": len(current),
+                "row_wise_ms": round(1000 * timings["row_wise"] / repeats, 1),
+                "vectorized_ms": round(1000 * timings["vectorized"] / repeats, 1),
+                "identical": bool(identical),
+            }
+        ),
+        flush=True,
+    )
+    return 0 if identical else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
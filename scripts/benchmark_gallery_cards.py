@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import argparse
+import base64
+import json
+from pathlib import Path
+import random
+import sys
+import time
+
+import streamlit as st
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from helpers.resource_gallery import (  # noqa: E402
+    GALLERY_META_COLUMN,
+    build_gallery_meta,
+    extract_gallery_image_url,
+    extract_gallery_language_label,
+    gallery_card_media,
+    render_gallery_card_html,
+)
+
+_LIST_KEYS = ("id", "user_id", "title", "subject", "topic", "status", "created_at")
+_RECORDS: dict[int, dict] = {}
+
+
+def _data_url(rng: random.Random, kb: int) -> str:
+    raw = bytes(rng.getrandbits(8) for _ in range(kb * 768))
+    return "data:image/png;base64," + base64.b64encode(raw).decode("ascii")
+
+
+def _worksheet(rng: random.Random, idx: int, image_kb: int) -> dict:
+    sections = [
+        {
+            "title": f"Section {n}",
+            "instructions": "Read and answer the questions.",
+            "items": [{"prompt": f"Question {q} about the text", "answer": f"Answer {q}"} for q in range(12)],
+        }
+        for n in range(6)
+    ]
+    roll = idx % 4
+    if roll in (0, 1):
+        # Generated visual in the first or in the last section.
+        target = sections[0] if roll == 0 else sections[-1]
+        target["visual_support"] = {"prompt": "classroom scene", "image_data_url": _data_url(rng, image_kb)}
+    worksheet = {
+        "title": f"Worksheet {idx}",
+        "topic": "Past simple",
+        "student_material_language": rng.choice(["en", "es", "tr", ""]),
+        "sections": sections,
+    }
+    if roll == 2:
+        worksheet["cover_image"] = {"image_url": f"https://cdn.example.com/covers/{idx}.png"}
+    return worksheet
+
+
+def _fixtures(cards: int, image_kb: int, seed: int) -> list[dict]:
+    rng = random.Random(seed)
+    _RECORDS.clear()
+    rows = []
+    for idx in range(1, cards + 1):
+        worksheet = _worksheet(rng, idx, image_kb)
+        full = {
+            "id": idx,
+            "user_id": "teacher-1",
+            "title": worksheet["title"],
+            "subject": "english",
+            "topic": worksheet["topic"],
+            "status": "active",
+            "created_at": "2026-10-01T10:00:00+00:00",
+            "plan_language": "en",
+            # Older rows kept the payload as a JSON string.
+            "worksheet_json": json.dumps(worksheet) if idx % 5 == 0 else worksheet,
+        }
+        _RECORDS[idx] = full
+        row = {key: full[key] for key in _LIST_KEYS}
+        row[GALLERY_META_COLUMN] = build_gallery_meta(full, kind="worksheet")
+        rows.append(row)
+    return rows
+
+
+@st.cache_data(show_spinner=False)
+def _load_worksheet_record(record_id) -> dict:
+    return dict(_RECORDS.get(int(record_id)) or {})
+
+
+# Previous card loop: load the full record (a cache hit still copies it) and walk it for every card.
+def _legacy_card(row: dict) -> str:
+    full_payload = dict(row or {})
+    if not extract_gallery_image_url(full_payload) and row.get("id") not in (None, "", 0, "0"):
+        full_payload = _load_worksheet_record(row.get("id")) or full_payload
+    hero_image = extract_gallery_image_url(full_payload)
+    language_label = extract_gallery_language_label(full_payload)
+    return render_gallery_card_html(
+        kind="worksheet", title=row["title"], chips_html=language_label, description=row["topic"], meta_html="", image_url=hero_image
+    )
+
+
+def _meta_card(row: dict) -> str:
+    hero_image, language_label = gallery_card_media(row, _load_worksheet_record)
+    return render_gallery_card_html(
+        kind="worksheet", title=row["title"], chips_html=language_label, description=row["topic"], meta_html="", image_url=hero_image
+    )
+
+
+def _render(rows: list[dict], card, renders: int) -> tuple[float, list[str]]:
+    started = time.perf_counter()
+    for _ in range(renders):
+        grid = [card(row) for row in rows]
+    return time.perf_counter() - started, grid
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark a library grid: full-record parse per card vs stored gallery_meta.")
+    parser.add_argument("--cards", type=int, default=120)
+    parser.add_argument("--image-kb", type=int, default=256, help="Approximate size of each inline visual.")
+    parser.add_argument("--renders", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    rows = _fixtures(max(1, args.cards), max(1, args.image_kb), args.seed)
+    legacy_rows = [{key: value for key, value in row.items() if key != GALLERY_META_COLUMN} for row in rows]
+    renders = max(1, args.renders)
+
+    _load_worksheet_record.clear()
+    _render(legacy_rows, _legacy_card, 1)  # warm the record cache, as a second visit would
+    legacy_s, legacy_grid = _render(legacy_rows, _legacy_card, renders)
+    meta_s, meta_grid = _render(rows, _meta_card, renders)
+    _load_worksheet_record.clear()
+
+    identical = legacy_grid == meta_grid
+    print(
+        json.dumps(
+            {
+                "cards": len(rows),
+                "renders": renders,
+                "with_image": sum(bool(row[GALLERY_META_COLUMN]["image_url"]) for row in rows),
+                "with_inline_image": sum(bool(row[GALLERY_META_COLUMN]["has_inline_image"]) for row in rows),
+                "max_gallery_meta_bytes": max(len(json.dumps(row[GALLERY_META_COLUMN])) for row in rows),
+                "parse_ms_per_grid": round(1000 * legacy_s / renders, 1),
+                "gallery_meta_ms_per_grid": round(1000 * meta_s / renders, 1),
+                "identical": bool(identical),
+            }
+        ),
+        flush=True,
+    )
+    return 0 if identical else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+import random
+import sys
+import time
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import numpy as np  # noqa: E402
+
+from helpers import goal_optimizer  # noqa: E402
+
+
+def _fixtures(count: int, seed: int) -> list[dict]:
+    rng = random.Random(seed)
+    out = []
+    for _ in range(count):
+        baseline = rng.uniform(10_000.0, 500_000.0)
+        out.append(
+            {
+                "gap": rng.uniform(0.05, 1.0) * baseline,
+                "baseline_projection": baseline,
+                "avg_package_value": rng.uniform(500.0, 20_000.0),
+                "effective_rate": rng.uniform(100.0, 2_000.0),
+                "weeks_left": rng.uniform(1.0, 52.0),
+                "renewal_pool": rng.uniform(0.0, 50_000.0),
+            }
+        )
+    return out
+
+
+def _solve_all(solver, fixtures: list[dict]) -> tuple[float, float]:
+    started = time.perf_counter()
+    losses = []
+    for fixture in fixtures:
+        x, _ = solver(**fixture)
+        factors = goal_optimizer._action_factors(
+            fixture["baseline_projection"],
+            fixture["avg_package_value"],
+            fixture["effective_rate"],
+            fixture["weeks_left"],
+            fixture["renewal_pool"],
+        )
+        losses.append(float(goal_optimizer._action_loss(np.array(x), fixture["gap"], factors)) / fixture["gap"] ** 2)
+    elapsed = time.perf_counter() - started
+    return len(fixtures) / elapsed, float(np.mean(losses))
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the goal action optimizer against the reference descent.")
+    parser.add_argument("--solves", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    fixtures = _fixtures(max(1, args.solves), args.seed)
+    reference_rate, reference_loss = _solve_all(goal_optimizer._optimize_actions_reference, fixtures)
+    solver_rate, solver_loss = _solve_all(goal_optimizer._optimize_actions, fixtures)
+    print(
+        json.dumps(
+            {
+                "solves": len(fixtures),
+                "reference_solves_per_second": round(reference_rate, 1),
+                "closed_form_solves_per_second": round(solver_rate, 1),
+                "speedup": round(solver_rate / reference_rate, 1),
+                "reference_mean_normalized_loss": round(reference_loss, 4),
+                "closed_form_mean_normalized_loss": round(solver_loss, 4),
+            }
+        )
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
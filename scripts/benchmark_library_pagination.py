@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import argparse
+from datetime import datetime, timedelta, timezone
+import json
+from pathlib import Path
+import random
+import sqlite3
+import sys
+import time
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from helpers.keyset_pagination import LIBRARY_PAGE_SIZE, KeysetCursor  # noqa: E402
+
+
+def _library(items: int, seed: int) -> sqlite3.Connection:
+    rng = random.Random(seed)
+    conn = sqlite3.connect(":memory:")
+    conn.execute("create table worksheets (id text primary key, user_id text, title text, created_at text)")
+    conn.execute("create index idx_worksheets_owner_keyset on worksheets (user_id, created_at desc, id desc)")
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    rows = []
+    for idx in range(items):
+        # Bursts of saves within the same second, as bulk generation produces.
+        created_at = (start + timedelta(seconds=(idx // 3) * rng.randint(1, 600))).isoformat()
+        rows.append((f"{idx:08d}", "teacher-1", f"Worksheet {idx}", created_at))
+    conn.executemany("insert into worksheets values (?, ?, ?, ?)", rows)
+    conn.commit()
+    return conn
+
+
+def _offset_page(conn: sqlite3.Connection, page: int, page_size: int) -> list[tuple]:
+    # Previous shape: the listing grows by re-reading everything before the page.
+    return conn.execute(
+        "select id, title, created_at from worksheets where user_id = ? "
+        "order by created_at desc, id desc limit ? offset ?",
+        ("teacher-1", page_size, page * page_size),
+    ).fetchall()
+
+
+def _keyset_page(conn: sqlite3.Connection, token: str, page_size: int) -> tuple[list[tuple], str]:
+    cursor = KeysetCursor.from_token(token)
+    if cursor is None:
+        rows = conn.execute(
+            "select id, title, created_at from worksheets where user_id = ? "
+            "order by created_at desc, id desc limit ?",
+            ("teacher-1", page_size + 1),
+        ).fetchall()
+    else:
+        rows = conn.execute(
+            "select id, title, created_at from worksheets where user_id = ? "
+            "and created_at <= ? and (created_at < ? or (created_at = ? and id < ?)) "
+            "order by created_at desc, id desc limit ?",
+            ("teacher-1", cursor.created_at, cursor.created_at, cursor.created_at, cursor.id, page_size + 1),
+        ).fetchall()
+    if len(rows) <= page_size:
+        return rows, ""
+    rows = rows[:page_size]
+    return rows, KeysetCursor(created_at=rows[-1][2], id=rows[-1][0]).token()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark library paging: per-page latency by depth, OFFSET vs keyset.")
+    parser.add_argument("--items", type=int, default=10_000)
+    parser.add_argument("--page-size", type=int, default=LIBRARY_PAGE_SIZE)
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    conn = _library(max(1, args.items), args.seed)
+    page_size = max(1, args.page_size)
+    tokens = [""]
+    visited: list[str] = []
+    while True:
+        rows, token = _keyset_page(conn, tokens[-1], page_size)
+        visited.extend(row[0] for row in rows)
+        if not token:
+            break
+        tokens.append(token)
+    if len(visited) != len(set(visited)) or len(visited) != args.items:
+        raise SystemExit("keyset walk skipped or repeated rows")
+
+    last = len(tokens) - 1
+    for page in sorted({0, last // 4, last // 2, (3 * last) // 4, last}):
+        timings = {"offset": 0.0, "keyset": 0.0}
+        for _ in range(max(1, args.repeats)):
+            started = time.perf_counter()
+            _offset_page(conn, page, page_size)
+            timings["offset"] += time.perf_counter() - started
+            started = time.perf_counter()
+            _keyset_page(conn, tokens[page], page_size)
+            timings["keyset"] += time.perf_counter() - started
+        repeats = max(1, args.repeats)
+        print(
+            json.dumps(
+                {
+                    "items": args.items,
+                    "page": page + 1,
+                    "offset_ms": round(1000 * timings["offset"] / repeats, 3),
+                    "keyset_ms": round(1000 * timings["keyset"] / repeats, 3),
+                }
+            ),
+            flush=True,
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+import random
+import sys
+import time
+from unittest.mock import patch
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from helpers import material_recommendations  # noqa: E402
+from helpers.minhash_lsh import MinHashLSHIndex  # noqa: E402
+
+
+_TOPIC_WORDS = [
+    "animals", "farm", "wild", "past", "simple", "present", "perfect", "fractions", "decimals", "water",
+    "cycle", "photosynthesis", "family", "routines", "weather", "seasons", "food", "drinks", "verbs",
+    "comparatives", "multiplication", "volcanoes", "solar", "system", "body", "parts", "clothes",
+    "shopping", "time", "plants", "habitats", "geometry", "angles", "poetry", "holidays", "sports",
+]
+
+
+def _synthetic_pool(size: int, seed: int) -> list[dict]:
+    rng = random.Random(seed)
+    pool = []
+    for idx in range(size):
+        topic = " ".join(rng.sample(_TOPIC_WORDS, 2)) + f" {idx % 997}"
+        row = {
+            "id": idx,
+            "title": f"{topic.title()} worksheet",
+            "topic": topic,
+            "subject": rng.choice(["English", "Science", "Math"]),
+            "learner_stage": rng.choice(["upper_primary", "lower_secondary"]),
+            "level_or_band": rng.choice(["A1", "A2", "B1", "B2"]),
+            "worksheet_type": rng.choice(["multiple_choice", "true_false", "matching", "short_answer"]),
+        }
+        pool.append(
+            {
+                "kind": "worksheet",
+                "source": "community",
+                "row": row,
+                "search_text": material_recommendations._resource_search_text(row, "worksheet"),
+                "tokens": material_recommendations._resource_tokens(row, "worksheet"),
+            }
+        )
+    return pool
+
+
+def _query_seconds(pool: list[dict], index, requests: list[dict]) -> float:
+    cached = {"resources": pool, "index": index}
+    with patch.object(material_recommendations, "_load_material_pool_cached", return_value=cached), patch.object(
+        material_recommendations, "resource_affinity_score", return_value=(0.0, {})
+    ):
+        started = time.perf_counter()
+        for request in requests:
+            material_recommendations.find_similar_materials(request, limit=3)
+    return (time.perf_counter() - started) / max(1, len(requests))
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark reuse-gate lookups: linear scan vs MinHash/LSH candidates.")
+    parser.add_argument("--sizes", default="10000,25000")
+    parser.add_argument("--queries", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    requests = [
+        material_recommendations.build_generation_request(
+            kind="worksheet",
+            subject="English",
+            learner_stage="upper_primary",
+            level_or_band="A2",
+            topic=" ".join(rng.sample(_TOPIC_WORDS, 2)),
+            worksheet_type="multiple_choice",
+        )
+        for _ in range(max(1, args.queries))
+    ]
+    for size in [int(part) for part in args.sizes.split(",") if part.strip()]:
+        pool = _synthetic_pool(size, args.seed)
+        started = time.perf_counter()
+        index = MinHashLSHIndex([material_recommendations._resource_shingles(item["row"]) for item in pool])
+        build_seconds = time.perf_counter() - started
+        candidates = sum(len(index.query(material_recommendations._request_shingles(request))) for request in requests)
+        linear = _query_seconds(pool, None, requests)
+        indexed = _query_seconds(pool, index, requests)
+        print(
+            json.dumps(
+                {
+                    "pool_size": size,
+                    "index_build_seconds": round(build_seconds, 3),
+                    "mean_candidates": round(candidates / len(requests), 1),
+                    "linear_query_seconds": round(linear, 4),
+                    "lsh_query_seconds": round(indexed, 4),
+                    "speedup": round(linear / indexed, 1) if indexed else None,
+                }
+            )
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+import random
+import sys
+import time
+from unittest.mock import patch
+from zoneinfo import ZoneInfo
+
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from helpers import schedule  # noqa: E402
+
+_TZ_NAME = "Europe/Istanbul"
+
+
+def _fixtures(schedules: int, overrides: int, seed: int, now: pd.Timestamp) -> tuple[pd.DataFrame, pd.DataFrame]:
+    rng = random.Random(seed)
+    now_naive = now.tz_localize(None)
+    sched = pd.DataFrame(
+        {
+            "id": list(range(1, schedules + 1)),
+            "student": [f"Student {rng.randint(1, 300)}" for _ in range(schedules)],
+            "weekday": [rng.randint(0, 6) for _ in range(schedules)],
+            "time": [f"{rng.randint(7, 21):02d}:{rng.choice([0, 15, 30, 45]):02d}" for _ in range(schedules)],
+            "duration_minutes": [60] * schedules,
+            "active": [rng.random() > 0.2 for _ in range(schedules)],
+            "timezone": [_TZ_NAME] * schedules,
+        }
+    )
+    # Original dates stay in the past so the legacy scan (which ignores
+    # cancelled slots) answers the same question.
+    ov = pd.DataFrame(
+        {
+            "id": list(range(1, overrides + 1)),
+            "student": [f"Student {rng.randint(1, 300)}" for _ in range(overrides)],
+            "original_date": [(now_naive - pd.Timedelta(days=rng.randint(1, 400))).normalize() for _ in range(overrides)],
+            "new_datetime": [now_naive + pd.Timedelta(minutes=rng.randint(-90 * 24 * 60, 90 * 24 * 60)) for _ in range(overrides)],
+            "duration_minutes": [60] * overrides,
+            "status": [rng.choice(["scheduled", "scheduled", "cancelled"]) for _ in range(overrides)],
+        }
+    )
+    return sched, ov
+
+
+# Previous home indicator: two iterrows passes over every schedule and override.
+def _legacy_next_lesson(sched: pd.DataFrame, ov: pd.DataFrame, now_ts: pd.Timestamp):
+    candidates = []
+    if ov is not None and not ov.empty and "new_datetime" in ov.columns:
+        tmp = ov.copy()
+        tmp["status"] = tmp.get("status", "").astype(str).str.lower()
+        tmp = tmp[tmp["status"] == "scheduled"].copy()
+        tmp["new_datetime"] = pd.to_datetime(tmp["new_datetime"], errors="coerce")
+        tmp = tmp[tmp["new_datetime"].notna()].copy()
+        tmp["new_datetime"] = tmp["new_datetime"].dt.tz_localize(None)
+        upcoming = tmp[tmp["new_datetime"] >= now_ts].sort_values("new_datetime")
+        for _, r in upcoming.head(20).iterrows():
+            candidates.append(pd.Timestamp(r["new_datetime"]).to_pydatetime())
+    if sched is not None and not sched.empty:
+        s = sched[sched.get("active", True) == True].copy()
+        for _, r in s.iterrows():
+            try:
+                wd = int(r.get("weekday", 0))
+                hh, mm = [int(x) for x in str(r.get("time", "00:00")).strip().split(":")[:2]]
+                days_ahead = (wd - now_ts.weekday()) % 7
+                dt = (now_ts + pd.Timedelta(days=days_ahead)).normalize() + pd.Timedelta(hours=hh, minutes=mm)
+                if dt < now_ts:
+                    dt = dt + pd.Timedelta(days=7)
+                candidates.append(dt.to_pydatetime())
+            except Exception:
+                continue
+    return min(candidates) if candidates else None
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the home next-lesson lookup: iterrows scan vs vectorized index.")
+    parser.add_argument("--schedules", type=int, default=1000)
+    parser.add_argument("--overrides", type=int, default=2000)
+    parser.add_argument("--renders", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    now = pd.Timestamp.now(tz=ZoneInfo(_TZ_NAME)).floor("min")
+    sched, ov = _fixtures(max(1, args.schedules), max(1, args.overrides), args.seed, now)
+    freezes = pd.DataFrame(columns=["student", "start_date", "end_date", "active"])
+    renders = max(1, args.renders)
+
+    started = time.perf_counter()
+    for _ in range(renders):
+        legacy = _legacy_next_lesson(sched, ov, now.tz_localize(None))
+    legacy_s = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for _ in range(renders):
+        rebuilt = schedule._next_lesson_from_frames(sched, ov, freezes, now)
+    rebuild_s = time.perf_counter() - started
+
+    schedule._NEXT_LESSON_INDEX.clear()
+    with patch.object(schedule, "get_current_user_id", return_value="teacher-1"), patch.object(
+        schedule, "get_app_tz", return_value=ZoneInfo(_TZ_NAME)
+    ), patch.object(schedule, "now_local", return_value=now.to_pydatetime()), patch.object(
+        schedule, "load_schedules", return_value=sched
+    ), patch.object(schedule, "load_overrides", return_value=ov), patch.object(schedule, "load_schedule_freezes", return_value=freezes):
+        started = time.perf_counter()
+        for _ in range(renders):
+            indexed = schedule.next_lesson_datetime()
+        indexed_s = time.perf_counter() - started
+    schedule._NEXT_LESSON_INDEX.clear()
+
+    identical = legacy is not None and pd.Timestamp(legacy) == rebuilt == indexed
+    print(
+        json.dumps(
+            {
+                "schedules": len(sched),
+                "overrides": len(ov),
+                "renders": renders,
+                "iterrows_ms_per_render": round(1000 * legacy_s / renders, 3),
+                "vectorized_ms_per_render": round(1000 * rebuild_s / renders, 3),
+                "indexed_ms_per_render": round(1000 * indexed_s / renders, 3),
+                "next_lesson": str(rebuilt),
+                "identical": bool(identical),
+            }
+        ),
+        flush=True,
+    )
+    return 0 if identical else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+import random
+import sys
+import time
+
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from helpers.analytics import (  # noqa: E402
+    _build_income_analytics_from_payments,
+    _build_income_analytics_from_rollups,
+    _normalize_subject_combo,
+)
+from helpers.payment_rollups import rollup_payments  # noqa: E402
+from helpers.ui_components import to_dt_naive, ts_today_naive  # noqa: E402
+
+
+def _payments(count: int, seed: int) -> pd.DataFrame:
+    rng = random.Random(seed)
+    today = ts_today_naive()
+    subjects = ["English", "Spanish", "English,Spanish", "Math", "Physics", ""]
+    return pd.DataFrame(
+        {
+            "student": [f"Student {rng.randint(1, 400)}" for _ in range(count)],
+            "payment_date": [(today - pd.Timedelta(days=rng.randint(0, 365 * 6))).strftime("%Y-%m-%d") for _ in range(count)],
+            "paid_amount": [rng.choice([500, 750, 1200, 2000]) for _ in range(count)],
+            "number_of_lesson": [rng.choice([4, 8, 12]) for _ in range(count)],
+            "modality": [rng.choice(["Online", "Offline"]) for _ in range(count)],
+            "subject": [rng.choice(subjects) for _ in range(count)],
+        }
+    )
+
+
+def _legacy_goal_ytd(payments: pd.DataFrame, year: int) -> float:
+    # Previous goal snapshot: its own pass over the year's payments.
+    p = payments[["payment_date", "paid_amount"]].copy()
+    p["payment_date"] = to_dt_naive(p["payment_date"], utc=True)
+    p["paid_amount"] = pd.to_numeric(p["paid_amount"], errors="coerce").fillna(0.0).astype(float)
+    p = p.dropna(subset=["payment_date"])
+    return float(p.loc[p["payment_date"].dt.year == year, "paid_amount"].sum())
+
+
+def _legacy_subject_keys(payments: pd.DataFrame) -> pd.Series:
+    # Previous subject normalization: one regex split per payment row.
+    return payments["subject"].fillna("").astype(str).str.strip().apply(_normalize_subject_combo)
+
+
+def _same_frame(left: pd.DataFrame, right: pd.DataFrame) -> bool:
+    # Integer amounts stay int64 on the payments path; rollups are floats.
+    try:
+        pd.testing.assert_frame_equal(left, right, check_dtype=False)
+    except AssertionError:
+        return False
+    return True
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark income analytics and year-goal totals: full payments vs daily rollups.")
+    parser.add_argument("--payments", type=int, default=50_000)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    payments = _payments(max(1, args.payments), args.seed)
+    year = int(ts_today_naive().year)
+    repeats = max(1, args.repeats)
+
+    started = time.perf_counter()
+    rollups = rollup_payments(payments.copy())
+    backfill_s = time.perf_counter() - started
+
+    timings = {"payments": 0.0, "rollups": 0.0}
+    for _ in range(repeats):
+        started = time.perf_counter()
+        _legacy_subject_keys(payments)
+        legacy = _build_income_analytics_from_payments(payments.copy(), group="monthly")
+        legacy_ytd = _legacy_goal_ytd(payments, year)
+        timings["payments"] += time.perf_counter() - started
+
+        started = time.perf_counter()
+        rolled = _build_income_analytics_from_rollups(rollups, group="monthly")
+        rolled_ytd = float(rollups.loc[rollups["period"].dt.year == year, "paid_amount"].sum())
+        timings["rollups"] += time.perf_counter() - started
+
+    identical = (
+        legacy[0] == rolled[0]
+        and _same_frame(legacy[1], rolled[1])
+        and _same_frame(legacy[3], rolled[2])
+        and _same_frame(legacy[4], rolled[3])
+        and legacy_ytd == rolled_ytd
+    )
+    print(
+        json.dumps(
+            {
+                "payments": len(payments),
+                "rollup_rows": len(rollups),
+                "backfill_ms": round(1000 * backfill_s, 1),
+                "payments_ms": round(1000 * timings["payments"] / repeats, 1),
+                "rollups_ms": round(1000 * timings["rollups"] / repeats, 1),
+                "identical": bool(identical),
+            }
+        ),
+        flush=True,
+    )
+    return 0 if identical else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
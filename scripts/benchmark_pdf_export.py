@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+import sys
+import time
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from helpers.branding import _default_branding  # noqa: E402
+from helpers.pdf_export import PDFBytesCache, export_pdfs_batch  # noqa: E402
+
+
+def _sample_worksheet(index: int) -> dict:
+    return {
+        "title": f"Animals and habitats #{index}",
+        "worksheet_type": "multiple_choice",
+        "instructions": "Choose the correct answer for each question.",
+        "plan_language": "en",
+        "student_material_language": "en",
+        "vocabulary_bank": ["habitat", "desert", "forest", "ocean", "predator", "prey"],
+        "multiple_choice_items": [
+            {
+                "stem": f"Worksheet {index}, question {item + 1}: where does animal {item} live?",
+                "options": ["In the desert", "In the forest", "In the ocean", "In the city"],
+            }
+            for item in range(12)
+        ],
+        "answer_key": ["In the forest"] * 12,
+        "teacher_notes": "Review habitat vocabulary before starting.",
+    }
+
+
+def _worksheet_jobs(count: int) -> list[tuple[str, dict]]:
+    return [
+        (
+            "worksheet",
+            {
+                "ws": _sample_worksheet(index),
+                "subject": "english",
+                "topic": "animals",
+                "ws_type": "multiple_choice",
+                "learner_stage": "upper_primary",
+                "level_or_band": "A2",
+                "student_only": True,
+            },
+        )
+        for index in range(count)
+    ]
+
+
+def _timed(label: str, count: int, fn) -> float:
+    started = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - started
+    print(f"{label:<28} {elapsed:8.3f}s  {count / elapsed if elapsed else float('inf'):8.1f} docs/s")
+    return elapsed
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark batch worksheet PDF export and the PDF bytes cache.")
+    parser.add_argument("--count", type=int, default=50)
+    parser.add_argument("--workers", type=int, default=0, help="Process pool size (0 = CPU count).")
+    args = parser.parse_args(argv)
+
+    jobs = _worksheet_jobs(max(1, args.count))
+    branding = _default_branding()
+    workers = args.workers or None
+
+    serial = _timed(
+        "serial (1 process)",
+        len(jobs),
+        lambda: export_pdfs_batch(jobs, branding=branding, ui_lang="en", max_workers=1, cache=PDFBytesCache()),
+    )
+    cache = PDFBytesCache()
+    pooled = _timed(
+        "process pool",
+        len(jobs),
+        lambda: export_pdfs_batch(jobs, branding=branding, ui_lang="en", max_workers=workers, cache=cache),
+    )
+    repeated = _timed(
+        "repeated download (cached)",
+        len(jobs),
+        lambda: export_pdfs_batch(jobs, branding=branding, ui_lang="en", max_workers=workers, cache=cache),
+    )
+
+    print(f"pool speedup vs serial:     {serial / pooled:6.2f}x")
+    print(f"cached speedup vs pool:     {pooled / max(repeated, 1e-9):6.1f}x")
+    print(f"cache: {cache.size()} entries, {cache.total_bytes() / 1024:.0f} KiB")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
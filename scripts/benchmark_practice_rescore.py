@@ -0,0 +1,228 @@
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+import random
+import re
+import sys
+import time
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from core.i18n import t  # noqa: E402
+from helpers import practice_engine as pe  # noqa: E402
+
+
+# Previous evaluator: both sides normalized from scratch on every check.
+def _legacy_normalize_answer(s: str) -> str:
+    text = (
+        str(s or "")
+        .replace("’", "'")
+        .replace("‘", "'")
+        .replace("“", '"')
+        .replace("”", '"')
+        .replace("—", "-")
+        .replace("–", "-")
+    )
+    text = pe._fold_text(text).lower()
+    text = re.sub(r"[^\w\s'/-]", " ", text, flags=re.UNICODE)
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def _legacy_normalize_error_correction_answer(s: str) -> str:
+    text = pe._fold_text(str(s or "").strip()).lower()
+    text = (
+        text.replace("’", "'")
+        .replace("‘", "'")
+        .replace("“", '"')
+        .replace("”", '"')
+        .replace("—", "-")
+        .replace("–", "-")
+    )
+    text = re.sub(r"\s+", " ", text)
+    text = re.sub(r"\s+([,;:.!?])", r"\1", text)
+    return re.sub(r"[.!?]+$", "", text).strip()
+
+
+def _legacy_answer_words(s: str) -> set[str]:
+    stop = {
+        "a", "an", "the", "is", "are", "was", "were", "be", "been", "being",
+        "it", "its", "to", "of", "in", "on", "at", "for", "and", "or", "but",
+        "by", "as", "with", "from", "that", "this", "also", "very", "than",
+        "not", "no", "do", "does", "did", "has", "have", "had", "will",
+        "can", "could", "would", "should", "may", "might",
+    }
+    return set(re.findall(r"[a-z0-9]+", _legacy_normalize_answer(s))) - stop
+
+
+def _legacy_canonical_true_false(value: str) -> str:
+    text = _legacy_normalize_answer(value)
+    truthy = {_legacy_normalize_answer(t("quick_exam_true_label")), "true", "t", "yes", "dogru", "doğru", "verdadero"}
+    falsy = {_legacy_normalize_answer(t("quick_exam_false_label")), "false", "f", "no", "yanlis", "yanlış", "falso"}
+    if text in truthy:
+        return "true"
+    if text in falsy:
+        return "false"
+    return text
+
+
+def _legacy_check_answer(ex_type: str, student: str, correct) -> bool:
+    s = _legacy_normalize_answer(student)
+    if not s:
+        return False
+    if ex_type == "true_false":
+        s = _legacy_canonical_true_false(student)
+        c = _legacy_canonical_true_false(pe._comparison_answer_text(correct))
+    else:
+        c = _legacy_normalize_answer(pe._comparison_answer_text(correct))
+    if not c:
+        return False
+    if ex_type in ("multiple_choice", "true_false", "matching"):
+        return s == c
+    if ex_type == "error_correction":
+        correct_exact = _legacy_normalize_error_correction_answer(pe._comparison_answer_text(correct))
+        if not correct_exact:
+            return False
+        return _legacy_normalize_error_correction_answer(student) == correct_exact
+    if s == c or c in s or s in c:
+        return True
+    c_words = _legacy_answer_words(c)
+    if c_words:
+        s_words = _legacy_answer_words(s)
+        if len(c_words & s_words) / len(c_words) >= 0.55:
+            return True
+    return False
+
+
+def legacy_evaluate_answer(ex_type: str, student: str, correct) -> dict:
+    if ex_type == "writing_prompt":
+        return pe._writing_prompt_feedback(student, correct)
+    if ex_type == "word_search_vocab":
+        return pe._wordsearch_feedback(student, correct)
+    is_correct = _legacy_check_answer(ex_type, student, correct)
+    return {
+        "is_correct": is_correct,
+        "score": 1.0 if is_correct else 0.0,
+        "expected": pe._display_answer_text(correct),
+        "feedback_lines": [],
+    }
+
+
+def resource_fixture() -> dict:
+    return {
+        "exercises": [
+            {
+                "type": "multiple_choice",
+                "questions": [{"stem": f"Q{i}", "options": ["went", "goes", "gone"]} for i in range(5)],
+                "answers": ["went", "B) goes", "gone", "went", "goes"],
+            },
+            {"type": "true_false", "questions": ["a", "b", "c", "d"], "answers": ["True", "False", "Doğru", "Falso"]},
+            {
+                "type": "fill_in_blank",
+                "questions": ["a", "b", "c", "d", "e"],
+                "answers": ["have been", "since", "for ages", "“already”", "haven’t seen"],
+            },
+            {
+                "type": "error_correction",
+                "questions": ["a", "b", "c"],
+                "answers": ["She doesn't like coffee.", "They were at home!", "He has lived here since 2019."],
+            },
+            {
+                "type": "matching",
+                "questions": [{"left": "cat", "right": "gato"}, {"left": "dog", "right": "perro"}, {"left": "bird", "right": "pájaro"}],
+                "answers": [{"left": "cat", "right": "gato"}, {"left": "dog", "right": "perro"}, {"left": "bird", "right": "pájaro"}],
+            },
+            {
+                "type": "short_answer",
+                "questions": ["a", "b"],
+                "answers": ["Because the river flooded the village in spring", "Photosynthesis turns light into chemical energy"],
+            },
+            {"type": "writing_prompt", "questions": ["Describe your weekend."], "answers": ["weekend family park football dinner"]},
+            {"type": "word_search_vocab", "questions": [{}], "answers": [["APPLE", "PEAR", "GRAPE", "LEMON"]]},
+        ]
+    }
+
+
+_STUDENT_VARIANTS = {
+    "multiple_choice": ["went", "goes", "gone", "Went ", "", "go"],
+    "true_false": ["true", "false", "Yes", "no", "verdadero", "yanlis", "maybe", ""],
+    "fill_in_blank": ["have been", "Since", "for ages!", "already", "havent seen", "haven't seen", "", "has been"],
+    "error_correction": ["She doesn't like coffee", "she doesn’t like coffee.", "They were at home", "He lived here", ""],
+    "matching": ["gato", "Perro", "pajaro", "pájaro", "cat", ""],
+    "short_answer": [
+        "the river flooded the village",
+        "It flooded in spring because of the river",
+        "light becomes chemical energy via photosynthesis",
+        "I don't know",
+        "",
+    ],
+    "writing_prompt": [
+        "On my weekend I went to the park with my family. We played football. Then we had dinner together.",
+        "Weekend.",
+        "",
+    ],
+    "word_search_vocab": ['["APPLE", "PEAR"]', '["APPLE", "PEAR", "GRAPE", "LEMON"]', "[]", ""],
+}
+
+
+def session_answers(exercise_data: dict, rng: random.Random) -> list[tuple[int, int, str]]:
+    answers = []
+    for ex_idx, exercise in enumerate(exercise_data["exercises"]):
+        variants = _STUDENT_VARIANTS[exercise["type"]]
+        for q_idx in range(len(exercise["questions"])):
+            answers.append((ex_idx, q_idx, rng.choice(variants)))
+    return answers
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark rescoring stored practice sessions: legacy evaluator vs compiled answer key.")
+    parser.add_argument("--sessions", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    exercise_data = resource_fixture()
+    rng = random.Random(args.seed)
+    sessions = [session_answers(exercise_data, rng) for _ in range(max(1, args.sessions))]
+    exercises = exercise_data["exercises"]
+
+    started = time.perf_counter()
+    legacy = []
+    for answers in sessions:
+        for ex_idx, q_idx, student in answers:
+            ex_type = exercises[ex_idx]["type"]
+            correct = exercises[ex_idx]["answers"][q_idx]
+            evaluation = legacy_evaluate_answer(ex_type, student, correct)
+            legacy.append((evaluation["is_correct"], evaluation["score"], pe._display_answer_text(correct)))
+    legacy_s = time.perf_counter() - started
+
+    started = time.perf_counter()
+    answer_key = pe.compile_answer_key(exercise_data)
+    compiled = []
+    for answers in sessions:
+        for ex_idx, q_idx, student in answers:
+            entry = answer_key.answer(ex_idx, q_idx)
+            evaluation = entry.evaluate(student)
+            compiled.append((evaluation["is_correct"], evaluation["score"], entry.display))
+    compiled_s = time.perf_counter() - started
+
+    print(
+        json.dumps(
+            {
+                "sessions": len(sessions),
+                "answers": len(legacy),
+                "legacy_s": round(legacy_s, 3),
+                "compiled_s": round(compiled_s, 3),
+                "speedup": round(legacy_s / compiled_s, 2) if compiled_s else None,
+                "identical": legacy == compiled,
+            }
+        ),
+        flush=True,
+    )
+    return 0 if legacy == compiled else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
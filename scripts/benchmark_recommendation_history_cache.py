@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import argparse
+from datetime import datetime, timedelta, timezone
+import json
+from pathlib import Path
+import random
+import sys
+import time
+from unittest.mock import patch
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from core import database  # noqa: E402
+from helpers import recommendation_models as rm  # noqa: E402
+from helpers import student_recommendation_ml as srm  # noqa: E402
+
+
+class _Result:
+    def __init__(self, data):
+        self.data = data
+
+
+class _Query:
+    """Accepts any PostgREST builder chain; the patched executor answers it."""
+
+    def __getattr__(self, _name):
+        return lambda *_args, **_kwargs: self
+
+
+class _Client:
+    def table(self, _name):
+        return _Query()
+
+
+def _history_source(counter: dict[str, int]):
+    started = datetime(2026, 3, 1, tzinfo=timezone.utc)
+    practice = [
+        {
+            "source_type": "worksheet",
+            "subject": "english",
+            "topic": f"topic {idx % 7}",
+            "level": "A2",
+            "score_pct": 40 + idx % 60,
+            "status": "completed",
+            "created_at": (started + timedelta(hours=idx)).isoformat(),
+        }
+        for idx in range(60)
+    ]
+
+    def execute(_query, *, function_name: str, source_name: str):
+        counter["queries"] += 1
+        return _Result(practice if source_name == "practice_sessions" else [])
+
+    return execute
+
+
+def _events(students: int, events: int, impression_share: float, seed: int) -> list[tuple[str, str]]:
+    rng = random.Random(seed)
+    # A few students scroll far more than the rest, as on a real feed.
+    weights = [1.0 / (rank + 1) for rank in range(students)]
+    student_ids = [f"student-{idx}" for idx in range(students)]
+    return [
+        (rng.choices(student_ids, weights)[0], "impression" if rng.random() < impression_share else "view")
+        for _ in range(events)
+    ]
+
+
+def _simulate(events: list[tuple[str, str]], mode: str) -> dict[str, float]:
+    counter = {"queries": 0}
+    rm._load_student_history_rows_cached.clear()
+    srm._evaluate_student_recommendation_pipeline_cached.clear()
+    rm._STUDENT_ACTIVITY_APPENDS.clear()
+    rm._STUDENT_HISTORY_GENERATIONS.clear()
+    requests = 0
+    started = time.perf_counter()
+    with patch.object(rm, "get_sb", return_value=_Client()), patch.object(
+        rm, "_execute_recommendation_query", _history_source(counter)
+    ):
+        for student_id, event in events:
+            if event == "view":
+                requests += 1
+                srm.evaluate_student_recommendation_pipeline(student_id, {})
+                continue
+            row = {
+                "activity_type": "student_recommendation_impression",
+                "meta_json": {"surface": "home"},
+                "created_at": datetime.now(timezone.utc).isoformat(),
+            }
+            if mode == "legacy":
+                # Previous behaviour: every impression cleared every student's entries.
+                rm._load_student_history_rows_cached.clear()
+                srm._evaluate_student_recommendation_pipeline_cached.clear()
+            else:
+                rm.append_student_recommendation_activity(student_id, [row])
+    loads = counter["queries"] // 3
+    return {
+        "history_requests": requests,
+        "history_loads": loads,
+        "hit_rate": round(1.0 - loads / requests, 4) if requests else 0.0,
+        "elapsed_s": round(time.perf_counter() - started, 3),
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Simulate many students viewing feeds and logging impressions; compare history cache hit rates.")
+    parser.add_argument("--students", type=int, default=40)
+    parser.add_argument("--events", type=int, default=800)
+    parser.add_argument("--impression-share", type=float, default=0.4)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    database.set_shared_cache_backend(None)
+    events = _events(max(1, args.students), max(1, args.events), args.impression_share, args.seed)
+    legacy = _simulate(events, "legacy")
+    scoped = _simulate(events, "scoped")
+    print(
+        json.dumps(
+            {
+                "students": args.students,
+                "events": len(events),
+                "legacy": legacy,
+                "scoped": scoped,
+                "loader_calls_avoided": legacy["history_loads"] - scoped["history_loads"],
+            }
+        ),
+        flush=True,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing
+from pathlib import Path
+import resource
+import sys
+import time
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux.
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+
+
+def _run_case(n_rows: int, dims: int, top_k: int, method: str, queue) -> None:
+    import numpy as np
+
+    from helpers.resource_affinity_unsupervised_eval import _top_k_cosine_neighbors
+
+    vectors = np.random.default_rng(n_rows).normal(size=(n_rows, dims))
+    baseline_rss = _peak_rss_mb()
+    started = time.perf_counter()
+    if method == "blocked":
+        _top_k_cosine_neighbors(vectors, top_k)
+    else:
+        from sklearn.metrics.pairwise import cosine_similarity
+
+        sim = cosine_similarity(vectors)
+        for i in range(n_rows):
+            order = np.argsort(-sim[i])
+            [int(j) for j in order[: top_k + 1] if int(j) != i][:top_k]
+    queue.put(
+        {
+            "method": method,
+            "resources": n_rows,
+            "seconds": round(time.perf_counter() - started, 3),
+            "peak_rss_mb": round(_peak_rss_mb(), 1),
+            "rss_growth_mb": round(_peak_rss_mb() - baseline_rss, 1),
+        }
+    )
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the resource-affinity top-k neighbour search.")
+    parser.add_argument("--sizes", default="5000,20000,50000")
+    parser.add_argument("--dims", type=int, default=128, help="Embedding width (the SVD representation is ~128).")
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument(
+        "--full-matrix-max",
+        type=int,
+        default=20000,
+        help="Largest size at which the previous N x N implementation is also timed.",
+    )
+    args = parser.parse_args(argv)
+
+    ctx = multiprocessing.get_context("spawn")
+    results = []
+    for n_rows in [int(part) for part in args.sizes.split(",") if part.strip()]:
+        methods = ["blocked"] + (["full_matrix"] if n_rows <= args.full_matrix_max else [])
+        for method in methods:
+            # One process per case so peak RSS is not inherited from earlier runs.
+            queue = ctx.Queue()
+            proc = ctx.Process(target=_run_case, args=(n_rows, args.dims, args.top_k, method, queue))
+            proc.start()
+            row = queue.get()
+            proc.join()
+            results.append(row)
+            print(json.dumps(row))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,238 @@
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+import random
+import sys
+import time
+from unittest.mock import patch
+
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from core import database  # noqa: E402
+from core.database import LESSON_NOTE_DEFAULT_TOKEN, clear_cache_domains, load_table_filtered  # noqa: E402
+from helpers import history  # noqa: E402
+from helpers.history import _display_lesson_note_for_table  # noqa: E402
+from helpers.language import translate_modality_value  # noqa: E402
+from helpers.ui_components import to_dt_naive  # noqa: E402
+
+
+class _Result:
+    def __init__(self, data):
+        self.data = data
+
+
+class _Query:
+    def __init__(self, client, rows):
+        self.client = client
+        self.rows = rows
+        self.columns = None
+        self.bounds = None
+        self.sort = None
+
+    def select(self, columns):
+        self.columns = [c.strip() for c in str(columns).split(",")] if columns != "*" else None
+        return self
+
+    def eq(self, column, value):
+        self.rows = [row for row in self.rows if row.get(column) == value]
+        return self
+
+    def order(self, column, desc=False):
+        self.sort = (column, desc)
+        return self
+
+    def range(self, start, end):
+        self.bounds = (start, end)
+        return self
+
+    def limit(self, _count):
+        return self
+
+    def execute(self):
+        self.client.queries += 1
+        if self.client.latency_s:
+            time.sleep(self.client.latency_s)
+        rows = self.rows
+        if self.sort:
+            rows = sorted(rows, key=lambda row: str(row.get(self.sort[0]) or ""), reverse=self.sort[1])
+        if self.bounds:
+            rows = rows[self.bounds[0]:self.bounds[1] + 1]
+        if self.columns:
+            rows = [{c: row.get(c) for c in self.columns} for row in rows]
+        return _Result(rows)
+
+
+class _Client:
+    def __init__(self, tables: dict[str, list[dict]], latency_ms: float):
+        self.tables = tables
+        self.latency_s = latency_ms / 1000.0
+        self.queries = 0
+
+    def table(self, name):
+        return _Query(self, list(self.tables.get(name, [])))
+
+
+def _tables(students: int, lessons: int, seed: int) -> dict[str, list[dict]]:
+    rng = random.Random(seed)
+    today = pd.Timestamp.today().normalize()
+    classes, payments = [], []
+    for idx in range(1, students + 1):
+        name = f"Student {idx}"
+        for n in range(lessons):
+            classes.append(
+                {
+                    "id": len(classes) + 1,
+                    "user_id": "teacher-1",
+                    "student": name,
+                    "number_of_lesson": rng.choice([1, 1, 2]),
+                    "lesson_date": (today - pd.Timedelta(days=n * 3)).strftime("%Y-%m-%dT10:00:00+00:00"),
+                    "modality": rng.choice(["Online", "Offline", "online "]),
+                    "note": rng.choice(["", LESSON_NOTE_DEFAULT_TOKEN, "Past simple", "Role play"]),
+                    "subject": rng.choice(["English", "Spanish"]),
+                }
+            )
+        for n in range(max(1, lessons // 30)):
+            payments.append(
+                {
+                    "id": len(payments) + 1,
+                    "user_id": "teacher-1",
+                    "student": name,
+                    "number_of_lesson": 30,
+                    "payment_date": (today - pd.Timedelta(days=n * 90)).strftime("%Y-%m-%d"),
+                    "paid_amount": 9000,
+                    "modality": "Online",
+                    "subject": "English",
+                    "package_start_date": (today - pd.Timedelta(days=n * 90)).strftime("%Y-%m-%d"),
+                    "package_expiry_date": None,
+                    "lesson_adjustment_units": 0,
+                    "package_normalized": False,
+                    "normalized_note": None,
+                    "normalized_at": None,
+                }
+            )
+    return {"classes": classes, "payments": payments}
+
+
+# Previous loader: wide table reads, Python-side student filter and row-wise apply on every view.
+def _legacy_student_history(student: str) -> tuple[pd.DataFrame, pd.DataFrame]:
+    classes = load_table_filtered(
+        "classes", columns="id,student,number_of_lesson,lesson_date,modality,note,subject",
+        filters=[("eq", "student", student)], limit=2000, page_size=500, order_by="lesson_date", order_desc=True,
+    )
+    payments = load_table_filtered(
+        "payments",
+        columns="id,student,number_of_lesson,payment_date,paid_amount,modality,subject,package_start_date,package_expiry_date,"
+        "lesson_adjustment_units,package_normalized,normalized_note,normalized_at",
+        filters=[("eq", "student", student)], limit=2000, page_size=500, order_by="payment_date", order_desc=True,
+    )
+    lessons_df = classes[classes["student"].astype(str).str.strip() == student].copy()
+    payments_df = payments[payments["student"].astype(str).str.strip() == student].copy()
+    lessons_df["lesson_date"] = to_dt_naive(lessons_df["lesson_date"], utc=True)
+    payments_df["payment_date"] = to_dt_naive(payments_df["payment_date"], utc=True)
+    payments_df["package_start_date"] = to_dt_naive(payments_df["package_start_date"], utc=True)
+    payments_df["package_expiry_date"] = to_dt_naive(payments_df["package_expiry_date"], utc=True)
+    lessons_df["number_of_lesson"] = pd.to_numeric(lessons_df["number_of_lesson"], errors="coerce").fillna(0).astype(int)
+    payments_df["number_of_lesson"] = pd.to_numeric(payments_df["number_of_lesson"], errors="coerce").fillna(0).astype(int)
+    payments_df["paid_amount"] = pd.to_numeric(payments_df["paid_amount"], errors="coerce").fillna(0.0)
+    lessons_df = lessons_df.sort_values(["lesson_date", "id"], ascending=[False, False]).reset_index(drop=True)
+    payments_df = payments_df.sort_values(["payment_date", "id"], ascending=[False, False]).reset_index(drop=True)
+    lessons_df = lessons_df.rename(columns={"id": "lesson_id", "number_of_lesson": "lessons"})[
+        ["lesson_id", "lesson_date", "lessons", "modality", "subject", "note"]
+    ]
+    payments_df = payments_df.rename(
+        columns={"id": "payment_id", "number_of_lesson": "lessons_paid", "lesson_adjustment_units": "adjustment_units"}
+    )[
+        ["payment_id", "payment_date", "lessons_paid", "paid_amount", "modality", "subject", "package_start_date",
+         "package_expiry_date", "adjustment_units", "package_normalized", "normalized_note", "normalized_at"]
+    ]
+    for frame, columns in ((lessons_df, ["lesson_date"]), (payments_df, ["payment_date", "package_start_date", "package_expiry_date"])):
+        for column in columns:
+            frame[column] = pd.to_datetime(frame[column], errors="coerce").dt.strftime("%Y-%m-%d")
+    lessons_df["modality"] = lessons_df["modality"].apply(translate_modality_value)
+    lessons_df["subject"] = lessons_df["subject"].fillna("").astype(str)
+    lessons_df["note"] = lessons_df["note"].apply(_display_lesson_note_for_table)
+    payments_df["modality"] = payments_df["modality"].apply(translate_modality_value)
+    payments_df["subject"] = payments_df["subject"].fillna("").astype(str)
+    return lessons_df, payments_df
+
+
+def _same(left: tuple[pd.DataFrame, pd.DataFrame], right: tuple[pd.DataFrame, pd.DataFrame]) -> bool:
+    try:
+        for a, b in zip(left, right):
+            pd.testing.assert_frame_equal(a.reset_index(drop=True), b.reset_index(drop=True), check_dtype=False)
+    except AssertionError:
+        return False
+    return True
+
+
+def _browse(loader, students: list[str], passes: int, mutate_after_pass: int) -> tuple[list[float], dict[str, tuple]]:
+    seen: dict[str, tuple] = {}
+    pass_seconds = []
+    for number in range(passes):
+        started = time.perf_counter()
+        for student in students:
+            seen[student] = loader(student)
+        pass_seconds.append(time.perf_counter() - started)
+        if number + 1 == mutate_after_pass:
+            # A lesson was logged: the same clear add_class performs.
+            clear_cache_domains("classes", "dashboard", "notifications")
+    return pass_seconds, seen
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark switching the student history view across many students.")
+    parser.add_argument("--students", type=int, default=50)
+    parser.add_argument("--lessons", type=int, default=300)
+    parser.add_argument("--passes", type=int, default=3)
+    parser.add_argument("--latency-ms", type=float, default=15.0)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    database.set_shared_cache_backend(None)
+    tables = _tables(max(1, args.students), max(1, args.lessons), args.seed)
+    students = [f"Student {idx}" for idx in range(1, max(1, args.students) + 1)]
+    results = {}
+    outputs = {}
+    for name, loader in (("legacy", _legacy_student_history), ("cached", history.show_student_history)):
+        client = _Client(tables, args.latency_ms)
+        database.clear_app_caches()
+        with patch.object(database, "get_sb", return_value=client), patch.object(history, "get_sb", return_value=client), patch.object(
+            database, "get_current_user_id", return_value="teacher-1"
+        ), patch.object(history, "get_current_user_id", return_value="teacher-1"), patch.object(
+            database, "_db_diagnostics_enabled", return_value=False
+        ):
+            pass_seconds, outputs[name] = _browse(loader, students, max(1, args.passes), mutate_after_pass=1)
+        views = len(students) * len(pass_seconds)
+        results[name] = {
+            "ms_per_view": round(1000 * sum(pass_seconds) / views, 2),
+            "warm_ms_per_view": round(1000 * pass_seconds[-1] / len(students), 2),
+            "queries": client.queries,
+        }
+    database.clear_app_caches()
+
+    identical = all(_same(outputs["legacy"][student], outputs["cached"][student]) for student in students)
+    print(
+        json.dumps(
+            {
+                "students": len(students),
+                "lessons_per_student": args.lessons,
+                "passes": args.passes,
+                "latency_ms": args.latency_ms,
+                "legacy": results["legacy"],
+                "cached": results["cached"],
+                "identical": bool(identical),
+            }
+        ),
+        flush=True,
+    )
+    return 0 if identical else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
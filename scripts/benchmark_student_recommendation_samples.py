@@ -0,0 +1,289 @@
+from __future__ import annotations
+
+import argparse
+from contextlib import ExitStack
+import json
+from pathlib import Path
+import random
+import sys
+import time
+from unittest.mock import patch
+
+import numpy as np
+import streamlit as st
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from helpers import recommendation_models, student_recommendation_ml  # noqa: E402
+from helpers.recommendation_models import (  # noqa: E402
+    _fit_linear_model,
+    _norm_key,
+    _norm_text,
+    _overlap_score,
+    _safe_float,
+    _tokenize,
+    normalize_subject,
+    topic_resource_alignment_features,
+)
+from helpers.student_recommendation_ml import (  # noqa: E402
+    _base_student_weights,
+    _target_to_label,
+    _train_weights,
+    build_student_recommendation_design,
+)
+
+_SUBJECTS = ("English", "english", "Spanish", "Math", "")
+_TOPICS = ("Past simple", "Present  perfect", "Irregular verbs", "Fractions", "Reading: short stories", "", None)
+_LEVELS = ("B1", "b1", "A2", "", None)
+_FIXTURE: dict = {"history": {}, "model": {}}
+
+
+def _timestamp(rng: random.Random) -> str:
+    return f"2026-{rng.randint(1, 9):02d}-{rng.randint(1, 28):02d}T{rng.randint(0, 23):02d}:00:00+00:00"
+
+
+def fixture_history(rows: int, seed: int) -> dict[str, list[dict]]:
+    """Practice, assignment and activity rows split 2:2:1, with the messy values real rows carry."""
+    rng = random.Random(seed)
+    practice_n, assignment_n = (2 * rows) // 5, (2 * rows) // 5
+    activity_n = max(0, rows - practice_n - assignment_n)
+    practice = [
+        {
+            "source_type": rng.choice(["worksheet", "Exam", "video", "flashcards", ""]),
+            "subject": rng.choice(_SUBJECTS),
+            "topic": rng.choice(_TOPICS),
+            "level": rng.choice(_LEVELS),
+            "score_pct": rng.choice([None, "", 0, 55, 72.5, 100, "88"]),
+            "completed_at": rng.choice([None, _timestamp(rng)]),
+            "created_at": _timestamp(rng),
+        }
+        for _ in range(practice_n)
+    ]
+    assignments = [
+        {
+            "assignment_type": rng.choice(["worksheet", "exam", "video", "lesson_plan_topic", "Worksheet"]),
+            "source_record_id": rng.choice([None, 0, *range(1, 400)]),
+            "learning_program_topic_id": rng.choice([None, 0, 1, 2, 3, 4, 5, 6]),
+            "subject_key": rng.choice(_SUBJECTS),
+            "topic": rng.choice(_TOPICS),
+            "status": rng.choice(["graded", "Completed", "started", "submitted", "assigned", "overdue", "archived"]),
+            "score_pct": rng.choice([None, 40, 90, "75"]),
+            "updated_at": rng.choice([None, "", _timestamp(rng)]),
+            "created_at": _timestamp(rng),
+        }
+        for _ in range(assignment_n)
+    ]
+    activity = [
+        {
+            "activity_type": rng.choice(["student_recommendation_impression", "student_recommendation_open", "page_view"]),
+            "meta_json": rng.choice(
+                [
+                    None,
+                    {
+                        "resource_kind": rng.choice(["worksheet", "exam", "video", ""]),
+                        "subject": rng.choice(_SUBJECTS),
+                        "topic": rng.choice(_TOPICS),
+                        "level": rng.choice(_LEVELS),
+                        "assigned_resource": rng.choice([True, False, None, 1]),
+                        "ml_blend_weight": rng.choice([None, 0.42, "0.5"]),
+                        "ml_score": rng.choice([None, 0.61, 0.2]),
+                    },
+                ]
+            ),
+            "created_at": _timestamp(rng),
+        }
+        for _ in range(activity_n)
+    ]
+    return {"practice_sessions": practice, "teacher_assignments": assignments, "recommendation_activity": activity}
+
+
+def fixture_topic_model(seed: int, resources: int = 400, topics: int = 6) -> dict:
+    rng = random.Random(seed)
+    pair_prior, pair_support, kind_topic_prior, span, direct = {}, {}, {}, {}, set()
+    for kind in ("worksheet", "exam", "video"):
+        for topic_id in range(1, topics + 1):
+            kind_topic_prior[(kind, topic_id)] = round(rng.random(), 3)
+        for resource_id in range(1, resources + 1):
+            linked = rng.sample(range(1, topics + 1), rng.randint(0, 3))
+            for topic_id in linked:
+                pair_prior[(kind, str(resource_id), topic_id)] = round(rng.random(), 3)
+                pair_support[(kind, str(resource_id), topic_id)] = rng.choice([0.25, 0.5, 1.0])
+                if kind == "video" and rng.random() < 0.3:
+                    direct.add((kind, str(resource_id), topic_id))
+            if linked:
+                span[(kind, str(resource_id))] = len(linked)
+    return {
+        "pair_prior": pair_prior,
+        "pair_support": pair_support,
+        "kind_topic_prior": kind_topic_prior,
+        "resource_topic_span": span,
+        "direct_pairs": direct,
+    }
+
+
+def fixture_profile() -> dict:
+    return {
+        "program_signals": {
+            "subjects": {"english", "spanish"},
+            "topic_tokens": {"past", "simple", "irregular", "verbs", "reading"},
+            "subject_levels": {"english": "B1", "spanish": "A2"},
+            "active_topic_ids": {2, 4, 5},
+        }
+    }
+
+
+@st.cache_data(show_spinner=False)
+def _cached_topic_model(*, teacher_id: str | None = None, student_id: str | None = None) -> dict:
+    # Stands in for build_explicit_topic_resource_model: a hit returns a copy.
+    return _FIXTURE["model"]
+
+
+def patched_history(history: dict[str, list[dict]], model: dict) -> ExitStack:
+    _FIXTURE.update(history=history, model=model)
+    _cached_topic_model.clear()
+    stack = ExitStack()
+    stack.enter_context(
+        patch.object(student_recommendation_ml, "_load_student_history_rows", side_effect=lambda _student_id: _FIXTURE["history"])
+    )
+    stack.enter_context(patch.object(recommendation_models, "build_explicit_topic_resource_model", _cached_topic_model))
+    stack.callback(_cached_topic_model.clear)
+    return stack
+
+
+# Previous builder: one Python pass per source and one alignment call (one model copy) per assignment row.
+def legacy_samples(student_profile: dict, *, student_id: str) -> list[dict]:
+    history = student_recommendation_ml._load_student_history_rows(student_id)
+    signals = student_profile.get("program_signals") or {}
+    subjects_in_program = set(signals.get("subjects") or set())
+    topic_tokens = set(signals.get("topic_tokens") or set())
+    subject_levels = signals.get("subject_levels") or {}
+    active_topic_ids = set(signals.get("active_topic_ids") or set())
+
+    def level_fit(level, subject):
+        return 1.0 if _norm_key(level) and _norm_key(level) == _norm_key(subject_levels.get(subject, "")) else 0.0
+
+    def sample(kind, subject, topic, timestamp, target, features, source):
+        return {"kind": kind, "subject": subject, "topic": topic, "timestamp": timestamp, "target": target,
+                "label": _target_to_label(target), "features": features, "source": source}
+
+    samples = []
+    for row in history.get("practice_sessions") or []:
+        kind = _norm_key(row.get("source_type"))
+        if kind not in {"worksheet", "exam", "video"}:
+            continue
+        subject, topic = normalize_subject(row.get("subject")), _norm_text(row.get("topic"))
+        target = 0.3 + 0.7 * (_safe_float(row.get("score_pct")) / 100.0)
+        features = {f"kind_{kind}": 1.0 if kind else 0.0,
+                    "subject_in_program": 1.0 if subject and subject in subjects_in_program else 0.0,
+                    "level_fit": level_fit(row.get("level"), subject),
+                    "topic_in_program": _overlap_score(_tokenize(topic), topic_tokens)}
+        samples.append(sample(kind, subject, topic, str(row.get("completed_at") or row.get("created_at") or ""), target,
+                              features, "practice_session"))
+    for row in history.get("teacher_assignments") or []:
+        assignment_type = _norm_key(row.get("assignment_type"))
+        kind = assignment_type if assignment_type in {"worksheet", "exam", "video"} else ""
+        if not kind:
+            continue
+        subject, topic = normalize_subject(row.get("subject_key")), _norm_text(row.get("topic"))
+        score, status = _safe_float(row.get("score_pct")) / 100.0, _norm_key(row.get("status"))
+        topic_id = int(row.get("learning_program_topic_id") or 0)
+        alignment = topic_resource_alignment_features(
+            kind, row.get("source_record_id"), [topic_id] if topic_id > 0 else list(active_topic_ids), student_id=student_id
+        )
+        target = 0.2
+        if status in {"graded", "completed"}:
+            target = 0.4 + 0.6 * score
+        elif status in {"started", "submitted"}:
+            target = 0.45
+        elif status in {"assigned", "overdue"} and kind == "video":
+            target = 0.3
+        features = {f"kind_{kind}": 1.0,
+                    "subject_in_program": 1.0 if subject and subject in subjects_in_program else 0.0,
+                    "topic_in_program": _overlap_score(_tokenize(topic), topic_tokens), **alignment}
+        samples.append(sample(kind, subject, topic, str(row.get("updated_at") or row.get("created_at") or ""), target,
+                              features, "teacher_assignment"))
+    for row in history.get("recommendation_activity") or []:
+        meta = row.get("meta_json") if isinstance(row.get("meta_json"), dict) else {}
+        activity_type, kind = _norm_key(row.get("activity_type")), _norm_key(meta.get("resource_kind"))
+        if activity_type not in {"student_recommendation_impression", "student_recommendation_open"} or not kind:
+            continue
+        subject, topic = normalize_subject(meta.get("subject")), _norm_text(meta.get("topic"))
+        target = 0.78 if activity_type == "student_recommendation_open" else 0.16
+        features = {f"kind_{kind}": 1.0,
+                    "subject_in_program": 1.0 if subject and subject in subjects_in_program else 0.0,
+                    "level_fit": level_fit(meta.get("level"), subject),
+                    "topic_in_program": _overlap_score(_tokenize(topic), topic_tokens),
+                    "program_type_fit": 1.0 if bool(meta.get("assigned_resource")) else 0.0,
+                    "completion_fit": _safe_float(meta.get("ml_blend_weight"), 0.0),
+                    "topic_need": _safe_float(meta.get("ml_score"), 0.0)}
+        samples.append(sample(kind, subject, topic, str(row.get("created_at") or ""), target, features, activity_type))
+    samples.sort(key=lambda item: str(item.get("timestamp") or ""))
+    return samples
+
+
+def legacy_train(samples: list[dict]) -> dict[str, float]:
+    rows = [(dict(sample.get("features") or {}), _safe_float(sample.get("target"), 0.0)) for sample in samples]
+    return _fit_linear_model(rows, base_weights=_base_student_weights())
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark building and fitting student recommendation samples.")
+    parser.add_argument("--rows", type=int, default=20000, help="History rows across the three sources.")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--train-rows", type=int, default=2000, help="Samples fitted by both trainers (the dict one is slow).")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    history = fixture_history(max(1, args.rows), args.seed)
+    profile = fixture_profile()
+    repeats = max(1, args.repeats)
+    with patched_history(history, fixture_topic_model(args.seed)):
+        started = time.perf_counter()
+        for _ in range(repeats):
+            legacy = legacy_samples(profile, student_id="student-1")
+        legacy_s = (time.perf_counter() - started) / repeats
+
+        started = time.perf_counter()
+        for _ in range(repeats):
+            design = build_student_recommendation_design(profile, student_id="student-1")
+        design_s = (time.perf_counter() - started) / repeats
+
+    matrix_matches = all(
+        np.array_equal(design.matrix[:, idx], [sample["features"].get(name, 0.0) for sample in design.samples])
+        for idx, name in enumerate(design.feature_names)
+    )
+
+    train_samples = design.samples[: max(1, args.train_rows)]
+    started = time.perf_counter()
+    legacy_weights = legacy_train(train_samples)
+    legacy_train_s = time.perf_counter() - started
+    started = time.perf_counter()
+    weights = _train_weights(train_samples, design=design, rows=list(range(len(train_samples))))
+    train_s = time.perf_counter() - started
+    weight_gap = max(abs(legacy_weights[name] - weights.get(name, float("nan"))) for name in legacy_weights)
+
+    identical = legacy == design.samples and matrix_matches and set(weights) == set(legacy_weights) and weight_gap < 1e-9
+    print(
+        json.dumps(
+            {
+                "history_rows": sum(len(rows) for rows in history.values()),
+                "samples": len(design.samples),
+                "features": len(design.feature_names),
+                "legacy_build_ms": round(1000 * legacy_s, 1),
+                "columnwise_build_ms": round(1000 * design_s, 1),
+                "train_rows": len(train_samples),
+                "legacy_train_ms": round(1000 * legacy_train_s, 1),
+                "matrix_train_ms": round(1000 * train_s, 1),
+                "max_weight_gap": weight_gap,
+                "identical": bool(identical),
+            }
+        ),
+        flush=True,
+    )
+    return 0 if identical else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import argparse
+from io import BytesIO
+import json
+from pathlib import Path
+import random
+import re
+import sys
+import time
+
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from helpers.student_report import build_student_report_pdf  # noqa: E402
+
+_NOTES = ["", "", "Past simple review", "Homework: unit 4 & 5", "Speaking practice, role play at the airport", "Reading <B1> text"]
+
+
+def _history(lessons: int, years: int, seed: int) -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    rng = random.Random(seed)
+    today = pd.Timestamp.today().normalize()
+    span = 365 * max(1, years)
+    lessons_df = pd.DataFrame(
+        {
+            "lesson_id": list(range(lessons, 0, -1)),
+            "lesson_date": [(today - pd.Timedelta(days=int(idx * span / lessons))).strftime("%Y-%m-%d") for idx in range(lessons)],
+            "lessons": [rng.choice([1, 1, 1, 2]) for _ in range(lessons)],
+            "modality": [rng.choice(["Online", "Offline"]) for _ in range(lessons)],
+            "subject": [rng.choice(["English", "Spanish", "English, Spanish"]) for _ in range(lessons)],
+            "note": [rng.choice(_NOTES) for _ in range(lessons)],
+        }
+    )
+    packages = max(1, lessons // 40)
+    payments_df = pd.DataFrame(
+        {
+            "payment_id": list(range(packages, 0, -1)),
+            "payment_date": [(today - pd.Timedelta(days=int(idx * span / packages))).strftime("%Y-%m-%d") for idx in range(packages)],
+            "lessons_paid": [40] * packages,
+            "paid_amount": [rng.choice([9600.0, 12000.0, 14400.0]) for _ in range(packages)],
+            "modality": ["Online"] * packages,
+            "subject": ["English"] * packages,
+            "package_start_date": [(today - pd.Timedelta(days=int(idx * span / packages))).strftime("%Y-%m-%d") for idx in range(packages)],
+            "package_expiry_date": [None] * packages,
+        }
+    )
+    package_df = pd.DataFrame(
+        {
+            "Subject": ["English"],
+            "Modality": ["Online"],
+            "Lessons_Paid_Total": [40],
+            "Lessons_Taken_Units": [12],
+            "Lessons_Left_Units": [28],
+        }
+    )
+    return lessons_df, payments_df, package_df
+
+
+# Previous builder: one Paragraph per cell via iterrows, one Table per section.
+def _legacy_report_pdf(student_name: str, lessons_df: pd.DataFrame, payments_df: pd.DataFrame, package_df: pd.DataFrame) -> bytes:
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+    from reportlab.lib.units import cm
+    from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+
+    buf = BytesIO()
+    doc = SimpleDocTemplate(buf, pagesize=A4, leftMargin=1.8 * cm, rightMargin=1.8 * cm, topMargin=1.5 * cm, bottomMargin=1.5 * cm)
+    styles = getSampleStyleSheet()
+    sty_hdr = ParagraphStyle("LegacyHdr", parent=styles["Normal"], fontSize=9, textColor=colors.white, leading=11)
+    sty_cell = ParagraphStyle("LegacyCell", parent=styles["Normal"], fontSize=9, leading=11, textColor=colors.HexColor("#1E293B"))
+    style = TableStyle([
+        ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#1D4ED8")),
+        ("FONTSIZE", (0, 0), (-1, -1), 9),
+        ("GRID", (0, 0), (-1, -1), 0.4, colors.HexColor("#CBD5E1")),
+        ("ROWBACKGROUNDS", (0, 1), (-1, -1), [colors.white, colors.HexColor("#F1F5F9")]),
+        ("VALIGN", (0, 0), (-1, -1), "TOP"),
+        ("LEFTPADDING", (0, 0), (-1, -1), 4),
+        ("RIGHTPADDING", (0, 0), (-1, -1), 4),
+        ("TOPPADDING", (0, 0), (-1, -1), 3),
+        ("BOTTOMPADDING", (0, 0), (-1, -1), 3),
+    ])
+    story: list = [Paragraph(student_name, styles["Title"])]
+    sections = [
+        (lessons_df, ["lesson_date", "lessons", "modality", "subject", "note"]),
+        (payments_df, ["payment_date", "lessons_paid", "paid_amount", "modality", "subject", "package_start_date", "package_expiry_date"]),
+        (package_df, ["Subject", "Modality", "Lessons_Paid_Total", "Lessons_Taken_Units", "Lessons_Left_Units"]),
+    ]
+    for frame, cols in sections:
+        tdata = [[Paragraph(c, sty_hdr) for c in cols]]
+        for _, row in frame.iterrows():
+            tdata.append([Paragraph(str(row.get(c, "") or ""), sty_cell) for c in cols])
+        tbl = Table(tdata, repeatRows=1)
+        tbl.setStyle(style)
+        story.extend([tbl, Spacer(1, 12)])
+    doc.build(story)
+    return buf.getvalue()
+
+
+def _pages(pdf: bytes) -> int:
+    return len(re.findall(rb"/Type /Page\b", pdf))
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the student report PDF: iterrows + single tables vs vectorized, chunked tables.")
+    parser.add_argument("--lessons", type=int, default=2400)
+    parser.add_argument("--years", type=int, default=5)
+    parser.add_argument("--repeats", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    lessons_df, payments_df, package_df = _history(max(1, args.lessons), args.years, args.seed)
+    repeats = max(1, args.repeats)
+
+    timings = {"legacy": 0.0, "chunked": 0.0}
+    for _ in range(repeats):
+        started = time.perf_counter()
+        legacy = _legacy_report_pdf("Student 1", lessons_df, payments_df, package_df)
+        timings["legacy"] += time.perf_counter() - started
+
+        started = time.perf_counter()
+        current = build_student_report_pdf("Student 1", lessons_df, payments_df, package_df)
+        timings["chunked"] += time.perf_counter() - started
+
+    print(
+        json.dumps(
+            {
+                "lessons": len(lessons_df),
+                "payments": len(payments_df),
+                "legacy_ms": round(1000 * timings["legacy"] / repeats, 1),
+                "chunked_ms": round(1000 * timings["chunked"] / repeats, 1),
+                "legacy_pages": _pages(legacy),
+                "chunked_pages": _pages(current),
+            }
+        ),
+        flush=True,
+    )
+    return 0 if current.startswith(b"%PDF") else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
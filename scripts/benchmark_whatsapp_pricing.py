@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+import random
+import sys
+import time
+from unittest.mock import patch
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import pandas as pd  # noqa: E402
+
+from helpers import whatsapp  # noqa: E402
+
+
+def _pricing_items(package_count: int, seed: int) -> pd.DataFrame:
+    rng = random.Random(seed)
+    rows = [
+        {"id": 1, "modality": "online", "kind": "hourly", "hours": None, "price": 900, "active": True, "sort_order": 0},
+        {"id": 2, "modality": "offline", "kind": "hourly", "hours": None, "price": 1200, "active": True, "sort_order": 0},
+    ]
+    for idx in range(package_count):
+        hours = rng.choice([5, 10, 20, 44]) + idx
+        rows.append(
+            {
+                "id": idx + 3,
+                "modality": rng.choice(["online", "offline"]),
+                "kind": "package",
+                "hours": hours,
+                "price": hours * rng.randint(700, 1000),
+                "active": rng.random() > 0.1,
+                "sort_order": rng.randint(0, 3),
+            }
+        )
+    return pd.DataFrame(rows)
+
+
+def _legacy_snapshot(df: pd.DataFrame) -> dict:
+    # Per-message path before the snapshot cache: copy, filter per modality, iterrows.
+    df = df[df["active"] == True].copy()
+    df["modality"] = df["modality"].fillna("").astype(str).str.strip().str.lower()
+    df["kind"] = df["kind"].fillna("").astype(str).str.strip().str.lower()
+    df["price_try"] = pd.to_numeric(df["price"], errors="coerce").fillna(0).astype(int)
+
+    def _hourly(mod: str) -> int:
+        h = df[(df["modality"] == mod) & (df["kind"] == "hourly")].copy()
+        h = h.sort_values(["sort_order", "id"], na_position="last")
+        return int(h.iloc[0].get("price_try") or 0) if not h.empty else 0
+
+    def _packages(mod: str) -> list:
+        p = df[(df["modality"] == mod) & (df["kind"] == "package")].copy()
+        p["hours"] = pd.to_numeric(p["hours"], errors="coerce").fillna(0).astype(int)
+        p = p.sort_values(["sort_order", "hours"], ascending=[True, False])
+        out = []
+        for _, r in p.iterrows():
+            if int(r["hours"]) > 0:
+                out.append((int(r["hours"]), int(r["price_try"]), int(round(r["price_try"] / r["hours"]))))
+        return out
+
+    return {
+        "online_hourly": _hourly("online"),
+        "offline_hourly": _hourly("offline"),
+        "online_packages": _packages("online"),
+        "offline_packages": _packages("offline"),
+    }
+
+
+def _timed(fn, messages: int) -> float:
+    started = time.perf_counter()
+    for idx in range(messages):
+        fn(("tr", "en", "es")[idx % 3])
+    return time.perf_counter() - started
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark WhatsApp pricing block construction.")
+    parser.add_argument("--messages", type=int, default=1000)
+    parser.add_argument("--packages", type=int, default=12)
+    parser.add_argument("--seed", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    items = _pricing_items(args.packages, args.seed)
+    whatsapp._load_pricing_snapshot_cached.clear()
+    whatsapp._render_pricing_block_cached.clear()
+
+    with patch.object(whatsapp, "_load_pricing_items_cached", return_value=items), patch.object(
+        whatsapp, "get_current_user_id", return_value="teacher-1"
+    ):
+        legacy = _timed(lambda lang: whatsapp._render_pricing_block(lang, _legacy_snapshot(items)), args.messages)
+        vectorized = _timed(
+            lambda lang: whatsapp._render_pricing_block(lang, whatsapp._pricing_snapshot_from_items(items)),
+            args.messages,
+        )
+        memoized = _timed(whatsapp.build_pricing_block, args.messages)
+
+    print(
+        json.dumps(
+            {
+                "messages": args.messages,
+                "pricing_rows": len(items),
+                "legacy_seconds": round(legacy, 3),
+                "vectorized_seconds": round(vectorized, 3),
+                "memoized_seconds": round(memoized, 3),
+                "speedup": round(legacy / memoized, 1) if memoized else None,
+            }
+        )
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
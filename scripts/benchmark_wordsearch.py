@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+import random
+import string
+import sys
+import time
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from helpers.wordsearch_layout import WORDSEARCH_DIRECTIONS, layout_wordsearch  # noqa: E402
+
+
+def _words(count: int, size: int, seed: int) -> list[str]:
+    rng = random.Random(seed)
+    words: set[str] = set()
+    while len(words) < count:
+        length = rng.randint(3, min(9, size - 1))
+        words.add("".join(rng.choice(string.ascii_uppercase) for _ in range(length)))
+    return sorted(words, key=len, reverse=True)
+
+
+def _legacy_layout(words: list[str], size: int, seed: int) -> list[str]:
+    # Previous engine: random trials, 500 per word, 20 restarts, all or nothing.
+    rng = random.Random(seed)
+    for _ in range(20):
+        grid = [["" for _ in range(size)] for _ in range(size)]
+        ok_all = True
+        for word in words:
+            for _ in range(500):
+                dr, dc = rng.choice(WORDSEARCH_DIRECTIONS)
+                r_min, r_max = (len(word) - 1, size - 1) if dr < 0 else (0, size - 1 - (len(word) - 1) * dr)
+                c_max = size - 1 - (len(word) - 1) * dc
+                if r_min > r_max or c_max < 0:
+                    continue
+                r, c = rng.randint(r_min, r_max), rng.randint(0, c_max)
+                coords = [(r + k * dr, c + k * dc) for k in range(len(word))]
+                if all(grid[rr][cc] in ("", ch) for (rr, cc), ch in zip(coords, word)):
+                    for (rr, cc), ch in zip(coords, word):
+                        grid[rr][cc] = ch
+                    break
+            else:
+                ok_all = False
+                break
+        if ok_all:
+            return words
+    return []
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark word-search placement: time and fraction of words placed.")
+    parser.add_argument("--sizes", default="10,15,20,25")
+    parser.add_argument("--word-counts", default="10,20,30,40")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    for size in [int(part) for part in args.sizes.split(",") if part.strip()]:
+        for count in [int(part) for part in args.word_counts.split(",") if part.strip()]:
+            totals = {"legacy": [0.0, 0.0], "engine": [0.0, 0.0]}
+            for repeat in range(max(1, args.repeats)):
+                words = _words(count, size, args.seed + repeat)
+                started = time.perf_counter()
+                placed = _legacy_layout(words, size, args.seed + repeat)
+                totals["legacy"][0] += time.perf_counter() - started
+                totals["legacy"][1] += len(placed) / len(words)
+                started = time.perf_counter()
+                _, placed, _ = layout_wordsearch(words, size, string.ascii_uppercase, seed=args.seed + repeat)
+                totals["engine"][0] += time.perf_counter() - started
+                totals["engine"][1] += len(placed) / len(words)
+            repeats = max(1, args.repeats)
+            print(
+                json.dumps(
+                    {
+                        "size": size,
+                        "words": count,
+                        "legacy_ms": round(1000 * totals["legacy"][0] / repeats, 2),
+                        "legacy_placed_fraction": round(totals["legacy"][1] / repeats, 3),
+                        "engine_ms": round(1000 * totals["engine"][0] / repeats, 2),
+                        "engine_placed_fraction": round(totals["engine"][1] / repeats, 3),
+                    }
+                )
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""Drain the Google Calendar outbox: send queued event creates/deletes in per-teacher batches.
+
+Run with a service-role SUPABASE_KEY so every teacher's outbox rows and
+calendar tokens are readable.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+import sys
+import time
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from core.database import get_sb  # noqa: E402
+from helpers.google_calendar import drain_gcal_outbox  # noqa: E402
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--limit", type=int, default=500, help="Max outbox rows per drain pass.")
+    parser.add_argument("--interval", type=float, default=15.0, help="Seconds between passes when looping.")
+    parser.add_argument("--once", action="store_true", help="Run a single pass and exit.")
+    args = parser.parse_args(argv)
+
+    sb = get_sb()
+    while True:
+        summary = drain_gcal_outbox(sb, limit=args.limit)
+        print(json.dumps(summary), flush=True)
+        if args.once:
+            return 0
+        # A full pass means more rows are probably waiting; go again right away.
+        if summary["processed"] < args.limit:
+            time.sleep(max(0.0, args.interval))
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -43,6 +43,7 @@ _bootstrap_supabase_env()
 
 from core.database import get_sb  # noqa: E402
 from helpers.quick_exam_builder import attach_exam_language_metadata  # noqa: E402
+from helpers.resource_gallery import GALLERY_META_COLUMN, build_gallery_meta  # noqa: E402
 
 
 def main() -> int:
@@ -53,7 +54,7 @@ def main() -> int:
     sb = get_sb()
     rows = (
         sb.table("quick_exams")
-        .select("id,subject,plan_language,student_material_language,exam_data,answer_key")
+        .select("id,title,subject,plan_language,student_material_language,exam_data,answer_key")
         .order("id")
         .execute()
         .data
@@ -88,15 +89,15 @@ def main() -> int:
             f"plan_language={resolved_plan} student_material_language={resolved_student}"
         )
         if args.apply:
+            update_payload = {
+                "exam_data": repaired_exam_data,
+                "plan_language": resolved_plan,
+                "student_material_language": resolved_student,
+            }
+            update_payload[GALLERY_META_COLUMN] = build_gallery_meta({**row, **update_payload}, kind="exam")
             (
                 sb.table("quick_exams")
-                .update(
-                    {
-                        "exam_data": repaired_exam_data,
-                        "plan_language": resolved_plan,
-                        "student_material_language": resolved_student,
-                    }
-                )
+                .update(update_payload)
                 .eq("id", row.get("id"))
                 .execute()
             )
@@ -6,7 +6,7 @@ from uuid import UUID
 
 import streamlit as st
 
-from core.database import get_sb
+from core.database import clear_cache_domains, get_sb, register_cache, shared_cache
 from core.state import get_current_user_id
 
 
@@ -69,6 +69,7 @@ def _clean_text(value: Any) -> str:
 
 
 @st.cache_data(ttl=60, show_spinner=False)
+@shared_cache("authorization", ttl=60)
 def _load_authorization_context(user_id: str, cache_bust: str = "") -> dict[str, Any]:
     safe_user_id = _clean_text(user_id)
     if not safe_user_id:
@@ -142,8 +143,11 @@ def _load_authorization_context(user_id: str, cache_bust: str = "") -> dict[str,
     }
 
 
+register_cache(_load_authorization_context, "authorization")
+
+
 def clear_authorization_cache() -> None:
-    _load_authorization_context.clear()
+    clear_cache_domains("authorization", include_data_cache=False)
 
 
 def get_authorization_context(*, user_id: str | None = None, refresh: bool = False) -> AuthorizationContext:
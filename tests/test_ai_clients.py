@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from helpers import ai_clients
+from helpers import lesson_planner
+
+
+class _FakeProvider:
+    """Local stand-in for an AI provider with a scripted latency and outcome per call."""
+
+    def __init__(self, name, script):
+        self.name = name
+        self.script = list(script)
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        with self._lock:
+            step = self.script[min(self.calls, len(self.script) - 1)]
+            self.calls += 1
+        latency, outcome = step
+        time.sleep(latency)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+def _json_attempt(providers):
+    def _attempt(name):
+        raw = providers[name]()
+        return json.loads(raw)
+
+    return _attempt
+
+
+class ClientPoolTests(unittest.TestCase):
+    def setUp(self):
+        ai_clients.clear_ai_client_pool()
+
+    def tearDown(self):
+        ai_clients.clear_ai_client_pool()
+
+    def test_pool_reuses_client_per_provider_and_credentials(self):
+        built = []
+
+        def factory():
+            built.append(object())
+            return built[-1]
+
+        first = ai_clients.get_pooled_ai_client("openai", "key-a", factory)
+        second = ai_clients.get_pooled_ai_client("openai", "key-a", factory)
+        other_key = ai_clients.get_pooled_ai_client("openai", "key-b", factory)
+        other_url = ai_clients.get_pooled_ai_client("openai", "key-a", factory, base_url="https://example.test")
+
+        self.assertIs(first, second)
+        self.assertIsNot(first, other_key)
+        self.assertIsNot(first, other_url)
+        self.assertEqual(3, len(built))
+
+    def test_lesson_planner_builds_one_openai_client_across_calls(self):
+        instances = []
+
+        class _Completions:
+            def create(self, **_kwargs):
+                message = type("Message", (), {"content": '{"title": "ok"}'})()
+                choice = type("Choice", (), {"message": message})()
+                return type("Response", (), {"choices": [choice]})()
+
+        class _FakeOpenAI:
+            def __init__(self, **kwargs):
+                instances.append(kwargs)
+                self.chat = type("Chat", (), {"completions": _Completions()})()
+
+        ai_clients.get_ai_circuit_breaker().reset()
+        with patch.object(lesson_planner, "OpenAI", _FakeOpenAI), patch.dict(
+            "os.environ", {"OPENAI_API_KEY": "test-key"}
+        ):
+            lesson_planner._generate_with_openai("system", "user")
+            lesson_planner._generate_with_openai("system", "user")
+
+        self.assertEqual([{"api_key": "test-key"}], instances)
+
+
+class CircuitBreakerTests(unittest.TestCase):
+    def test_only_retryable_errors_trip_the_breaker(self):
+        now = [0.0]
+        breaker = ai_clients.ProviderCircuitBreaker(failure_threshold=2, cooldown_seconds=30, timer=lambda: now[0])
+
+        breaker.record_failure("gemini", RuntimeError("401 invalid api key"))
+        breaker.record_failure("gemini", RuntimeError("401 invalid api key"))
+        self.assertEqual("closed", breaker.state("gemini"))
+
+        breaker.record_failure("gemini", RuntimeError("503 service unavailable"))
+        breaker.record_failure("gemini", RuntimeError("429 rate limit"))
+        self.assertEqual("open", breaker.state("gemini"))
+        self.assertTrue(breaker.allow("openai"))
+
+        now[0] = 31.0
+        self.assertEqual("half_open", breaker.state("gemini"))
+        breaker.record_success("gemini")
+        self.assertEqual("closed", breaker.state("gemini"))
+
+    def test_open_circuit_short_circuits_provider_calls(self):
+        breaker = ai_clients.ProviderCircuitBreaker(failure_threshold=1, cooldown_seconds=60)
+        provider = _FakeProvider("openrouter", [(0.0, RuntimeError("502 bad gateway"))])
+
+        with patch("helpers.ai_retry.time.sleep"):
+            with self.assertRaises(RuntimeError):
+                ai_clients.call_ai_provider("openrouter", provider, breaker=breaker)
+        calls_after_trip = provider.calls
+
+        with self.assertRaises(ai_clients.AIProviderCircuitOpenError):
+            ai_clients.call_ai_provider("openrouter", provider, breaker=breaker)
+        self.assertEqual(calls_after_trip, provider.calls)
+
+
+class ProviderChainTests(unittest.TestCase):
+    def test_sequential_chain_falls_through_invalid_json(self):
+        providers = {
+            "openrouter": _FakeProvider("openrouter", [(0.0, "not json")]),
+            "gemini": _FakeProvider("gemini", [(0.0, '{"ok": true}')]),
+            "openai": _FakeProvider("openai", [(0.0, '{"ok": "late"}')]),
+        }
+
+        result, provider, errors = ai_clients.run_provider_chain(
+            ["openrouter", "gemini", "openai"],
+            _json_attempt(providers),
+        )
+
+        self.assertEqual({"ok": True}, result)
+        self.assertEqual("gemini", provider)
+        self.assertEqual(1, len(errors))
+        self.assertEqual(0, providers["openai"].calls)
+
+    def test_hedge_starts_next_provider_when_first_is_slow(self):
+        providers = {
+            "openrouter": _FakeProvider("openrouter", [(0.5, '{"winner": "openrouter"}')]),
+            "gemini": _FakeProvider("gemini", [(0.02, '{"winner": "gemini"}')]),
+        }
+
+        started = time.monotonic()
+        result, provider, _errors = ai_clients.run_provider_chain(
+            ["openrouter", "gemini"],
+            _json_attempt(providers),
+            hedge_delay_seconds=0.05,
+        )
+        elapsed = time.monotonic() - started
+
+        self.assertEqual("gemini", provider)
+        self.assertEqual({"winner": "gemini"}, result)
+        self.assertLess(elapsed, 0.4)
+
+    def test_hedge_does_not_fire_when_first_provider_is_fast(self):
+        providers = {
+            "openrouter": _FakeProvider("openrouter", [(0.01, '{"winner": "openrouter"}')]),
+            "gemini": _FakeProvider("gemini", [(0.0, '{"winner": "gemini"}')]),
+        }
+
+        _result, provider, _errors = ai_clients.run_provider_chain(
+            ["openrouter", "gemini"],
+            _json_attempt(providers),
+            hedge_delay_seconds=0.3,
+        )
+
+        self.assertEqual("openrouter", provider)
+        self.assertEqual(0, providers["gemini"].calls)
+
+    def test_hedge_moves_on_immediately_after_invalid_answer(self):
+        providers = {
+            "openrouter": _FakeProvider("openrouter", [(0.0, "{broken")]),
+            "gemini": _FakeProvider("gemini", [(0.0, RuntimeError("503 overloaded"))]),
+            "openai": _FakeProvider("openai", [(0.01, '{"winner": "openai"}')]),
+        }
+
+        started = time.monotonic()
+        result, provider, errors = ai_clients.run_provider_chain(
+            ["openrouter", "gemini", "openai"],
+            _json_attempt(providers),
+            hedge_delay_seconds=1.0,
+        )
+
+        self.assertEqual("openai", provider)
+        self.assertEqual({"winner": "openai"}, result)
+        self.assertEqual(2, len(errors))
+        self.assertLess(time.monotonic() - started, 0.5)
+
+    def test_all_failures_raise_combined_error(self):
+        providers = {
+            "openrouter": _FakeProvider("openrouter", [(0.0, RuntimeError("timeout"))]),
+            "gemini": _FakeProvider("gemini", [(0.0, "nope")]),
+        }
+
+        with self.assertRaises(RuntimeError) as ctx:
+            ai_clients.run_provider_chain(
+                ["openrouter", "gemini"],
+                _json_attempt(providers),
+                hedge_delay_seconds=0.01,
+            )
+
+        self.assertIn("openrouter: timeout", str(ctx.exception))
+        self.assertIn("gemini:", str(ctx.exception))
+
+
+class HedgeDelayTests(unittest.TestCase):
+    def setUp(self):
+        ai_clients.clear_provider_latencies()
+
+    def tearDown(self):
+        ai_clients.clear_provider_latencies()
+
+    def test_hedging_is_off_unless_enabled(self):
+        with patch.dict("os.environ", {"AI_HEDGE_ENABLED": ""}):
+            self.assertIsNone(ai_clients.get_ai_hedge_delay_seconds("openrouter"))
+
+    def test_hedge_delay_uses_observed_latency_percentile(self):
+        for seconds in (1.0, 2.0, 3.0, 4.0, 5.0):
+            ai_clients.record_provider_latency("openrouter", seconds)
+
+        env = {"AI_HEDGE_ENABLED": "true", "AI_HEDGE_PERCENTILE": "75", "AI_HEDGE_DELAY_SECONDS": "9"}
+        with patch.dict("os.environ", env):
+            self.assertAlmostEqual(4.0, ai_clients.get_ai_hedge_delay_seconds("openrouter"))
+            self.assertAlmostEqual(9.0, ai_clients.get_ai_hedge_delay_seconds("gemini"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import pandas as pd
+
+from helpers import ai_response_cache
+from helpers import worksheet_builder
+
+
+class AIResponseCacheTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.now = [1000.0]
+        self.cache = ai_response_cache.AIResponseCache(
+            os.path.join(self._tmp.name, "cache.sqlite3"),
+            ttl_seconds=60,
+            max_entries=3,
+            clock=lambda: self.now[0],
+        )
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_cache_key_normalizes_text_and_key_order(self):
+        first = ai_response_cache.build_ai_cache_key(
+            "quick_worksheet_ai",
+            "1",
+            {"topic": "  Past   Simple ", "subject": "English", "options": {"b": 1, "a": True}},
+        )
+        second = ai_response_cache.build_ai_cache_key(
+            "quick_worksheet_ai",
+            "1",
+            {"subject": "english", "options": {"a": True, "b": 1}, "topic": "past simple"},
+        )
+        other_version = ai_response_cache.build_ai_cache_key(
+            "quick_worksheet_ai",
+            "2",
+            {"subject": "english", "options": {"a": True, "b": 1}, "topic": "past simple"},
+        )
+
+        self.assertEqual(first, second)
+        self.assertNotEqual(first, other_version)
+
+    def test_identical_inputs_reuse_parsed_result(self):
+        calls = []
+
+        def generate():
+            calls.append(1)
+            return {"title": "Animals", "items": ["cat", "dog"]}
+
+        inputs = {"subject": "english", "topic": "animals"}
+        first, first_status = ai_response_cache.cached_ai_generation(
+            "quick_worksheet_ai", inputs, generate, template_version="1", cache=self.cache
+        )
+        first["title"] = "mutated by caller"
+        second, second_status = ai_response_cache.cached_ai_generation(
+            "quick_worksheet_ai", inputs, generate, template_version="1", cache=self.cache
+        )
+
+        self.assertEqual(ai_response_cache.CACHE_MISS, first_status)
+        self.assertEqual(ai_response_cache.CACHE_HIT, second_status)
+        self.assertEqual({"title": "Animals", "items": ["cat", "dog"]}, second)
+        self.assertEqual(1, len(calls))
+
+    def test_force_fresh_bypasses_lookup_and_refreshes_entry(self):
+        versions = iter([{"v": 1}, {"v": 2}])
+        inputs = {"topic": "fractions"}
+
+        ai_response_cache.cached_ai_generation("quick_exam_ai", inputs, lambda: next(versions), template_version="1", cache=self.cache)
+        fresh, status = ai_response_cache.cached_ai_generation(
+            "quick_exam_ai", inputs, lambda: next(versions), template_version="1", force_fresh=True, cache=self.cache
+        )
+        reused, reused_status = ai_response_cache.cached_ai_generation(
+            "quick_exam_ai", inputs, lambda: {"v": 3}, template_version="1", cache=self.cache
+        )
+
+        self.assertEqual(({"v": 2}, ai_response_cache.CACHE_BYPASS), (fresh, status))
+        self.assertEqual(({"v": 2}, ai_response_cache.CACHE_HIT), (reused, reused_status))
+
+    def test_entries_expire_after_ttl(self):
+        self.cache.put("k", "quick_lesson_ai", {"ok": True})
+        self.now[0] += 61
+
+        self.assertIsNone(self.cache.get("k"))
+        self.assertEqual(0, self.cache.size())
+
+    def test_lru_cap_evicts_least_recently_used(self):
+        for index, key in enumerate(["a", "b", "c"]):
+            self.now[0] = 1000.0 + index
+            self.cache.put(key, "f", {"key": key})
+        self.now[0] = 1010.0
+        self.cache.get("a")
+        self.now[0] = 1011.0
+        self.cache.put("d", "f", {"key": "d"})
+
+        self.assertEqual(3, self.cache.size())
+        self.assertIsNone(self.cache.get("b"))
+        self.assertEqual({"key": "a"}, self.cache.get("a"))
+
+    def test_generation_errors_are_not_cached(self):
+        def failing():
+            raise RuntimeError("openrouter: timeout")
+
+        with self.assertRaises(RuntimeError):
+            ai_response_cache.cached_ai_generation("f", {"x": 1}, failing, template_version="1", cache=self.cache)
+
+        self.assertEqual(0, self.cache.size())
+
+
+class WorksheetGenerationCacheTests(unittest.TestCase):
+    def test_regenerating_identical_worksheet_skips_provider_chain(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cache_path = os.path.join(tmp, "ai.sqlite3")
+            chain_calls = []
+
+            def fake_chain(_system_prompt, _user_prompt, parse):
+                chain_calls.append(1)
+                return {"title": "Animals", "_ai_provider": "gemini"}
+
+            kwargs = dict(
+                subject="english",
+                learner_stage="upper_primary",
+                level_or_band="A2",
+                worksheet_type="reading_comprehension",
+                topic="Animals",
+                plan_language="en",
+                student_material_language="en",
+                include_visuals=False,
+            )
+            with patch.dict("os.environ", {"AI_RESPONSE_CACHE_PATH": cache_path, "AI_RESPONSE_CACHE_ENABLED": "true"}), patch(
+                "helpers.lesson_planner.run_ai_provider_chain", side_effect=fake_chain
+            ):
+                first = worksheet_builder.generate_ai_worksheet(**kwargs)
+                second = worksheet_builder.generate_ai_worksheet(**kwargs)
+                fresh = worksheet_builder.generate_ai_worksheet(**kwargs, force_fresh=True)
+
+            self.assertEqual("miss", first["_ai_cache"])
+            self.assertEqual("hit", second["_ai_cache"])
+            self.assertEqual("gemini", second["_ai_provider"])
+            self.assertEqual("bypass", fresh["_ai_cache"])
+            self.assertEqual(2, len(chain_calls))
+
+    def test_cache_hit_is_not_charged_as_a_generation(self):
+        usage = {"remaining_today": 5, "cooldown_ok": True, "seconds_left": 0}
+        logged, charged = [], []
+        with tempfile.TemporaryDirectory() as tmp, patch.dict(
+            "os.environ", {"AI_RESPONSE_CACHE_PATH": os.path.join(tmp, "ai.sqlite3"), "AI_RESPONSE_CACHE_ENABLED": "true"}
+        ), patch("helpers.lesson_planner.run_ai_provider_chain", return_value={"title": "Animals", "_ai_provider": "gemini"}), patch(
+            "helpers.lesson_planner.get_ai_provider_order", return_value=["gemini"]
+        ), patch("helpers.worksheet_storage.get_ai_worksheet_usage_status", return_value=usage), patch(
+            "helpers.worksheet_storage.log_ai_usage", side_effect=lambda **kw: logged.append((kw["status"], kw["meta"]))
+        ), patch("services.permissions_service.can_use_ai_tool", return_value=True), patch(
+            "services.permissions_service.increment_usage", side_effect=lambda *args: charged.append(args)
+        ), patch.object(worksheet_builder, "get_plan_language", return_value="en"), patch.object(
+            worksheet_builder, "get_student_material_language", return_value="en"
+        ):
+            for _ in range(2):
+                worksheet, error = worksheet_builder.generate_worksheet_with_limit(
+                    "english", "upper_primary", "A2", "reading_comprehension", "Animals"
+                )
+                self.assertIsNone(error)
+
+        self.assertEqual([(None, "ai_generations")], charged)
+        self.assertEqual(["requested", "success", "requested", ai_response_cache.CACHE_HIT_LOG_STATUS], [status for status, _ in logged])
+        self.assertEqual("hit", logged[-1][1]["cache"])
+        self.assertIs(False, logged[-1][1]["used_ai"])
+
+
+class ProviderRequestRowsTests(unittest.TestCase):
+    def test_cache_hits_and_their_requests_do_not_start_the_cooldown(self):
+        logs = pd.DataFrame(
+            {
+                "created_at": pd.to_datetime(["2026-10-01T10:00:00Z", "2026-10-01T10:00:20Z", "2026-10-01T10:05:00Z", "2026-10-01T10:05:01Z"]),
+                "status": ["requested", "success", "requested", ai_response_cache.CACHE_HIT_LOG_STATUS],
+            }
+        )
+        remaining = ai_response_cache.provider_request_rows(logs)
+        self.assertEqual(["requested", "success"], remaining["status"].tolist())
+        self.assertEqual(logs["created_at"].iloc[1], remaining["created_at"].iloc[-1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import random
+import unittest
+from unittest.mock import patch
+
+import pandas as pd
+
+from helpers import forecast
+from helpers.package_lang_lookups import _free_note_mask, _is_free_note
+from helpers.ui_components import ts_today_naive
+from scripts.benchmark_forecast_burn_rate import _classes, _dashboard, _legacy_build_forecast_table
+
+
+class ForecastBurnRateTests(unittest.TestCase):
+    def test_free_note_mask_matches_is_free_note(self):
+        notes = pd.Series(["[free] trial", "x [DEMO]", "[Don't Count]", "[DONT COUNT] makeup", "free", "[FREE", "", None, 7])
+
+        self.assertEqual([_is_free_note(note) for note in notes], _free_note_mask(notes).tolist())
+
+    def test_vectorized_forecast_matches_row_wise_units(self):
+        classes = _classes(3000, students=60, seed=4)
+        classes.loc[::37, "note"] = None
+        classes.loc[::41, "modality"] = None
+        dashboard = _dashboard(60, seed=4)
+
+        for lookback in (14, 56, 400):
+            with self.subTest(lookback=lookback):
+                expected = _legacy_build_forecast_table(dashboard, classes.copy(), lookback_days_for_rate=lookback)
+                actual = forecast.build_forecast_table(dashboard_df=dashboard, classes_df=classes, lookback_days_for_rate=lookback)
+
+                pd.testing.assert_frame_equal(expected, actual)
+
+    def test_passed_classes_are_not_modified(self):
+        classes = _classes(200, students=10, seed=2)
+        before = classes.copy()
+
+        forecast.build_forecast_table(dashboard_df=_dashboard(10, seed=2), classes_df=classes)
+
+        pd.testing.assert_frame_equal(before, classes)
+
+    def test_standalone_call_reads_only_the_lookback_window(self):
+        classes = _classes(300, students=12, seed=8)
+        cutoff = (ts_today_naive() - pd.Timedelta(days=30)).strftime("%Y-%m-%d")
+
+        with patch.object(forecast, "load_table_filtered", return_value=classes) as load_classes:
+            forecast.build_forecast_table(dashboard_df=_dashboard(12, seed=8), lookback_days_for_rate=30)
+
+        self.assertEqual("classes", load_classes.call_args.args[0])
+        self.assertEqual([("gte", "lesson_date", cutoff)], load_classes.call_args.kwargs["filters"])
+        self.assertEqual("student,lesson_date,number_of_lesson,modality,note", load_classes.call_args.kwargs["columns"])
+
+    def test_no_classes_in_window_falls_back_to_the_minimum_rate(self):
+        dashboard = _dashboard(5, seed=1)
+        old = pd.DataFrame({"student": ["Student 1"], "lesson_date": ["2001-01-01"], "number_of_lesson": [3], "modality": ["Online"], "note": [""]})
+
+        result = forecast.build_forecast_table(dashboard_df=dashboard, classes_df=old)
+
+        self.assertTrue((result["Units_Per_Day"] == 0.1).all())
+
+
+if __name__ == "__main__":
+    unittest.main()
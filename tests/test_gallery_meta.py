@@ -0,0 +1,168 @@
+import json
+import unittest
+from unittest.mock import Mock, patch
+
+from core import database
+from helpers import planner_storage, quick_exam_storage, worksheet_storage
+from helpers.keyset_pagination import KeysetPage
+from helpers.resource_gallery import GALLERY_META_COLUMN, build_gallery_meta, gallery_card_media, read_gallery_meta
+from scripts.benchmark_gallery_cards import _RECORDS, _fixtures
+
+
+class GalleryMetaTests(unittest.TestCase):
+    def test_projection_matches_the_parse_path(self):
+        rows = _fixtures(cards=12, image_kb=1, seed=4)
+        records = dict(_RECORDS)
+        loader = Mock(side_effect=lambda record_id: records[record_id])
+        for row in rows:
+            with self.subTest(id=row["id"]):
+                legacy_row = {key: value for key, value in row.items() if key != GALLERY_META_COLUMN}
+                expected = gallery_card_media(legacy_row, lambda record_id: records[record_id])
+                self.assertEqual(expected, gallery_card_media(row, loader))
+        inline_ids = [row["id"] for row in rows if row[GALLERY_META_COLUMN]["has_inline_image"]]
+        self.assertTrue(inline_ids)
+        # Only inline visuals go back to the record; URLs and image-less cards do not.
+        self.assertEqual(inline_ids, [call.args[0] for call in loader.call_args_list])
+        self.assertFalse(any(row[GALLERY_META_COLUMN]["image_url"].startswith("data:") for row in rows))
+
+    def test_stored_meta_skips_the_full_record_load(self):
+        loader = Mock(return_value={"worksheet_json": {"image_url": "https://cdn.example.com/old.png"}})
+        row = {"id": 7, GALLERY_META_COLUMN: json.dumps({"kind": "worksheet", "title": "W", "image_url": "", "language": "es"})}
+
+        self.assertEqual(("", "ES"), gallery_card_media(row, loader))
+        loader.assert_not_called()
+
+        self.assertEqual(("https://cdn.example.com/old.png", ""), gallery_card_media({"id": 7}, loader))
+        loader.assert_called_once_with(7)
+
+    def test_missing_or_malformed_meta_reads_as_none(self):
+        for value in (None, "", "not json", "[]", {"kind": "worksheet"}):
+            with self.subTest(value=value):
+                self.assertIsNone(read_gallery_meta({GALLERY_META_COLUMN: value}))
+        self.assertIsNone(read_gallery_meta(None))
+
+    def test_build_uses_the_payload_title_and_kind_alias(self):
+        meta = build_gallery_meta(
+            {"exam_data": {"title": " Unit 3 ", "plan_language": "TR", "cover_image": {"b64_json": "AAAA"}}},
+            kind="quick_exam",
+        )
+        self.assertEqual({"kind": "exam", "title": "", "image_url": "", "has_inline_image": True, "language": "tr"}, meta)
+        self.assertEqual(
+            ("https://cdn.example.com/c.png", False),
+            tuple(build_gallery_meta({"cover_image": {"image_url": "https://cdn.example.com/c.png"}}, kind="exam")[key] for key in ("image_url", "has_inline_image")),
+        )
+        self.assertEqual("Unit 3", build_gallery_meta({"title": " Unit 3 "}, kind="exam")["title"])
+
+
+class LessonPlanUpdateTests(unittest.TestCase):
+    def test_meta_survives_the_schema_without_updated_at(self):
+        attempts = []
+
+        class _Query:
+            def __init__(self, payload):
+                self.payload = payload
+
+            def eq(self, *_args):
+                return self
+
+            def execute(self):
+                attempts.append(self.payload)
+                if "updated_at" in self.payload:
+                    raise RuntimeError("column lesson_plans.updated_at does not exist")
+                return Mock(data=[])
+
+        client = Mock()
+        client.table.return_value.update.side_effect = _Query
+        meta = {"kind": "lesson_plan", "title": "", "image_url": "", "language": "en"}
+        with patch.object(planner_storage, "get_sb", return_value=client):
+            planner_storage._update_lesson_plan_row(5, "teacher-1", {"plan_json": {}, GALLERY_META_COLUMN: meta, "updated_at": "now"})
+
+        self.assertEqual([{"plan_json": {}, GALLERY_META_COLUMN: meta}], attempts[1:])
+
+
+def _reject_gallery_meta(columns):
+    if GALLERY_META_COLUMN in columns:
+        raise RuntimeError(f"column {GALLERY_META_COLUMN} does not exist")
+
+
+class SchemaWithoutMetaTests(unittest.TestCase):
+    def test_list_reads_retry_without_the_column(self):
+        class _Query:
+            def __init__(self, columns):
+                self.columns = columns.split(",")
+
+            def eq(self, *_args):
+                return self
+
+        def fetch(query, _cursor_token, _page_size):
+            _reject_gallery_meta(query.columns)
+            return KeysetPage([{"id": 1, "columns": query.columns}], "")
+
+        client = Mock()
+        client.table.return_value.select.side_effect = _Query
+        loaders = (
+            (worksheet_storage, worksheet_storage._load_worksheet_list_rows),
+            (quick_exam_storage, quick_exam_storage._load_exam_list_rows),
+            (planner_storage, planner_storage._load_lesson_plan_list_rows),
+        )
+        for module, loader in loaders:
+            with self.subTest(module=module.__name__):
+                with patch.object(module, "get_sb", return_value=client), patch.object(module, "fetch_keyset_page", side_effect=fetch):
+                    page = loader("user_id", "teacher-1")
+                self.assertEqual([1], [row["id"] for row in page.rows])
+                self.assertIn("title", page.rows[0]["columns"])
+                self.assertNotIn(GALLERY_META_COLUMN, page.rows[0]["columns"])
+
+    def test_inserts_retry_without_the_column(self):
+        inserted = []
+
+        class _Insert:
+            def __init__(self, payload):
+                self.payload = payload
+
+            def execute(self):
+                _reject_gallery_meta(self.payload)
+                inserted.append(self.payload)
+                return Mock(data=[{"id": 9}])
+
+        client = Mock()
+        client.table.return_value.insert.side_effect = _Insert
+        payload = {"title": "W", "status": "active", GALLERY_META_COLUMN: {"kind": "worksheet"}}
+        with patch.object(database, "get_sb", return_value=client), self.assertLogs(database.logger, "ERROR"):
+            response = database.insert_row_with_retries("worksheets", payload, optional_columns=(GALLERY_META_COLUMN,))
+
+        self.assertEqual([{"id": 9}], response.data)
+        self.assertEqual([{"title": "W", "status": "active"}], inserted)
+
+    def test_updates_retry_without_the_column(self):
+        for module, update in (
+            (worksheet_storage, worksheet_storage._update_worksheet_row),
+            (quick_exam_storage, quick_exam_storage._update_exam_row),
+        ):
+            attempts = []
+
+            class _Query:
+                def __init__(self, payload):
+                    self.payload = payload
+
+                def eq(self, *_args):
+                    return self
+
+                def execute(self):
+                    attempts.append(self.payload)
+                    _reject_gallery_meta(self.payload)
+                    return Mock(data=[])
+
+            client = Mock()
+            client.table.return_value.update.side_effect = _Query
+            with self.subTest(module=module.__name__), patch.object(module, "get_sb", return_value=client):
+                update(5, "teacher-1", {"title": "T", GALLERY_META_COLUMN: {"kind": "exam"}})
+                self.assertEqual([{"title": "T"}], attempts[1:])
+
+                client.table.return_value.update.side_effect = RuntimeError("offline")
+                with self.assertRaises(RuntimeError):
+                    update(5, "teacher-1", {"title": "T"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,365 @@
+import threading
+import time
+import unittest
+from datetime import date, datetime
+from unittest.mock import patch
+
+from helpers import google_calendar, schedule
+
+
+class _FakeResult:
+    def __init__(self, data):
+        self.data = data
+
+
+class _FakeTableQuery:
+    """Tiny in-memory PostgREST stand-in: select/insert/update with eq/in_ filters."""
+
+    def __init__(self, db, table_name):
+        self.db = db
+        self.table_name = table_name
+        self.filters = []
+        self.action = "select"
+        self.payload = None
+        self.limit_value = None
+
+    def select(self, _columns):
+        self.action = "select"
+        return self
+
+    def insert(self, payload):
+        self.action = "insert"
+        self.payload = payload
+        return self
+
+    def update(self, payload):
+        self.action = "update"
+        self.payload = payload
+        return self
+
+    def delete(self):
+        self.action = "delete"
+        return self
+
+    def eq(self, column, value):
+        self.filters.append(lambda row: row.get(column) == value)
+        return self
+
+    def in_(self, column, values):
+        values = list(values)
+        self.filters.append(lambda row: row.get(column) in values)
+        return self
+
+    def lt(self, column, value):
+        self.filters.append(lambda row: row.get(column) is not None and row.get(column) < value)
+        return self
+
+    def order(self, _column, desc=False):
+        return self
+
+    def limit(self, value):
+        self.limit_value = value
+        return self
+
+    def execute(self):
+        self.db.calls.append((self.table_name, self.action))
+        rows = self.db.tables.setdefault(self.table_name, [])
+        if self.action == "insert":
+            row = dict(self.payload)
+            row.setdefault("id", len(rows) + 1)
+            row.setdefault("status", "pending")
+            row.setdefault("attempts", 0)
+            rows.append(row)
+            return _FakeResult([row])
+        matched = [row for row in rows if all(check(row) for check in self.filters)]
+        if self.limit_value is not None:
+            matched = matched[: self.limit_value]
+        if self.action == "update":
+            for row in matched:
+                row.update(self.payload)
+        if self.action == "delete":
+            self.db.tables[self.table_name] = [row for row in rows if not any(row is hit for hit in matched)]
+        return _FakeResult([dict(row) for row in matched])
+
+
+class _FakeSupabase:
+    def __init__(self, tables=None):
+        self.tables = tables or {}
+        self.calls = []
+
+    def table(self, table_name):
+        return _FakeTableQuery(self, table_name)
+
+
+class _FakeHttpError(Exception):
+    def __init__(self, status):
+        super().__init__(f"HTTP {status}")
+        self.resp = type("Resp", (), {"status": status})()
+
+
+class _FakeCalendarService:
+    """Records every batch sent to Google and answers each request from a script."""
+
+    def __init__(self, *, latency=0.0, failing_event_ids=(), during_first_send=None):
+        self.batches = []
+        self.latency = latency
+        self.failing_event_ids = set(failing_event_ids)
+        self.during_first_send = during_first_send
+        self._next_event = 0
+
+    def events(self):
+        service = self
+
+        class _Events:
+            def insert(self, calendarId, body, sendUpdates):
+                return ("insert", body)
+
+            def delete(self, calendarId, eventId):
+                return ("delete", eventId)
+
+        return _Events()
+
+    def new_batch_http_request(self, callback):
+        service = self
+
+        class _Batch:
+            def __init__(self):
+                self.requests = []
+
+            def add(self, request, request_id):
+                self.requests.append((request_id, request))
+
+            def execute(self):
+                time.sleep(service.latency)
+                if service.during_first_send is not None:
+                    hook, service.during_first_send = service.during_first_send, None
+                    hook()
+                service.batches.append([request for _rid, request in self.requests])
+                for request_id, (op, payload) in self.requests:
+                    if op == "delete" and payload in service.failing_event_ids:
+                        callback(request_id, None, _FakeHttpError(500))
+                    elif op == "delete" and payload == "gone":
+                        callback(request_id, None, _FakeHttpError(410))
+                    elif op == "delete":
+                        callback(request_id, "", None)
+                    else:
+                        service._next_event += 1
+                        callback(request_id, {"id": f"evt-{service._next_event}"}, None)
+
+        return _Batch()
+
+
+_TOKENS = '{"refresh_token": "r-1", "token": "t", "client_id": "c"}'
+
+
+class GcalOutboxTests(unittest.TestCase):
+    def setUp(self):
+        google_calendar.clear_calendar_service_cache()
+
+    def tearDown(self):
+        google_calendar.clear_calendar_service_cache()
+
+    def _enqueue_edits(self, fake_sb, count):
+        body = {"summary": "Classio: Ana"}
+        with patch.object(google_calendar, "get_sb", return_value=fake_sb), patch.object(
+            google_calendar, "get_current_user_id", return_value="teacher-1"
+        ), patch("core.state.get_current_user_id", return_value="teacher-1"), patch.object(
+            google_calendar, "_build_event_body", return_value=body
+        ):
+            started = time.perf_counter()
+            for idx in range(count):
+                google_calendar.enqueue_gcal_create(
+                    "Ana", datetime(2026, 1, 5, 10), 60, original_date=date(2026, 1, 5), override_id=100 + idx
+                )
+            return time.perf_counter() - started
+
+    def test_fifty_edits_enqueue_without_calendar_calls_and_drain_in_one_batch(self):
+        fake_sb = _FakeSupabase(
+            {
+                "profiles": [{"user_id": "teacher-1", "gcal_tokens": _TOKENS}],
+                "calendar_overrides": [{"id": 100 + idx, "user_id": "teacher-1"} for idx in range(50)],
+            }
+        )
+        service = _FakeCalendarService(latency=0.05)
+        builds = []
+
+        def factory(tokens):
+            builds.append(tokens)
+            return service
+
+        save_seconds = self._enqueue_edits(fake_sb, 50)
+
+        self.assertEqual([], service.batches)
+        self.assertEqual(50, sum(1 for call in fake_sb.calls if call == ("gcal_outbox", "insert")))
+        self.assertLess(save_seconds, 0.05 * 50)
+
+        summary = google_calendar.drain_gcal_outbox(fake_sb, service_factory=factory)
+
+        self.assertEqual({"processed": 50, "done": 50, "failed": 0, "skipped": 0, "superseded": 0, "batches": 1}, summary)
+        self.assertEqual(1, len(service.batches))
+        self.assertEqual(50, len(service.batches[0]))
+        self.assertEqual(1, len(builds))
+        self.assertEqual(1, sum(1 for call in fake_sb.calls if call[0] == "profiles"))
+        self.assertEqual("evt-1", fake_sb.tables["calendar_overrides"][0]["gcal_event_id"])
+        self.assertTrue(all(row["status"] == "done" for row in fake_sb.tables["gcal_outbox"]))
+
+    def test_batches_split_at_google_limit_and_service_is_reused_across_drains(self):
+        fake_sb = _FakeSupabase({"profiles": [{"user_id": "teacher-1", "gcal_tokens": _TOKENS}], "calendar_overrides": []})
+        service = _FakeCalendarService()
+        builds = []
+
+        def factory(tokens):
+            builds.append(tokens)
+            return service
+
+        self._enqueue_edits(fake_sb, 60)
+        first = google_calendar.drain_gcal_outbox(fake_sb, service_factory=factory)
+        self._enqueue_edits(fake_sb, 3)
+        second = google_calendar.drain_gcal_outbox(fake_sb, service_factory=factory)
+
+        self.assertEqual(2, first["batches"])
+        self.assertEqual([50, 10, 3], [len(batch) for batch in service.batches])
+        self.assertEqual(3, second["done"])
+        self.assertEqual(1, len(builds))
+
+    def test_failures_retry_and_missing_events_count_as_deleted(self):
+        fake_sb = _FakeSupabase(
+            {
+                "profiles": [{"user_id": "teacher-1", "gcal_tokens": _TOKENS}],
+                "gcal_outbox": [
+                    {"id": 1, "user_id": "teacher-1", "op": "delete", "gcal_event_id": "gone", "status": "pending", "attempts": 0},
+                    {"id": 2, "user_id": "teacher-1", "op": "delete", "gcal_event_id": "boom", "status": "pending", "attempts": 0},
+                    {"id": 3, "user_id": "teacher-2", "op": "delete", "gcal_event_id": "x", "status": "pending", "attempts": 0},
+                ],
+            }
+        )
+        service = _FakeCalendarService(failing_event_ids={"boom"})
+
+        summary = google_calendar.drain_gcal_outbox(fake_sb, service_factory=lambda _tokens: service)
+
+        rows = {row["id"]: row for row in fake_sb.tables["gcal_outbox"]}
+        self.assertEqual({"processed": 3, "done": 1, "failed": 1, "skipped": 1, "superseded": 0, "batches": 1}, summary)
+        self.assertEqual("done", rows[1]["status"])
+        self.assertEqual(("pending", 1), (rows[2]["status"], rows[2]["attempts"]))
+        self.assertEqual("skipped", rows[3]["status"])
+
+    def test_reschedule_supersedes_queued_create(self):
+        fake_sb = _FakeSupabase({"gcal_outbox": []})
+        self._enqueue_edits(fake_sb, 1)
+        with patch.object(google_calendar, "get_sb", return_value=fake_sb), patch.object(
+            google_calendar, "get_current_user_id", return_value="teacher-1"
+        ):
+            google_calendar.supersede_pending_gcal_creates("Ana", date(2026, 1, 5))
+
+        self.assertEqual("superseded", fake_sb.tables["gcal_outbox"][0]["status"])
+
+    def test_deleting_override_supersedes_its_queued_create(self):
+        fake_sb = _FakeSupabase(
+            {
+                "profiles": [{"user_id": "teacher-1", "gcal_tokens": _TOKENS}],
+                "calendar_overrides": [
+                    {"id": 100, "user_id": "teacher-1", "student": "Ana"},
+                    {"id": 101, "user_id": "teacher-1", "student": "Ana"},
+                ],
+            }
+        )
+        self._enqueue_edits(fake_sb, 2)
+        with patch.object(google_calendar, "get_sb", return_value=fake_sb), patch.object(
+            google_calendar, "get_current_user_id", return_value="teacher-1"
+        ), patch.object(schedule, "get_sb", return_value=fake_sb), patch.object(
+            schedule, "get_current_user_id", return_value="teacher-1"
+        ), patch.object(schedule, "clear_app_caches"):
+            schedule.delete_override(100)
+
+        service = _FakeCalendarService()
+        summary = google_calendar.drain_gcal_outbox(fake_sb, service_factory=lambda _tokens: service)
+
+        statuses = {row["override_id"]: row["status"] for row in fake_sb.tables["gcal_outbox"]}
+        self.assertEqual({100: "superseded", 101: "done"}, statuses)
+        self.assertEqual(1, summary["processed"])
+        self.assertEqual([101], [row["id"] for row in fake_sb.tables["calendar_overrides"]])
+
+    def test_overlapping_drains_send_each_row_once(self):
+        fake_sb = _FakeSupabase({"profiles": [{"user_id": "teacher-1", "gcal_tokens": _TOKENS}], "calendar_overrides": []})
+        self._enqueue_edits(fake_sb, 3)
+        overlapping = []
+        service = _FakeCalendarService(
+            during_first_send=lambda: overlapping.append(
+                google_calendar.drain_gcal_outbox(fake_sb, service_factory=lambda _tokens: service)
+            )
+        )
+
+        summary = google_calendar.drain_gcal_outbox(fake_sb, service_factory=lambda _tokens: service)
+
+        self.assertEqual(0, overlapping[0]["processed"])
+        self.assertEqual(3, summary["done"])
+        self.assertEqual([3], [len(batch) for batch in service.batches])
+        self.assertTrue(all(row["status"] == "done" for row in fake_sb.tables["gcal_outbox"]))
+
+    def test_create_superseded_mid_send_is_not_marked_done_and_its_event_is_removed(self):
+        fake_sb = _FakeSupabase(
+            {
+                "profiles": [{"user_id": "teacher-1", "gcal_tokens": _TOKENS}],
+                "calendar_overrides": [{"id": 100, "user_id": "teacher-1", "student": "Ana"}],
+            }
+        )
+        self._enqueue_edits(fake_sb, 1)
+
+        def delete_override():
+            with patch.object(google_calendar, "get_sb", return_value=fake_sb), patch.object(
+                google_calendar, "get_current_user_id", return_value="teacher-1"
+            ):
+                google_calendar.supersede_pending_gcal_creates_for_override(100)
+
+        service = _FakeCalendarService(during_first_send=delete_override)
+        summary = google_calendar.drain_gcal_outbox(fake_sb, service_factory=lambda _tokens: service)
+
+        row = fake_sb.tables["gcal_outbox"][0]
+        self.assertEqual(("superseded", None), (row["status"], row.get("gcal_event_id")))
+        self.assertNotIn("gcal_event_id", fake_sb.tables["calendar_overrides"][0])
+        self.assertEqual({"done": 0, "superseded": 1, "batches": 2}, {key: summary[key] for key in ("done", "superseded", "batches")})
+        self.assertEqual([("delete", "evt-1")], service.batches[1])
+
+    def test_stale_claims_are_requeued(self):
+        fake_sb = _FakeSupabase(
+            {
+                "profiles": [{"user_id": "teacher-1", "gcal_tokens": _TOKENS}],
+                "gcal_outbox": [
+                    {"id": 1, "user_id": "teacher-1", "op": "delete", "gcal_event_id": "a", "status": "sending",
+                     "claimed_at": "2000-01-01T00:00:00+00:00", "attempts": 0},
+                    {"id": 2, "user_id": "teacher-1", "op": "delete", "gcal_event_id": "b", "status": "sending",
+                     "claimed_at": "2999-01-01T00:00:00+00:00", "attempts": 0},
+                ],
+            }
+        )
+        service = _FakeCalendarService()
+
+        summary = google_calendar.drain_gcal_outbox(fake_sb, service_factory=lambda _tokens: service)
+
+        self.assertEqual(1, summary["done"])
+        self.assertEqual(["done", "sending"], [row["status"] for row in fake_sb.tables["gcal_outbox"]])
+
+    def test_cached_service_is_used_by_one_thread_at_a_time(self):
+        active, overlaps = [], []
+        tokens = {"refresh_token": "r-1"}
+
+        def use_service():
+            with google_calendar.calendar_service(tokens, factory=lambda _tokens: object()) as service:
+                active.append(service)
+                if len(active) > 1:
+                    overlaps.append(len(active))
+                time.sleep(0.01)
+                active.remove(service)
+
+        threads = [threading.Thread(target=use_service) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual([], overlaps)
+        self.assertEqual(1, len(google_calendar._SERVICE_CACHE))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+import random
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from helpers import goal_optimizer
+
+
+def _random_goal_fixtures(count=300, seed=7):
+    rng = random.Random(seed)
+    fixtures = []
+    for _ in range(count):
+        baseline = rng.uniform(0.0, 500_000.0)
+        fixtures.append(
+            {
+                "gap": rng.choice([0.0, 25.0, rng.uniform(0.0, 1.2) * baseline]),
+                "baseline_projection": baseline,
+                "avg_package_value": rng.choice([0.0, rng.uniform(500.0, 20_000.0)]),
+                "effective_rate": rng.uniform(0.0, 2_000.0),
+                "weeks_left": rng.uniform(1.0, 52.0),
+                "renewal_pool": rng.choice([0.0, rng.uniform(0.0, 50_000.0)]),
+            }
+        )
+    return fixtures
+
+
+def _factors(fixture):
+    return goal_optimizer._action_factors(
+        fixture["baseline_projection"],
+        fixture["avg_package_value"],
+        fixture["effective_rate"],
+        fixture["weeks_left"],
+        fixture["renewal_pool"],
+    )
+
+
+class GoalOptimizerTests(unittest.TestCase):
+    def test_solver_satisfies_box_constrained_optimality_conditions(self):
+        high = goal_optimizer._ACTION_BOUNDS[:, 1]
+        for fixture in _random_goal_fixtures():
+            x, impacts = goal_optimizer._optimize_actions(**fixture)
+            x = np.array(x)
+            self.assertTrue(np.all(x >= 0.0) and np.all(x <= high + 1e-12))
+            if fixture["gap"] <= 0:
+                self.assertEqual([0.0] * 4, impacts)
+                continue
+            factors = _factors(fixture)
+            costs = goal_optimizer._action_effort_costs(fixture["gap"])
+            remaining = max(0.0, fixture["gap"] - float(x @ factors))
+            gradient = -2.0 * remaining * factors + 2.0 * costs * x
+            scale = max(1.0, fixture["gap"]) ** 2
+            interior = x < high - 1e-9
+            np.testing.assert_allclose(gradient[interior] / scale, 0.0, atol=1e-6)
+            self.assertTrue(np.all(gradient[~interior] / scale <= 1e-6))
+            np.testing.assert_allclose(impacts, x * factors)
+
+    def test_solver_never_loses_to_reference_descent(self):
+        for fixture in _random_goal_fixtures(count=120, seed=11):
+            factors = _factors(fixture)
+            x, _ = goal_optimizer._optimize_actions(**fixture)
+            reference, _ = goal_optimizer._optimize_actions_reference(**fixture)
+            solved = float(goal_optimizer._action_loss(np.array(x), fixture["gap"], factors))
+            oracle = float(goal_optimizer._action_loss(np.array(reference), fixture["gap"], factors))
+            self.assertLessEqual(solved, oracle * (1.0 + 1e-9) + 1e-6)
+
+    def test_build_goal_optimization_closes_part_of_the_gap(self):
+        payments = pd.DataFrame(
+            {
+                "student": ["Ana", "Ana", "Ben", "Cem"],
+                "paid_amount": [4000, 4200, 6000, 3000],
+                "payment_date": ["2026-01-10", "2026-03-10", "2026-02-01", "2026-04-01"],
+            }
+        )
+        forecast = pd.DataFrame({"Student": ["Ana", "Ben"], "Lessons_Left_Units": [1, 6], "Due_Now": [True, False]})
+        result = goal_optimizer.build_goal_optimization(
+            goal=200_000,
+            baseline_projection=150_000,
+            ytd_income=90_000,
+            expected_future=60_000,
+            effective_rate=900,
+            payments_df=payments,
+            forecast_df=forecast,
+            today=pd.Timestamp("2026-06-01"),
+        )
+
+        self.assertGreater(result.optimized_projection, result.baseline_projection)
+        self.assertLess(result.remaining_gap, result.gap)
+        self.assertAlmostEqual(
+            result.optimized_projection - result.baseline_projection,
+            result.price_impact + result.growth_impact + result.capacity_impact + result.renewal_impact,
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,132 @@
+import re
+import time
+import unittest
+from unittest.mock import patch
+
+from helpers import keyset_pagination, worksheet_storage
+from helpers.keyset_pagination import KeysetCursor, KeysetFeed, KeysetPage, fetch_keyset_page
+
+
+def _library(count=25):
+    # Four rows share each timestamp so ties have to be broken by id.
+    return [
+        {"id": f"{idx:04d}", "user_id": "teacher-1", "is_public": True, "created_at": f"2026-03-{1 + idx // 4:02d}T08:00:00+00:00"}
+        for idx in range(count)
+    ]
+
+
+class _FakeResult:
+    def __init__(self, data):
+        self.data = data
+
+
+class _FakeQuery:
+    def __init__(self, db, table):
+        self.db = db
+        self.table = table
+        self.filters = []
+        self.orders = []
+        self.row_limit = None
+
+    def select(self, _columns):
+        return self
+
+    def eq(self, column, value):
+        self.filters.append(lambda row: row.get(column) == value)
+        return self
+
+    def lte(self, column, value):
+        self.filters.append(lambda row: row.get(column) <= value)
+        return self
+
+    def or_(self, expression):
+        match = re.fullmatch(r'created_at\.lt\."(.+)",and\(created_at\.eq\."(.+)",id\.lt\."(.+)"\)', expression)
+        created_at, _same, row_id = match.groups()
+        self.filters.append(
+            lambda row: row["created_at"] < created_at or (row["created_at"] == created_at and row["id"] < row_id)
+        )
+        return self
+
+    def order(self, column, desc=False):
+        self.orders.append((column, desc))
+        return self
+
+    def limit(self, value):
+        self.row_limit = value
+        return self
+
+    def execute(self):
+        self.db.calls.append(self.table)
+        rows = [row for row in self.db.rows if all(check(row) for check in self.filters)]
+        for column, desc in reversed(self.orders):
+            rows.sort(key=lambda row: row[column], reverse=desc)
+        return _FakeResult(rows[: self.row_limit])
+
+
+class _FakeSupabase:
+    def __init__(self, rows):
+        self.rows = rows
+        self.calls = []
+
+    def table(self, name):
+        return _FakeQuery(self, name)
+
+
+class KeysetPaginationTests(unittest.TestCase):
+    def tearDown(self):
+        worksheet_storage._load_my_worksheets_page_cached.clear()
+        worksheet_storage._load_my_worksheets_cached.clear()
+
+    def test_pages_visit_every_row_once_in_key_order(self):
+        fake_sb = _FakeSupabase(_library())
+        seen = []
+        token = ""
+        while True:
+            page = fetch_keyset_page(fake_sb.table("worksheets").select("*"), token, page_size=6)
+            seen.extend(row["id"] for row in page.rows)
+            token = page.next_token
+            if not token:
+                break
+
+        expected = [row["id"] for row in sorted(_library(), key=lambda row: (row["created_at"], row["id"]), reverse=True)]
+        self.assertEqual(expected, seen)
+        self.assertEqual(5, len(fake_sb.calls))
+
+    def test_cursor_token_round_trips(self):
+        cursor = KeysetCursor.after({"created_at": "2026-03-01T08:00:00+00:00", "id": 42})
+
+        self.assertEqual(cursor, KeysetCursor.from_token(cursor.token()))
+        self.assertIsNone(KeysetCursor.from_token(""))
+
+    def test_loading_one_more_page_costs_one_query(self):
+        fake_sb = _FakeSupabase(_library())
+        with patch.object(worksheet_storage, "get_sb", return_value=fake_sb):
+            first = worksheet_storage._load_my_worksheets_cached("teacher-1", limit=6, pages=1)
+            second = worksheet_storage._load_my_worksheets_cached("teacher-1", limit=6, pages=2)
+            has_more = worksheet_storage.MY_WORKSHEETS_FEED.has_more("teacher-1", 2, page_size=6)
+
+        self.assertEqual((6, 12), (len(first), len(second)))
+        self.assertEqual(list(first["id"]), list(second["id"])[:6])
+        self.assertEqual(2, len(fake_sb.calls))
+        self.assertTrue(has_more)
+
+    def test_prefetch_loads_the_next_page_in_the_background(self):
+        calls = []
+
+        def _load_page(scope, token, page_size):
+            calls.append(token)
+            return KeysetPage([{"id": token or "first"}], "" if token else "cursor-1")
+
+        feed = KeysetFeed(_load_page, page_size=1)
+        self.assertTrue(feed.prefetch("teacher-1", 1))
+        deadline = time.monotonic() + 2
+        while keyset_pagination._PREFETCH_INFLIGHT and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        self.assertIn("cursor-1", calls)
+        self.assertEqual(([{"id": "first"}, {"id": "cursor-1"}], False), feed.window("teacher-1", 3))
+        self.assertFalse(keyset_pagination._PREFETCH_INFLIGHT)
+
+
+if __name__ == "__main__":
+    unittest.main()
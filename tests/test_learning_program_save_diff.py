@@ -0,0 +1,233 @@
+import unittest
+from unittest.mock import patch
+
+from helpers import learning_programs
+
+
+class _FakeResult:
+    def __init__(self, data):
+        self.data = data
+
+
+class _FakeTableQuery:
+    """In-memory PostgREST stand-in that understands the program/unit/topic embed."""
+
+    def __init__(self, db, table_name):
+        self.db = db
+        self.table_name = table_name
+        self.filters = []
+        self.action = "select"
+        self.columns = "*"
+        self.payload = None
+        self.limit_value = None
+
+    def select(self, columns="*"):
+        self.action = "select"
+        self.columns = columns
+        return self
+
+    def insert(self, payload):
+        self.action = "insert"
+        self.payload = payload
+        return self
+
+    def upsert(self, payload, on_conflict=""):
+        self.action = "upsert"
+        self.payload = payload
+        return self
+
+    def update(self, payload):
+        self.action = "update"
+        self.payload = payload
+        return self
+
+    def delete(self):
+        self.action = "delete"
+        return self
+
+    def eq(self, column, value):
+        self.filters.append(lambda row: row.get(column) == value)
+        return self
+
+    def in_(self, column, values):
+        values = list(values)
+        self.filters.append(lambda row: row.get(column) in values)
+        return self
+
+    def order(self, _column, desc=False):
+        return self
+
+    def limit(self, value):
+        self.limit_value = value
+        return self
+
+    def _embed(self, row):
+        row = dict(row)
+        if self.db.nested and "units:learning_program_units(" in self.columns:
+            row["units"] = [dict(unit) for unit in self.db.tables["learning_program_units"] if unit["program_id"] == row["id"]]
+            row["topics"] = [dict(topic) for topic in self.db.tables["learning_program_topics"] if topic["program_id"] == row["id"]]
+        return row
+
+    def execute(self):
+        rows = self.db.tables.setdefault(self.table_name, [])
+        if self.action in {"insert", "upsert"}:
+            batch = self.payload if isinstance(self.payload, list) else [self.payload]
+            self.db.calls.append((self.table_name, self.action, len(batch)))
+            written = []
+            for item in batch:
+                existing = next((row for row in rows if item.get("id") and row["id"] == item["id"]), None)
+                if existing is not None:
+                    existing.update(item)
+                    written.append(dict(existing))
+                    continue
+                self.db.next_id += 1
+                row = {"id": self.db.next_id, **item}
+                rows.append(row)
+                written.append(dict(row))
+            return _FakeResult(written)
+        matched = [row for row in rows if all(check(row) for check in self.filters)]
+        if self.limit_value is not None:
+            matched = matched[: self.limit_value]
+        self.db.calls.append((self.table_name, self.action, len(matched)))
+        if self.action == "update":
+            for row in matched:
+                row.update(self.payload)
+        if self.action == "delete":
+            self.db.tables[self.table_name] = [row for row in rows if row not in matched]
+        if self.action == "select":
+            return _FakeResult([self._embed(row) for row in matched])
+        return _FakeResult([dict(row) for row in matched])
+
+
+class _FakeSupabase:
+    def __init__(self, *, nested=True):
+        self.nested = nested
+        self.next_id = 1000
+        self.calls = []
+        self.tables = {
+            "learning_programs": [
+                {"id": 7, "user_id": "teacher-1", "title": "English A2", "updated_at": "2026-01-01T00:00:00+00:00"}
+            ],
+            "learning_program_units": [],
+            "learning_program_topics": [],
+        }
+
+    def table(self, table_name):
+        return _FakeTableQuery(self, table_name)
+
+
+def _program(unit_count=12, topics_per_unit=3):
+    return {
+        "title": "English A2",
+        "units": [
+            {
+                "unit_number": unit_number,
+                "title": f"Unit {unit_number}",
+                "overview": f"Overview {unit_number}",
+                "topics": [
+                    {"topic_number": topic_number, "title": f"Topic {unit_number}.{topic_number}"}
+                    for topic_number in range(1, topics_per_unit + 1)
+                ],
+            }
+            for unit_number in range(1, unit_count + 1)
+        ],
+    }
+
+
+class LearningProgramSaveDiffTests(unittest.TestCase):
+    def _save(self, fake_sb, program, **kwargs):
+        with patch.object(learning_programs, "get_sb", return_value=fake_sb), patch.object(
+            learning_programs, "get_current_user_id", return_value="teacher-1"
+        ), patch("core.state.get_current_user_id", return_value="teacher-1"), patch.object(
+            learning_programs, "clear_app_caches"
+        ):
+            return learning_programs.update_learning_program(
+                program_id=7,
+                subject="english",
+                learner_stage="upper_primary",
+                level_or_band="A2",
+                program=program,
+                program_language="en",
+                student_material_language="en",
+                sequence_group_id="english-upper-primary",
+                sequence_order=2,
+                **kwargs,
+            )
+
+    def _load(self, fake_sb):
+        learning_programs.load_learning_program.clear()
+        try:
+            with patch.object(learning_programs, "get_sb", return_value=fake_sb):
+                return learning_programs.load_learning_program(7)
+        finally:
+            learning_programs.load_learning_program.clear()
+
+    def test_single_topic_title_edit_writes_one_row(self):
+        fake_sb = _FakeSupabase()
+        self.assertEqual((True, "updated"), self._save(fake_sb, _program()))
+        self.assertEqual(12, len(fake_sb.tables["learning_program_units"]))
+        self.assertEqual(36, len(fake_sb.tables["learning_program_topics"]))
+
+        loaded = self._load(fake_sb)
+        loaded["units"][4]["topics"][1]["title"] = "Past simple questions"
+        fake_sb.calls.clear()
+
+        ok, message = self._save(fake_sb, loaded, expected_updated_at=loaded["updated_at"])
+
+        self.assertEqual((True, "updated"), (ok, message))
+        self.assertEqual(
+            [
+                ("learning_programs", "select", 1),
+                ("learning_programs", "update", 1),
+                ("learning_program_topics", "upsert", 1),
+            ],
+            fake_sb.calls,
+        )
+        row_writes = sum(count for _table, action, count in fake_sb.calls if action != "select")
+        self.assertEqual(2, row_writes)
+        topic = next(row for row in fake_sb.tables["learning_program_topics"] if row["title"] == "Past simple questions")
+        self.assertEqual((5, 2), (topic["unit_number"], topic["topic_number"]))
+        self.assertEqual(36, len(fake_sb.tables["learning_program_topics"]))
+
+    def test_removed_units_and_topics_are_deleted_in_one_call_each(self):
+        fake_sb = _FakeSupabase()
+        self._save(fake_sb, _program())
+        loaded = self._load(fake_sb)
+        loaded["units"] = loaded["units"][:10]
+        loaded["units"][0]["topics"] = loaded["units"][0]["topics"][:2]
+        fake_sb.calls.clear()
+
+        self.assertEqual((True, "updated"), self._save(fake_sb, loaded))
+
+        deletes = [call for call in fake_sb.calls if call[1] == "delete"]
+        self.assertEqual([("learning_program_topics", "delete", 7), ("learning_program_units", "delete", 2)], deletes)
+        self.assertEqual(10, len(fake_sb.tables["learning_program_units"]))
+        self.assertEqual(29, len(fake_sb.tables["learning_program_topics"]))
+
+    def test_stale_version_is_rejected_without_writes(self):
+        fake_sb = _FakeSupabase()
+        self._save(fake_sb, _program(unit_count=2))
+        loaded = self._load(fake_sb)
+        fake_sb.tables["learning_programs"][0]["updated_at"] = "2026-02-01T00:00:00+00:00"
+        fake_sb.calls.clear()
+
+        result = self._save(fake_sb, loaded, expected_updated_at=loaded["updated_at"])
+
+        self.assertEqual((False, learning_programs.LEARNING_PROGRAM_VERSION_CONFLICT), result)
+        self.assertEqual([("learning_programs", "select", 1)], fake_sb.calls)
+
+    def test_load_falls_back_to_flat_queries_without_embeds(self):
+        fake_sb = _FakeSupabase()
+        self._save(fake_sb, _program(unit_count=3))
+        fake_sb.nested = False
+        fake_sb.calls.clear()
+
+        loaded = self._load(fake_sb)
+
+        self.assertEqual(3, len(loaded["units"]))
+        self.assertEqual(["Topic 2.1", "Topic 2.2", "Topic 2.3"], [topic["title"] for topic in loaded["units"][1]["topics"]])
+        self.assertEqual(4, sum(1 for call in fake_sb.calls if call[1] == "select"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+import random
+import unittest
+from unittest.mock import patch
+
+from helpers import material_recommendations
+from helpers.minhash_lsh import MinHashLSHIndex
+
+
+_TOPICS = [
+    "farm animals", "wild animals", "past simple", "present perfect", "fractions", "decimals",
+    "the water cycle", "photosynthesis", "family members", "daily routines", "weather and seasons",
+    "food and drinks", "irregular verbs", "comparatives and superlatives", "multiplication tables",
+    "volcanoes", "solar system", "body parts", "clothes shopping", "telling the time",
+]
+_LEVELS = ["A1", "A2", "B1"]
+_TYPES = ["multiple_choice", "true_false", "matching", "short_answer"]
+
+
+def _fixture_pool(size=400, seed=11):
+    rng = random.Random(seed)
+    pool = []
+    for idx in range(size):
+        topic = rng.choice(_TOPICS)
+        row = {
+            "id": idx,
+            "title": f"{topic.title()} {rng.choice(['practice', 'review', 'challenge'])}",
+            "topic": topic if idx % 11 else "",
+            "subject": "English" if idx % 3 else "Science",
+            "learner_stage": "upper_primary",
+            "level_or_band": rng.choice(_LEVELS),
+            "worksheet_type": rng.choice(_TYPES),
+        }
+        pool.append(
+            {
+                "kind": "worksheet",
+                "source": "own" if idx % 5 == 0 else "community",
+                "row": row,
+                "search_text": material_recommendations._resource_search_text(row, "worksheet"),
+                "tokens": material_recommendations._resource_tokens(row, "worksheet"),
+            }
+        )
+    return pool
+
+
+def _request(topic, worksheet_type="multiple_choice", level="A2", subject="English"):
+    return material_recommendations.build_generation_request(
+        kind="worksheet",
+        subject=subject,
+        learner_stage="upper_primary",
+        level_or_band=level,
+        topic=topic,
+        worksheet_type=worksheet_type,
+    )
+
+
+class MaterialLSHRecallTests(unittest.TestCase):
+    def setUp(self):
+        self.pool = _fixture_pool()
+        self.index = MinHashLSHIndex([material_recommendations._resource_shingles(item["row"]) for item in self.pool])
+
+    def _matches(self, request, *, index):
+        cached = {"resources": self.pool, "index": index}
+        with patch.object(material_recommendations, "_load_material_pool_cached", return_value=cached), patch.object(
+            material_recommendations, "resource_affinity_score", return_value=(0.0, {})
+        ):
+            return material_recommendations.find_similar_materials(request, limit=len(self.pool))
+
+    def test_reuse_gate_recall_matches_linear_scan_on_fixture_pool(self):
+        requests = [_request(topic) for topic in _TOPICS]
+        requests += [_request(topic, "true_false", "A1") for topic in _TOPICS[::4]]
+        requests += [_request("animals", "matching", "B1"), _request("verbs", "short_answer", "A2")]
+        expected_total = 0
+        recalled_total = 0
+        for request in requests:
+            linear = self._matches(request, index=None)
+            indexed = self._matches(request, index=self.index)
+            expected = {item["row"]["id"] for item in linear if item["recommendation_bucket"] == "very_close"}
+            recalled = {item["row"]["id"] for item in indexed if item["recommendation_bucket"] == "very_close"}
+            expected_total += len(expected)
+            recalled_total += len(expected & recalled)
+            self.assertEqual(
+                material_recommendations.has_strong_material_match(linear),
+                material_recommendations.has_strong_material_match(indexed),
+                msg=request["topic"],
+            )
+            if expected:
+                self.assertEqual([item["row"]["id"] for item in linear[:3]], [item["row"]["id"] for item in indexed[:3]])
+
+        self.assertGreater(expected_total, 0)
+        self.assertEqual(expected_total, recalled_total)
+
+    def test_index_narrows_candidates_and_keeps_unindexed_rows(self):
+        request = _request("photosynthesis")
+        positions = self.index.query(material_recommendations._request_shingles(request))
+
+        self.assertLess(len(positions), len(self.pool) / 4)
+        unindexed = [idx for idx, item in enumerate(self.pool) if not material_recommendations._resource_shingles(item["row"])]
+        self.assertTrue(set(unindexed) <= set(positions.tolist()))
+
+    def test_request_without_topic_scans_whole_pool(self):
+        cached = {"resources": self.pool, "index": self.index}
+        with patch.object(material_recommendations, "_load_material_pool_cached", return_value=cached):
+            candidates = material_recommendations._material_candidates(_request(""))
+
+        self.assertEqual(len(self.pool), len(candidates))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,171 @@
+import datetime
+import unittest
+from unittest.mock import patch
+from zoneinfo import ZoneInfo
+
+import pandas as pd
+
+from helpers import goals, schedule
+
+ISTANBUL = ZoneInfo("Europe/Istanbul")
+
+
+def _now(text, tz=ISTANBUL):
+    return pd.Timestamp(text, tz=tz)
+
+
+def _schedules(*rows):
+    return pd.DataFrame(
+        [
+            {"id": idx, "student": student, "weekday": weekday, "time": time, "duration_minutes": 60, "active": active, "timezone": tz}
+            for idx, (student, weekday, time, tz, active) in enumerate(rows, start=1)
+        ]
+    )
+
+
+def _freezes(*rows):
+    return pd.DataFrame(
+        [
+            {"student": student, "start_date": start, "end_date": end, "active": active}
+            for student, start, end, active in rows
+        ]
+    )
+
+
+class _Query:
+    def __getattr__(self, _name):
+        return lambda *_args, **_kwargs: self
+
+    def execute(self):
+        return type("Result", (), {"data": [{"id": 1}]})()
+
+
+class _Client:
+    def table(self, _name):
+        return _Query()
+
+
+class NextLessonFromFramesTests(unittest.TestCase):
+    def test_slot_already_passed_today_rolls_to_next_week(self):
+        # 2026-10-19 is a Monday.
+        sched = _schedules(("Ana", 0, "09:00", "Europe/Istanbul", True), ("Ben", 0, "18:30", "Europe/Istanbul", False))
+
+        self.assertEqual(pd.Timestamp("2026-10-26 09:00"), schedule._next_lesson_from_frames(sched, None, None, _now("2026-10-19 10:00")))
+        self.assertEqual(pd.Timestamp("2026-10-19 09:00"), schedule._next_lesson_from_frames(sched, None, None, _now("2026-10-19 09:00")))
+
+    def test_schedules_are_placed_in_their_own_timezone(self):
+        # Monday 10:00 New York (EDT, UTC-4) is Monday 17:00 in Istanbul (UTC+3).
+        sched = _schedules(("Ana", 0, "10:00", "America/New_York", True))
+        self.assertEqual(pd.Timestamp("2026-10-19 17:00"), schedule._next_lesson_from_frames(sched, None, None, _now("2026-10-19 12:00")))
+
+        # Sunday 22:00 in New York is already Monday 05:00 in Istanbul.
+        sched = _schedules(("Ana", 6, "22:00", "America/New_York", True))
+        self.assertEqual(pd.Timestamp("2026-10-19 05:00"), schedule._next_lesson_from_frames(sched, None, None, _now("2026-10-19 01:00")))
+
+        # After New York leaves DST (2026-11-01) the same slot is an hour later.
+        sched = _schedules(("Ana", 0, "10:00", "America/New_York", True))
+        self.assertEqual(pd.Timestamp("2026-11-02 18:00"), schedule._next_lesson_from_frames(sched, None, None, _now("2026-10-27 12:00")))
+
+    def test_dst_gaps_and_repeats_match_zoneinfo(self):
+        berlin = ZoneInfo("Europe/Berlin")
+        sched = _schedules(("Ana", 6, "02:30", "Europe/Berlin", True))
+        for now_text in ("2027-03-27 12:00", "2026-10-24 12:00"):
+            with self.subTest(now=now_text):
+                now = _now(now_text, tz=berlin)
+                day = (now + pd.Timedelta(days=1)).date()
+                wall = datetime.datetime(day.year, day.month, day.day, 2, 30, tzinfo=berlin)
+                expected = pd.Timestamp(wall.astimezone(datetime.timezone.utc)).tz_convert(berlin).tz_localize(None)
+
+                self.assertEqual(expected, schedule._next_lesson_from_frames(sched, None, None, now))
+
+    def test_freeze_windows_skip_a_students_lessons(self):
+        sched = _schedules(("Ana", 1, "09:00", "Europe/Istanbul", True), ("Ben", 3, "09:00", "Europe/Istanbul", True))
+        now = _now("2026-10-19 10:00")
+
+        # Ana is paused through next Tuesday (inclusive); Ben's Thursday comes first.
+        freezes = _freezes((" ana ", datetime.date(2026, 10, 19), datetime.date(2026, 10, 20), True))
+        self.assertEqual(pd.Timestamp("2026-10-22 09:00"), schedule._next_lesson_from_frames(sched, None, freezes, now))
+
+        # Both paused with open-ended freezes: no lesson at all.
+        freezes = _freezes(("Ana", None, None, True), ("BEN", datetime.date(2026, 10, 1), None, True))
+        self.assertIsNone(schedule._next_lesson_from_frames(sched, None, freezes, now))
+
+        # A resumed freeze no longer hides anything; a finished one ends after its last day.
+        freezes = _freezes(("Ana", None, None, False), ("Ben", datetime.date(2026, 10, 1), datetime.date(2026, 10, 19), True))
+        self.assertEqual(pd.Timestamp("2026-10-20 09:00"), schedule._next_lesson_from_frames(sched, None, freezes, now))
+
+    def test_overrides_move_and_cancel_recurring_slots(self):
+        sched = _schedules(("Ana", 1, "09:00", "Europe/Istanbul", True))
+        now = _now("2026-10-19 10:00")
+        overrides = pd.DataFrame(
+            [
+                {"student": "Ana", "original_date": pd.Timestamp("2026-10-20"), "new_datetime": pd.NaT, "status": "cancelled"},
+                {"student": "Ana", "original_date": pd.Timestamp("2026-10-27"), "new_datetime": pd.Timestamp("2026-10-25 16:00"), "status": "scheduled"},
+                {"student": "Ben", "original_date": pd.Timestamp("2026-10-01"), "new_datetime": pd.Timestamp("2026-10-19 09:59"), "status": "scheduled"},
+            ]
+        )
+        self.assertEqual(pd.Timestamp("2026-10-25 16:00"), schedule._next_lesson_from_frames(sched, overrides, None, now))
+
+        # The moved lesson itself falls inside a freeze, so the week after is next.
+        freezes = _freezes(("Ana", datetime.date(2026, 10, 25), datetime.date(2026, 10, 25), True))
+        self.assertEqual(pd.Timestamp("2026-11-03 09:00"), schedule._next_lesson_from_frames(sched, overrides, freezes, now))
+
+
+class NextLessonIndexTests(unittest.TestCase):
+    def setUp(self):
+        schedule._NEXT_LESSON_INDEX.clear()
+        self.loads = 0
+        self.now = _now("2026-10-19 10:00")
+        self.sched = _schedules(("Ana", 0, "18:00", "Europe/Istanbul", True))
+
+    def tearDown(self):
+        schedule._NEXT_LESSON_INDEX.clear()
+
+    def _load_schedules(self):
+        self.loads += 1
+        return self.sched
+
+    def _next(self, now=None):
+        with patch.object(schedule, "get_current_user_id", return_value="teacher-1"), patch.object(
+            schedule, "get_app_tz", return_value=ISTANBUL
+        ), patch.object(schedule, "now_local", return_value=(now or self.now).to_pydatetime()), patch.object(
+            schedule, "load_schedules", side_effect=self._load_schedules
+        ), patch.object(schedule, "load_overrides", return_value=pd.DataFrame()), patch.object(
+            schedule, "load_schedule_freezes", return_value=pd.DataFrame()
+        ):
+            return schedule.next_lesson_datetime()
+
+    def test_index_is_reused_until_the_lesson_starts(self):
+        self.assertEqual(pd.Timestamp("2026-10-19 18:00"), self._next())
+        self.assertEqual(pd.Timestamp("2026-10-19 18:00"), self._next(_now("2026-10-19 17:59")))
+        self.assertEqual(1, self.loads)
+
+        self.assertEqual(pd.Timestamp("2026-10-26 18:00"), self._next(_now("2026-10-19 18:01")))
+        self.assertEqual(2, self.loads)
+
+    def test_schedule_writes_drop_the_index(self):
+        writes = {
+            "add_schedule": lambda: schedule.add_schedule("Ana", 2, "08:00", 60),
+            "add_override": lambda: schedule.add_override("Ana", datetime.date(2026, 10, 19), None, status="cancelled"),
+            "add_schedule_freeze": lambda: schedule.add_schedule_freeze("Ana", datetime.date(2026, 10, 19)),
+        }
+        for name, write in writes.items():
+            with self.subTest(write=name):
+                self._next()
+                loads_before = self.loads
+                with patch.object(schedule, "get_sb", return_value=_Client()), patch.object(schedule, "ensure_student"), patch.object(
+                    schedule, "with_owner", side_effect=lambda payload: payload
+                ), patch.object(schedule, "_schedule_creation_tz_name", return_value="Europe/Istanbul"):
+                    write()
+                self._next()
+                self.assertEqual(loads_before + 1, self.loads)
+
+    def test_home_indicator_formats_the_indexed_time(self):
+        with patch.object(goals, "next_lesson_datetime", return_value=pd.Timestamp("2026-10-20 19:15")):
+            self.assertEqual("Tue 19:15", goals.get_next_lesson_display())
+        with patch.object(goals, "next_lesson_datetime", return_value=None):
+            self.assertEqual("--:--", goals.get_next_lesson_display())
+
+
+if __name__ == "__main__":
+    unittest.main()
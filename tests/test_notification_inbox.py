@@ -0,0 +1,304 @@
+import re
+import unittest
+from contextlib import ExitStack
+from datetime import date, datetime
+from pathlib import Path
+from unittest.mock import patch
+
+import pandas as pd
+
+from helpers import notification_inbox, notifications
+
+
+_NOW = datetime(2026, 3, 10, 12, 0)
+_PROFILES = {
+    "teacher-1": {"user_id": "teacher-1", "display_name": "maria lopez"},
+    "teacher-2": {"user_id": "teacher-2", "username": "kemal"},
+    "student-1": {"user_id": "student-1", "display_name": "ana"},
+    "student-2": {"user_id": "student-2", "email": "luis@example.com"},
+}
+
+_ASSIGNMENTS = [
+    {"id": 31, "teacher_id": "teacher-1", "student_id": "student-1", "status": "assigned", "title": "past simple quiz",
+     "assignment_type": "worksheet", "created_at": "2026-03-09T08:00:00+00:00"},
+    {"id": 30, "teacher_id": "teacher-2", "student_id": "student-1", "status": "assigned", "title": "unit 3: food",
+     "assignment_type": "lesson_plan_topic", "created_at": "2026-03-08T08:00:00+00:00"},
+    {"id": 29, "teacher_id": "teacher-1", "student_id": "student-1", "status": "assigned", "title": "fractions",
+     "assignment_type": "exam", "created_at": "2026-03-07T08:00:00+00:00"},
+    {"id": 12, "teacher_id": "teacher-1", "student_id": "student-1", "status": "assigned", "title": "old work",
+     "assignment_type": "worksheet", "created_at": "2026-02-01T08:00:00+00:00"},
+]
+
+_REVIEWS = [
+    {"id": 8, "teacher_id": "teacher-1", "student_id": "student-1", "status": "requested", "title": "reading check",
+     "source_type": "exam", "requested_at": "2026-03-09T10:00:00+00:00"},
+    {"id": 7, "teacher_id": "teacher-1", "student_id": "student-2", "status": "requested", "title": "verbs",
+     "source_type": "worksheet", "requested_at": "2026-03-05T10:00:00+00:00"},
+    {"id": 6, "teacher_id": "teacher-2", "student_id": "student-1", "status": "reviewed", "title": "animals",
+     "source_type": "worksheet", "requested_at": "2026-03-01T10:00:00+00:00", "reviewed_at": "2026-03-06T10:00:00+00:00"},
+    {"id": 5, "teacher_id": "teacher-1", "student_id": "student-1", "status": "reviewed", "title": "old review",
+     "source_type": "exam", "requested_at": "2026-01-01T10:00:00+00:00", "reviewed_at": "2026-01-02T10:00:00+00:00"},
+]
+
+
+def _label(user_id):
+    from helpers.teacher_student_integration import _profile_label
+
+    return _profile_label(_PROFILES.get(user_id, {}))
+
+
+def _inbox_for(user_id):
+    """What notification_inbox holds for ``user_id`` after the backfill, newest first."""
+    rows = notification_inbox.inbox_backfill_rows(
+        assignments=_ASSIGNMENTS,
+        review_requests=_REVIEWS,
+        profile_names={user_id: _label(user_id) for user_id in _PROFILES},
+    )
+    mine = [
+        {"id": idx, "kind": row["kind"], "source_id": row["source_id"], "payload": row["payload"], "event_at": row["event_at"]}
+        for idx, row in enumerate(rows, start=1)
+        if row["user_id"] == user_id
+    ]
+    return sorted(mine, key=lambda row: (row["event_at"], row["id"]), reverse=True)
+
+
+class NotificationInboxParityTests(unittest.TestCase):
+    def _common_patches(self, stack, uid, inbox):
+        stack.enter_context(patch.object(notifications, "_uid", return_value=uid))
+        stack.enter_context(patch.object(notifications, "_load_name", return_value=("Sam", "Sam")))
+        stack.enter_context(patch.object(notifications, "now_local", return_value=_NOW))
+        stack.enter_context(patch.object(notifications, "today_local", return_value=date(2026, 3, 10)))
+        stack.enter_context(patch.object(notifications, "load_notification_inbox_page", return_value=inbox))
+        stack.enter_context(patch.object(notifications, "sync_package_ending_inbox"))
+        stack.enter_context(
+            patch(
+                "helpers.teacher_student_integration._load_profiles_map",
+                side_effect=lambda ids: {uid_: _PROFILES[uid_] for uid_ in ids if uid_ in _PROFILES},
+            )
+        )
+
+    def _student_notifications(self, inbox):
+        student_rows = [
+            {**row, "teacher_name": _label(row["teacher_id"])}
+            for row in _ASSIGNMENTS
+            if row["student_id"] == "student-1"
+        ]
+        with ExitStack() as stack:
+            self._common_patches(stack, "student-1", inbox)
+            stack.enter_context(patch.object(notifications, "load_student_assignments", return_value=student_rows))
+            stack.enter_context(
+                patch.object(
+                    notifications,
+                    "_load_teacher_review_requests_for_notifications",
+                    side_effect=lambda **kw: [r for r in _REVIEWS if r["student_id"] == kw.get("student_id")],
+                )
+            )
+            stack.enter_context(patch.object(notifications, "load_in_progress_practice_session", return_value=None))
+            stack.enter_context(patch.object(notifications, "load_student_teacher_links", return_value=[]))
+            stack.enter_context(patch.object(notifications, "_smart_plan_state", return_value={}))
+            stack.enter_context(patch.object(notifications, "load_practice_progress", return_value=None))
+            return notifications.get_student_notifications()
+
+    def _teacher_notifications(self, inbox, review_loader):
+        with ExitStack() as stack:
+            self._common_patches(stack, "teacher-1", inbox)
+            stack.enter_context(
+                patch.object(notifications, "_load_teacher_review_requests_for_notifications", side_effect=review_loader)
+            )
+            stack.enter_context(patch.object(notifications, "load_incoming_teacher_requests", return_value=[]))
+            stack.enter_context(patch.object(notifications, "_teacher_learning_program_help_requests", return_value=[]))
+            stack.enter_context(patch.object(notifications, "load_active_linked_students_for_teacher", return_value=[{"id": 1}] * 3))
+            stack.enter_context(patch.object(notifications, "load_teacher_assignment_progress", return_value=[]))
+            stack.enter_context(patch.object(notifications, "active_schedule_freezes", return_value=pd.DataFrame()))
+            stack.enter_context(patch.object(notifications, "get_year_goal_progress_snapshot", return_value={"progress": 0.0}))
+            return notifications.get_teacher_notifications_from_context(
+                dashboard_df=pd.DataFrame(),
+                today_events_df=pd.DataFrame(),
+                future_events_df=pd.DataFrame(),
+                payments_df=pd.DataFrame({"payment_date": ["2026-03-02"]}),
+                classes_df=pd.DataFrame(),
+            )
+
+    def test_student_inbox_matches_aggregated_notifications(self):
+        aggregated = self._student_notifications(None)
+        from_inbox = self._student_notifications(_inbox_for("student-1"))
+
+        signatures = [item["signature"] for item in aggregated]
+        self.assertIn("student_new_assignment_31_29", signatures)
+        self.assertIn("student_topics_30", signatures)
+        self.assertIn("student_review_completed_6", signatures)
+        self.assertEqual(aggregated, from_inbox)
+
+    def test_teacher_inbox_matches_aggregated_and_skips_review_query(self):
+        def _reviews(**kwargs):
+            return [r for r in _REVIEWS if r["teacher_id"] == kwargs.get("teacher_id")]
+
+        aggregated = self._teacher_notifications(None, _reviews)
+        calls = []
+        from_inbox = self._teacher_notifications(_inbox_for("teacher-1"), lambda **kw: calls.append(kw) or [])
+
+        self.assertIn("teacher_review_request_8_7", [item["signature"] for item in aggregated])
+        self.assertEqual(aggregated, from_inbox)
+        self.assertEqual([], calls)
+
+    def test_resolved_rows_drop_out_of_the_inbox_family(self):
+        inbox = [row for row in _inbox_for("teacher-1") if row["source_id"] != "8"]
+
+        result = self._teacher_notifications(inbox, lambda **kw: [])
+
+        self.assertIn("teacher_review_request_7", [item["signature"] for item in result])
+
+
+class InboxBackfillMigrationTests(unittest.TestCase):
+    def test_migration_writes_the_payloads_the_backfill_helper_builds(self):
+        sql = Path("migrations/notification_inbox_backfill.sql").read_text(encoding="utf-8")
+        migrated = {}
+        for block in sql.split("insert into public.notification_inbox")[1:]:
+            kind = re.search(r"^\s*'(\w+)',$", block, re.M).group(1)
+            payload = re.search(r"jsonb_build_object\((.*?)\n  \)", block, re.S).group(1)
+            migrated[kind] = set(re.findall(r"^\s*'(\w+)',", payload, re.M))
+            self.assertIn("on conflict (user_id, kind, source_id) do nothing", block)
+            self.assertIn("interval '14 days'", block)
+
+        helper_rows = notification_inbox.inbox_backfill_rows(assignments=_ASSIGNMENTS, review_requests=_REVIEWS, profile_names={})
+        expected = {row["kind"]: set(row["payload"]) for row in helper_rows}
+        self.assertEqual(expected, migrated)
+
+
+class _FakeResult:
+    def __init__(self, data):
+        self.data = data
+
+
+class _FakeQuery:
+    def __init__(self, db, table):
+        self.db = db
+        self.table = table
+        self.action = None
+        self.payload = None
+        self.filters = []
+
+    def insert(self, payload):
+        self.action, self.payload = "insert", payload
+        return self
+
+    def update(self, payload):
+        self.action, self.payload = "update", payload
+        return self
+
+    def eq(self, column, value):
+        self.filters.append(lambda row: row.get(column) == value)
+        return self
+
+    def in_(self, column, values):
+        values = list(values)
+        self.filters.append(lambda row: row.get(column) in values)
+        return self
+
+    def execute(self):
+        self.db.calls.append((self.table, self.action))
+        if self.action == "insert":
+            if any(
+                (row["user_id"], row["kind"], row["source_id"]) == (self.payload["user_id"], self.payload["kind"], self.payload["source_id"])
+                for row in self.db.rows
+            ):
+                raise RuntimeError("duplicate key value violates unique constraint")
+            self.db.rows.append(dict(self.payload))
+            return _FakeResult([self.payload])
+        matched = [row for row in self.db.rows if all(check(row) for check in self.filters)]
+        for row in matched:
+            row.update(self.payload)
+        return _FakeResult(matched)
+
+
+class _FakeSupabase:
+    def __init__(self):
+        self.rows = []
+        self.calls = []
+
+    def table(self, name):
+        return _FakeQuery(self, name)
+
+
+class PackageEndingInboxTests(unittest.TestCase):
+    def test_sync_writes_only_changes(self):
+        fake_sb = _FakeSupabase()
+        with patch.object(notification_inbox, "get_sb", return_value=fake_sb), patch.object(
+            notification_inbox, "_uid", return_value="teacher-1"
+        ), patch.object(notification_inbox, "clear_cache_domains"):
+            notification_inbox.sync_package_ending_inbox(
+                "teacher-1", {"ana:2026-02-01": "Ana", "luis:2026-01-15": "Luis"}, inbox_rows=[]
+            )
+            stored = [
+                {"kind": row["kind"], "source_id": row["source_id"], "payload": row["payload"]}
+                for row in fake_sb.rows
+            ]
+            fake_sb.calls.clear()
+            notification_inbox.sync_package_ending_inbox(
+                "teacher-1", {"ana:2026-02-01": "Ana", "luis:2026-01-15": "Luis"}, inbox_rows=stored
+            )
+            self.assertEqual([], fake_sb.calls)
+
+            notification_inbox.sync_package_ending_inbox("teacher-1", {"ana:2026-02-01": "Ana"}, inbox_rows=stored)
+
+        self.assertEqual([("notification_inbox", "update")], fake_sb.calls)
+        resolved = {row["payload"]["package_key"]: row.get("resolved_at") for row in fake_sb.rows}
+        self.assertIsNone(resolved["ana:2026-02-01"])
+        self.assertIsNotNone(resolved["luis:2026-01-15"])
+
+    def test_resolved_package_notice_can_be_raised_again(self):
+        fake_sb = _FakeSupabase()
+        with patch.object(notification_inbox, "get_sb", return_value=fake_sb), patch.object(
+            notification_inbox, "_uid", return_value="teacher-1"
+        ), patch.object(notification_inbox, "clear_cache_domains"), patch.object(
+            notification_inbox, "_now_iso", side_effect=["2026-10-01T10:00:00+00:00", "2026-10-02T10:00:00+00:00", "2026-10-03T10:00:00+00:00"]
+        ):
+            notification_inbox.sync_package_ending_inbox("teacher-1", {"ana:2026-02-01": "Ana"}, inbox_rows=[])
+            first = [dict(row) for row in fake_sb.rows]
+            # The package was topped up: the notice resolves and leaves the unresolved page.
+            notification_inbox.sync_package_ending_inbox("teacher-1", {}, inbox_rows=first)
+            # Lessons were removed again and the package is nearly used up once more.
+            notification_inbox.sync_package_ending_inbox("teacher-1", {"ana:2026-02-01": "Ana"}, inbox_rows=[])
+
+        self.assertEqual(2, len(fake_sb.rows))
+        self.assertIsNotNone(fake_sb.rows[0].get("resolved_at"))
+        self.assertIsNone(fake_sb.rows[1].get("resolved_at"))
+        self.assertEqual(["ana:2026-02-01", "ana:2026-02-01"], [row["payload"]["package_key"] for row in fake_sb.rows])
+        self.assertNotEqual(fake_sb.rows[0]["source_id"], fake_sb.rows[1]["source_id"])
+
+    def test_record_inbox_event_swallows_duplicates(self):
+        fake_sb = _FakeSupabase()
+        with patch.object(notification_inbox, "_uid", return_value="teacher-1"), patch.object(
+            notification_inbox, "clear_cache_domains"
+        ):
+            first = notification_inbox.record_inbox_event(user_id="student-1", kind="assignment_assigned", source_id=4, sb=fake_sb)
+            second = notification_inbox.record_inbox_event(user_id="student-1", kind="assignment_assigned", source_id=4, sb=fake_sb)
+
+        self.assertEqual((True, False), (first, second))
+        self.assertEqual("teacher-1", fake_sb.rows[0]["actor_id"])
+
+
+class LazyPanelUnreadCounterTests(unittest.TestCase):
+    def test_badge_uses_counter_and_opening_marks_read(self):
+        markdown = []
+        with (
+            patch.object(notifications, "_inject_notification_styles"),
+            patch.object(notifications.st, "toggle", return_value=True, create=True),
+            patch.object(notifications.st, "markdown", side_effect=lambda body, **_kw: markdown.append(body), create=True),
+            patch.object(notifications, "render_notification_panel"),
+            patch.object(notifications, "mark_notification_inbox_read") as mark_read,
+        ):
+            notifications.render_lazy_notification_panel(
+                scope="student",
+                toggle_key="student_home_notifications_toggle",
+                loader=lambda: [],
+                title_text="Notifications",
+                unread_loader=lambda: 3,
+            )
+
+        self.assertIn("classio-notification-badge'>3<", markdown[0])
+        mark_read.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
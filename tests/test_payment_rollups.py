@@ -0,0 +1,155 @@
+import random
+import unittest
+from unittest.mock import patch
+
+import pandas as pd
+
+from helpers import analytics, goals, payment_rollups
+from helpers.analytics import _build_income_analytics_from_payments, _build_income_analytics_from_rollups
+from helpers.payment_rollups import rollup_payments
+from helpers.ui_components import ts_today_naive
+
+
+def _payments(count=400, seed=5):
+    rng = random.Random(seed)
+    today = ts_today_naive()
+    subjects = ["English", " english", "English,Spanish", "Spanish & English", "Math", "", None]
+    modalities = ["Online", "Offline", " Online ", None]
+    rows = []
+    for idx in range(count):
+        payment_day = today - pd.Timedelta(days=rng.randint(0, 800))
+        rows.append(
+            {
+                "student": f"Student {idx % 23}",
+                "payment_date": payment_day.strftime("%Y-%m-%d"),
+                "paid_amount": rng.choice([500, 750, 1200, 2000, "900", None]),
+                "number_of_lesson": rng.choice([4, 8, 12]),
+                "modality": rng.choice(modalities),
+                "subject": rng.choice(subjects),
+            }
+        )
+    rows.append({"student": " ", "payment_date": today.strftime("%Y-%m-%d"), "paid_amount": 999, "number_of_lesson": 1, "modality": "Online", "subject": "English"})
+    rows.append({"student": "Student 1", "payment_date": None, "paid_amount": 999, "number_of_lesson": 1, "modality": "Online", "subject": "English"})
+    rows.append({"student": "Student 2", "payment_date": today.strftime("%Y-%m-%d"), "paid_amount": 300, "number_of_lesson": 2, "modality": "Online", "subject": "English"})
+    return pd.DataFrame(rows)
+
+
+class PaymentRollupTests(unittest.TestCase):
+    def test_rollups_reproduce_payment_analytics(self):
+        payments = _payments()
+        rollups = rollup_payments(payments.copy())
+
+        self.assertLess(len(rollups), len(payments))
+        self.assertEqual(len(payments) - 2, int(rollups["payment_count"].sum()))
+        for group in ("monthly", "yearly"):
+            with self.subTest(group=group):
+                kpis, income_table, _by_student, by_subject, by_modality = _build_income_analytics_from_payments(
+                    payments.copy(),
+                    group=group,
+                )
+                rolled = _build_income_analytics_from_rollups(rollups, group=group)
+
+                self.assertEqual(kpis, rolled[0])
+                pd.testing.assert_frame_equal(income_table, rolled[1])
+                pd.testing.assert_frame_equal(by_subject, rolled[2])
+                pd.testing.assert_frame_equal(by_modality, rolled[3])
+
+    def test_rollups_from_the_table_and_the_fallback_agree(self):
+        payments = _payments(count=120, seed=9)
+        table_rows = rollup_payments(payments.copy()).assign(period=lambda frame: frame["period"].dt.strftime("%Y-%m-%d"))
+
+        with patch.object(payment_rollups, "get_current_user_id", return_value="teacher-1"), patch.object(
+            payment_rollups, "_load_payment_rollups_cached", return_value=payment_rollups.normalize_payment_rollups(table_rows.to_dict("records"))
+        ):
+            from_table = payment_rollups.load_payment_rollups()
+        with patch.object(payment_rollups, "get_current_user_id", return_value="teacher-1"), patch.object(
+            payment_rollups, "_load_payment_rollups_cached", return_value=None
+        ), patch.object(payment_rollups, "load_table_filtered", return_value=payments.copy()):
+            fallback = payment_rollups.load_payment_rollups()
+
+        pd.testing.assert_frame_equal(from_table, fallback.reset_index(drop=True), check_dtype=False)
+
+    def test_year_goal_snapshot_reads_rollups(self):
+        payments = _payments(count=200, seed=3)
+        year = int(ts_today_naive().year)
+        kpis = _build_income_analytics_from_payments(payments.copy())[0]
+
+        with patch.object(goals, "load_payment_rollups", return_value=rollup_payments(payments.copy())), patch.object(
+            goals, "load_app_setting", return_value=10000.0
+        ):
+            snapshot = goals.get_year_goal_progress_snapshot(year)
+
+        self.assertEqual(kpis["income_this_year"], snapshot["ytd_income"])
+        self.assertEqual(max(0.0, 10000.0 - kpis["income_this_year"]), snapshot["remaining"])
+
+    def test_income_analytics_reads_rollups_and_lean_student_columns(self):
+        payments = _payments(count=80, seed=11)
+        with patch.object(analytics, "load_payment_rollups", return_value=rollup_payments(payments.copy())), patch.object(
+            analytics, "load_table_filtered", return_value=payments[["student", "payment_date", "paid_amount"]].copy()
+        ) as load_payments:
+            result = analytics.build_income_analytics("monthly")
+
+        expected = _build_income_analytics_from_payments(payments.copy())
+        self.assertEqual("student,payment_date,paid_amount", load_payments.call_args.kwargs["columns"])
+        self.assertEqual(expected[0], result[0])
+        pd.testing.assert_frame_equal(expected[2], result[2])
+
+    def test_income_analytics_reuses_a_loaded_payments_frame(self):
+        payments = _payments(count=60, seed=4)
+        with patch.object(analytics, "load_payment_rollups", return_value=rollup_payments(payments.copy())), patch.object(
+            analytics, "load_table_filtered"
+        ) as load_payments:
+            result = analytics.build_income_analytics("yearly", payments=payments)
+
+        load_payments.assert_not_called()
+        expected = _build_income_analytics_from_payments(payments.copy(), group="yearly")
+        self.assertEqual(expected[0], result[0])
+        pd.testing.assert_frame_equal(expected[1], result[1])
+        pd.testing.assert_frame_equal(expected[2], result[2])
+
+    def test_table_reads_page_in_primary_key_order(self):
+        rows = [
+            {"period": f"2026-01-{1 + idx // 100:02d}", "subject": f"S{idx % 50:02d}", "modality": ("Online", "Offline")[idx % 100 // 50],
+             "paid_amount": 100, "payment_count": 1, "lesson_count": 4}
+            for idx in range(2500)
+        ]
+        orders = []
+
+        class _Query:
+            def __init__(self):
+                self.columns = []
+                self.bounds = (0, len(rows))
+
+            def select(self, *_args):
+                return self
+
+            def eq(self, *_args):
+                return self
+
+            def order(self, column):
+                self.columns.append(column)
+                return self
+
+            def range(self, start, end):
+                self.bounds = (start, end + 1)
+                return self
+
+            def execute(self):
+                orders.append(tuple(self.columns))
+                ordered = sorted(rows, key=lambda row: tuple(row[column] for column in self.columns))
+                return type("Result", (), {"data": ordered[self.bounds[0] : self.bounds[1]]})()
+
+        client = type("Client", (), {"table": lambda _self, _name: _Query()})()
+        payment_rollups._load_payment_rollups_cached.clear()
+        with patch.object(payment_rollups, "get_sb", return_value=client):
+            loaded = payment_rollups._load_payment_rollups_cached("teacher-1")
+        payment_rollups._load_payment_rollups_cached.clear()
+
+        self.assertEqual({("period", "subject", "modality")}, set(orders))
+        self.assertEqual(3, len(orders))
+        self.assertEqual(len(rows), len(loaded))
+        self.assertFalse(loaded.duplicated(["period", "subject", "modality"]).any())
+
+
+if __name__ == "__main__":
+    unittest.main()
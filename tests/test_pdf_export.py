@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import unittest
+from unittest.mock import patch
+
+from helpers import pdf_export
+from helpers.branding import _default_branding
+
+
+def _worksheet(title: str = "Animals") -> dict:
+    return {
+        "title": title,
+        "worksheet_type": "multiple_choice",
+        "instructions": "Choose the correct answer.",
+        "plan_language": "en",
+        "multiple_choice_items": [{"stem": "Where do fish live?", "options": ["Sea", "Desert"]}],
+        "answer_key": ["Sea"],
+    }
+
+
+class PDFBytesCacheTests(unittest.TestCase):
+    def test_lru_respects_entry_and_byte_budgets(self):
+        cache = pdf_export.PDFBytesCache(max_entries=3, max_bytes=10)
+        cache.put("a", b"aaaa")
+        cache.put("b", b"bbbb")
+        cache.get("a")
+        cache.put("c", b"cccc")
+
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(b"aaaa", cache.get("a"))
+        self.assertEqual(8, cache.total_bytes())
+
+        cache.put("too_big", b"x" * 11)
+        self.assertIsNone(cache.get("too_big"))
+
+    def test_cache_key_covers_branding_and_language(self):
+        kwargs = {"ws": _worksheet(), "student_only": True}
+        branding = _default_branding()
+        base = pdf_export.build_pdf_cache_key("worksheet", kwargs, branding, "en")
+
+        self.assertEqual(base, pdf_export.build_pdf_cache_key("worksheet", dict(kwargs), dict(branding), "en"))
+        self.assertNotEqual(base, pdf_export.build_pdf_cache_key("worksheet", kwargs, branding, "es"))
+        self.assertNotEqual(
+            base,
+            pdf_export.build_pdf_cache_key("worksheet", kwargs, {**branding, "branding_font": "open_sans"}, "en"),
+        )
+        self.assertNotEqual(
+            base,
+            pdf_export.build_pdf_cache_key("worksheet", {**kwargs, "student_only": False}, branding, "en"),
+        )
+
+
+class CachedPDFBytesTests(unittest.TestCase):
+    def test_repeated_download_reuses_rendered_bytes(self):
+        cache = pdf_export.PDFBytesCache()
+        calls = []
+
+        def fake_builder(**kwargs):
+            calls.append(kwargs)
+            return b"%PDF-" + kwargs["ws"]["title"].encode("utf-8")
+
+        with patch.object(pdf_export, "_resolve_builder", return_value=fake_builder):
+            first = pdf_export.cached_pdf_bytes("worksheet", branding=_default_branding(), cache=cache, ws=_worksheet())
+            second = pdf_export.cached_pdf_bytes("worksheet", branding=_default_branding(), cache=cache, ws=_worksheet())
+            other = pdf_export.cached_pdf_bytes(
+                "worksheet", branding=_default_branding(), cache=cache, ws=_worksheet("Plants")
+            )
+
+        self.assertEqual(first, second)
+        self.assertEqual(b"%PDF-Plants", other)
+        self.assertEqual(2, len(calls))
+        self.assertEqual(_default_branding(), calls[0]["branding"])
+
+    def test_unknown_kind_is_rejected(self):
+        with self.assertRaises(ValueError):
+            pdf_export.cached_pdf_bytes("report_card", branding={}, cache=pdf_export.PDFBytesCache())
+
+
+class BatchExportTests(unittest.TestCase):
+    def test_batch_renders_real_worksheets_in_order_and_dedupes(self):
+        cache = pdf_export.PDFBytesCache()
+        jobs = [
+            ("worksheet", {"ws": _worksheet("Animals"), "student_only": True}),
+            ("worksheet", {"ws": _worksheet("Plants"), "student_only": True}),
+            ("worksheet", {"ws": _worksheet("Animals"), "student_only": True}),
+        ]
+
+        first = pdf_export.export_pdfs_batch(jobs, branding=_default_branding(), ui_lang="en", max_workers=1, cache=cache)
+
+        self.assertEqual(3, len(first))
+        self.assertTrue(all(pdf.startswith(b"%PDF-") for pdf in first))
+        self.assertEqual(first[0], first[2])
+        self.assertEqual(2, cache.size())
+
+        with patch.object(pdf_export, "_render_pdf_job", side_effect=AssertionError("re-rendered")):
+            again = pdf_export.export_pdfs_batch(jobs, branding=_default_branding(), ui_lang="en", cache=cache)
+        self.assertEqual(first, again)
+
+    def test_process_pool_renders_every_job(self):
+        jobs = [("worksheet", {"ws": _worksheet(f"Sheet {index}"), "student_only": True}) for index in range(2)]
+
+        pooled = pdf_export.export_pdfs_batch(
+            jobs, branding=_default_branding(), ui_lang="en", max_workers=2, cache=pdf_export.PDFBytesCache()
+        )
+
+        self.assertEqual(2, len(pooled))
+        self.assertTrue(all(pdf.startswith(b"%PDF-") for pdf in pooled))
+
+
+if __name__ == "__main__":
+    unittest.main()
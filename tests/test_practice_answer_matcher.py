@@ -0,0 +1,106 @@
+import copy
+import random
+import unittest
+
+from helpers import practice_engine
+from helpers.practice_engine import AnswerKeyMatcher, compile_answer_key
+from scripts.benchmark_practice_rescore import (
+    _STUDENT_VARIANTS,
+    legacy_evaluate_answer,
+    resource_fixture,
+)
+
+
+class PracticeAnswerMatcherTests(unittest.TestCase):
+    def setUp(self):
+        practice_engine._ANSWER_MATCHER_CACHE.clear()
+        self.exercise_data = resource_fixture()
+
+    def test_compiled_key_matches_the_legacy_evaluator(self):
+        matcher = AnswerKeyMatcher(self.exercise_data)
+        extra = ["", "  ", "A", "b) goes", "TRUE.", "dogru", "the", "She doesnt like coffee", "[\"apple\"]"]
+
+        for ex_idx, exercise in enumerate(self.exercise_data["exercises"]):
+            ex_type = exercise["type"]
+            for q_idx, correct in enumerate(exercise["answers"]):
+                for student in _STUDENT_VARIANTS[ex_type] + extra:
+                    with self.subTest(ex_type=ex_type, q_idx=q_idx, student=student):
+                        expected = legacy_evaluate_answer(ex_type, student, correct)
+                        self.assertEqual(expected, matcher.evaluate(ex_idx, q_idx, student))
+                        self.assertEqual(bool(expected["is_correct"]), matcher.is_correct(ex_idx, q_idx, student))
+                        self.assertEqual(
+                            practice_engine._display_answer_text(correct),
+                            matcher.expected_display(ex_idx, q_idx),
+                        )
+
+    def test_missing_key_entries_compile_to_empty_answers(self):
+        matcher = AnswerKeyMatcher(
+            {
+                "exercises": [
+                    {"type": "short_answer", "questions": ["a", "b"], "answers": ["only one"]},
+                    {"type": "word_search_vocab", "questions": [], "answers": []},
+                ]
+            }
+        )
+
+        self.assertFalse(matcher.is_correct(0, 1, "anything"))
+        self.assertEqual("", matcher.expected_display(0, 1))
+        self.assertIsNotNone(matcher.answer(1, 0))
+
+    def test_word_search_without_question_row_uses_the_first_answer(self):
+        matcher = AnswerKeyMatcher({"exercises": [{"type": "word_search_vocab", "questions": [], "answers": [["CAT", "DOG"]]}]})
+
+        for student in ('["CAT", "DOG"]', '["cat"]', "", "[]"):
+            with self.subTest(student=student):
+                expected = legacy_evaluate_answer("word_search_vocab", student, ["CAT", "DOG"])
+                self.assertEqual(expected, matcher.evaluate(0, 0, student))
+                self.assertEqual(bool(expected["is_correct"]), matcher.is_correct(0, 0, student))
+        self.assertTrue(matcher.is_correct(0, 0, '["CAT", "DOG"]'))
+
+    def test_matchers_are_shared_until_the_answer_key_changes(self):
+        first = compile_answer_key(self.exercise_data)
+        same = compile_answer_key(copy.deepcopy(self.exercise_data))
+        changed_data = copy.deepcopy(self.exercise_data)
+        changed_data["exercises"][0]["answers"][0] = "gone"
+        changed = compile_answer_key(changed_data)
+
+        self.assertIs(first, same)
+        self.assertIsNot(first, changed)
+        self.assertTrue(changed.is_correct(0, 0, "gone"))
+        self.assertFalse(first.is_correct(0, 0, "gone"))
+
+    def test_saved_sessions_rescore_the_same_with_a_shared_key(self):
+        rng = random.Random(3)
+        rows = []
+        for ex_idx, exercise in enumerate(self.exercise_data["exercises"]):
+            for q_idx in range(len(exercise["questions"])):
+                rows.append(
+                    {
+                        "session_id": 7,
+                        "user_id": "student-1",
+                        "exercise_idx": ex_idx,
+                        "question_idx": q_idx,
+                        "exercise_type": exercise["type"],
+                        "student_answer": rng.choice(_STUDENT_VARIANTS[exercise["type"]]),
+                        "answered_at": "2026-03-01T08:00:00+00:00",
+                    }
+                )
+
+        fresh = practice_engine._evaluate_saved_practice_answers(self.exercise_data, rows)
+        shared = practice_engine._evaluate_saved_practice_answers(
+            self.exercise_data,
+            rows,
+            answer_key=compile_answer_key(self.exercise_data),
+        )
+
+        self.assertEqual(fresh, shared)
+        self.assertGreater(fresh[1]["total_questions"], 0)
+        exercises = self.exercise_data["exercises"]
+        for row in fresh[0]:
+            correct = exercises[row["exercise_idx"]]["answers"][row["question_idx"]]
+            legacy = legacy_evaluate_answer(row["exercise_type"], row["student_answer"], correct)
+            self.assertEqual(bool(legacy["is_correct"]), row["is_correct"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.metrics.pairwise import cosine_similarity
+
+from helpers import resource_affinity_unsupervised_eval as affinity_eval
+
+
+def _reference_neighbor_lists(vectors, top_k):
+    """Previous full-matrix implementation, with ties broken by index."""
+    sim = cosine_similarity(vectors)
+    result = []
+    for i in range(sim.shape[0]):
+        order = [int(j) for j in np.argsort(-sim[i], kind="stable") if int(j) != i]
+        result.append(order[:top_k])
+    return result
+
+
+def _profile(n_rows):
+    return pd.DataFrame(
+        {
+            "resource_key": [f"worksheet:{idx}" for idx in range(n_rows)],
+            "resource_type": ["worksheet"] * n_rows,
+            "resource_role": ["candidate_resource"] * n_rows,
+            "title": [f"Resource {idx}" for idx in range(n_rows)],
+            "subject_normalized": ["english" if idx % 2 else "math" for idx in range(n_rows)],
+            "language_normalized": ["en"] * n_rows,
+            "level_normalized": ["a2"] * n_rows,
+        }
+    )
+
+
+class TopNeighborParityTests(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(7)
+        self.vectors = rng.normal(size=(60, 12))
+        # Duplicate rows and a zero row force exact score ties.
+        self.vectors[10] = self.vectors[3]
+        self.vectors[11] = self.vectors[3]
+        self.vectors[20] = 0.0
+
+    def test_blocked_search_matches_full_matrix_across_block_sizes(self):
+        expected = _reference_neighbor_lists(self.vectors, 5)
+        for max_block_cells in (1, 60 * 7, 60 * 60, 10**9):
+            indices, scores = affinity_eval._top_k_cosine_neighbors(self.vectors, 5, max_block_cells=max_block_cells)
+            self.assertEqual(expected, indices.tolist(), msg=f"block cells {max_block_cells}")
+            self.assertTrue(np.all(np.diff(scores, axis=1) <= 0))
+
+    def test_sparse_vectors_and_k_larger_than_pool(self):
+        small = sparse.csr_matrix(self.vectors[:4])
+        indices, _scores = affinity_eval._top_k_cosine_neighbors(small, 10, max_block_cells=4)
+
+        self.assertEqual(_reference_neighbor_lists(small, 10), indices.tolist())
+        self.assertEqual((4, 3), indices.shape)
+
+    def test_neighbor_frame_matches_reference_edges(self):
+        profile = _profile(len(self.vectors))
+        labels = np.arange(len(self.vectors)) % 3
+
+        frame = affinity_eval._top_neighbors(profile, self.vectors, labels, top_k=3)
+
+        expected_edges = [
+            (f"worksheet:{i}", f"worksheet:{j}")
+            for i, targets in enumerate(_reference_neighbor_lists(self.vectors, 3))
+            for j in targets
+        ]
+        self.assertEqual(expected_edges, list(zip(frame["source_resource_key"], frame["target_resource_key"])))
+        sim = cosine_similarity(self.vectors)
+        self.assertAlmostEqual(round(float(sim[0, int(frame.iloc[0]["target_resource_key"].split(":")[1])]), 6), frame.iloc[0]["similarity_score"])
+        duplicate_edge = frame[(frame["source_resource_key"] == "worksheet:3") & (frame["target_resource_key"] == "worksheet:10")]
+        self.assertTrue(bool(duplicate_edge["reciprocal"].iloc[0]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,149 @@
+import unittest
+from unittest.mock import patch
+
+from core import database
+from helpers import resource_deletion
+from helpers.resource_deletion import delete_archived_resource, delete_archived_resources
+
+
+class _Result:
+    def __init__(self, data):
+        self.data = data
+
+
+class _Query:
+    def __init__(self, client, table, rows):
+        self.client = client
+        self.table = table
+        self.rows = rows
+
+    def select(self, _columns):
+        return self
+
+    def update(self, _payload):
+        return self
+
+    def delete(self):
+        return self
+
+    def eq(self, column, value):
+        self.rows = [row for row in self.rows if str(row.get(column)) == str(value)]
+        return self
+
+    def in_(self, column, values):
+        wanted = {str(value) for value in values}
+        self.rows = [row for row in self.rows if str(row.get(column)) in wanted]
+        return self
+
+    def execute(self):
+        self.client.round_trips += 1
+        return _Result(self.rows)
+
+
+class _Rpc:
+    def __init__(self, client, name, params):
+        self.client = client
+        self.name = name
+        self.params = params
+
+    def execute(self):
+        self.client.round_trips += 1
+        self.client.rpc_calls.append((self.name, self.params))
+        if self.client.rpc_error:
+            raise RuntimeError("function classio_delete_archived_resources does not exist")
+        assigned = {str(row["source_record_id"]) for row in self.client.tables["teacher_assignments"]}
+        owned = {str(row["id"]) for row in self.client.tables["worksheets"] if row["user_id"] == "teacher-1"}
+        rows = []
+        for record_id in self.params["p_ids"]:
+            if record_id not in owned:
+                rows.append({"resource_id": record_id, "outcome": "not_owner"})
+            elif record_id in assigned:
+                rows.append(
+                    {"resource_id": record_id, "outcome": "detached", "assignment_count": 1, "student_count": 1, "active_assignment_count": 1}
+                )
+            else:
+                rows.append({"resource_id": record_id, "outcome": "deleted", "assignment_count": 0, "student_count": 0})
+        return _Result(rows)
+
+
+class _Client:
+    def __init__(self, worksheets: int, assigned: int = 0, rpc_error: bool = False):
+        self.tables = {
+            "worksheets": [{"id": idx, "user_id": "teacher-1", "status": "archived", "is_public": False} for idx in range(1, worksheets + 1)],
+            "teacher_assignments": [
+                {"id": idx, "teacher_id": "teacher-1", "student_id": f"student-{idx}", "status": "assigned",
+                 "assignment_type": "worksheet", "source_type": "worksheet_builder", "source_record_id": str(idx)}
+                for idx in range(1, assigned + 1)
+            ],
+        }
+        self.rpc_error = rpc_error
+        self.round_trips = 0
+        self.rpc_calls = []
+
+    def table(self, name):
+        return _Query(self, name, list(self.tables.get(name, [])))
+
+    def rpc(self, name, params):
+        return _Rpc(self, name, params)
+
+
+class ArchivedResourceBatchDeleteTests(unittest.TestCase):
+    def _run(self, client, fn):
+        with patch.object(resource_deletion, "get_sb", return_value=client), patch.object(
+            resource_deletion, "get_current_user_id", return_value="teacher-1"
+        ), patch.object(resource_deletion, "clear_app_caches") as clear, patch.object(
+            database, "_db_diagnostics_enabled", return_value=False
+        ), patch("services.operational_diagnostics_service.capture_exception"):
+            return fn(), clear
+
+    def test_round_trips_stay_constant_for_100_worksheets(self):
+        per_row = _Client(100)
+        self._run(
+            per_row,
+            lambda: [delete_archived_resource(table_name="worksheets", row=row, assignment_type="worksheet", source_type="worksheet_builder")
+                     for row in per_row.tables["worksheets"]],
+        )
+
+        for count in (1, 100):
+            with self.subTest(count=count):
+                client = _Client(count)
+                outcomes, clear = self._run(client, lambda: delete_archived_resources("worksheet", range(1, count + 1)))
+                self.assertEqual(1, client.round_trips)
+                self.assertEqual(count, sum(ok for ok, _msg, _summary in outcomes.values()))
+                clear.assert_called_once()
+
+        self.assertGreaterEqual(per_row.round_trips, 200)
+
+    def test_outcomes_are_reported_per_id(self):
+        client = _Client(4, assigned=2)
+        outcomes, _clear = self._run(client, lambda: delete_archived_resources("worksheet", [1, "3", 3, 9, ""]))
+
+        self.assertEqual(
+            [("classio_delete_archived_resources", {
+                "p_table": "worksheets", "p_ids": ["1", "3", "9"], "p_assignment_type": "worksheet", "p_source_type": "worksheet_builder",
+            })],
+            client.rpc_calls,
+        )
+        self.assertEqual((True, "ok", {"assignment_count": 1, "student_count": 1, "active_assignment_count": 1}), outcomes["1"])
+        self.assertEqual((True, "ok", {"assignment_count": 0, "student_count": 0, "active_assignment_count": 0}), outcomes["3"])
+        self.assertEqual((False, "not_owner"), outcomes["9"][:2])
+        self.assertEqual((False, "invalid_id", {}), outcomes[""])
+
+    def test_falls_back_to_the_per_row_path_without_the_sql_function(self):
+        client = _Client(3, assigned=1, rpc_error=True)
+        outcomes, _clear = self._run(client, lambda: delete_archived_resources("worksheet", [1, 2, 7]))
+
+        self.assertEqual((True, "ok"), outcomes["1"][:2])
+        self.assertEqual(1, outcomes["1"][2]["assignment_count"])
+        self.assertEqual((True, "ok"), outcomes["2"][:2])
+        self.assertEqual((False, "not_owner", {}), outcomes["7"])
+
+    def test_unknown_kind_and_missing_user(self):
+        with self.assertRaises(ValueError):
+            delete_archived_resources("flashcards", [1])
+        with patch.object(resource_deletion, "get_current_user_id", return_value=""):
+            self.assertEqual({"1": (False, "auth_required", {})}, delete_archived_resources("worksheet", [1]))
+
+
+if __name__ == "__main__":
+    unittest.main()
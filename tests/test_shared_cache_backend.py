@@ -0,0 +1,114 @@
+import multiprocessing
+import os
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from core import database
+from core.cache_backend import MISSING, SQLiteCacheBackend
+
+
+_CALLS = []
+
+
+@database.shared_cache("resources", ttl=60)
+def _load_probe(uid):
+    _CALLS.append(uid)
+    return {"uid": uid, "pid": os.getpid()}
+
+
+def _worker(path, action, queue):
+    _CALLS.clear()
+    database.set_shared_cache_backend(SQLiteCacheBackend(path))
+    if action == "invalidate":
+        database.clear_cache_domains("resources")
+        queue.put({})
+        return
+    value = _load_probe("teacher-1")
+    calls = len(_CALLS)
+    started = time.perf_counter()
+    for _ in range(200):
+        _load_probe("teacher-1")
+    queue.put({"value": value, "calls": calls, "warm_ms": 1000 * (time.perf_counter() - started) / 200})
+
+
+class _FakeLocalCache:
+    def __init__(self):
+        self.cleared = 0
+
+    def clear(self):
+        self.cleared += 1
+
+
+@unittest.skipUnless("fork" in multiprocessing.get_all_start_methods(), "needs fork to share the imported modules")
+class SharedCacheBackendTests(unittest.TestCase):
+    def setUp(self):
+        self._saved = (
+            database._SHARED_CACHE_BACKEND,
+            database._SHARED_CACHE_CONFIGURED,
+            database._SHARED_DOMAIN_VERSIONS,
+        )
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = str(Path(self._tmp.name) / "shared-cache.sqlite3")
+
+    def tearDown(self):
+        (
+            database._SHARED_CACHE_BACKEND,
+            database._SHARED_CACHE_CONFIGURED,
+            database._SHARED_DOMAIN_VERSIONS,
+        ) = self._saved
+        self._tmp.cleanup()
+
+    def _run(self, action):
+        ctx = multiprocessing.get_context("fork")
+        queue = ctx.Queue()
+        process = ctx.Process(target=_worker, args=(self.path, action, queue))
+        process.start()
+        result = queue.get(timeout=30)
+        process.join(timeout=30)
+        self.assertEqual(0, process.exitcode)
+        return result
+
+    def test_values_and_invalidations_cross_processes(self):
+        first = self._run("load")
+        second = self._run("load")
+        self._run("invalidate")
+        third = self._run("load")
+
+        self.assertEqual(1, first["calls"])
+        self.assertEqual(0, second["calls"])
+        self.assertEqual(first["value"], second["value"])
+        self.assertEqual(1, third["calls"])
+        self.assertNotEqual(first["value"]["pid"], third["value"]["pid"])
+        self.assertLess(first["warm_ms"], 2.0)
+
+    def test_sync_clears_local_caches_another_process_invalidated(self):
+        fake = _FakeLocalCache()
+        database.register_cache(fake, "resources")
+        try:
+            database.set_shared_cache_backend(SQLiteCacheBackend(self.path))
+            database.sync_shared_cache_domains()
+
+            self._run("invalidate")
+            database.sync_shared_cache_domains()
+            self.assertEqual(1, fake.cleared)
+
+            database.clear_cache_domains("resources")
+            database.sync_shared_cache_domains()
+            self.assertEqual(2, fake.cleared)
+        finally:
+            database._CACHE_REGISTRY.remove(fake)
+            database._CACHE_DOMAINS.pop(fake, None)
+
+    def test_values_over_the_size_limit_are_not_shared(self):
+        backend = SQLiteCacheBackend(self.path, max_value_bytes=1024)
+
+        self.assertTrue(backend.set("small", {"rows": [1, 2, 3]}, ttl=60))
+        self.assertFalse(backend.set("large", "x" * 4096, ttl=60))
+        self.assertEqual({"rows": [1, 2, 3]}, backend.get("small"))
+        self.assertIs(MISSING, backend.get("large"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,138 @@
+import os
+import unittest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+from core import database
+from helpers import recommendation_models as rm
+from helpers import student_recommendation_ml as srm
+
+
+class _Result:
+    def __init__(self, data):
+        self.data = data
+
+
+class _Query:
+    def __getattr__(self, _name):
+        return lambda *_args, **_kwargs: self
+
+    def execute(self):
+        return _Result([])
+
+
+class _Client:
+    def __init__(self):
+        self.inserted = []
+
+    def table(self, _name):
+        client = self
+
+        class _Insert(_Query):
+            def insert(self, payload):
+                client.inserted.extend(payload if isinstance(payload, list) else [payload])
+                return self
+
+        return _Insert()
+
+
+class StudentHistoryCacheScopeTests(unittest.TestCase):
+    def setUp(self):
+        self._saved_backend = (database._SHARED_CACHE_BACKEND, database._SHARED_CACHE_CONFIGURED)
+        database.set_shared_cache_backend(None)
+        self.loads = []
+        self._reset()
+
+    def tearDown(self):
+        self._reset()
+        database._SHARED_CACHE_BACKEND, database._SHARED_CACHE_CONFIGURED = self._saved_backend
+
+    def _reset(self):
+        rm._load_student_history_rows_cached.clear()
+        srm._evaluate_student_recommendation_pipeline_cached.clear()
+        rm._STUDENT_ACTIVITY_APPENDS.clear()
+        rm._STUDENT_HISTORY_GENERATIONS.clear()
+
+    def _execute(self, query, *, function_name, source_name):
+        self.loads.append(source_name)
+        if source_name == "user_activity_log":
+            return _Result([{"activity_type": "student_recommendation_open", "meta_json": {}, "created_at": "2026-01-01T00:00:00+00:00"}])
+        return _Result([])
+
+    def _history(self, student_id):
+        with patch.object(rm, "get_sb", return_value=_Client()), patch.object(rm, "_execute_recommendation_query", self._execute):
+            return rm._load_student_history_rows(student_id)
+
+    def test_impression_extends_only_that_students_cached_history(self):
+        self._history("student-a")
+        self._history("student-b")
+        loads_before = len(self.loads)
+
+        generation = rm.append_student_recommendation_activity(
+            "student-a",
+            [{"activity_type": "student_recommendation_impression", "meta_json": {"surface": "home"}, "created_at": "2999-01-01T00:00:00+00:00"}],
+        )
+        history_a = self._history("student-a")
+        history_b = self._history("student-b")
+
+        self.assertEqual(loads_before, len(self.loads))
+        self.assertEqual(1, generation)
+        self.assertEqual(1, rm.student_history_generation("student-a"))
+        self.assertEqual(0, rm.student_history_generation("student-b"))
+        self.assertEqual(
+            ["student_recommendation_impression", "student_recommendation_open"],
+            [row["activity_type"] for row in history_a["recommendation_activity"]],
+        )
+        self.assertEqual(["student_recommendation_open"], [row["activity_type"] for row in history_b["recommendation_activity"]])
+
+    def test_reload_drops_appends_the_database_already_returns(self):
+        self._history("student-a")
+        rm.append_student_recommendation_activity(
+            "student-a",
+            [{"activity_type": "student_recommendation_impression", "meta_json": {}, "created_at": "2000-01-01T00:00:00+00:00"}],
+        )
+        rm._load_student_history_rows_cached.clear()
+
+        history = self._history("student-a")
+
+        self.assertEqual(["student_recommendation_open"], [row["activity_type"] for row in history["recommendation_activity"]])
+        self.assertNotIn("student-a", rm._STUDENT_ACTIVITY_APPENDS)
+
+    def test_appends_are_capped_and_expire_without_a_reload(self):
+        now = datetime.now(timezone.utc)
+        rm.append_student_recommendation_activity(
+            "student-left",
+            [{"activity_type": "student_recommendation_impression", "meta_json": {}, "created_at": (now - timedelta(minutes=10)).isoformat()}],
+        )
+        rows = [
+            {"activity_type": "student_recommendation_impression", "meta_json": {"i": i}, "created_at": (now + timedelta(seconds=i)).isoformat()}
+            for i in range(60)
+        ]
+        with patch.dict(os.environ, {"RECOMMENDATION_STUDENT_ACTIVITY_LIMIT": "50"}):
+            rm.append_student_recommendation_activity("student-a", rows)
+
+        self.assertNotIn("student-left", rm._STUDENT_ACTIVITY_APPENDS)
+        self.assertEqual(rows[-50:], rm._STUDENT_ACTIVITY_APPENDS["student-a"])
+
+    def test_logging_impressions_does_not_clear_other_students(self):
+        client = _Client()
+        items = [{"id": 11, "resource_type": "worksheet", "title": "Past simple", "row": {}}]
+        self._history("student-b")
+        loads_before = len(self.loads)
+
+        with patch.object(srm, "get_current_user_id", return_value="student-a"), patch.object(
+            srm, "attach_student_recommendation_exposures", side_effect=lambda rows, surface: rows
+        ), patch.object(srm, "_owned_activity_payload", side_effect=lambda payload: {**payload, "user_id": "student-a"}), patch.object(
+            srm, "get_sb", return_value=client
+        ):
+            srm.log_student_recommendation_impressions(items, surface="home")
+
+        self._history("student-b")
+        self.assertEqual(1, len(client.inserted))
+        self.assertEqual(loads_before, len(self.loads))
+        self.assertEqual(1, rm.student_history_generation("student-a"))
+        self.assertEqual(0, rm.student_history_generation("student-b"))
+
+
+if __name__ == "__main__":
+    unittest.main()
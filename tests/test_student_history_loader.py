@@ -0,0 +1,102 @@
+from contextlib import ExitStack
+import unittest
+from unittest.mock import patch
+
+import pandas as pd
+import streamlit as st
+
+from core import database
+from core.database import LESSON_NOTE_DEFAULT_TOKEN, clear_cache_domains
+from helpers import history
+from helpers.history import _display_lesson_note_for_table, _display_lesson_notes
+from helpers.language import translate_modality_series, translate_modality_value
+from scripts.benchmark_student_history import _Client, _legacy_student_history, _tables
+
+
+class ModalitySeriesTests(unittest.TestCase):
+    def test_series_translation_matches_the_scalar_helper(self):
+        values = pd.Series(["Online", " offline ", "ONLINE", "hybrid", "", None])
+        for lang in ("en", "es"):
+            with self.subTest(lang=lang), patch.dict(st.session_state, {"ui_lang": lang}):
+                expected = [translate_modality_value(v) for v in values]
+                self.assertEqual(expected, translate_modality_series(values, lang).tolist())
+
+    def test_note_column_matches_the_scalar_helper(self):
+        notes = pd.Series(["", None, f" {LESSON_NOTE_DEFAULT_TOKEN} ", " Past simple ", "Role play"])
+        self.assertEqual([_display_lesson_note_for_table(v) for v in notes], _display_lesson_notes(notes).tolist())
+
+
+class StudentHistoryLoaderTests(unittest.TestCase):
+    def setUp(self):
+        database.set_shared_cache_backend(None)
+        database.clear_app_caches()
+        self.client = _Client(_tables(students=3, lessons=40, seed=2), latency_ms=0)
+
+    def tearDown(self):
+        database.clear_app_caches()
+
+    def _patched(self):
+        stack = ExitStack()
+        for target in (database, history):
+            stack.enter_context(patch.object(target, "get_sb", return_value=self.client))
+            stack.enter_context(patch.object(target, "get_current_user_id", return_value="teacher-1"))
+        stack.enter_context(patch.object(database, "_db_diagnostics_enabled", return_value=False))
+        return stack
+
+    def test_output_matches_the_previous_loader(self):
+        with self._patched():
+            for student in ("Student 1", "Student 3"):
+                with self.subTest(student=student):
+                    legacy = _legacy_student_history(student)
+                    current = history.show_student_history(f" {student} ")
+                    for left, right in zip(legacy, current):
+                        pd.testing.assert_frame_equal(left, right, check_dtype=False)
+
+    def test_fetch_selects_only_the_displayed_columns(self):
+        selected = []
+        original = self.client.table
+
+        def spy(name):
+            query = original(name)
+            select = query.select
+
+            def record(columns):
+                selected.append((name, columns))
+                return select(columns)
+
+            query.select = record
+            return query
+
+        with self._patched(), patch.object(self.client, "table", side_effect=spy):
+            history.show_student_history("Student 2")
+
+        self.assertEqual(
+            {("classes", ",".join(history._HISTORY_CLASS_COLUMNS)), ("payments", ",".join(history._HISTORY_PAYMENT_COLUMNS))},
+            set(selected),
+        )
+        self.assertTrue(all("student" not in columns.split(",") for _name, columns in selected))
+
+    def test_cached_per_student_and_language_until_a_mutation(self):
+        with self._patched():
+            with patch.dict(st.session_state, {"ui_lang": "en"}):
+                history.show_student_history("Student 1")
+                history.show_student_history("Student 1")
+                self.assertEqual(2, self.client.queries)
+                history.show_student_history("Student 2")
+                self.assertEqual(4, self.client.queries)
+            with patch.dict(st.session_state, {"ui_lang": "es"}):
+                history.show_student_history("Student 1")
+                self.assertEqual(6, self.client.queries)
+
+            for domain in ("classes", "payments"):
+                with self.subTest(domain=domain), patch.dict(st.session_state, {"ui_lang": "en"}):
+                    before = self.client.queries
+                    history.show_student_history("Student 1")
+                    self.assertEqual(before, self.client.queries)
+                    clear_cache_domains(domain)
+                    history.show_student_history("Student 1")
+                    self.assertEqual(before + 2, self.client.queries)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+
+from helpers import recommendation_models
+from helpers.recommendation_models import topic_resource_alignment_batch, topic_resource_alignment_features
+from helpers.student_recommendation_ml import (
+    _train_weights,
+    build_student_recommendation_design,
+    build_student_recommendation_samples,
+    summarize_student_recommendation_samples,
+)
+from scripts.benchmark_student_recommendation_samples import (
+    fixture_history,
+    fixture_profile,
+    fixture_topic_model,
+    legacy_samples,
+    legacy_train,
+    patched_history,
+)
+
+
+class StudentRecommendationSampleTests(unittest.TestCase):
+    def test_samples_match_the_previous_builder(self):
+        for seed, rows in ((1, 300), (7, 41), (3, 0)):
+            history = fixture_history(rows, seed)
+            with self.subTest(seed=seed, rows=rows), patched_history(history, fixture_topic_model(seed, resources=60)):
+                expected = legacy_samples(fixture_profile(), student_id="student-1")
+                self.assertEqual(expected, build_student_recommendation_samples(fixture_profile(), student_id="student-1"))
+
+    def test_design_matrix_matches_the_sample_features(self):
+        with patched_history(fixture_history(300, 2), fixture_topic_model(2, resources=60)):
+            design = build_student_recommendation_design(fixture_profile(), student_id="student-1")
+        self.assertEqual((len(design.samples), len(design.feature_names)), design.matrix.shape)
+        self.assertIn("explicit_topic_match", design.feature_names)
+        for idx, name in enumerate(design.feature_names):
+            expected = [sample["features"].get(name, 0.0) for sample in design.samples]
+            np.testing.assert_array_equal(expected, design.matrix[:, idx])
+        np.testing.assert_array_equal([sample["target"] for sample in design.samples], design.targets)
+
+    def test_topic_model_is_loaded_once_per_build(self):
+        model = fixture_topic_model(4, resources=60)
+        loads = []
+
+        def build_model(**kwargs):
+            loads.append(kwargs)
+            return model
+
+        with patched_history(fixture_history(300, 4), model):
+            with patch.object(recommendation_models, "build_explicit_topic_resource_model", side_effect=build_model):
+                build_student_recommendation_samples(fixture_profile(), student_id="student-1")
+        self.assertEqual([{"teacher_id": None, "student_id": "student-1"}], loads)
+
+    def test_batch_alignment_matches_single_calls(self):
+        requests = [
+            ("worksheet", 3, [1, 2]),
+            ("Video", "7", (4,)),
+            ("exam", None, [1]),
+            ("worksheet", 3, {2, 1}),
+            ("", 5, [1]),
+            ("video", 12, []),
+        ]
+        with patched_history({}, fixture_topic_model(5, resources=20)):
+            expected = [topic_resource_alignment_features(kind, rid, topics) for kind, rid, topics in requests]
+            self.assertEqual(expected, topic_resource_alignment_batch(requests))
+
+    def test_matrix_training_matches_the_dict_fit(self):
+        with patched_history(fixture_history(200, 6), fixture_topic_model(6, resources=60)):
+            design = build_student_recommendation_design(fixture_profile(), student_id="student-1")
+        train = design.samples[:60]
+        expected = legacy_train(train)
+        weights = _train_weights(train, design=design, rows=list(range(60)))
+        self.assertEqual(set(expected), set(weights))
+        for name, weight in expected.items():
+            self.assertAlmostEqual(weight, weights[name], places=12)
+        self.assertEqual(set(expected), set(_train_weights(train)))
+
+        with_design = summarize_student_recommendation_samples(design.samples, design=design)
+        without_design = summarize_student_recommendation_samples(list(design.samples))
+        self.assertEqual(without_design["metrics"], with_design["metrics"])
+        for name, weight in without_design["feature_weights"].items():
+            self.assertAlmostEqual(weight, with_design["feature_weights"][name], places=12)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+import unittest
+from unittest.mock import patch
+
+import pandas as pd
+
+from helpers import student_report
+from helpers.student_report import _format_report_cells, build_student_report_pdf
+from scripts.benchmark_student_report_pdf import _history
+
+
+class StudentReportPdfTests(unittest.TestCase):
+    def test_cells_are_formatted_column_wise(self):
+        frame = pd.DataFrame(
+            {
+                "payment_date": pd.to_datetime(["2026-01-05", None]),
+                "paid_amount": [12000.0, None],
+                "lessons_paid": [0, 8],
+                "note": ["Unit 4 & <B1>", None],
+            }
+        )
+
+        cells = _format_report_cells(
+            frame,
+            ["payment_date", "paid_amount", "lessons_paid", "note", "missing"],
+            money_columns=("paid_amount",),
+            wrap_columns=("note",),
+        )
+
+        self.assertEqual(
+            [
+                ["2026-01-05", "12,000.00", "0", "Unit 4 &amp; &lt;B1&gt;", ""],
+                ["", "", "8", "", ""],
+            ],
+            cells,
+        )
+
+    def test_long_histories_are_split_into_chunked_tables(self):
+        from reportlab.platypus import Table
+
+        lessons_df, payments_df, package_df = _history(lessons=2 * student_report._REPORT_TABLE_CHUNK_ROWS + 5, years=5, seed=3)
+        captured = []
+        original = student_report._report_tables
+
+        def capture(*args, **kwargs):
+            tables = original(*args, **kwargs)
+            captured.append(tables)
+            return tables
+
+        with patch.object(student_report, "_report_tables", side_effect=capture):
+            pdf = build_student_report_pdf("Ana", lessons_df, payments_df, package_df)
+
+        self.assertTrue(pdf.startswith(b"%PDF"))
+        lesson_tables = captured[0]
+        self.assertEqual(3, len(lesson_tables))
+        self.assertTrue(all(isinstance(tbl, Table) and tbl.repeatRows == 1 for tbl in lesson_tables))
+        self.assertEqual(
+            [student_report._REPORT_TABLE_CHUNK_ROWS + 1, student_report._REPORT_TABLE_CHUNK_ROWS + 1, 6],
+            [len(tbl._cellvalues) for tbl in lesson_tables],
+        )
+        self.assertEqual(1, len({tuple(tbl._argW) for tbl in lesson_tables}))
+
+    def test_caller_frames_are_not_modified(self):
+        lessons_df, payments_df, _package_df = _history(lessons=12, years=1, seed=1)
+        package_df = pd.DataFrame({"Subject": ["English"], "Lessons_Left_Units": [3]})
+        before = package_df.copy()
+
+        build_student_report_pdf("Ana", lessons_df, payments_df, package_df)
+        build_student_report_pdf("Ana", lessons_df.iloc[0:0], payments_df.iloc[0:0], None)
+
+        pd.testing.assert_frame_equal(before, package_df)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,251 @@
+from contextlib import ExitStack
+import unittest
+from unittest.mock import patch
+
+import pandas as pd
+
+from helpers import learning_programs, teacher_recommendation_ml
+
+# Captured at import: page tests swap these module attributes out for stubs.
+_LOAD_PROGRAM = learning_programs.load_learning_program
+_LOAD_PROGRESS_MAP = learning_programs.load_assignment_progress_map
+
+
+class _FakeResult:
+    def __init__(self, data):
+        self.data = data
+
+
+class _FakeQuery:
+    def __init__(self, db, table_name):
+        self.db = db
+        self.table_name = table_name
+        self.filters = []
+        self.columns = "*"
+        self.orders = []
+        self.limit_value = None
+        self.range_value = None
+
+    def select(self, columns="*"):
+        self.columns = columns
+        return self
+
+    def eq(self, column, value):
+        self.filters.append(lambda row: row.get(column) == value)
+        return self
+
+    def in_(self, column, values):
+        values = list(values)
+        self.filters.append(lambda row: row.get(column) in values)
+        return self
+
+    def order(self, column, desc=False):
+        self.orders.append((column, desc))
+        return self
+
+    def limit(self, value):
+        self.limit_value = value
+        return self
+
+    def range(self, start, end):
+        self.range_value = (start, end)
+        return self
+
+    def execute(self):
+        self.db.calls.append(self.table_name)
+        rows = [dict(row) for row in self.db.tables.get(self.table_name, []) if all(check(row) for check in self.filters)]
+        for column, desc in reversed(self.orders):
+            rows.sort(key=lambda row: row.get(column) or 0, reverse=desc)
+        if self.db.nested and "units:learning_program_units(" in self.columns:
+            for row in rows:
+                row["units"] = [dict(unit) for unit in self.db.tables["learning_program_units"] if unit["program_id"] == row["id"]]
+                row["topics"] = [dict(topic) for topic in self.db.tables["learning_program_topics"] if topic["program_id"] == row["id"]]
+        if self.range_value is not None:
+            start, end = self.range_value
+            rows = rows[start : end + 1]
+        if self.limit_value is not None:
+            rows = rows[: self.limit_value]
+        # PostgREST max-rows: every response is capped, paged or not.
+        return _FakeResult(rows[: self.db.max_rows])
+
+
+class _FakeSupabase:
+    def __init__(self, program_count, *, nested=True):
+        self.nested = nested
+        self.max_rows = 1000
+        self.calls = []
+        self.tables = {"learning_programs": [], "learning_program_units": [], "learning_program_topics": [], "learning_program_progress": []}
+        topic_id = 500
+        for program_id in range(1, program_count + 1):
+            self.tables["learning_programs"].append(
+                {"id": program_id, "user_id": "teacher-1", "title": f"Program {program_id}", "subject": "english", "program_data": {}}
+            )
+            for unit_number in (1, 2):
+                unit_id = program_id * 10 + unit_number
+                self.tables["learning_program_units"].append(
+                    {"id": unit_id, "program_id": program_id, "unit_number": unit_number, "title": f"Unit {unit_number}"}
+                )
+                # Stored out of order to exercise the position sort.
+                for topic_number in (3, 1, 2):
+                    topic_id += 1
+                    self.tables["learning_program_topics"].append(
+                        {
+                            "id": topic_id,
+                            "program_id": program_id,
+                            "unit_id": unit_id,
+                            "unit_number": unit_number,
+                            "topic_number": topic_number,
+                            "title": f"Topic {unit_number}.{topic_number}",
+                        }
+                    )
+
+    def add_progress(self, assignment_id, program_id, done_count):
+        topics = [topic for topic in self.tables["learning_program_topics"] if topic["program_id"] == program_id]
+        for topic in topics[:done_count]:
+            self.tables["learning_program_progress"].append(
+                {"assignment_id": assignment_id, "topic_id": topic["id"], "teacher_done": True, "student_done": topic["id"] % 2 == 0}
+            )
+
+    def table(self, table_name):
+        return _FakeQuery(self, table_name)
+
+
+def _assignments(count, program_count):
+    return pd.DataFrame(
+        [
+            {
+                "id": assignment_id,
+                "program_id": 1 + (assignment_id % program_count),
+                "student_user_id": f"student-{assignment_id % 4}",
+                "subject_key": "english",
+                "updated_at": f"2026-03-{1 + assignment_id % 28:02d}T08:00:00+00:00",
+            }
+            for assignment_id in range(1, count + 1)
+        ]
+    )
+
+
+def _progress_rows():
+    return [
+        {"student_id": f"student-{idx % 4}", "subject_key": "english" if idx % 3 else "math", "score_pct": 40 + idx, "status": "assigned", "attempt_count": idx % 3}
+        for idx in range(12)
+    ]
+
+
+def _single_programs(ids):
+    programs = {}
+    for program_id in ids:
+        program = _LOAD_PROGRAM(program_id)
+        if program:
+            programs[program_id] = program
+    return programs
+
+
+def _single_progress_maps(ids):
+    return {assignment_id: _LOAD_PROGRESS_MAP(assignment_id) for assignment_id in ids}
+
+
+class TeacherObjectiveHydrationTests(unittest.TestCase):
+    def setUp(self):
+        self._clear()
+
+    def tearDown(self):
+        self._clear()
+
+    def _clear(self):
+        _LOAD_PROGRAM.clear()
+        learning_programs._load_learning_programs_cached.clear()
+        _LOAD_PROGRESS_MAP.clear()
+        learning_programs._load_assignment_progress_maps_cached.clear()
+
+    def _samples(self, fake_sb, assignment_count, program_count, **loaders):
+        with ExitStack() as stack:
+            stack.enter_context(patch.object(learning_programs, "get_sb", return_value=fake_sb))
+            stack.enter_context(
+                patch.object(
+                    teacher_recommendation_ml,
+                    "_load_program_assignments_for_teacher_cached",
+                    return_value=_assignments(assignment_count, program_count),
+                )
+            )
+            stack.enter_context(
+                patch.object(teacher_recommendation_ml, "_load_teacher_assignment_progress_cached", return_value=_progress_rows())
+            )
+            stack.enter_context(patch.object(teacher_recommendation_ml, "_load_teacher_objective_events", return_value=[]))
+            for name, loader in loaders.items():
+                stack.enter_context(patch.object(teacher_recommendation_ml, name, loader))
+            return teacher_recommendation_ml.build_teacher_objective_samples("teacher-1")
+
+    def test_batch_programs_match_single_loads(self):
+        for nested in (True, False):
+            with self.subTest(nested=nested):
+                self._clear()
+                fake_sb = _FakeSupabase(4, nested=nested)
+                with patch.object(learning_programs, "get_sb", return_value=fake_sb):
+                    batch = learning_programs.load_learning_programs([3, 1, 2, 99, 1])
+                    single = _single_programs([1, 2, 3])
+
+                self.assertEqual(single, batch)
+                self.assertEqual(["Topic 1.1", "Topic 1.2", "Topic 1.3"], [topic["title"] for topic in batch[1]["units"][0]["topics"]])
+
+    def test_batch_reads_page_past_the_row_cap(self):
+        fake_sb = _FakeSupabase(240, nested=False)
+        assignment_ids = list(range(1, 241))
+        for assignment_id in assignment_ids:
+            fake_sb.add_progress(assignment_id, assignment_id, 6)
+        self.assertGreater(len(fake_sb.tables["learning_program_progress"]), 1000)
+        self.assertGreater(len(fake_sb.tables["learning_program_topics"]), 1000)
+
+        with patch.object(learning_programs, "get_sb", return_value=fake_sb):
+            batch_maps = learning_programs.load_assignment_progress_maps(assignment_ids)
+            batch_programs = learning_programs.load_learning_programs(assignment_ids)
+            self.assertEqual(_single_progress_maps(assignment_ids), batch_maps)
+            self.assertEqual(_single_programs(assignment_ids), batch_programs)
+
+        self.assertEqual(len(fake_sb.tables["learning_program_progress"]), sum(len(rows) for rows in batch_maps.values()))
+        self.assertEqual(6, len(batch_maps[240]))
+
+    def test_samples_match_per_assignment_loading_in_constant_round_trips(self):
+        program_count = 3
+        legacy_sb = _FakeSupabase(program_count)
+        batch_sb = _FakeSupabase(program_count)
+        for fake_sb in (legacy_sb, batch_sb):
+            for assignment_id in range(1, 31):
+                fake_sb.add_progress(assignment_id, 1 + (assignment_id % program_count), assignment_id % 5)
+
+        legacy = self._samples(
+            legacy_sb,
+            30,
+            program_count,
+            load_learning_programs=_single_programs,
+            load_assignment_progress_maps=_single_progress_maps,
+        )
+        self._clear()
+        batch = self._samples(batch_sb, 30, program_count)
+
+        self.assertTrue(batch)
+        self.assertEqual(legacy, batch)
+        self.assertEqual(2, len(batch_sb.calls))
+        self.assertGreater(len(legacy_sb.calls), 30)
+
+        self._clear()
+        small_sb = _FakeSupabase(program_count)
+        self._samples(small_sb, 4, program_count)
+        self.assertEqual(len(small_sb.calls), len(batch_sb.calls))
+
+    def test_progress_grouping_matches_the_per_row_filter(self):
+        progress_df = pd.DataFrame(_progress_rows())
+        grouped = teacher_recommendation_ml._group_progress_rows_by_student_subject(progress_df)
+
+        for student_id in ("student-0", "student-3", "student-9"):
+            for subject_key in ("english", "math"):
+                expected = progress_df[
+                    (progress_df["student_id"].astype(str) == student_id)
+                    & (progress_df["subject_key"].astype(str) == subject_key)
+                ].to_dict("records")
+                self.assertEqual(expected, grouped.get((student_id, subject_key), []))
+        self.assertEqual({}, teacher_recommendation_ml._group_progress_rows_by_student_subject(pd.DataFrame()))
+
+
+if __name__ == "__main__":
+    unittest.main()
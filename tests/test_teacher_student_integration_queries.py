@@ -69,6 +69,7 @@ class TeacherStudentIntegrationQueryTests(unittest.TestCase):
         tsi._load_teacher_assignment_progress_cached.clear()
         tsi._load_teacher_review_requests_cached.clear()
         video_library._load_public_videos_cached.clear()
+        video_library._load_public_videos_page_cached.clear()
 
     def test_teacher_student_rows_use_explicit_student_columns(self):
         fake_sb = _FakeSupabase(
@@ -385,6 +386,7 @@ class TeacherStudentIntegrationQueryTests(unittest.TestCase):
             }
         )
         video_library._load_public_videos_cached.clear()
+        video_library._load_public_videos_page_cached.clear()
         try:
             with (
                 patch.object(video_library, "get_sb", return_value=fake_sb),
@@ -393,6 +395,7 @@ class TeacherStudentIntegrationQueryTests(unittest.TestCase):
                 df = video_library._load_public_videos_cached(limit=5)
         finally:
             video_library._load_public_videos_cached.clear()
+            video_library._load_public_videos_page_cached.clear()
 
         self.assertEqual(1, len(df))
         self.assertEqual("https://img.youtube.com/vi/abcdefghijk/hqdefault.jpg", df.iloc[0]["thumbnail_url"])
@@ -401,8 +404,9 @@ class TeacherStudentIntegrationQueryTests(unittest.TestCase):
         self.assertIn("thumbnail_url", query.ops[0][1])
         self.assertNotEqual("*", query.ops[0][1])
         self.assertIn(("eq", "is_public", True), query.ops)
-        self.assertIn(("order", "updated_at", True), query.ops)
-        self.assertIn(("limit", 5), query.ops)
+        self.assertIn(("order", "created_at", True), query.ops)
+        self.assertIn(("order", "id", True), query.ops)
+        self.assertIn(("limit", 6), query.ops)
 
     def test_load_worksheet_record_normalizes_float_identifier(self):
         captured = {}
@@ -0,0 +1,138 @@
+import unittest
+from unittest.mock import patch
+
+from helpers import video_library
+
+
+class _FakeResult:
+    def __init__(self, data):
+        self.data = data
+
+
+class _FakeQuery:
+    def __init__(self, sb, table_name):
+        self.sb = sb
+        self.table_name = table_name
+        self.columns = ""
+        self.filters = {}
+
+    def select(self, columns):
+        self.columns = columns
+        return self
+
+    def eq(self, column, value):
+        self.filters[column] = [value]
+        return self
+
+    def in_(self, column, values):
+        self.filters[column] = list(values)
+        return self
+
+    def order(self, _column, desc=False):
+        return self
+
+    def limit(self, _value):
+        return self
+
+    def execute(self):
+        self.sb.round_trips.append((self.table_name, self.columns))
+        if self.table_name == "learning_program_topic_videos" and "program:" in self.columns and not self.sb.nested_ok:
+            raise RuntimeError("PGRST200 could not find a relationship")
+        rows = self.sb.tables.get(self.table_name, [])
+        for column, values in self.filters.items():
+            rows = [row for row in rows if row.get(column) in values]
+        if self.table_name == "learning_program_topic_videos" and "program:" in self.columns:
+            programs = {row["id"]: row for row in self.sb.tables["learning_programs"]}
+            topics = {row["id"]: row for row in self.sb.tables["learning_program_topics"]}
+            rows = [{**row, "program": programs[row["program_id"]], "topic": topics[row["topic_id"]]} for row in rows]
+        return _FakeResult([dict(row) for row in rows])
+
+
+class _FakeSupabase:
+    def __init__(self, tables, *, nested_ok=True):
+        self.tables = tables
+        self.nested_ok = nested_ok
+        self.round_trips = []
+
+    def table(self, table_name):
+        return _FakeQuery(self, table_name)
+
+
+def _library(video_count=120):
+    videos = [
+        {
+            "id": idx,
+            "user_id": f"teacher-{idx % 7}",
+            "title": f"Video {idx}",
+            "youtube_video_id": "dQw4w9WgXcQ",
+            "is_public": True,
+            "status": "active",
+        }
+        for idx in range(1, video_count + 1)
+    ]
+    links = [
+        {"id": 1000 + idx, "video_id": idx, "program_id": 1 + idx % 4, "topic_id": 10 + idx % 9, "created_at": "2026-01-01"}
+        for idx in range(1, video_count + 1, 2)
+    ]
+    return {
+        "videos": videos,
+        "learning_program_topic_videos": links,
+        "learning_programs": [{"id": pid, "title": f"Program {pid}", "subject": "english"} for pid in range(1, 5)],
+        "learning_program_topics": [{"id": tid, "title": f"Topic {tid}"} for tid in range(10, 19)],
+        "profiles": [{"user_id": f"teacher-{idx}", "display_name": f"Teacher {idx}"} for idx in range(7)],
+    }
+
+
+class VideoLibraryBatchingTests(unittest.TestCase):
+    def setUp(self):
+        video_library._VIDEO_TOPIC_LINK_CACHE.clear()
+        video_library._PROFILE_NAME_CACHE.clear()
+
+    def tearDown(self):
+        video_library._VIDEO_TOPIC_LINK_CACHE.clear()
+        video_library._PROFILE_NAME_CACHE.clear()
+
+    def test_gallery_page_topic_links_load_in_one_round_trip(self):
+        fake_sb = _FakeSupabase(_library())
+        video_ids = list(range(1, 121))
+        with patch.object(video_library, "get_sb", return_value=fake_sb):
+            page = video_library.load_video_topic_links_many(video_ids)
+            opened = [video_library.load_video_topic_links(video_id) for video_id in video_ids]
+
+        # Before batching, opening each video cost 3 round trips (360 for the page).
+        self.assertEqual(1, len(fake_sb.round_trips))
+        self.assertEqual(120, len(page))
+        self.assertEqual("Program 2", page[1][0]["program"]["title"])
+        self.assertEqual("Topic 11", page[1][0]["topic"]["title"])
+        self.assertEqual([], page[2])
+        self.assertEqual([page[video_id] for video_id in video_ids], opened)
+
+    def test_topic_links_fall_back_to_flat_queries_without_embedding(self):
+        fake_sb = _FakeSupabase(_library(), nested_ok=False)
+        with patch.object(video_library, "get_sb", return_value=fake_sb):
+            page = video_library.load_video_topic_links_many(range(1, 121))
+
+        self.assertEqual(4, len(fake_sb.round_trips))
+        self.assertEqual("Program 2", page[1][0]["program"]["title"])
+        self.assertEqual("Topic 11", page[1][0]["topic"]["title"])
+
+    def test_profile_names_are_shared_across_library_loaders(self):
+        fake_sb = _FakeSupabase(_library())
+        with patch.object(video_library, "get_sb", return_value=fake_sb):
+            video_library._load_public_videos_cached.clear()
+            video_library._load_public_videos_page_cached.clear()
+            public_df = video_library._load_public_videos_cached()
+            by_ids = video_library.load_videos_by_ids(list(range(1, 121)))
+            video_library._load_public_videos_cached.clear()
+            video_library._load_public_videos_page_cached.clear()
+
+        profile_trips = [trip for trip in fake_sb.round_trips if trip[0] == "profiles"]
+        # Previously: one profiles query for the public list plus one per video (121).
+        self.assertEqual(1, len(profile_trips))
+        self.assertEqual("Teacher 1", public_df.iloc[0]["author_name"])
+        self.assertEqual(120, len(by_ids))
+        self.assertEqual("Teacher 3", by_ids[2]["author_name"])
+
+
+if __name__ == "__main__":
+    unittest.main()
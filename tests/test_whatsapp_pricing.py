@@ -0,0 +1,65 @@
+import unittest
+from unittest.mock import patch
+
+import pandas as pd
+
+from helpers import whatsapp
+
+
+def _items(rows):
+    return pd.DataFrame(
+        rows,
+        columns=["id", "modality", "kind", "hours", "price", "active", "sort_order"],
+    )
+
+
+_ROWS = [
+    (1, "online", "hourly", None, 900, True, 0),
+    (2, " Online ", "package", 10, 8500, True, 1),
+    (3, "online", "package", 20, 16000, True, 1),
+    (4, "online", "package", 5, 4400, True, 0),
+    (5, "offline", "hourly", None, 1200, True, 1),
+    (6, "offline", "hourly", None, 1100, True, 0),
+    (7, "offline", "package", 44, 40000, False, 0),
+    (8, "offline", "package", 0, 500, True, 0),
+    (9, "OFFLINE", "Package", 3, 3500, True, 0),
+]
+
+
+class PricingSnapshotTests(unittest.TestCase):
+    def test_snapshot_orders_packages_and_picks_first_hourly(self):
+        snapshot = whatsapp._pricing_snapshot_from_items(_items(_ROWS))
+
+        self.assertEqual(900, snapshot["online_hourly"])
+        self.assertEqual(1100, snapshot["offline_hourly"])
+        self.assertEqual([(5, 4400, 880), (20, 16000, 800), (10, 8500, 850)], snapshot["online_packages"])
+        self.assertEqual([(3, 3500, 1167)], snapshot["offline_packages"])
+
+    def test_version_tracks_pricing_content(self):
+        base = whatsapp._pricing_snapshot_from_items(_items(_ROWS))
+        same = whatsapp._pricing_snapshot_from_items(_items(list(reversed(_ROWS))))
+        changed_rows = list(_ROWS)
+        changed_rows[0] = (1, "online", "hourly", None, 950, True, 0)
+        changed = whatsapp._pricing_snapshot_from_items(_items(changed_rows))
+
+        self.assertEqual(base["version"], same["version"])
+        self.assertNotEqual(base["version"], changed["version"])
+        self.assertEqual("empty", whatsapp._pricing_snapshot_from_items(_items([]))["version"])
+
+    def test_pricing_block_is_rendered_once_per_language_and_version(self):
+        whatsapp._render_pricing_block_cached.clear()
+        snapshot = whatsapp._pricing_snapshot_from_items(_items(_ROWS))
+        render = whatsapp._render_pricing_block
+        with patch.object(whatsapp, "_get_pricing_snapshot", return_value=snapshot), patch.object(
+            whatsapp, "_render_pricing_block", side_effect=render
+        ) as rendered:
+            blocks = [whatsapp.build_pricing_block(lang) for lang in ["en", "tr", "en", "en", "tr"]]
+
+        self.assertEqual(2, rendered.call_count)
+        self.assertIn("5 hours → 4.400 TL (≈ 880 TL / hour)", blocks[0])
+        self.assertEqual(blocks[0], blocks[2])
+        whatsapp._render_pricing_block_cached.clear()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+import random
+import string
+import unittest
+
+from helpers.wordsearch_layout import (
+    WORDSEARCH_DIRECTIONS,
+    WORDSEARCH_LAYOUT_KEY,
+    WORDSEARCH_LAYOUT_VERSION,
+    layout_wordsearch,
+    stamp_wordsearch_layout,
+    wordsearch_layout_version,
+)
+from helpers.worksheet_storage import _generate_wordsearch_grid
+
+
+def _random_words(count, seed, min_len=3, max_len=9):
+    rng = random.Random(seed)
+    words = set()
+    while len(words) < count:
+        words.add("".join(rng.choice(string.ascii_uppercase) for _ in range(rng.randint(min_len, max_len))))
+    return sorted(words)
+
+
+class WordsearchLayoutTests(unittest.TestCase):
+    def _assert_consistent(self, grid, words, placed_words, placements):
+        size = len(grid)
+        self.assertTrue(all(len(row) == size and all(cell for cell in row) for row in grid))
+        self.assertEqual(placed_words, [item["word"] for item in placements])
+        self.assertTrue(set(placed_words) <= set(words))
+        for item in placements:
+            coords = item["coords"]
+            self.assertEqual(item["word"], "".join(grid[r][c] for r, c in coords))
+            steps = {(r2 - r1, c2 - c1) for (r1, c1), (r2, c2) in zip(coords, coords[1:])}
+            self.assertEqual(1, len(steps))
+            self.assertIn(steps.pop(), WORDSEARCH_DIRECTIONS)
+
+    def test_same_seed_gives_same_grid(self):
+        words = _random_words(12, seed=1)
+        first = layout_wordsearch(words, 12, string.ascii_uppercase, seed="lesson-7")
+        again = layout_wordsearch(words, 12, string.ascii_uppercase, seed="lesson-7")
+        other = layout_wordsearch(words, 12, string.ascii_uppercase, seed="lesson-8")
+
+        self.assertEqual(first, again)
+        self.assertNotEqual(first[0], other[0])
+
+    def test_placements_spell_words_on_dense_grids(self):
+        for size, count in [(10, 10), (12, 20), (15, 30), (25, 40)]:
+            words = _random_words(count, seed=size * count, max_len=min(9, size))
+            grid, placed_words, placements = layout_wordsearch(words, size, string.ascii_uppercase, seed=size)
+            self._assert_consistent(grid, words, placed_words, placements)
+            self.assertGreaterEqual(len(placed_words) / len(words), 0.9, msg=(size, count))
+
+    def test_roomy_grid_places_every_word_longest_first(self):
+        words = _random_words(12, seed=5)
+        grid, placed_words, placements = _generate_wordsearch_grid(words, seed="fixed")
+
+        self._assert_consistent(grid, words, placed_words, placements)
+        self.assertEqual(sorted(words), sorted(placed_words))
+        self.assertEqual(sorted(words, key=len, reverse=True)[0], placed_words[0])
+
+    def test_overfull_grid_reports_only_placed_words(self):
+        words = _random_words(40, seed=9, min_len=6, max_len=8)
+        grid, placed_words, placements = layout_wordsearch(words, 8, string.ascii_uppercase, seed=3)
+
+        self._assert_consistent(grid, words, placed_words, placements)
+        self.assertLess(len(placed_words), len(words))
+
+    def test_unversioned_worksheets_keep_the_original_grid(self):
+        ws = {"worksheet_type": "word_search_vocab", "vocabulary_bank": ["cat", "dog", "sun"]}
+        self.assertEqual(1, wordsearch_layout_version(ws))
+
+        grid, placed_words, placements = _generate_wordsearch_grid(
+            ws["vocabulary_bank"], seed="CAT|DOG|SUN", size=8, layout_version=wordsearch_layout_version(ws)
+        )
+
+        self.assertEqual(
+            ["HJMCBQGY", "EIAWGTAR", "NPHDATDS", "DCSFAMBZ", "QDBCNWNW", "NPOUXAQX", "ZKSGPKHX", "LEEJLFFY"],
+            ["".join(row) for row in grid],
+        )
+        self.assertEqual(["CAT", "DOG", "SUN"], placed_words)
+        self.assertEqual([(4, 3), (3, 4), (2, 5)], placements[0]["coords"])
+
+    def test_stamped_worksheets_use_the_current_engine(self):
+        ws = stamp_wordsearch_layout({"worksheet_type": "word_search_vocab"})
+        words = _random_words(12, seed=5)
+
+        self.assertEqual(WORDSEARCH_LAYOUT_VERSION, wordsearch_layout_version(ws))
+        self.assertEqual(
+            _generate_wordsearch_grid(words, seed="fixed"),
+            _generate_wordsearch_grid(words, seed="fixed", layout_version=wordsearch_layout_version(ws)),
+        )
+        self.assertNotIn(WORDSEARCH_LAYOUT_KEY, stamp_wordsearch_layout({"worksheet_type": "matching"}))
+        self.assertEqual(1, wordsearch_layout_version(stamp_wordsearch_layout({WORDSEARCH_LAYOUT_KEY: 1, "worksheet_type": "word_search_vocab"})))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -269,6 +269,7 @@ EN: Dict[str, str] = {
     "admin_ai_metric_review_closure": "Review closure",
     "admin_ai_metric_feedback_loop": "Feedback loop",
     "admin_ai_metric_ai_success": "AI success",
+    "admin_ai_metric_ai_cache_hits": "AI cache hits",
     "admin_ai_map_signals_title": "Signals",
     "admin_ai_map_signals_body": "Teacher, student, review, recommendation, practice, and activity events collected by the app.",
     "admin_ai_map_features_title": "Features",
@@ -474,6 +475,7 @@ EN: Dict[str, str] = {
     "admin_ai_status_requested": "Requested",
     "admin_ai_status_success": "Success",
     "admin_ai_status_failed": "Failed",
+    "admin_ai_status_cache_hit": "Served from cache",
     "admin_ai_events_inspector_title": "Inspect AI events",
     "admin_ai_events_inspector_caption": "See which features consume the most AI and which supplier handled each event.",
     "admin_ai_graphs_library_title": "Operational intelligence graphs",
@@ -2050,6 +2052,8 @@ EN: Dict[str, str] = {
     "save_template_plan": "Save template plan",
     "template_plan_saved": "Template plan saved.",
     "ai_unavailable_fallback": "⚠️ This resource was generated with Template. Save it if you want to keep it, or try AI generation again later.",
+    "ai_force_fresh_generation": "Generate a fresh AI version",
+    "ai_force_fresh_generation_help": "Identical requests reuse the last AI result. Tick this to ask the AI again.",
     "no_template_for_subject": "No template for this subject/topic yet. Try AI model.",
     "community_plan_found_note": "Plan found in the community library.",
 
@@ -2971,6 +2975,7 @@ EN: Dict[str, str] = {
     "learning_program_previous_incomplete_warning": "The previous program has not been completed yet ({ready_units} of {total_units} units ready). Please complete the previous level before using it to generate a new one.",
     "learning_program_update_failed": "Could not update the learning program: {error}",
     "learning_program_update_conflict": "We couldn't save the new unit details just now. Please try again once. If the issue continues, refresh the page and reopen the learning program.",
+    "learning_program_version_conflict": "This learning program was changed somewhere else since you opened it. Refresh the page to load the latest version, then make your edit again.",
     "learning_program_update_retry_generic": "We couldn't update the learning program right now. Please try again in a moment.",
     "clear_builder": "Clear builder",
     "learning_program_units_adjusted": "Units adjusted to {units} for {learner_stage} based on Classio pedagogical guardrails.",
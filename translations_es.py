@@ -269,6 +269,7 @@ ES: Dict[str, str] = {
     "admin_ai_metric_review_closure": "Cierre de revisiones",
     "admin_ai_metric_feedback_loop": "Bucle de feedback",
     "admin_ai_metric_ai_success": "Éxito IA",
+    "admin_ai_metric_ai_cache_hits": "Aciertos de caché IA",
     "admin_ai_map_signals_title": "Señales",
     "admin_ai_map_signals_body": "Eventos de profesor, alumno, revisión, recomendación, práctica y actividad recogidos por la app.",
     "admin_ai_map_features_title": "Variables",
@@ -474,6 +475,7 @@ ES: Dict[str, str] = {
     "admin_ai_status_requested": "Solicitado",
     "admin_ai_status_success": "Éxito",
     "admin_ai_status_failed": "Falló",
+    "admin_ai_status_cache_hit": "Servido desde caché",
     "admin_ai_events_inspector_title": "Inspeccionar eventos IA",
     "admin_ai_events_inspector_caption": "Mira qué funciones consumen más IA y qué proveedor atendió cada evento.",
     "admin_ai_graphs_library_title": "Gráficas operativas de inteligencia",
@@ -2050,6 +2052,8 @@ ES: Dict[str, str] = {
     "save_template_plan": "Guardar plan de plantilla",
     "template_plan_saved": "Plan de plantilla guardado.",
     "ai_unavailable_fallback": "⚠️ Este recurso fue generado con Plantilla. Guárdelo si lo quiere conservar o puede intentar la generación con IA otra vez más tarde.",
+    "ai_force_fresh_generation": "Generar una versión nueva con IA",
+    "ai_force_fresh_generation_help": "Las solicitudes idénticas reutilizan el último resultado de IA. Marque esta opción para pedirle a la IA de nuevo.",
     "no_template_for_subject": "Aún no hay plantilla para esta materia/tema. Prueba el modo IA.",
     "community_plan_found_note": "Plan encontrado en la biblioteca comunitaria.",
 
@@ -2971,6 +2975,7 @@ ES: Dict[str, str] = {
     "learning_program_previous_incomplete_warning": "El programa anterior todavía no se ha completado ({ready_units} de {total_units} unidades listas). Completa el nivel anterior antes de usarlo para generar uno nuevo.",
     "learning_program_update_failed": "No se pudo actualizar el programa de aprendizaje: {error}",
     "learning_program_update_conflict": "No pudimos guardar ahora los nuevos detalles de la unidad. Inténtalo una vez más. Si el problema continúa, recarga la página y vuelve a abrir el programa de aprendizaje.",
+    "learning_program_version_conflict": "Este programa de aprendizaje se modificó en otro lugar desde que lo abriste. Recarga la página para cargar la versión más reciente y vuelve a hacer tu cambio.",
     "learning_program_update_retry_generic": "No pudimos actualizar el programa de aprendizaje en este momento. Inténtalo de nuevo en un momento.",
     "clear_builder": "Limpiar generador",
     "learning_program_units_adjusted": "Las unidades se ajustaron a {units} para {learner_stage} según las guías pedagógicas de Classio.",
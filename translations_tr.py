@@ -269,6 +269,7 @@ TR: Dict[str, str] = {
     "admin_ai_metric_review_closure": "İnceleme kapanışı",
     "admin_ai_metric_feedback_loop": "Geri bildirim döngüsü",
     "admin_ai_metric_ai_success": "YZ başarısı",
+    "admin_ai_metric_ai_cache_hits": "YZ önbellek isabeti",
     "admin_ai_map_signals_title": "Sinyaller",
     "admin_ai_map_signals_body": "Uygulamanın topladığı öğretmen, öğrenci, inceleme, öneri, pratik ve etkinlik olayları.",
     "admin_ai_map_features_title": "Özellikler",
@@ -474,6 +475,7 @@ TR: Dict[str, str] = {
     "admin_ai_status_requested": "İstendi",
     "admin_ai_status_success": "Başarılı",
     "admin_ai_status_failed": "Başarısız",
+    "admin_ai_status_cache_hit": "Önbellekten sunuldu",
     "admin_ai_events_inspector_title": "Yapay zeka olaylarını incele",
     "admin_ai_events_inspector_caption": "Hangi özelliklerin en çok yapay zeka tükettiğini ve her olayda hangi sağlayıcının kullanıldığını görün.",
     "admin_ai_graphs_library_title": "Operasyonel zekâ grafikleri",
@@ -2049,6 +2051,8 @@ TR: Dict[str, str] = {
     "save_template_plan": "Şablon planı kaydet",
     "template_plan_saved": "Şablon plan kaydedildi.",
     "ai_unavailable_fallback": "⚠️ Bu kaynak Şablon ile oluşturuldu. Saklamak istiyorsanız kaydedin ya da daha sonra AI üretimini tekrar deneyin.",
+    "ai_force_fresh_generation": "Yeni bir AI sürümü oluştur",
+    "ai_force_fresh_generation_help": "Aynı istekler son AI sonucunu yeniden kullanır. AI'dan yeniden istemek için bunu işaretleyin.",
     "no_template_for_subject": "Bu ders/konu için henüz şablon yok. Yapay zeka modunu deneyin.",
     "community_plan_found_note": "Topluluk kütüphanesinde plan bulundu.",
 
@@ -2957,6 +2961,7 @@ TR: Dict[str, str] = {
     "learning_program_previous_incomplete_warning": "Önceki program henüz tamamlanmadı ({total_units} üniteden {ready_units} tanesi hazır). Yeni bir program oluşturmak için kullanmadan önce önceki seviyeyi tamamlayın.",
     "learning_program_update_failed": "Öğrenme programı güncellenemedi: {error}",
     "learning_program_update_conflict": "Yeni ünite ayrıntılarını şu anda kaydedemedik. Lütfen bir kez daha deneyin. Sorun devam ederse sayfayı yenileyip öğrenme programını yeniden açın.",
+    "learning_program_version_conflict": "Bu öğrenme programı siz açtıktan sonra başka bir yerde değiştirildi. En son sürümü yüklemek için sayfayı yenileyin ve düzenlemenizi yeniden yapın.",
     "learning_program_update_retry_generic": "Öğrenme programını şu anda güncelleyemedik. Lütfen birazdan tekrar deneyin.",
     "clear_builder": "Oluşturucuyu temizle",
     "learning_program_units_adjusted": "Üniteler, Classio pedagojik sınırlarına göre {learner_stage} için {units} olarak ayarlandı.",